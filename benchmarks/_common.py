@@ -0,0 +1,95 @@
+"""Shared helpers for screenshot pipeline benchmarks."""
+from __future__ import annotations
+
+import glob
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+# Ensure workspace package sources are importable when running via `python -m benchmarks.<name>`
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _src_dir in glob.glob(os.path.join(_ROOT, "packages", "*", "src")):
+    if _src_dir not in sys.path:
+        sys.path.insert(0, _src_dir)
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+
+RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4K": (3840, 2160),
+}
+
+
+def synthetic_screen(width: int, height: int, seed: int = 0) -> Image.Image:
+    """Desktop-like frame: flat panels, a gradient 'wallpaper' and rows of text-like glyphs."""
+    img = Image.new("RGB", (width, height), (236, 236, 236))
+    draw = ImageDraw.Draw(img)
+    # Gradient wallpaper on the right third
+    x0 = width * 2 // 3
+    for x in range(x0, width, 4):
+        shade = int(40 + 160 * (x - x0) / max(1, width - x0))
+        draw.rectangle([x, 0, x + 3, height], fill=(shade // 2, shade, 200))
+    # Title bar, sidebar, buttons
+    draw.rectangle([0, 0, x0, 36], fill=(48, 52, 64))
+    draw.rectangle([0, 36, 240, height], fill=(250, 250, 252))
+    for i in range(12):
+        draw.rectangle([16, 60 + i * 44, 224, 92 + i * 44], outline=(180, 180, 190), fill=(255, 255, 255))
+    # Text-like rows
+    step = 22
+    for row, y in enumerate(range(60, height - 20, step)):
+        x = 260
+        k = seed + row
+        while x < x0 - 40:
+            word = 18 + (k * 7919) % 60
+            draw.rectangle([x, y, x + word, y + 10], fill=(30, 30, 30))
+            x += word + 8
+            k += 1
+    return img
+
+
+def time_call(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples: List[float] = []
+    fn()  # warm-up
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples
+
+
+def median_ms(samples: List[float]) -> float:
+    return statistics.median(samples) if samples else 0.0
+
+
+def photo_screen(width: int, height: int, seed: int = 0) -> Image.Image:
+    """Photo/video-like frame: smooth random colour field with soft detail."""
+    import random
+
+    from PIL import ImageFilter
+
+    rnd = random.Random(seed)
+    small = Image.new("RGB", (48, 27))
+    small.putdata([(rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)) for _ in range(48 * 27)])
+    img = small.resize((width, height), resample=Image.BICUBIC)
+    noise = Image.effect_noise((width, height), 24).convert("RGB")
+    return Image.blend(img, noise, 0.15).filter(ImageFilter.SMOOTH)
+
+
+def flat_ui_screen(width: int, height: int, seed: int = 0) -> Image.Image:
+    """Flat UI frame: solid panels and non-antialiased glyph blocks, a handful of colours."""
+    img = Image.new("RGB", (width, height), (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([0, 0, width, 40], fill=(33, 150, 243))
+    draw.rectangle([0, 40, 260, height], fill=(245, 245, 245))
+    for row, y in enumerate(range(70, height - 20, 26)):
+        x, k = 290, seed + row
+        while x < width - 60:
+            word = 14 + (k * 7919) % 50
+            draw.rectangle([x, y, x + word, y + 9], fill=(33, 33, 33))
+            x += word + 7
+            k += 1
+    return img
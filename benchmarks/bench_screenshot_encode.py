@@ -0,0 +1,67 @@
+"""Per-frame cost of the legacy double-encode path vs a single shared EncodedFrame.
+
+Legacy: encode to the file in screenshots/, encode again into BytesIO, base64 the buffer.
+Shared: encode once, write the same bytes to disk, base64 once.
+
+Run:
+    python -m benchmarks.bench_screenshot_encode [--repeat 10] [--format JPEG]
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import os
+import tempfile
+from io import BytesIO
+
+from benchmarks._common import RESOLUTIONS, median_ms, synthetic_screen, time_call
+
+from os_ai_core.utils.frames import encode_frame
+
+
+def _legacy(img, fmt: str, quality: int, path: str) -> str:
+    if fmt == "JPEG":
+        img.convert("RGB").save(path, format="JPEG", quality=quality)
+    else:
+        img.save(path, format="PNG")
+    buf = BytesIO()
+    if fmt == "JPEG":
+        img.convert("RGB").save(buf, format="JPEG", quality=quality)
+    else:
+        img.save(buf, format="PNG")
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def _shared(img, fmt: str, quality: int, path: str) -> str:
+    frame = encode_frame(img, fmt, quality=quality)
+    frame.write_to(path)
+    return frame.b64
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--format", default="JPEG", choices=["JPEG", "PNG"])
+    parser.add_argument("--quality", type=int, default=50)
+    parser.add_argument("--no-resize", action="store_true", help="encode at native resolution (skip 1024px downscale)")
+    args = parser.parse_args()
+
+    print(f"format={args.format} quality={args.quality} repeat={args.repeat}")
+    print(f"{'resolution':<10} {'encoded':>12} {'legacy ms':>10} {'shared ms':>10} {'saved ms':>9} {'saved %':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "frame.bin")
+        for label, (w, h) in RESOLUTIONS.items():
+            img = synthetic_screen(w, h)
+            if not args.no_resize:
+                img = img.resize((1024, max(1, round(h * 1024 / w))))
+            legacy = median_ms(time_call(lambda: _legacy(img, args.format, args.quality, path), args.repeat))
+            shared = median_ms(time_call(lambda: _shared(img, args.format, args.quality, path), args.repeat))
+            saved = legacy - shared
+            pct = (saved / legacy * 100.0) if legacy else 0.0
+            enc = f"{img.width}x{img.height}"
+            print(f"{label:<10} {enc:>12} {legacy:>10.2f} {shared:>10.2f} {saved:>9.2f} {pct:>7.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
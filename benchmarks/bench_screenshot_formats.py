@@ -0,0 +1,95 @@
+"""Bytes and encode time per screenshot format over a corpus of frames.
+
+Frames are scaled to the model width first (as the tool does) and then encoded as
+JPEG, PNG, palette PNG, lossless/lossy WebP and AUTO (per-frame choice).
+
+Corpus: every PNG/JPEG/WebP under --corpus (default: ./screenshots). Without
+saved screenshots a synthetic corpus is used (desktop, flat UI, photo).
+
+Run:
+    python -m benchmarks.bench_screenshot_formats [--corpus screenshots] [--limit 50]
+"""
+from __future__ import annotations
+
+import argparse
+import collections
+import glob
+import os
+import statistics
+from typing import Dict, List, Tuple
+
+from PIL import Image
+
+from benchmarks._common import RESOLUTIONS, flat_ui_screen, median_ms, photo_screen, synthetic_screen, time_call
+
+from os_ai_core.utils.frames import choose_format, encode_frame
+from os_ai_core.utils.resize import ResizeEngine
+
+
+CANDIDATES: Dict[str, Dict[str, object]] = {
+    "jpeg": {"fmt": "JPEG"},
+    "png": {"fmt": "PNG"},
+    "png8": {"fmt": "PNG", "palette_colors": 256},
+    "webp-ll": {"fmt": "WEBP", "lossless": True},
+    "webp": {"fmt": "WEBP"},
+    "auto": {"fmt": "AUTO"},
+}
+
+
+def _load_corpus(path: str, limit: int) -> List[Tuple[str, Image.Image]]:
+    files: List[str] = []
+    for ext in ("png", "jpg", "jpeg", "webp"):
+        files.extend(glob.glob(os.path.join(path, f"*.{ext}")))
+    frames = []
+    for f in sorted(files)[: max(1, limit)]:
+        try:
+            frames.append((os.path.basename(f), Image.open(f).convert("RGB")))
+        except Exception:
+            continue
+    if frames:
+        return frames
+    synth = []
+    for label, (w, h) in RESOLUTIONS.items():
+        synth.append((f"desktop-{label}", synthetic_screen(w, h)))
+        synth.append((f"flat-{label}", flat_ui_screen(w, h)))
+        synth.append((f"photo-{label}", photo_screen(w, h)))
+    return synth
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default="screenshots")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--quality", type=int, default=50)
+    parser.add_argument("--model-width", type=int, default=1024)
+    args = parser.parse_args()
+
+    corpus = _load_corpus(args.corpus, args.limit)
+    print(f"corpus={len(corpus)} frames quality={args.quality} model_width={args.model_width}")
+    sizes: Dict[str, List[int]] = collections.defaultdict(list)
+    times: Dict[str, List[float]] = collections.defaultdict(list)
+    choices: Dict[str, int] = collections.Counter()
+    for name, img in corpus:
+        h = max(1, int(round(img.height * args.model_width / float(img.width))))
+        frame_img = ResizeEngine((args.model_width, h)).process(img)
+        choices[choose_format(frame_img)[0]] += 1
+        row = []
+        for label, opts in CANDIDATES.items():
+            kw = {k: v for k, v in opts.items() if k != "fmt"}
+            out = encode_frame(frame_img, str(opts["fmt"]), quality=args.quality, **kw)
+            t = median_ms(time_call(lambda: encode_frame(frame_img, str(opts["fmt"]), quality=args.quality, **kw), args.repeat))
+            sizes[label].append(out.size_bytes)
+            times[label].append(t)
+            row.append(f"{label}={out.size_bytes / 1024:.0f}KB/{t:.0f}ms")
+        print(f"  {name:<28} " + " ".join(row))
+
+    print(f"\n{'format':<8} {'median KB':>10} {'total KB':>10} {'median ms':>10}")
+    for label in CANDIDATES:
+        print(f"{label:<8} {statistics.median(sizes[label]) / 1024:>10.1f} {sum(sizes[label]) / 1024:>10.1f} {statistics.median(times[label]):>10.2f}")
+    print("auto choices: " + ", ".join(f"{k}={v}" for k, v in sorted(choices.items())))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""Per-frame cost of the legacy resize/letterbox path vs the precomputed ResizeEngine.
+
+Legacy: resize to the logical screen, LANCZOS to the content size, new black canvas, paste.
+Engine: one Image.reduce + resample straight to the content size, reused canvas.
+
+Each resolution is measured at 1x and as a 2x HiDPI capture of the same logical screen.
+
+Run:
+    python -m benchmarks.bench_screenshot_resize [--repeat 10] [--model-width 1024]
+"""
+from __future__ import annotations
+
+import argparse
+
+from PIL import Image
+
+from benchmarks._common import RESOLUTIONS, median_ms, synthetic_screen, time_call
+
+from os_ai_core.utils.resize import ResizeEngine
+
+
+def _geometry(screen_w: int, screen_h: int, model_w: int, model_h: int):
+    """Letterbox geometry (canvas fixed at model_w x model_h, content centred)."""
+    screen_aspect = screen_w / float(screen_h)
+    model_aspect = model_w / float(model_h)
+    if screen_aspect > model_aspect:
+        cw, ch = model_w, max(1, int(round(model_w / screen_aspect)))
+        ox, oy = 0, int((model_h - ch) / 2)
+    else:
+        ch, cw = model_h, max(1, int(round(model_h * screen_aspect)))
+        ox, oy = int((model_w - cw) / 2), 0
+    return (cw, ch), (ox, oy)
+
+
+def _legacy(img, screen_size, content_size, canvas_size, offset):
+    if img.size != screen_size:
+        img = img.resize(screen_size, resample=Image.LANCZOS)
+    content = img.resize(content_size, resample=Image.LANCZOS)
+    canvas = Image.new("RGB", canvas_size, (0, 0, 0))
+    canvas.paste(content, offset)
+    return canvas
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--model-width", type=int, default=1024)
+    parser.add_argument("--model-height", type=int, default=0, help="0 = keep screen aspect (no letterbox)")
+    args = parser.parse_args()
+
+    print(f"model={args.model_width}x{args.model_height or 'auto'} repeat={args.repeat}")
+    print(f"{'screen':<10} {'capture':>11} {'legacy ms':>10} {'quality ms':>11} {'fast ms':>8} {'speedup':>8}")
+    for label, (w, h) in RESOLUTIONS.items():
+        model_w = args.model_width
+        model_h = args.model_height or max(1, int(round(h * model_w / float(w))))
+        content, offset = _geometry(w, h, model_w, model_h)
+        engines = {
+            mode: ResizeEngine(content, (model_w, model_h), offset, resample=mode)
+            for mode in ("quality", "fast")
+        }
+        for scale in (1, 2):
+            img = synthetic_screen(w * scale, h * scale)
+            legacy = median_ms(time_call(lambda: _legacy(img, (w, h), content, (model_w, model_h), offset), args.repeat))
+            quality = median_ms(time_call(lambda: engines["quality"].process(img), args.repeat))
+            fast = median_ms(time_call(lambda: engines["fast"].process(img), args.repeat))
+            speedup = legacy / quality if quality else 0.0
+            print(f"{label:<10} {f'{w * scale}x{h * scale}':>11} {legacy:>10.2f} {quality:>11.2f} {fast:>8.2f} {speedup:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
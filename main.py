@@ -40,6 +40,8 @@ def handle_computer_action(action, params):  # type: ignore
         _computer.pyautogui = globals()["pyautogui"]  # type: ignore
         res = _computer.handle_computer_action(action, params)
         try:
+            # Screenshots are written asynchronously; legacy callers expect the file on disk
+            _computer.flush_screenshots()
             globals()["LAST_SCREENSHOT_PATH"] = getattr(_computer, "LAST_SCREENSHOT_PATH", "")
         except Exception:
             pass
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import threading
 import uuid
+import weakref
 from typing import Any, Dict, Optional
 
 import httpx
@@ -16,6 +16,7 @@ except Exception:  # pragma: no cover - fallback if orjson not available
 
 from os_ai_llm.types import ToolDescriptor
 from os_ai_core.orchestrator import Orchestrator, CancelToken
+from os_ai_core.tools.compound import compound_tools_for
 
 from os_ai_llm.interfaces import LLMClient
 from os_ai_core.tools.registry import ToolRegistry
@@ -26,7 +27,18 @@ from os_ai_llm.config import COMPUTER_TOOL_TYPES as _COMPUTER_TOOL_TYPES, LLM_PR
 _PROVIDER_DISPLAY = {"anthropic": "Anthropic", "openai": "OpenAI"}
 
 # pyautogui не является thread-safe — только один agent.run одновременно.
-_agent_run_lock = threading.Lock()
+# asyncio.Lock is bound to the loop it is first used on: one lock per running loop
+_agent_run_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def _agent_run_lock() -> asyncio.Lock:
+    """The agent run lock of the running event loop (created on first use)."""
+    loop = asyncio.get_running_loop()
+    lock = _agent_run_locks.get(loop)
+    if lock is None:
+        lock = _agent_run_locks[loop] = asyncio.Lock()
+    return lock
+
 from .jobs import jobs, Job
 from .metrics import metrics
 
@@ -198,6 +210,7 @@ class WebSocketRPCHandler:
                 },
             )
         ]
+        tool_descs.extend(compound_tools_for(_provider))
         import platform
         os_name = platform.system()
         if os_name == "Darwin":
@@ -227,28 +240,30 @@ class WebSocketRPCHandler:
         )
 
         orch = Orchestrator(client, tools)
-        loop = asyncio.get_running_loop()
 
-        def on_event(kind: str, payload: Dict[str, Any]) -> None:
+        async def on_event(kind: str, payload: Dict[str, Any]) -> None:
             try:
                 # Map orchestrator events to WS notifications
-                if kind == "assistant_text":
+                if kind == "assistant_text" and payload.get("delta"):
+                    # Streamed text as it arrives; the completed block follows as event.log
+                    await self._send_event(websocket, "event.text_delta", {"text": payload.get("text", ""), "jobId": job_id})
+                elif kind == "assistant_text":
                     # as log for now
-                    asyncio.run_coroutine_threadsafe(self._send_event(websocket, "event.log", {"level": "info", "message": payload.get("text", ""), "jobId": job_id}), loop)
+                    await self._send_event(websocket, "event.log", {"level": "info", "message": payload.get("text", ""), "jobId": job_id})
                 elif kind == "tool_call":
-                    asyncio.run_coroutine_threadsafe(self._send_event(websocket, "event.action", {"name": payload.get("name"), "status": "start", "meta": payload.get("args", {}), "jobId": job_id}), loop)
+                    await self._send_event(websocket, "event.action", {"name": payload.get("name"), "status": "start", "meta": payload.get("args", {}), "jobId": job_id})
                 elif kind == "tool_result_text":
-                    asyncio.run_coroutine_threadsafe(self._send_event(websocket, "event.action", {"name": "tool_result", "status": "ok", "meta": payload, "jobId": job_id}), loop)
+                    await self._send_event(websocket, "event.action", {"name": "tool_result", "status": "ok", "meta": payload, "jobId": job_id})
                 elif kind == "tool_result_image":
-                    asyncio.run_coroutine_threadsafe(self._send_event(websocket, "event.screenshot", {"mime": payload.get("media_type", "image/jpeg"), "data": payload.get("data", ""), "ts": None, "jobId": job_id}), loop)
+                    await self._send_event(websocket, "event.screenshot", {"mime": payload.get("media_type", "image/jpeg"), "data": payload.get("data", ""), "ts": None, "jobId": job_id})
                 elif kind == "progress":
-                    asyncio.run_coroutine_threadsafe(self._send_event(websocket, "event.progress", {**payload, "jobId": job_id}), loop)
+                    await self._send_event(websocket, "event.progress", {**payload, "jobId": job_id})
                 elif kind == "usage":
-                    asyncio.run_coroutine_threadsafe(self._send_event(websocket, "event.usage", {**payload, "jobId": job_id}), loop)
+                    await self._send_event(websocket, "event.usage", {**payload, "jobId": job_id})
             except Exception as e:
                 self._logger.debug("Error in on_event %s: %s", kind, e)
 
-        def _blocking_run() -> Dict[str, Any]:
+        async def _run() -> Dict[str, Any]:
             # Convert initial context from wire into Message[] if provided
             base_msgs = []
             try:
@@ -275,7 +290,7 @@ class WebSocketRPCHandler:
                             from .files import store as _store
                             try:
                                 meta = _store.get(str(fid))
-                                data = meta.path.read_bytes()
+                                data = await asyncio.to_thread(meta.path.read_bytes)
                                 import base64
                                 b64 = base64.b64encode(data).decode("ascii")
                                 base_msgs.append(Message(role="user", content=[ImagePart(media_type=a.get("mime") or "application/octet-stream", data_base64=b64)]))
@@ -291,7 +306,7 @@ class WebSocketRPCHandler:
 
             # Run orchestrator with auth error handling
             try:
-                messages = orch.run(task_text, tool_descs, system_prompt, max_iterations=max_iterations, cancel_token=cancel, on_event=on_event, initial_messages=base_msgs, initial_provider_context=init_ctx)
+                messages = await orch.arun(task_text, tool_descs, system_prompt, max_iterations=max_iterations, cancel_token=cancel, on_event=on_event, initial_messages=base_msgs, initial_provider_context=init_ctx)
             except httpx.HTTPStatusError as e:
                 # Check for authentication/authorization errors
                 if e.response.status_code in (401, 403):
@@ -317,17 +332,16 @@ class WebSocketRPCHandler:
                 "usage": {
                     "input_tokens": int(getattr(orch, "total_input_tokens", 0) or 0),
                     "output_tokens": int(getattr(orch, "total_output_tokens", 0) or 0),
+                    "cache_creation_input_tokens": int(getattr(orch, "total_cache_creation_tokens", 0) or 0),
+                    "cache_read_input_tokens": int(getattr(orch, "total_cache_read_tokens", 0) or 0),
                 },
                 "status": "ok",
                 "provider_context": orch.last_provider_context,
             }
 
-        def _locked_blocking_run():
-            with _agent_run_lock:
-                return _blocking_run()
-
         try:
-            result = await loop.run_in_executor(None, _locked_blocking_run)
+            async with _agent_run_lock():
+                result = await _run()
         except Exception as exc:
             logging.getLogger(LOGGER_NAME).exception("Job failed: %s", exc)
             await self._send_event(websocket, "event.final", {"jobId": job_id, "status": "fail", "error": str(exc)})
@@ -7,6 +7,7 @@ from os_ai_core.utils.logger import setup_logging
 from os_ai_llm.types import ToolDescriptor
 
 from os_ai_core.orchestrator import Orchestrator
+from os_ai_core.tools.compound import compound_tools_for
 
 import pyautogui
 
@@ -54,6 +55,7 @@ def main() -> int:
             },
         )
     ]
+    tool_descs.extend(compound_tools_for(actual_provider))
     import platform
     os_name = platform.system()
     if os_name == "Darwin":
@@ -86,7 +88,10 @@ def main() -> int:
         try:
             from os_ai_core.utils.costs import estimate_cost
             model_name = client.get_model_name()
-            in_cost, out_cost, total_cost, _tier = estimate_cost(model_name, int(total_in), int(total_out))
+            in_cost, out_cost, total_cost, _tier = estimate_cost(
+                model_name, int(total_in), int(total_out),
+                int(getattr(orch, 'total_cache_creation_tokens', 0)), int(getattr(orch, 'total_cache_read_tokens', 0)),
+            )
             print(f"\nInterrupted by user (Ctrl+C)\n📈 Usage total in={total_in} out={total_out} cost=${total_cost:.6f} (input=${in_cost:.6f}, output=${out_cost:.6f})")
         except Exception:
             print("\nInterrupted by user (Ctrl+C)")
@@ -109,7 +114,11 @@ def main() -> int:
         total_out = getattr(orch, 'total_output_tokens', 0)
         from os_ai_core.utils.costs import estimate_cost
         model_name = client.get_model_name()
-        in_cost, out_cost, total_cost, _tier = estimate_cost(model_name, int(total_in), int(total_out))
+        cache_write = int(getattr(orch, 'total_cache_creation_tokens', 0))
+        cache_read = int(getattr(orch, 'total_cache_read_tokens', 0))
+        in_cost, out_cost, total_cost, _tier = estimate_cost(model_name, int(total_in), int(total_out), cache_write, cache_read)
+        if cache_write or cache_read:
+            print(f"💾 Prompt cache write={cache_write} read={cache_read}")
         print(f"📈 Usage total in={total_in} out={total_out} cost=${total_cost:.6f} (input=${in_cost:.6f}, output=${out_cost:.6f})")
     except Exception:
         pass
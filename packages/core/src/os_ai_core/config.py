@@ -2,8 +2,19 @@
 LOGGER_NAME = 'agent'
 # Conversation optimizer
 SIMPLE_STEP_MAX_TOKENS = 600
+# History compaction: older turns are folded into a rolling summary appended to system
+HISTORY_COMPACTION_ENABLED = True
+# Compact when more messages than this follow the task...
 HISTORY_MAX_MESSAGES = 14
+# ...down to about this many newest messages, sent verbatim
+HISTORY_KEEP_MESSAGES = 8
+# Also compact every N iterations (0 = only by length)
+HISTORY_SUMMARY_INTERVAL = 0
 HISTORY_SUMMARY_MAX_CHARS = 800
+# 'text' (extracted from the messages, no model call) or 'llm' (cheap model of the same provider)
+HISTORY_SUMMARIZER = 'text'
+HISTORY_SUMMARY_MODELS = {'anthropic': 'claude-haiku-4-5', 'openai': 'gpt-5-mini'}
+HISTORY_SUMMARY_MAX_TOKENS = 400
 # Coordinate calibration
 COORD_X_SCALE = 1.0
 COORD_Y_SCALE = 1.0
@@ -13,19 +24,103 @@ COORD_Y_OFFSET = 0
 POST_MOVE_VERIFY = True
 POST_MOVE_TOLERANCE_PX = 2
 POST_MOVE_CORRECTION_DURATION = 0.05
+# Online calibration: fit an affine (commanded -> actual) from verified moves, applied after COORD_*
+COORD_AUTO_CALIBRATION = True
+COORD_CALIBRATION_MIN_SAMPLES = 6
+COORD_CALIBRATION_MAX_SAMPLES = 64
+COORD_CALIBRATION_OUTLIER_PX = 25
+COORD_CALIBRATION_MAX_ERROR_PX = 1.5
+# Full affine only when the samples spread this much (std, px) in every direction; else per-axis/offset
+COORD_CALIBRATION_MIN_SPREAD_PX = 32
+# Largest distance a calibrated command may be from its target
+COORD_CALIBRATION_MAX_CORRECTION_PX = 100
+# Fits are saved per screen size; None = <project root>/.pointer_calibration.json, '' = don't persist
+COORD_CALIBRATION_FILE = None
+# Pointer motion: 'human' (eased, MIN/MAX_MOVE_DURATION), 'fast' (short, no minimum) or 'instant' (warp).
+# Unattended runs lose nothing with 'fast'/'instant'; actions may override it with a "motion" param.
+MOTION_PROFILE = 'human'
+# Multi-point drags: drop path points within this many px of a straight line (RDP; 0 keeps all),
+# then replay the path at a fixed event rate (vertices are always hit)
+DRAG_PATH_SIMPLIFY_PX = 1.0
+DRAG_PATH_EVENT_HZ = 120
 # Typing settings
 TYPING_USE_CLIPBOARD_FOR_NON_ASCII = True
 RESTORE_CLIPBOARD_AFTER_PASTE = True
 PASTE_COPY_DELAY_SECONDS = 0.05
 PASTE_POST_DELAY_SECONDS = 0.05
+# Keystroke rate for typed text (600 wpm = 50 chars/s, one key every 20 ms)
+TYPE_WPM = 600
+# Rate when the keyboard driver batches keysyms itself (XTest); 6000 wpm = 500 chars/s
+XTEST_TYPE_WPM = 6000
+# 'auto' pastes multiline/code-like text, non-ASCII the keyboard cannot type and texts of at least
+# TYPE_PASTE_MIN_CHARS chars (0 = no length rule); 'paste' / 'type' force one strategy
+TYPE_STRATEGY = 'auto'
+TYPE_PASTE_MIN_CHARS = 200
+# Long texts are pasted / typed in pieces of at most this many chars, split at line or word breaks
+PASTE_CHUNK_CHARS = 4000
+TYPE_CHUNK_CHARS = 500
+# How long to wait for the target app to fetch pasted text (returns early when the clipboard can tell)
+PASTE_READ_TIMEOUT_SECONDS = 1.0
+# OpenAI multi-action turns: fuse move+click, merge adjacent type/key actions and waits, drop
+# screenshots and zero scrolls before executing the batch (results are still reported per action)
+BATCH_OPTIMIZE_ENABLED = True
+# Compound actions (click_and_type, fill_form, key_sequence): pause after clicks and submit keys
+# so focus / page changes land before the next input
+COMPOUND_ACTIONS_ENABLED = True
+COMPOUND_STEP_DELAY_MS = 50
+# wait_until_stable: sample a small frame every SETTLE_INTERVAL_MS and return once at most
+# SETTLE_MAX_CHANGED_FRACTION of a SETTLE_GRID_WIDTH-wide grayscale grid changed for
+# SETTLE_STABLE_SAMPLES consecutive samples (or after SETTLE_TIMEOUT_S)
+SETTLE_TIMEOUT_S = 5.0
+SETTLE_INTERVAL_MS = 100
+SETTLE_STABLE_SAMPLES = 3
+SETTLE_MAX_CHANGED_FRACTION = 0.002
+SETTLE_GRID_WIDTH = 64
+# OpenAI batches: wait for the screen to settle (at most BATCH_SETTLE_TIMEOUT_S) before the closing screenshot
+# when the last step is a click, scroll, drag or Enter/Escape. Costs >= SETTLE_STABLE_SAMPLES * SETTLE_INTERVAL_MS per batch
+BATCH_SETTLE_ENABLED = False
+BATCH_SETTLE_TIMEOUT_S = 2.0
 # Virtual display
 VIRTUAL_DISPLAY_ENABLED = True
 VIRTUAL_DISPLAY_WIDTH_PX = 1024
 VIRTUAL_DISPLAY_HEIGHT_PX = None
+# Pad frames to exactly WIDTH x HEIGHT with black bars; False = shrink the canvas to the screen aspect
+SCREENSHOT_LETTERBOX = False
 # Screenshot generic
 SCREENSHOT_MODE = 'downscale'
+# 'JPEG', 'PNG', 'WEBP' or 'AUTO' (per frame: palette PNG / lossless WebP / JPEG)
 SCREENSHOT_FORMAT = 'JPEG'
 SCREENSHOT_JPEG_QUALITY = 50
+# Per-frame JPEG byte budget: 0 = fixed SCREENSHOT_JPEG_QUALITY; >0 = search quality to fit
+SCREENSHOT_BYTE_BUDGET_KB = 0
+SCREENSHOT_BUDGET_MIN_QUALITY = 25
+SCREENSHOT_BUDGET_MAX_QUALITY = 90
+SCREENSHOT_BUDGET_MAX_ITERS = 5
+# 'quality' (reduce + LANCZOS) or 'fast' (reduce + BILINEAR)
+SCREENSHOT_RESAMPLE = 'quality'
+# Let drivers that support it (macOS/Quartz) capture at logical size and scale to the model size natively
+SCREENSHOT_NATIVE_SCALING = True
+# Screenshot archive (screenshots/ folder, written by a background thread)
+SCREENSHOT_ARCHIVE_ENABLED = True
+SCREENSHOT_ARCHIVE_MAX_PENDING = 8
+SCREENSHOT_ARCHIVE_MAX_TOTAL_MB = 512
+SCREENSHOT_ARCHIVE_TTL_SECONDS = 7 * 86400
+# Unchanged-screenshot suppression (within an orchestrator run)
+SCREENSHOT_DEDUP_ENABLED = True
+SCREENSHOT_DEDUP_GRID_WIDTH = 96
+SCREENSHOT_DEDUP_PIXEL_TOLERANCE = 8
+SCREENSHOT_DEDUP_MAX_CHANGED_FRACTION = 0.0
+# 'screen' or 'active_window' (focused window only; actions map back through its offset)
+SCREENSHOT_CAPTURE_AREA = 'screen'
+# Windows smaller than this (either side) fall back to full-screen capture
+SCREENSHOT_WINDOW_MIN_PX = 64
+# zoom / screenshot_region: max upsampling factor of the captured rectangle
+ZOOM_MAX_UPSCALE = 4.0
+# Background capture (frames grabbed continuously; actions read the newest post-input frame)
+SCREEN_CAPTURE_SERVICE_ENABLED = False
+SCREEN_CAPTURE_INTERVAL_MS = 100
+SCREEN_CAPTURE_SETTLE_MS = 0
+SCREEN_CAPTURE_FRESH_TIMEOUT_S = 1.0
 # Screenshot cadence
 SCREENSHOT_AFTER_ACTIONS = True
 SCREENSHOT_AFTER_ACTIONS_ACTIONS = (
@@ -38,5 +133,20 @@ COST_OUTPUT_PER_MTOKENS_USD = 15.0
 LONG_CONTEXT_INPUT_TOKENS_THRESHOLD = 200_000
 COST_INPUT_PER_MTOKENS_USD_LONG_CONTEXT = 6.0
 COST_OUTPUT_PER_MTOKENS_USD_LONG_CONTEXT = 22.5
+# Anthropic prompt caching: cache writes and reads relative to the base input rate
+COST_CACHE_WRITE_MULTIPLIER = 1.25
+COST_CACHE_READ_MULTIPLIER = 0.1
 # Usage logging
 USAGE_LOG_EACH_ITERATION = True
+# History image retention (applied before each model call): newest images kept,
+# the next ones downscaled, older ones replaced by a text note
+IMAGE_RETENTION_ENABLED = True
+IMAGE_RETENTION_KEEP_LAST = 3
+IMAGE_RETENTION_DOWNSCALE_COUNT = 3
+IMAGE_RETENTION_DOWNSCALE_WIDTH = 512
+# OpenAI computer_call_output must keep a screenshot: the oldest become thumbnails of this width
+IMAGE_RETENTION_THUMB_WIDTH = 96
+IMAGE_RETENTION_JPEG_QUALITY = 50
+# Re-tier only once this many new screenshots piled up beyond KEEP_LAST (1 = every turn);
+# in between the older history stays byte-identical and prompt-cache reads keep hitting
+IMAGE_RETENTION_RETIER_STEP = 3
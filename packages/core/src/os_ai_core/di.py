@@ -7,7 +7,13 @@ import injector
 from os_ai_llm.config import LLM_PROVIDER
 from os_ai_llm.interfaces import LLMClient
 from os_ai_core.tools.registry import ToolRegistry
-from os_ai_core.tools.computer import computer_tool_handler_batch
+from os_ai_core.tools.compound import COMPOUND_TOOL_NAME
+from os_ai_core.tools.computer import (
+    computer_tool_handler,
+    computer_tool_handler_batch,
+    reset_screenshot_dedup,
+    forget_screenshot_reference,
+)
 
 
 class LLMModule(injector.Module):
@@ -32,6 +38,9 @@ class ToolsModule(injector.Module):
     def provide_tool_registry(self) -> ToolRegistry:  # type: ignore[override]
         reg = ToolRegistry()
         reg.register("computer", computer_tool_handler_batch)
+        reg.register(COMPOUND_TOOL_NAME, computer_tool_handler)
+        reg.add_reset_hook(reset_screenshot_dedup)
+        reg.add_prune_hook(forget_screenshot_reference)
         return reg
 
 
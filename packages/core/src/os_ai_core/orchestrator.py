@@ -1,14 +1,35 @@
 from __future__ import annotations
 
-from typing import List, Optional, Callable, Dict, Any
-import logging, json, sys
+from typing import List, Optional, Callable, Dict, Any, Tuple
+import asyncio, inspect, logging, json, sys, threading
+from concurrent.futures import ThreadPoolExecutor
 import httpx
 
 from os_ai_llm.interfaces import LLMClient
-from os_ai_llm.types import Message, ToolDescriptor, TextPart, ToolCall, ToolResult, ImagePart
+from os_ai_llm.types import Message, ToolDescriptor, TextPart, ToolCall, ToolResult, ImagePart, LLMResponse, StreamEvent
 from os_ai_core.utils.costs import estimate_cost
 from os_ai_core.config import USAGE_LOG_EACH_ITERATION, LOGGER_NAME
 from os_ai_core.tools.registry import ToolRegistry
+from os_ai_core.utils.image_retention import ImageRetentionPolicy, RetentionStats, default_image_policy
+from os_ai_core.utils.conversation_optimizer import ConversationOptimizer, default_conversation_optimizer
+
+Event = Tuple[str, Dict[str, Any]]
+
+_input_executor: Optional[ThreadPoolExecutor] = None
+_input_executor_lock = threading.Lock()
+
+
+def input_executor() -> ThreadPoolExecutor:
+    """Process-wide single-thread executor for tool calls made from Orchestrator.arun().
+
+    Input injection and screen capture go through libraries that are not thread-safe
+    (pyautogui, per-thread X/mss handles), so every async run shares one worker thread.
+    """
+    global _input_executor
+    with _input_executor_lock:
+        if _input_executor is None:
+            _input_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="os-ai-input")
+        return _input_executor
 
 
 class CancelToken:
@@ -24,13 +45,365 @@ class CancelToken:
 
 
 class Orchestrator:
-    def __init__(self, client: LLMClient, tool_registry: ToolRegistry) -> None:
+    def __init__(
+        self,
+        client: LLMClient,
+        tool_registry: ToolRegistry,
+        *,
+        tool_executor: Optional[ThreadPoolExecutor] = None,
+        image_policy: Optional[ImageRetentionPolicy] = None,
+        history_optimizer: Optional[ConversationOptimizer] = None,
+    ) -> None:
         self._client = client
         self._tools = tool_registry
+        # Applied to the history before each model call
+        self._image_policy = image_policy if image_policy is not None else default_image_policy()
+        self._image_stats = RetentionStats()
+        # Tool call id -> action name, for the notes that replace old screenshots
+        self._call_actions: Dict[str, str] = {}
+        # Folds older turns into a summary in `system`; None sends the whole history
+        self._optimizer = history_optimizer if history_optimizer is not None else default_conversation_optimizer(client)
+        # Tool calls from arun(); defaults to the shared input_executor(). run() calls tools on its own thread
+        self._tool_executor = tool_executor
         self.total_input_tokens: int = 0
         self.total_output_tokens: int = 0
+        # Prompt-cache tokens (not part of total_input_tokens)
+        self.total_cache_creation_tokens: int = 0
+        self.total_cache_read_tokens: int = 0
         self.last_provider_context: Optional[Dict[str, Any]] = None
 
+    def _start(self, task: str, initial_messages: Optional[List[Message]]) -> List[Message]:
+        messages: List[Message] = []
+        try:
+            if initial_messages:
+                messages.extend(initial_messages)
+        except Exception:
+            pass
+        messages.append(Message(role="user", content=[TextPart(text=task)]))
+        try:
+            self.total_input_tokens = 0
+            self.total_output_tokens = 0
+            self.total_cache_creation_tokens = 0
+            self.total_cache_read_tokens = 0
+        except Exception:
+            pass
+        try:
+            self._tools.reset()
+        except Exception:
+            pass
+        self._call_actions = {}
+        self._image_stats = RetentionStats()
+        try:
+            self._image_policy.reset()
+        except Exception:
+            pass
+        if self._optimizer is not None:
+            # Initial messages and the task are never folded
+            self._optimizer.reset(len(messages))
+        return messages
+
+    def _retain_images(self, messages: List[Message]) -> None:
+        logger = logging.getLogger(LOGGER_NAME)
+        try:
+            stats = self._image_policy.apply(messages, self._call_actions)
+        except Exception as e:
+            logger.debug("Image retention failed: %s", e)
+            return
+        self._image_stats = stats
+        if stats.changed:
+            logger.info("🖼️ History images=%s kept=%s downscaled=%s replaced=%s", stats.images, stats.kept, stats.downscaled, stats.replaced)
+        if stats.latest_changed:
+            # The model no longer has the frame "screen unchanged" notes would refer to
+            self._tools.history_pruned()
+
+    def _compact(
+        self,
+        messages: List[Message],
+        system: Optional[str],
+        provider_context: Optional[Dict[str, Any]],
+        iter_idx: int,
+    ) -> Tuple[List[Message], Optional[str], List[Event]]:
+        """Messages and system prompt to send this turn, with the older turns folded into a summary."""
+        if self._optimizer is None or provider_context:
+            # Server-side conversation state (OpenAI previous_response_id): only new items are sent anyway
+            return messages, system, []
+        try:
+            sent, _summary = self._optimizer.summarize_history(messages)
+            turn_system = self._optimizer.system_prompt(system)
+        except Exception as e:
+            logging.getLogger(LOGGER_NAME).debug("History compaction failed: %s", e)
+            return messages, system, []
+        folded = self._optimizer.last_folded
+        if not folded:
+            return sent, turn_system, []
+        summary_chars = len(self._optimizer.summary or "")
+        logging.getLogger(LOGGER_NAME).info("🗜️ History compacted: folded=%s sent=%s/%s summary_chars=%s", folded, len(sent), len(messages), summary_chars)
+        return sent, turn_system, [("progress", {
+            "stage": "history_compacted",
+            "iteration": iter_idx,
+            "folded_messages": folded,
+            "sent_messages": len(sent),
+            "history_messages": len(messages),
+            "summary_chars": summary_chars,
+        })]
+
+    def _prepare_turn(
+        self,
+        messages: List[Message],
+        system: Optional[str],
+        provider_context: Optional[Dict[str, Any]],
+        iter_idx: int,
+    ) -> Tuple[List[Message], Optional[str], List[Event]]:
+        """History pipeline before each model call: image retention, then compaction."""
+        self._retain_images(messages)
+        return self._compact(messages, system, provider_context, iter_idx)
+
+    def _log_provider_error(self, e: Exception) -> None:
+        logger = logging.getLogger(LOGGER_NAME)
+        if isinstance(e, httpx.HTTPStatusError):
+            status = getattr(e.response, "status_code", None)
+            provider = "provider"
+            try:
+                provider = self._client.get_provider_name()
+            except Exception:
+                pass
+            try:
+                body = e.response.json()
+            except Exception:
+                body = e.response.text
+            logger.error(f"HTTP {status} from {provider}: {body}")
+        elif isinstance(e, (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.WriteTimeout)):
+            logger.error(f"HTTP timeout from provider: {e}")
+        else:
+            logger.error(f"Provider error: {e}")
+
+    def _response_events(self, resp: LLMResponse, iter_idx: int, *, texts: bool = True) -> List[Event]:
+        """Log assistant texts (unless already streamed) and usage for one response; return the events to emit."""
+        logger = logging.getLogger(LOGGER_NAME)
+        events: List[Event] = []
+        # Print assistant texts immediately (deduplicated)
+        _seen_texts: set = set()
+        try:
+            for m in (resp.messages or []) if texts else []:
+                if getattr(m, "role", None) == "assistant":
+                    for p in (getattr(m, "content", []) or []):
+                        try:
+                            if getattr(p, "type", None) == "text":
+                                txt = str(getattr(p, "text", "")).strip()
+                                if txt and txt not in _seen_texts:
+                                    _seen_texts.add(txt)
+                                    logger.info('🧠 %s', txt)
+                                    events.append(("assistant_text", {"text": txt}))
+                        except Exception:
+                            pass
+        except Exception:
+            pass
+        # Usage/cost logging
+        try:
+            inp = int(getattr(resp.usage, "input_tokens", 0) or 0)
+            out = int(getattr(resp.usage, "output_tokens", 0) or 0)
+            c_write = int(getattr(resp.usage, "cache_creation_input_tokens", 0) or 0)
+            c_read = int(getattr(resp.usage, "cache_read_input_tokens", 0) or 0)
+            try:
+                self.total_input_tokens += inp
+                self.total_output_tokens += out
+                self.total_cache_creation_tokens += c_write
+                self.total_cache_read_tokens += c_read
+            except Exception:
+                pass
+            try:
+                model_name = self._client.get_model_name()
+            except Exception:
+                model_name = "unknown"
+            _in_cost, _out_cost, _total, _tier = estimate_cost(model_name, inp, out, c_write, c_read)
+            events.append(("usage", {
+                "input_tokens": inp,
+                "output_tokens": out,
+                "cache_creation_input_tokens": c_write,
+                "cache_read_input_tokens": c_read,
+                "iteration": iter_idx,
+                "total_input_tokens": int(self.total_input_tokens),
+                "total_output_tokens": int(self.total_output_tokens),
+                "total_cache_creation_tokens": int(self.total_cache_creation_tokens),
+                "total_cache_read_tokens": int(self.total_cache_read_tokens),
+                # Whole prompt of this iteration and the history images it carried
+                "prompt_tokens": inp + c_write + c_read,
+                "history_images": int(self._image_stats.images),
+                "images_kept": int(self._image_stats.kept),
+                "images_downscaled": int(self._image_stats.downscaled),
+                "images_replaced": int(self._image_stats.replaced),
+                "input_cost": _in_cost,
+                "output_cost": _out_cost,
+                "total_cost": _total,
+            }))
+            if USAGE_LOG_EACH_ITERATION:
+                if c_write or c_read:
+                    logger.info("📈 Usage iter in=%s out=%s cache_write=%s cache_read=%s cost=$%.6f (input=$%.6f, output=$%.6f)", inp, out, c_write, c_read, _total, _in_cost, _out_cost)
+                else:
+                    logger.info("📈 Usage iter in=%s out=%s cost=$%.6f (input=$%.6f, output=$%.6f)", inp, out, _total, _in_cost, _out_cost)
+        except Exception:
+            pass
+        return events
+
+    @staticmethod
+    def _text_events(ev: StreamEvent, seen: set) -> List[Event]:
+        if ev.kind == "text_delta":
+            return [("assistant_text", {"text": ev.text, "delta": True})]
+        txt = str(ev.text or "").strip()
+        if ev.kind != "text" or not txt or txt in seen:
+            return []
+        seen.add(txt)
+        logging.getLogger(LOGGER_NAME).info('🧠 %s', txt)
+        return [("assistant_text", {"text": txt})]
+
+    def _streams(self) -> bool:
+        try:
+            return bool(self._client.supports_streaming())
+        except Exception:
+            return False
+
+    def _stream_turn(
+        self,
+        messages: List[Message],
+        tool_descriptors: List[ToolDescriptor],
+        system: Optional[str],
+        provider_context: Optional[Dict[str, Any]],
+        cancel_token: Optional[CancelToken],
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]],
+    ) -> Tuple[LLMResponse, Dict[str, ToolResult]]:
+        """Consume LLMClient.stream(); each tool call runs as soon as it is complete.
+
+        Tools run inline on the calling thread, as in the non-streaming path: platform
+        code such as the macOS overlay dispatches to the main thread and waits for it,
+        so the caller must not block on a worker. Returns the final response and the
+        results of the calls already run, by id.
+        """
+        done: Dict[str, ToolResult] = {}
+        seen: set = set()
+        resp: Optional[LLMResponse] = None
+        for ev in self._client.stream(
+            messages=messages,
+            tools=tool_descriptors,
+            system=system,
+            provider_context=provider_context,
+        ):
+            if ev.kind == "response":
+                resp = ev.response
+            elif ev.kind == "tool_call":
+                call = ev.tool_call
+                if call is None or call.id in done or (cancel_token is not None and cancel_token.is_cancelled):
+                    continue
+                self._emit(on_event, self._call_events(call))
+                done[call.id] = self._tools.execute(call, cancel_token=cancel_token)
+            else:
+                self._emit(on_event, self._text_events(ev, seen))
+        if resp is None:
+            raise RuntimeError("stream ended without a response")
+        return resp, done
+
+    async def _astream_turn(
+        self,
+        messages: List[Message],
+        tool_descriptors: List[ToolDescriptor],
+        system: Optional[str],
+        provider_context: Optional[Dict[str, Any]],
+        cancel_token: CancelToken,
+        on_event: Optional[Callable[[str, Dict[str, Any]], Any]],
+        executor: ThreadPoolExecutor,
+    ) -> Tuple[LLMResponse, Dict[str, "asyncio.Future[ToolResult]"]]:
+        """Async _stream_turn() over LLMClient.astream()."""
+        loop = asyncio.get_running_loop()
+        started: Dict[str, asyncio.Future] = {}
+        seen: set = set()
+        resp: Optional[LLMResponse] = None
+        try:
+            async for ev in self._client.astream(
+                messages=messages,
+                tools=tool_descriptors,
+                system=system,
+                provider_context=provider_context,
+            ):
+                if ev.kind == "response":
+                    resp = ev.response
+                elif ev.kind == "tool_call":
+                    call = ev.tool_call
+                    if call is None or call.id in started or cancel_token.is_cancelled:
+                        continue
+                    await self._aemit(on_event, self._call_events(call))
+                    started[call.id] = loop.run_in_executor(
+                        executor, lambda c=call: self._tools.execute(c, cancel_token=cancel_token)
+                    )
+                else:
+                    await self._aemit(on_event, self._text_events(ev, seen))
+        except BaseException:
+            if started:
+                await asyncio.gather(*started.values(), return_exceptions=True)
+            raise
+        if resp is None:
+            raise RuntimeError("stream ended without a response")
+        return resp, started
+
+    def _call_events(self, call: ToolCall) -> List[Event]:
+        try:
+            batch_actions = call.metadata.get("_openai_actions")
+            names = [str(a.get("action", "")) for a in batch_actions or [] if isinstance(a, dict)]
+            self._call_actions[call.id] = "+".join(n for n in names if n) or str(call.args.get("action") or call.name)
+            if batch_actions and len(batch_actions) > 1:
+                return [("tool_call", {"name": call.name, "args": act}) for act in batch_actions]
+            return [("tool_call", {"name": call.name, "args": call.args})]
+        except Exception:
+            return []
+
+    @staticmethod
+    def _result_events(call: ToolCall, result: ToolResult) -> List[Event]:
+        # Propagate provider metadata (safety checks, etc.)
+        safety_checks = call.metadata.get("_openai_pending_safety_checks", [])
+        if safety_checks:
+            result.metadata["_openai_pending_safety_checks"] = safety_checks
+        events: List[Event] = []
+        try:
+            # Batches report one result per original action (fused or skipped ones included)
+            for idx, item in enumerate(result.metadata.get("batch_results") or []):
+                events.append(("tool_result_text", {"text": item.get("text", ""), "action": item.get("action", ""), "index": idx}))
+        except Exception:
+            pass
+        try:
+            has_image = any(isinstance(p, ImagePart) for p in result.content)
+            if has_image:
+                for p in result.content:
+                    if isinstance(p, ImagePart):
+                        events.append(("tool_result_image", {"media_type": p.media_type, "data": p.data_base64}))
+            else:
+                for p in result.content:
+                    if getattr(p, "type", None) == "text" or type(p).__name__ == "TextPart":
+                        events.append(("tool_result_text", {"text": getattr(p, "text", "")}))
+                        break
+        except Exception:
+            pass
+        return events
+
+    @staticmethod
+    def _emit(on_event: Optional[Callable[[str, Dict[str, Any]], None]], events: List[Event]) -> None:
+        if on_event is None:
+            return
+        for kind, payload in events:
+            try:
+                on_event(kind, payload)
+            except Exception:
+                pass
+
+    @staticmethod
+    async def _aemit(on_event: Optional[Callable[[str, Dict[str, Any]], Any]], events: List[Event]) -> None:
+        if on_event is None:
+            return
+        for kind, payload in events:
+            try:
+                ret = on_event(kind, payload)
+                if inspect.isawaitable(ret):
+                    await ret
+            except Exception:
+                pass
+
     def run(
         self,
         task: str,
@@ -43,122 +416,37 @@ class Orchestrator:
         initial_messages: Optional[List[Message]] = None,
         initial_provider_context: Optional[Dict[str, Any]] = None,
     ) -> List[Message]:
-        messages: List[Message] = []
-        try:
-            if initial_messages:
-                messages.extend(initial_messages)
-        except Exception:
-            pass
-        messages.append(Message(role="user", content=[TextPart(text=task)]))
-        logger = logging.getLogger(LOGGER_NAME)
+        messages = self._start(task, initial_messages)
         provider_context: Optional[Dict[str, Any]] = initial_provider_context
-        try:
-            self.total_input_tokens = 0
-            self.total_output_tokens = 0
-        except Exception:
-            pass
+        streaming = self._streams()
         for iter_idx in range(max_iterations):
             if cancel_token is not None and cancel_token.is_cancelled:
-                if on_event is not None:
-                    try:
-                        on_event("progress", {"stage": "cancelled", "iteration": iter_idx})
-                    except Exception:
-                        pass
+                self._emit(on_event, [("progress", {"stage": "cancelled", "iteration": iter_idx})])
                 break
-            if on_event is not None:
-                try:
-                    on_event("progress", {"stage": "iteration_start", "iteration": iter_idx})
-                except Exception:
-                    pass
+            self._emit(on_event, [("progress", {"stage": "iteration_start", "iteration": iter_idx})])
+            started: Dict[str, ToolResult] = {}
+            sent, turn_system, prep_events = self._prepare_turn(messages, system, provider_context, iter_idx)
+            self._emit(on_event, prep_events)
             try:
-                resp = self._client.generate(
-                    messages=messages,
-                    tools=tool_descriptors,
-                    system=system,
-                    provider_context=provider_context,
-                )
-            except httpx.HTTPStatusError as e:
-                status = getattr(e.response, "status_code", None)
-                provider = "provider"
-                try:
-                    provider = self._client.get_provider_name()
-                except Exception:
-                    pass
-                try:
-                    body = e.response.json()
-                except Exception:
-                    body = e.response.text
-                logger.error(f"HTTP {status} from {provider}: {body}")
-                break
-            except (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.WriteTimeout) as e:
-                logger.error(f"HTTP timeout from provider: {e}")
-                break
+                if streaming:
+                    resp, started = self._stream_turn(
+                        sent, tool_descriptors, turn_system, provider_context, cancel_token, on_event
+                    )
+                else:
+                    resp = self._client.generate(
+                        messages=sent,
+                        tools=tool_descriptors,
+                        system=turn_system,
+                        provider_context=provider_context,
+                    )
             except Exception as e:
-                logger.error(f"Provider error: {e}")
+                self._log_provider_error(e)
                 break
 
             # Save provider context for next iteration
             provider_context = resp.provider_context
             self.last_provider_context = provider_context
-
-            # Print assistant texts immediately (deduplicated)
-            _seen_texts: set = set()
-            try:
-                for m in resp.messages or []:
-                    if getattr(m, "role", None) == "assistant":
-                        for p in (getattr(m, "content", []) or []):
-                            try:
-                                if getattr(p, "type", None) == "text":
-                                    txt = str(getattr(p, "text", "")).strip()
-                                    if txt and txt not in _seen_texts:
-                                        _seen_texts.add(txt)
-                                        logger.info('🧠 %s', txt)
-                                        if on_event is not None:
-                                            try:
-                                                on_event("assistant_text", {"text": txt})
-                                            except Exception:
-                                                pass
-                            except Exception:
-                                pass
-            except Exception:
-                pass
-            # Usage/cost logging
-            try:
-                inp = int(getattr(resp.usage, "input_tokens", 0) or 0)
-                out = int(getattr(resp.usage, "output_tokens", 0) or 0)
-                try:
-                    self.total_input_tokens += inp
-                    self.total_output_tokens += out
-                except Exception:
-                    pass
-                if on_event is not None:
-                    try:
-                        try:
-                            _model = self._client.get_model_name()
-                        except Exception:
-                            _model = "unknown"
-                        _ic, _oc, _tc, _tier = estimate_cost(_model, inp, out)
-                        on_event("usage", {
-                            "input_tokens": inp,
-                            "output_tokens": out,
-                            "iteration": iter_idx,
-                            "total_input_tokens": int(self.total_input_tokens),
-                            "total_output_tokens": int(self.total_output_tokens),
-                            "input_cost": _ic,
-                            "output_cost": _oc,
-                            "total_cost": _tc,
-                        })
-                    except Exception:
-                        pass
-                if USAGE_LOG_EACH_ITERATION:
-                    try:
-                        model_name = self._client.get_model_name()
-                    except Exception:
-                        model_name = "unknown"
-                    _in_cost, _out_cost, _total, _tier = estimate_cost(model_name, inp, out)
-                    logger.info("📈 Usage iter in=%s out=%s cost=$%.6f (input=$%.6f, output=$%.6f)", inp, out, (_in_cost + _out_cost), _in_cost, _out_cost)
-            except Exception:
-                pass
+            self._emit(on_event, self._response_events(resp, iter_idx, texts=not streaming))
 
             # Append assistant message
             if resp.messages:
@@ -167,41 +455,98 @@ class Orchestrator:
             if not resp.tool_calls:
                 break
 
-            # Execute tool calls sequentially
+            # Execute tool calls sequentially (streamed ones already ran, in order)
             for call in resp.tool_calls:
-                if cancel_token is not None and cancel_token.is_cancelled:
-                    break
-                if on_event is not None:
-                    try:
-                        batch_actions = call.metadata.get("_openai_actions")
-                        if batch_actions and len(batch_actions) > 1:
-                            for act in batch_actions:
-                                on_event("tool_call", {"name": call.name, "args": act})
-                        else:
-                            on_event("tool_call", {"name": call.name, "args": call.args})
-                    except Exception:
-                        pass
-                result = self._tools.execute(call, cancel_token=cancel_token)
-                # Propagate provider metadata (safety checks, etc.)
-                safety_checks = call.metadata.get("_openai_pending_safety_checks", [])
-                if safety_checks:
-                    result.metadata["_openai_pending_safety_checks"] = safety_checks
-                # Emit result events
-                if on_event is not None:
-                    try:
-                        has_image = any(isinstance(p, ImagePart) for p in result.content)
-                        if has_image:
-                            for p in result.content:
-                                if isinstance(p, ImagePart):
-                                    on_event("tool_result_image", {"media_type": p.media_type, "data": p.data_base64})
-                        else:
-                            for p in result.content:
-                                if getattr(p, "type", None) == "text" or type(p).__name__ == "TextPart":
-                                    on_event("tool_result_text", {"text": getattr(p, "text", "")})
-                                    break
-                    except Exception:
-                        pass
+                result = started.pop(call.id, None)
+                if result is None:
+                    if cancel_token is not None and cancel_token.is_cancelled:
+                        break
+                    self._emit(on_event, self._call_events(call))
+                    result = self._tools.execute(call, cancel_token=cancel_token)
+                self._emit(on_event, self._result_events(call, result))
                 # Append formatted tool result to history
                 messages.append(self._client.format_tool_result(result))
 
         return messages
+
+    async def arun(
+        self,
+        task: str,
+        tool_descriptors: List[ToolDescriptor],
+        system: Optional[str],
+        max_iterations: int = 30,
+        *,
+        cancel_token: Optional[CancelToken] = None,
+        on_event: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+        initial_messages: Optional[List[Message]] = None,
+        initial_provider_context: Optional[Dict[str, Any]] = None,
+    ) -> List[Message]:
+        """Async run(): the model is called through LLMClient.agenerate() and tool calls
+        run on the single input thread, so the event loop never blocks.
+
+        `on_event` may be a plain function or a coroutine function; returned awaitables
+        are awaited in order. Cancelling the task also cancels `cancel_token` so a tool
+        call that is already running stops at its next check.
+        """
+        messages = self._start(task, initial_messages)
+        provider_context: Optional[Dict[str, Any]] = initial_provider_context
+        cancel_token = cancel_token if cancel_token is not None else CancelToken()
+        loop = asyncio.get_running_loop()
+        executor = self._tool_executor or input_executor()
+        streaming = self._streams()
+        try:
+            for iter_idx in range(max_iterations):
+                if cancel_token.is_cancelled:
+                    await self._aemit(on_event, [("progress", {"stage": "cancelled", "iteration": iter_idx})])
+                    break
+                await self._aemit(on_event, [("progress", {"stage": "iteration_start", "iteration": iter_idx})])
+                started: Dict[str, asyncio.Future] = {}
+                # Off the loop: image re-encoding and the optional summary model call block
+                sent, turn_system, prep_events = await asyncio.to_thread(
+                    self._prepare_turn, messages, system, provider_context, iter_idx
+                )
+                await self._aemit(on_event, prep_events)
+                try:
+                    if streaming:
+                        resp, started = await self._astream_turn(
+                            sent, tool_descriptors, turn_system, provider_context, cancel_token, on_event, executor
+                        )
+                    else:
+                        resp = await self._client.agenerate(
+                            messages=sent,
+                            tools=tool_descriptors,
+                            system=turn_system,
+                            provider_context=provider_context,
+                        )
+                except Exception as e:
+                    self._log_provider_error(e)
+                    break
+
+                provider_context = resp.provider_context
+                self.last_provider_context = provider_context
+                await self._aemit(on_event, self._response_events(resp, iter_idx, texts=not streaming))
+
+                if resp.messages:
+                    messages.extend(resp.messages)
+
+                if not resp.tool_calls:
+                    break
+
+                for call in resp.tool_calls:
+                    afut = started.pop(call.id, None)
+                    if afut is not None:
+                        result = await afut
+                    else:
+                        if cancel_token.is_cancelled:
+                            break
+                        await self._aemit(on_event, self._call_events(call))
+                        result = await loop.run_in_executor(
+                            executor, lambda c=call: self._tools.execute(c, cancel_token=cancel_token)
+                        )
+                    await self._aemit(on_event, self._result_events(call, result))
+                    messages.append(self._client.format_tool_result(result))
+        except asyncio.CancelledError:
+            cancel_token.cancel()
+            raise
+
+        return messages
@@ -0,0 +1,99 @@
+"""Compound computer actions: several inputs in one tool call.
+
+Anthropic's computer tool runs one action per model turn, so focusing and
+filling a form costs two turns per field. The compound actions run a short,
+fully specified sequence locally (handled by handle_computer_action) and
+return one screenshot at the end:
+
+  click_and_type  click `coordinate`, optionally select all, type `text`, optionally press `submit_key`
+  fill_form       the same for each entry of `fields`, then an optional final `submit_key`
+  key_sequence    press `keys` in order (combo strings or {"key", "delay_ms"}), `delay_ms` apart
+
+The built-in computer tool has a fixed schema, so they are offered to the
+model as a separate function tool routed to the same handler.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from os_ai_llm.types import ToolDescriptor
+
+from os_ai_core.config import COMPOUND_ACTIONS_ENABLED
+
+COMPOUND_TOOL_NAME = "computer_compound"
+COMPOUND_ACTIONS = ("click_and_type", "fill_form", "key_sequence")
+
+_COORDINATE = {
+    "type": "array",
+    "items": {"type": "integer"},
+    "minItems": 2,
+    "maxItems": 2,
+    "description": "[x, y] in the same space as the computer tool's screenshots",
+}
+
+COMPOUND_INPUT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "action": {"type": "string", "enum": list(COMPOUND_ACTIONS)},
+        "coordinate": {**_COORDINATE, "description": "click_and_type: field to click before typing"},
+        "text": {"type": "string", "description": "click_and_type: text to enter"},
+        "clear": {"type": "boolean", "description": "Select all existing text in the field before typing (default false)"},
+        "submit_key": {
+            "type": "string",
+            "description": "Key combo pressed at the end, e.g. 'enter' (click_and_type, fill_form)",
+        },
+        "fields": {
+            "type": "array",
+            "description": "fill_form: fields in order",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "coordinate": _COORDINATE,
+                    "text": {"type": "string"},
+                    "clear": {"type": "boolean"},
+                    "submit_key": {"type": "string", "description": "Key combo pressed after this field, e.g. 'tab'"},
+                },
+                "required": ["coordinate", "text"],
+            },
+        },
+        "keys": {
+            "type": "array",
+            "description": "key_sequence: combos like 'ctrl+l' or {'key': 'enter', 'delay_ms': 500} (delay before the next key)",
+            "items": {
+                "anyOf": [
+                    {"type": "string"},
+                    {
+                        "type": "object",
+                        "properties": {"key": {"type": "string"}, "delay_ms": {"type": "integer", "minimum": 0}},
+                        "required": ["key"],
+                    },
+                ]
+            },
+        },
+        "delay_ms": {"type": "integer", "minimum": 0, "description": "key_sequence: default pause between keys"},
+    },
+    "required": ["action"],
+}
+
+COMPOUND_DESCRIPTION = (
+    "Run several computer inputs in one call and get one screenshot at the end. "
+    "Use it when every step is already known from the current screenshot: "
+    "click_and_type (click a field and type), fill_form (several fields, optionally submit) "
+    "and key_sequence (ordered key combos with optional delays). "
+    "Coordinates use the same space as the computer tool."
+)
+
+
+def compound_tool_descriptor() -> ToolDescriptor:
+    return ToolDescriptor(
+        name=COMPOUND_TOOL_NAME,
+        kind="function",
+        params={"description": COMPOUND_DESCRIPTION, "input_schema": COMPOUND_INPUT_SCHEMA},
+    )
+
+
+def compound_tools_for(provider: Optional[str]) -> List[ToolDescriptor]:
+    """Extra tool descriptors for `provider` (OpenAI already batches actions within one computer_call)."""
+    if not COMPOUND_ACTIONS_ENABLED or (provider or "").lower() != "anthropic":
+        return []
+    return [compound_tool_descriptor()]
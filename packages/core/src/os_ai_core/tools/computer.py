@@ -4,10 +4,12 @@ from typing import Dict, Any, List, Tuple
 
 import os
 import sys
+import atexit
 import time
-import base64
 import logging
 
+import numpy as np
+
 try:
     import pyautogui
 except (KeyError, Exception) as _pyautogui_err:
@@ -36,32 +38,190 @@ from os_ai_core.config import (
     POST_MOVE_VERIFY,
     POST_MOVE_TOLERANCE_PX,
     POST_MOVE_CORRECTION_DURATION,
+    COORD_AUTO_CALIBRATION,
+    COORD_CALIBRATION_MIN_SAMPLES,
+    COORD_CALIBRATION_MAX_SAMPLES,
+    COORD_CALIBRATION_OUTLIER_PX,
+    COORD_CALIBRATION_MAX_ERROR_PX,
+    COORD_CALIBRATION_MIN_SPREAD_PX,
+    COORD_CALIBRATION_MAX_CORRECTION_PX,
+    COORD_CALIBRATION_FILE,
+    MOTION_PROFILE,
+    DRAG_PATH_SIMPLIFY_PX,
+    DRAG_PATH_EVENT_HZ,
+    TYPE_WPM,
+    BATCH_OPTIMIZE_ENABLED,
+    COMPOUND_STEP_DELAY_MS,
+    SETTLE_TIMEOUT_S,
+    SETTLE_INTERVAL_MS,
+    SETTLE_STABLE_SAMPLES,
+    SETTLE_MAX_CHANGED_FRACTION,
+    SETTLE_GRID_WIDTH,
+    BATCH_SETTLE_ENABLED,
+    BATCH_SETTLE_TIMEOUT_S,
+    XTEST_TYPE_WPM,
+    TYPE_STRATEGY,
+    TYPE_PASTE_MIN_CHARS,
+    TYPE_CHUNK_CHARS,
+    PASTE_CHUNK_CHARS,
+    PASTE_READ_TIMEOUT_SECONDS,
+    RESTORE_CLIPBOARD_AFTER_PASTE,
+    PASTE_COPY_DELAY_SECONDS,
+    PASTE_POST_DELAY_SECONDS,
     VIRTUAL_DISPLAY_ENABLED,
     VIRTUAL_DISPLAY_WIDTH_PX,
     VIRTUAL_DISPLAY_HEIGHT_PX,
     SCREENSHOT_MODE,
+    SCREENSHOT_LETTERBOX,
     SCREENSHOT_FORMAT,
     SCREENSHOT_JPEG_QUALITY,
+    SCREENSHOT_RESAMPLE,
+    SCREENSHOT_NATIVE_SCALING,
+    SCREENSHOT_CAPTURE_AREA,
+    SCREENSHOT_WINDOW_MIN_PX,
+    ZOOM_MAX_UPSCALE,
+    SCREENSHOT_BYTE_BUDGET_KB,
+    SCREENSHOT_BUDGET_MIN_QUALITY,
+    SCREENSHOT_BUDGET_MAX_QUALITY,
+    SCREENSHOT_BUDGET_MAX_ITERS,
+    SCREENSHOT_ARCHIVE_ENABLED,
+    SCREENSHOT_ARCHIVE_MAX_PENDING,
+    SCREENSHOT_ARCHIVE_MAX_TOTAL_MB,
+    SCREENSHOT_ARCHIVE_TTL_SECONDS,
+    SCREEN_CAPTURE_SERVICE_ENABLED,
+    SCREEN_CAPTURE_INTERVAL_MS,
+    SCREEN_CAPTURE_SETTLE_MS,
+    SCREEN_CAPTURE_FRESH_TIMEOUT_S,
+    SCREENSHOT_DEDUP_ENABLED,
+    SCREENSHOT_DEDUP_GRID_WIDTH,
+    SCREENSHOT_DEDUP_PIXEL_TOLERANCE,
+    SCREENSHOT_DEDUP_MAX_CHANGED_FRACTION,
 )
 from os_ai_os.config import (
     PYAUTO_PAUSE_SECONDS,
     PYAUTO_FAILSAFE,
     DEFAULT_MOVE_SPEED_PPS,
     DEFAULT_DRAG_SPEED_PPS,
-    MIN_MOVE_DURATION,
     MAX_MOVE_DURATION,
 )
 from os_ai_os.config import PREMOVE_HIGHLIGHT_DEFAULT_DURATION
 from os_ai_os.api import get_drivers
+from os_ai_os.capture import CaptureService
+from os_ai_os.geometry import DisplayGeometry
+from os_ai_core.tools.compound import COMPOUND_ACTIONS
+from os_ai_core.utils.batch_optimizer import BatchStep, OptimizedBatch, likely_changes_screen, optimize_batch
+from os_ai_core.utils.calibration import AffineCalibrator, CalibrationStore
+from os_ai_core.utils.frames import AUTO as AUTO_FORMAT, BudgetJpegEncoder, EncodedFrame, choose_format, encode_frame, normalize_format
+from os_ai_core.utils.frame_diff import FrameDiffTracker
+from os_ai_core.utils.geometry import ModelGeometry, build_model_geometry
+from os_ai_core.utils.motion import MotionProfile, get_profile, normalize_tween, play, trajectory
+from os_ai_core.utils.paths import as_path, path_length, resample_path, simplify_path
+from os_ai_core.utils.resize import ResizeEngine
+from os_ai_core.utils.screenshot_archive import ScreenshotArchiver
+from os_ai_core.utils.settle import SettleResult, wait_until_stable
+from os_ai_core.utils.text_input import PASTE, choose_text_strategy, split_chunks
+from os_ai_core.utils.viewport import Viewport
 
 
-def press_enter_mac():
-    """Press Enter via platform-native Quartz helper, falling back to pyautogui."""
+def _mouse():
+    return get_drivers().mouse
+
+
+def _keyboard():
+    return get_drivers().keyboard
+
+
+class PasteInterrupted(Exception):
+    """Clipboard paste failed after some chunks already reached the target (typing it all again would duplicate them)."""
+
+    def __init__(self, done: int, total: int, error: Exception) -> None:
+        super().__init__(f"paste interrupted after {done} of {total} chunks: {error}")
+        self.done = done
+        self.total = total
+
+
+def _paste_text(text: str) -> Tuple[int, bool]:
+    """Paste `text` through the platform clipboard in PASTE_CHUNK_CHARS pieces.
+
+    Returns the chunk count and whether a native clipboard saw the target fetch the last chunk
+    (always True with pyperclip, which cannot tell). Raises PasteInterrupted when a chunk fails,
+    or is not fetched, after an earlier one was sent; any other exception means nothing reached
+    the target. The previous clipboard text is not restored over an unconfirmed paste.
+    """
+    drivers = get_drivers()
+    clipboard = drivers.clipboard
+    # pyperclip hands the text to a helper process and cannot tell when it was read: keep the fixed delays.
+    # Native clipboards own the selection on return and report when the target fetched the text.
+    legacy = getattr(drivers.capabilities, "clipboard_backend", "pyperclip") == "pyperclip"
+    copy_delay = PASTE_COPY_DELAY_SECONDS if legacy else 0.0
+    read_timeout = PASTE_POST_DELAY_SECONDS if legacy else PASTE_READ_TIMEOUT_SECONDS
+    prev_clip = None
+    if RESTORE_CLIPBOARD_AFTER_PASTE:
+        try:
+            prev_clip = clipboard.get_text()
+        except Exception:
+            prev_clip = None
+    # Use platform-appropriate modifier: command on macOS, ctrl on Windows/Linux
+    modifier = "command" if sys.platform == "darwin" else "ctrl"
+    chunks = split_chunks(text, PASTE_CHUNK_CHARS)
+    done = 0
+    confirmed = True
+    try:
+        for chunk in chunks:
+            try:
+                clipboard.set_text(chunk)
+                if copy_delay > 0:
+                    time.sleep(copy_delay)
+                # Only a read after the keystroke is the paste target's
+                clipboard.arm()
+                _keyboard().press_combo((modifier, "v"))
+            except Exception as e:
+                if done:
+                    raise PasteInterrupted(done, len(chunks), e) from e
+                raise
+            done += 1
+            try:
+                confirmed = bool(clipboard.wait_read(read_timeout)) or legacy
+            except Exception as e:
+                logging.getLogger(LOGGER_NAME).debug("Clipboard read wait failed: %s", e)
+                confirmed = legacy
+            if not confirmed and done < len(chunks):
+                # The target may still read this chunk: the next set_text would replace it
+                raise PasteInterrupted(
+                    done, len(chunks), TimeoutError(f"target did not fetch the clipboard within {read_timeout:.2f}s")
+                )
+    finally:
+        if prev_clip is not None and confirmed:
+            try:
+                clipboard.set_text(prev_clip)
+            except Exception:
+                pass
+    return len(chunks), confirmed
+
+
+def _motion_profile(params: Dict[str, Any]) -> MotionProfile:
+    return get_profile(params.get("motion") or params.get("motion_profile") or MOTION_PROFILE)
+
+
+def _move_to(x: int, y: int, duration: float, tween: str = "linear", profile: MotionProfile | None = None) -> None:
+    """Move to (x, y) over `duration` seconds: one warp, or a precomputed trajectory played at the profile's rate."""
+    profile = profile or get_profile(MOTION_PROFILE)
+    mouse = _mouse()
+    if duration <= 0 or profile.instant:
+        mouse.move_to(int(x), int(y))
+        return
     try:
-        from os_ai_os_macos.keyboard import press_enter_mac as _pem
-        _pem()
+        start = mouse.position()
     except Exception:
-        pyautogui.press("enter")
+        mouse.move_to(int(x), int(y))
+        return
+    points = trajectory(start, (x, y), duration, event_hz=profile.event_hz, tween=tween)
+    play(points, profile.event_hz, lambda px, py: mouse.move_to(px, py))
+
+
+def press_enter_mac():
+    """Press Enter via the platform keyboard driver (native Quartz helper on macOS)."""
+    _keyboard().press_enter()
 
 
 # Initialize PyAutoGUI basic settings
@@ -72,98 +232,63 @@ pyautogui.FAILSAFE = PYAUTO_FAILSAFE
 LAST_SCREENSHOT_PATH: str = ""
 
 
-# ---- Geometry setup (duplicated from legacy main, kept intact) ----
-SCREEN_W, SCREEN_H = pyautogui.size()
+# ---- Display geometry (driver-owned snapshot, refreshed on display changes) ----
+_GEOMETRY: ModelGeometry | None = None
 
-if (SCREENSHOT_MODE or "downscale").lower() == "native":
-    MODEL_DISPLAY_W = SCREEN_W
-    MODEL_DISPLAY_H = SCREEN_H
-    DYNAMIC_X_SCALE = 1.0
-    DYNAMIC_Y_SCALE = 1.0
-else:
-    if VIRTUAL_DISPLAY_ENABLED:
-        try:
-            vd_w = int(VIRTUAL_DISPLAY_WIDTH_PX)
-        except Exception:
-            vd_w = SCREEN_W
-        try:
-            vd_h = int(VIRTUAL_DISPLAY_HEIGHT_PX)
-        except Exception:
-            vd_h = 0
-        if vd_w <= 0:
-            vd_w = SCREEN_W
-        if vd_h <= 0:
-            vd_h = max(1, int(round(float(SCREEN_H) * float(vd_w) / float(SCREEN_W))))
-        MODEL_DISPLAY_W = vd_w
-        MODEL_DISPLAY_H = vd_h
-        try:
-            DYNAMIC_X_SCALE = float(SCREEN_W) / float(MODEL_DISPLAY_W)
-            DYNAMIC_Y_SCALE = float(SCREEN_H) / float(MODEL_DISPLAY_H)
-        except Exception:
-            DYNAMIC_X_SCALE = 1.0
-            DYNAMIC_Y_SCALE = 1.0
-    else:
-        MODEL_DISPLAY_W = SCREEN_W
-        MODEL_DISPLAY_H = SCREEN_H
-        DYNAMIC_X_SCALE = 1.0
-        DYNAMIC_Y_SCALE = 1.0
 
-try:
-    if (SCREENSHOT_MODE or "downscale").lower() == "downscale" and VIRTUAL_DISPLAY_ENABLED:
-        screen_aspect = float(SCREEN_W) / float(SCREEN_H)
-        model_aspect = float(MODEL_DISPLAY_W) / float(MODEL_DISPLAY_H)
-        if screen_aspect > model_aspect:
-            MODEL_CONTENT_W = int(MODEL_DISPLAY_W)
-            MODEL_CONTENT_H = max(1, int(round(MODEL_DISPLAY_W / screen_aspect)))
-            MODEL_LB_OFFSET_X = 0
-            MODEL_LB_OFFSET_Y = int((int(MODEL_DISPLAY_H) - MODEL_CONTENT_H) / 2)
-        else:
-            MODEL_CONTENT_H = int(MODEL_DISPLAY_H)
-            MODEL_CONTENT_W = max(1, int(round(MODEL_DISPLAY_H * screen_aspect)))
-            MODEL_LB_OFFSET_Y = 0
-            MODEL_LB_OFFSET_X = int((int(MODEL_DISPLAY_W) - MODEL_CONTENT_W) / 2)
-    else:
-        MODEL_CONTENT_W = int(MODEL_DISPLAY_W)
-        MODEL_CONTENT_H = int(MODEL_DISPLAY_H)
-        MODEL_LB_OFFSET_X = 0
-        MODEL_LB_OFFSET_Y = 0
-except Exception:
-    MODEL_CONTENT_W = int(MODEL_DISPLAY_W)
-    MODEL_CONTENT_H = int(MODEL_DISPLAY_H)
-    MODEL_LB_OFFSET_X = 0
-    MODEL_LB_OFFSET_Y = 0
-
-try:
-    CONTENT_X_SCALE = float(SCREEN_W) / float(MODEL_CONTENT_W)
-    CONTENT_Y_SCALE = float(SCREEN_H) / float(MODEL_CONTENT_H)
-except Exception:
-    CONTENT_X_SCALE = float(SCREEN_W) / float(max(1, int(MODEL_DISPLAY_W)))
-    CONTENT_Y_SCALE = float(SCREEN_H) / float(max(1, int(MODEL_DISPLAY_H)))
-
-
-def _resolve_tween(params: Dict[str, Any]):
-    tween_name = (params.get("tween") or params.get("easing") or "easeInOutQuad").lower()
-    mapping = {
-        "linear": getattr(pyautogui, "linear", None),
-        "easeinoutquad": getattr(pyautogui, "easeInOutQuad", None),
-        "easeinquad": getattr(pyautogui, "easeInQuad", None),
-        "easeoutquad": getattr(pyautogui, "easeOutQuad", None),
-    }
-    tween_fn = mapping.get(tween_name)
-    return tween_fn or getattr(pyautogui, "easeInOutQuad", None)
+def _geometry() -> ModelGeometry:
+    """Current model geometry; rebuilt (and derived caches dropped) when the display changes."""
+    global _GEOMETRY, _ACTIVE_VIEWPORT, _RESIZE_ENGINE, _VIEWPORT_ENGINE
+    try:
+        display = get_drivers().geometry.snapshot()
+        if not isinstance(display, DisplayGeometry):
+            raise TypeError("no display geometry")
+        sw, sh, generation = display.width, display.height, display.generation
+    except Exception:
+        sw, sh = pyautogui.size()
+        generation = _GEOMETRY.generation if _GEOMETRY is not None else 0
+    current = _GEOMETRY
+    if current is not None and current.generation == generation and (current.screen_w, current.screen_h) == (int(sw), int(sh)):
+        return current
+    geometry = build_model_geometry(
+        sw,
+        sh,
+        mode=SCREENSHOT_MODE,
+        virtual_enabled=VIRTUAL_DISPLAY_ENABLED,
+        virtual_w=VIRTUAL_DISPLAY_WIDTH_PX,
+        virtual_h=VIRTUAL_DISPLAY_HEIGHT_PX,
+        letterbox=SCREENSHOT_LETTERBOX,
+        generation=generation,
+    )
+    if current is not None:
+        logging.getLogger(LOGGER_NAME).info(
+            "Screen %dx%d -> %dx%d, model canvas %dx%d",
+            current.screen_w, current.screen_h, geometry.screen_w, geometry.screen_h, geometry.model_w, geometry.model_h,
+        )
+    _GEOMETRY = geometry
+    _ACTIVE_VIEWPORT = None
+    _RESIZE_ENGINE = None
+    _VIEWPORT_ENGINE = None
+    return geometry
+
+
+def _resolve_tween(params: Dict[str, Any]) -> str:
+    return normalize_tween(params.get("tween") or params.get("easing"))
 
 
 def _compute_duration_to(target_x: int, target_y: int, params: Dict[str, Any], *, default: float, speed_pps: float) -> float:
+    profile = _motion_profile(params)
+    if profile.instant:
+        return 0.0
     try:
         if "duration" in params or "move_duration" in params:
             val = float(params.get("duration", params.get("move_duration")))
-            return max(MIN_MOVE_DURATION, min(MAX_MOVE_DURATION, val))
-        cx, cy = pyautogui.position()
+            return max(profile.min_duration, min(MAX_MOVE_DURATION, val))
+        cx, cy = _mouse().position()
         dist = ((target_x - cx) ** 2 + (target_y - cy) ** 2) ** 0.5
-        dur = dist / float(speed_pps)
-        return max(MIN_MOVE_DURATION, min(MAX_MOVE_DURATION, dur))
+        return profile.duration_for(dist, speed_pps)
     except Exception:
-        return default
+        return min(default, profile.max_duration)
 
 
 def computer_tool_handler(args: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -178,8 +303,35 @@ def computer_tool_handler(args: Dict[str, Any]) -> List[Dict[str, Any]]:
     return handle_computer_action(action, args)
 
 
+_CAPTURE_SERVICE: CaptureService | None = None
+
+
+def _get_capture_service() -> CaptureService | None:
+    global _CAPTURE_SERVICE
+    if not SCREEN_CAPTURE_SERVICE_ENABLED:
+        return None
+    if _CAPTURE_SERVICE is None:
+        _CAPTURE_SERVICE = CaptureService(
+            get_drivers().screen,
+            interval_s=float(SCREEN_CAPTURE_INTERVAL_MS) / 1000.0,
+            settle_s=float(SCREEN_CAPTURE_SETTLE_MS) / 1000.0,
+        )
+        _CAPTURE_SERVICE.start()
+        atexit.register(_CAPTURE_SERVICE.stop)
+    return _CAPTURE_SERVICE
+
+
+def _note_input() -> None:
+    """Invalidate frames grabbed before the input event that just happened."""
+    if _CAPTURE_SERVICE is not None:
+        _CAPTURE_SERVICE.note_input()
+
+
 def _capture_driver_image():
     try:
+        service = _get_capture_service()
+        if service is not None:
+            return service.latest(timeout=float(SCREEN_CAPTURE_FRESH_TIMEOUT_S)).image
         drivers = get_drivers()
         return drivers.screen.screenshot()
     except Exception:
@@ -215,120 +367,504 @@ def _find_project_root(start_dir: str) -> str:
     return os.path.abspath(start_dir)
 
 
-def b64_image_from_screenshot() -> Dict[str, Any]:
-    img = _capture_driver_image() or pyautogui.screenshot(region=(0, 0, SCREEN_W, SCREEN_H))
+_RESIZE_ENGINE: ResizeEngine | None = None
+
+
+def _get_resize_engine(geometry: ModelGeometry) -> ResizeEngine:
+    """Full-screen scaler for `geometry` (rebuilt after a display change; canvas reused between frames)."""
+    global _RESIZE_ENGINE
+    if _RESIZE_ENGINE is None:
+        _RESIZE_ENGINE = geometry.viewport.resize_engine(resample=str(SCREENSHOT_RESAMPLE or "quality").lower())
+    return _RESIZE_ENGINE
+
+
+# Window the model is currently looking at (None = whole screen); set by each screenshot
+_ACTIVE_VIEWPORT: Viewport | None = None
+_VIEWPORT_ENGINE: ResizeEngine | None = None
 
+
+def _window_viewport(geometry: ModelGeometry) -> Viewport | None:
+    """Viewport of the focused window when SCREENSHOT_CAPTURE_AREA='active_window' and the driver can locate it."""
+    if str(SCREENSHOT_CAPTURE_AREA or "screen").lower() != "active_window":
+        return None
     try:
-        from PIL import Image  # type: ignore
-        target_w, target_h = int(MODEL_DISPLAY_W), int(MODEL_DISPLAY_H)
-        if (SCREENSHOT_MODE or "downscale").lower() == "downscale":
-            if img.width != SCREEN_W or img.height != SCREEN_H:
-                img = img.resize((SCREEN_W, SCREEN_H), resample=getattr(Image, "LANCZOS", None) or Image.BILINEAR)
-            content = img.resize((MODEL_CONTENT_W, MODEL_CONTENT_H), resample=getattr(Image, "LANCZOS", None) or Image.BILINEAR)
-            from PIL import Image as PILImage  # type: ignore
-            canvas = PILImage.new("RGB", (target_w, target_h), (0, 0, 0))
-            canvas.paste(content, (MODEL_LB_OFFSET_X, MODEL_LB_OFFSET_Y))
-            img = canvas
-        else:
-            if img.width != target_w or img.height != target_h:
-                resample = getattr(Image, "LANCZOS", getattr(Image, "BILINEAR", None))
-                img = img.resize((target_w, target_h), resample=resample)
+        drivers = get_drivers()
+        if not drivers.capabilities.supports_window_capture:
+            return None
+        rect = drivers.screen.active_window_rect()
+    except Exception:
+        return None
+    min_px = int(SCREENSHOT_WINDOW_MIN_PX)
+    if rect is None or rect.width < min_px or rect.height < min_px:
+        return None
+    if (rect.x, rect.y, rect.width, rect.height) == (0, 0, geometry.screen_w, geometry.screen_h):
+        # Fullscreen window: the regular screen geometry already matches
+        return None
+    return geometry.fit(rect.x, rect.y, rect.width, rect.height)
+
+
+def _capture_viewport_image(viewport: Viewport, geometry: ModelGeometry):
+    """Pixels of the viewport only: cropped from the background frame, else a region grab."""
+    scaled = _capture_scaled(viewport.content_size, viewport.rect)
+    if scaled is not None:
+        return scaled
+    if SCREEN_CAPTURE_SERVICE_ENABLED:
+        full = _capture_driver_image()
+        if full is not None:
+            # Background frames may be physical pixels (HiDPI); scale the logical rect
+            fx, fy = full.width / float(geometry.screen_w), full.height / float(geometry.screen_h)
+            box = (
+                int(round(viewport.x * fx)), int(round(viewport.y * fy)),
+                int(round((viewport.x + viewport.width) * fx)), int(round((viewport.y + viewport.height) * fy)),
+            )
+            return full.crop(box)
+    try:
+        return get_drivers().screen.screenshot(region=viewport.rect)
+    except Exception:
+        return None
+
+
+def _capture_scaled(size: Tuple[int, int], region: Tuple[int, int, int, int] | None = None):
+    """Frame already scaled to `size` by the platform driver (HiDPI-aware), or None.
+
+    Skips reading physical (e.g. 2x Retina) pixels that the resize step would throw away.
+    Background-capture frames are left alone: they are shared with other consumers.
+    """
+    if not SCREENSHOT_NATIVE_SCALING or SCREEN_CAPTURE_SERVICE_ENABLED:
+        return None
+    try:
+        drivers = get_drivers()
+        if not drivers.capabilities.supports_scaled_capture:
+            return None
+        img = drivers.screen.screenshot_scaled(size, region=region)
+    except Exception:
+        return None
+    if img is None or tuple(img.size) != tuple(size):
+        return None
+    return img
+
+
+def _get_viewport_engine(viewport: Viewport) -> ResizeEngine:
+    """Scaler for a window viewport, rebuilt only when the window's fitted size changes."""
+    global _VIEWPORT_ENGINE
+    engine = _VIEWPORT_ENGINE
+    if engine is None or engine.content_size != viewport.content_size or engine.offset != viewport.offset:
+        engine = viewport.resize_engine(resample=str(SCREENSHOT_RESAMPLE or "quality").lower())
+        _VIEWPORT_ENGINE = engine
+    return engine
+
+
+_FRAME_TRACKER = FrameDiffTracker(
+    grid_width=int(SCREENSHOT_DEDUP_GRID_WIDTH),
+    pixel_tolerance=int(SCREENSHOT_DEDUP_PIXEL_TOLERANCE),
+    max_changed_fraction=float(SCREENSHOT_DEDUP_MAX_CHANGED_FRACTION),
+)
+
+
+def reset_screenshot_dedup() -> None:
+    """Start a new conversation for unchanged-frame suppression (ToolRegistry reset hook)."""
+    if SCREENSHOT_DEDUP_ENABLED:
+        _FRAME_TRACKER.start_session()
+
+
+def forget_screenshot_reference() -> None:
+    """The last frame sent is gone from the history: send the next one in full (ToolRegistry prune hook)."""
+    _FRAME_TRACKER.forget()
+
+
+def b64_image_from_screenshot(*, dedupe: bool = False) -> Dict[str, Any]:
+    """Capture, scale and encode the screen (or only the focused window) for the model.
+
+    With dedupe=True and an active run, a frame identical to the last one sent
+    yields a short text block instead of an image.
+    """
+    global _ACTIVE_VIEWPORT
+    geometry = _geometry()
+    viewport = _window_viewport(geometry)
+    img = _capture_viewport_image(viewport, geometry) if viewport is not None else None
+    if img is None:
+        viewport = None
+        img = (
+            _capture_scaled(geometry.viewport.content_size)
+            or _capture_driver_image()
+            or pyautogui.screenshot(region=(0, 0, geometry.screen_w, geometry.screen_h))
+        )
+
+    try:
+        engine = _get_resize_engine(geometry) if viewport is None else _get_viewport_engine(viewport)
+        img = engine.process(img)
     except Exception:
         pass
+    # Later model coordinates refer to this frame
+    _ACTIVE_VIEWPORT = viewport
+
+    if dedupe:
+        same_as = _FRAME_TRACKER.observe(img)
+        if same_as is not None:
+            return {"type": "text", "text": f"screen unchanged since step {same_as} (no new screenshot)"}
 
-    from io import BytesIO
-    buf = BytesIO()
-    fmt = (SCREENSHOT_FORMAT or "PNG").upper()
-    media_type = "image/png" if fmt == "PNG" else "image/jpeg"
     try:
-        try:
-            save_root = _find_project_root(os.path.dirname(__file__))
-            save_dir = os.path.join(save_root, "screenshots")
-            os.makedirs(save_dir, exist_ok=True)
-            ts = time.strftime("%Y%m%d_%H%M%S")
-            ms = int((time.time() - int(time.time())) * 1000)
-            ext = "jpg" if fmt == "JPEG" else "png"
-            file_path = os.path.join(save_dir, f"screenshot_{ts}_{ms:03d}.{ext}")
-            if fmt == "JPEG":
-                img_to_save = img.convert("RGB")
-                img_to_save.save(file_path, format="JPEG", quality=int(SCREENSHOT_JPEG_QUALITY or 85))
+        frame = _encode_for_model(img)
+    except Exception:
+        _FRAME_TRACKER.forget()
+        return {
+            "type": "image",
+            "source": {"type": "base64", "media_type": "image/png", "data": ""},
+        }
+    _save_frame(frame)
+    return frame.to_block()
+
+
+_BUDGET_ENCODER: BudgetJpegEncoder | None = None
+
+
+def _encode_for_model(img) -> EncodedFrame:
+    """Encode per SCREENSHOT_FORMAT (AUTO picks per frame); JPEG honours SCREENSHOT_BYTE_BUDGET_KB."""
+    global _BUDGET_ENCODER
+    fmt = normalize_format(SCREENSHOT_FORMAT)
+    opts: Dict[str, Any] = {}
+    if fmt == AUTO_FORMAT:
+        fmt, opts = choose_format(img)
+    budget_kb = float(SCREENSHOT_BYTE_BUDGET_KB or 0)
+    if budget_kb <= 0 or fmt != "JPEG":
+        return encode_frame(img, fmt, quality=int(SCREENSHOT_JPEG_QUALITY or 85), **opts)
+    if _BUDGET_ENCODER is None:
+        _BUDGET_ENCODER = BudgetJpegEncoder(
+            int(budget_kb * 1024),
+            min_quality=int(SCREENSHOT_BUDGET_MIN_QUALITY),
+            max_quality=int(SCREENSHOT_BUDGET_MAX_QUALITY),
+            max_iters=int(SCREENSHOT_BUDGET_MAX_ITERS),
+            start_quality=int(SCREENSHOT_JPEG_QUALITY or 60),
+        )
+    frame = _BUDGET_ENCODER.encode(img)
+    logging.getLogger(LOGGER_NAME).info(
+        "Screenshot %dx%d quality=%s size=%.1fKB budget=%.0fKB passes=%d ~%d image tokens",
+        frame.width, frame.height, frame.quality, frame.size_bytes / 1024.0, budget_kb,
+        frame.attempts, frame.estimated_image_tokens,
+    )
+    return frame
+
+
+def _region_from_params(params: Dict[str, Any]) -> Tuple[int, int, int, int] | None:
+    """Rectangle (x1, y1, x2, y2) from zoom's `region` [x1, y1, x2, y2] or screenshot_region's x/y/width/height."""
+    try:
+        if params.get("action") == "screenshot_region" or "width" in params:
+            if isinstance(params.get("region"), (list, tuple)) and len(params["region"]) == 4:
+                x, y, w, h = (int(v) for v in params["region"])
             else:
-                img.save(file_path, format="PNG")
-            logging.getLogger(LOGGER_NAME).info(f"Saved screenshot: {file_path}")
-            try:
-                global LAST_SCREENSHOT_PATH
-                LAST_SCREENSHOT_PATH = file_path
-            except Exception:
-                pass
-        except Exception:
-            pass
+                x, y = int(params.get("x", 0)), int(params.get("y", 0))
+                w, h = int(params.get("width", 0)), int(params.get("height", 0))
+            return x, y, x + w, y + h
+        region = params.get("region")
+        if isinstance(region, (list, tuple)) and len(region) == 4:
+            x1, y1, x2, y2 = (int(v) for v in region)
+            return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+    except Exception:
+        return None
+    return None
+
 
-        if fmt == "JPEG":
-            img_enc = img.convert("RGB")
-            img_enc.save(buf, format="JPEG", quality=int(SCREENSHOT_JPEG_QUALITY or 85))
+def zoom_image_blocks(region: Tuple[int, int, int, int], *, coordinate_space: str | None = None) -> List[Dict[str, Any]]:
+    """Capture only `region` (model or screen coordinates) and upsample it to the model display.
+
+    The zoomed image is view-only: the coordinate mapping used by later actions is unchanged.
+    """
+    x1, y1, x2, y2 = region
+    geometry = _geometry()
+    sx1, sy1, sw, sh = _region_to_screen(region, coordinate_space=coordinate_space)
+    try:
+        img = get_drivers().screen.screenshot(region=(sx1, sy1, sw, sh))
+    except Exception:
+        img = None
+    if img is None:
+        img = pyautogui.screenshot(region=(sx1, sy1, sw, sh))
+    try:
+        from PIL import Image  # type: ignore
+        scale = min(float(geometry.model_w) / img.width, float(geometry.model_h) / img.height, float(ZOOM_MAX_UPSCALE))
+        size = (max(1, int(round(img.width * scale))), max(1, int(round(img.height * scale))))
+        if size != img.size:
+            img = img.resize(size, resample=getattr(Image, "LANCZOS", Image.BILINEAR))
+    except Exception:
+        pass
+    frame = _encode_for_model(img)
+    _save_frame(frame)
+    block = frame.to_block()
+    block["label"] = "zoom"
+    note = (
+        f"zoomed view of region ({x1},{y1})-({x2},{y2}) at {frame.width}x{frame.height}; "
+        "keep using screenshot coordinates for actions"
+    )
+    return [{"type": "text", "text": note}, block]
+
+
+def _settle_grabber(region: Tuple[int, int, int, int] | None = None):
+    """Frame source for settle detection: small frames from the driver when it can scale, else raw grabs."""
+    drivers = get_drivers()
+    screen = drivers.screen
+    scaled = False
+    try:
+        scaled = bool(drivers.capabilities.supports_scaled_capture)
+    except Exception:
+        pass
+    size = None
+    if scaled:
+        if region is not None:
+            w, h = region[2], region[3]
         else:
-            img.save(buf, format="PNG")
+            s = screen.size()
+            w, h = s.width, s.height
+        gw = max(8, min(int(SETTLE_GRID_WIDTH) * 2, int(w)))
+        size = (gw, max(1, int(round(h * gw / float(max(1, w))))))
+
+    def grab():
+        if size is not None:
+            img = screen.screenshot_scaled(size, region=region)
+            if img is not None:
+                return img
+        return screen.screenshot(region=region) if region is not None else screen.screenshot()
+
+    return grab
+
+
+def _wait_until_stable(params: Dict[str, Any], *, timeout_s: float) -> SettleResult:
+    """Run settle detection with config defaults overridable by action params."""
+    region = None
+    rect = _region_from_params(params)
+    if rect is not None:
+        # Pixels to sample, not a pointer target: no calibration
+        region = _region_to_screen(rect, coordinate_space=params.get("coordinate_space"))
+    try:
+        grab = _settle_grabber(region)
     except Exception:
-        try:
-            img.save(buf, format="PNG")
-            media_type = "image/png"
-        except Exception:
-            return {
-                "type": "image",
-                "source": {"type": "base64", "media_type": "image/png", "data": ""},
-            }
-
-    data = base64.b64encode(buf.getvalue()).decode("ascii")
-    return {
-        "type": "image",
-        "source": {"type": "base64", "media_type": media_type, "data": data},
-    }
+        return SettleResult(stable=False, elapsed_s=0.0, samples=0, last_change=1.0, frames=0)
+    return wait_until_stable(
+        grab,
+        threshold=float(params.get("threshold", SETTLE_MAX_CHANGED_FRACTION)),
+        stable_samples=int(params.get("samples", SETTLE_STABLE_SAMPLES)),
+        interval_s=float(params.get("interval_ms", SETTLE_INTERVAL_MS)) / 1000.0,
+        timeout_s=float(params.get("timeout", timeout_s)),
+        grid_width=int(SETTLE_GRID_WIDTH),
+        pixel_tolerance=int(SCREENSHOT_DEDUP_PIXEL_TOLERANCE),
+    )
+
+
+_ARCHIVER: ScreenshotArchiver | None = None
+
+
+def _get_archiver() -> ScreenshotArchiver:
+    # Root is resolved once per process instead of walking the tree on every frame
+    global _ARCHIVER
+    if _ARCHIVER is None:
+        save_root = _find_project_root(os.path.dirname(__file__))
+        _ARCHIVER = ScreenshotArchiver(
+            os.path.join(save_root, "screenshots"),
+            max_pending=int(SCREENSHOT_ARCHIVE_MAX_PENDING),
+            max_total_bytes=int(float(SCREENSHOT_ARCHIVE_MAX_TOTAL_MB) * 1024 * 1024),
+            ttl_seconds=float(SCREENSHOT_ARCHIVE_TTL_SECONDS),
+        )
+        atexit.register(_ARCHIVER.close)
+    return _ARCHIVER
+
+
+def flush_screenshots(timeout: float | None = 5.0) -> bool:
+    """Wait until queued screenshots hit the disk (used by tests and shutdown)."""
+    if _ARCHIVER is None:
+        return True
+    return _ARCHIVER.flush(timeout)
+
+
+def _save_frame(frame: EncodedFrame) -> None:
+    """Queue already-encoded frame bytes for the screenshots folder (no re-encode, no blocking I/O)."""
+    global LAST_SCREENSHOT_PATH
+    if not SCREENSHOT_ARCHIVE_ENABLED:
+        return
+    try:
+        LAST_SCREENSHOT_PATH = _get_archiver().submit(frame)
+    except Exception:
+        pass
 
 
+def clamp_xy(x: int, y: int, geometry: ModelGeometry | None = None) -> Tuple[int, int]:
+    geometry = geometry or _geometry()
+    return max(0, min(x, geometry.screen_w - 1)), max(0, min(y, geometry.screen_h - 1))
 
-def clamp_xy(x: int, y: int) -> Tuple[int, int]:
-    return max(0, min(x, SCREEN_W - 1)), max(0, min(y, SCREEN_H - 1))
 
+_CALIBRATOR: AffineCalibrator | None = None
+_CALIBRATION_KEY: str = ""
+_CALIBRATION_STORE: CalibrationStore | None = None
+# Persist every N accepted samples (plus at exit)
+_CALIBRATION_SAVE_EVERY = 8
 
-def _apply_calibration(x: int, y: int) -> Tuple[int, int]:
+
+def _calibration_store() -> CalibrationStore | None:
+    global _CALIBRATION_STORE
+    if COORD_CALIBRATION_FILE == "":
+        return None
+    if _CALIBRATION_STORE is None:
+        path = COORD_CALIBRATION_FILE or os.path.join(
+            _find_project_root(os.path.dirname(__file__)), ".pointer_calibration.json"
+        )
+        _CALIBRATION_STORE = CalibrationStore(path)
+        atexit.register(_save_calibration)
+    return _CALIBRATION_STORE
+
+
+def _save_calibration() -> None:
+    store = _CALIBRATION_STORE
+    if store is not None and _CALIBRATOR is not None and _CALIBRATOR.inliers:
+        store.save(_CALIBRATION_KEY, _CALIBRATOR.to_dict())
+
+
+def _get_calibrator(geometry: ModelGeometry) -> AffineCalibrator | None:
+    """Online pointer fit for the current screen size (saved fit loaded on first use / display change)."""
+    global _CALIBRATOR, _CALIBRATION_KEY
+    if not COORD_AUTO_CALIBRATION:
+        return None
+    key = f"{geometry.screen_w}x{geometry.screen_h}"
+    if _CALIBRATOR is None or key != _CALIBRATION_KEY:
+        if _CALIBRATOR is not None:
+            _save_calibration()
+        calibrator = AffineCalibrator(
+            min_samples=int(COORD_CALIBRATION_MIN_SAMPLES),
+            max_samples=int(COORD_CALIBRATION_MAX_SAMPLES),
+            outlier_px=float(COORD_CALIBRATION_OUTLIER_PX),
+            max_error_px=float(COORD_CALIBRATION_MAX_ERROR_PX),
+            min_spread_px=float(COORD_CALIBRATION_MIN_SPREAD_PX),
+            max_correction_px=float(COORD_CALIBRATION_MAX_CORRECTION_PX),
+        )
+        store = _calibration_store()
+        saved = store.load(key) if store is not None else None
+        if saved:
+            calibrator.load_dict(saved)
+        _CALIBRATOR, _CALIBRATION_KEY = calibrator, key
+    return _CALIBRATOR
+
+
+def _record_pointer_sample(commanded: Tuple[int, int], actual: Tuple[int, int]) -> None:
+    calibrator = _get_calibrator(_geometry())
+    if calibrator is None:
+        return
+    if calibrator.add_sample(commanded, actual) and len(calibrator.samples) % _CALIBRATION_SAVE_EVERY == 0:
+        _save_calibration()
+
+
+def _expected_landing(commanded: Tuple[int, int]) -> Tuple[int, int]:
+    """Where a converged fit says the cursor lands for this command (the command itself otherwise)."""
+    calibrator = _CALIBRATOR if COORD_AUTO_CALIBRATION else None
+    if calibrator is None:
+        return int(commanded[0]), int(commanded[1])
+    return calibrator.predict(commanded)
+
+
+def _read_pointer() -> Tuple[int, int] | None:
+    """Cursor position from the display server; None when the driver can only report its own tracking."""
+    mouse = _mouse()
+    if getattr(get_drivers().capabilities, "input_backend", "") == "xtest":
+        # XTestMouse.position() is the last injected target, so it always "lands"
+        query = getattr(mouse, "query_position", None)
+        return query() if callable(query) else None
+    return mouse.position()
+
+
+def _verify_pointer(x: int, y: int) -> None:
+    """Read the cursor after a move to (x, y): feed the online fit, re-issue the move if it missed."""
+    try:
+        pos = _read_pointer()
+    except Exception:
+        return
+    if pos is None:
+        return
+    ax, ay = pos
+    _record_pointer_sample((x, y), (int(ax), int(ay)))
+    ex, ey = _expected_landing((x, y))
+    if abs(ax - ex) > POST_MOVE_TOLERANCE_PX or abs(ay - ey) > POST_MOVE_TOLERANCE_PX:
+        _move_to(x, y, POST_MOVE_CORRECTION_DURATION, "linear")
+
+
+def _apply_calibration(x: int, y: int, geometry: ModelGeometry | None = None) -> Tuple[int, int]:
     try:
         cx = int(round(x * float(COORD_X_SCALE) + float(COORD_X_OFFSET)))
         cy = int(round(y * float(COORD_Y_SCALE) + float(COORD_Y_OFFSET)))
-        return cx, cy
     except Exception:
-        return x, y
+        cx, cy = x, y
+    try:
+        calibrator = _get_calibrator(geometry or _geometry())
+        if calibrator is not None:
+            return calibrator.command_for((cx, cy))
+    except Exception:
+        pass
+    return cx, cy
 
 
-def _to_screen_xy(x: int, y: int, *, coordinate_space: str | None = None) -> Tuple[int, int]:
+def _coordinate_space(coordinate_space: str | None, geometry: ModelGeometry, x: int, y: int) -> str:
+    """'screen' or 'model'; 'auto' treats coordinates beyond the model canvas as screen pixels."""
     try:
         space = (coordinate_space or "screen").lower()
     except Exception:
         space = "screen"
-    sx, sy = int(x), int(y)
     if space == "auto":
         try:
-            if int(sx) > int(MODEL_DISPLAY_W) or int(sy) > int(MODEL_DISPLAY_H):
+            if int(x) > int(geometry.model_w) or int(y) > int(geometry.model_h):
                 space = "screen"
             else:
                 space = "model"
         except Exception:
             space = "screen"
+    return space
+
+
+def _to_screen_xy(x: int, y: int, *, coordinate_space: str | None = None) -> Tuple[int, int]:
+    geometry = _geometry()
+    sx, sy = int(x), int(y)
+    space = _coordinate_space(coordinate_space, geometry, sx, sy)
     if space == "model":
-        try:
-            sx_adj = float(sx) - float(MODEL_LB_OFFSET_X)
-            sy_adj = float(sy) - float(MODEL_LB_OFFSET_Y)
-            sx_adj = max(0.0, min(sx_adj, float(MODEL_CONTENT_W) - 1.0))
-            sy_adj = max(0.0, min(sy_adj, float(MODEL_CONTENT_H) - 1.0))
-            sx = int(round(sx_adj * float(CONTENT_X_SCALE)))
-            sy = int(round(sy_adj * float(CONTENT_Y_SCALE)))
-        except Exception:
-            try:
-                sx = int(round(float(sx) * float(DYNAMIC_X_SCALE)))
-                sy = int(round(float(sy) * float(DYNAMIC_Y_SCALE)))
-            except Exception:
-                pass
-    sx, sy = _apply_calibration(sx, sy)
-    return clamp_xy(sx, sy)
+        viewport = _ACTIVE_VIEWPORT if _ACTIVE_VIEWPORT is not None else geometry.viewport
+        sx, sy = viewport.to_screen(sx, sy)
+    sx, sy = _apply_calibration(sx, sy, geometry)
+    return clamp_xy(sx, sy, geometry)
+
+
+def _region_to_screen(rect: Tuple[int, int, int, int], *, coordinate_space: str | None = None) -> Tuple[int, int, int, int]:
+    """(x, y, width, height) screen pixels of a model/screen rectangle, for capture.
+
+    Only the viewport mapping applies: COORD_* and the online fit correct where pointer
+    commands land, not where pixels are. Edges clamp to [0, screen size], so a region
+    ending on the right/bottom edge keeps its last pixel.
+    """
+    geometry = _geometry()
+    x1, y1, x2, y2 = (int(v) for v in rect)
+    if _coordinate_space(coordinate_space, geometry, max(x1, x2), max(y1, y2)) == "model":
+        viewport = _ACTIVE_VIEWPORT if _ACTIVE_VIEWPORT is not None else geometry.viewport
+        x1, y1, x2, y2 = viewport.region_to_screen(x1, y1, x2, y2)
+    sw_max, sh_max = int(geometry.screen_w), int(geometry.screen_h)
+    sx1, sx2 = sorted((max(0, min(x1, sw_max - 1)), max(0, min(x2, sw_max))))
+    sy1, sy2 = sorted((max(0, min(y1, sh_max - 1)), max(0, min(y2, sh_max))))
+    return sx1, sy1, max(1, sx2 - sx1), max(1, sy2 - sy1)
+
+
+def _to_screen_path(points: Any, *, coordinate_space: str | None = None) -> np.ndarray:
+    """_to_screen_xy for a whole path at once: (n, 2) int64 screen points from one geometry snapshot."""
+    geometry = _geometry()
+    pts = as_path(points)
+    if len(pts) == 0:
+        return pts.astype(np.int64)
+    space = _coordinate_space(coordinate_space, geometry, int(pts[:, 0].max()), int(pts[:, 1].max()))
+    if space == "model":
+        viewport = _ACTIVE_VIEWPORT if _ACTIVE_VIEWPORT is not None else geometry.viewport
+        pts = viewport.to_screen_array(pts).astype(np.float64)
+    try:
+        pts = np.rint(pts * (float(COORD_X_SCALE), float(COORD_Y_SCALE)) + (float(COORD_X_OFFSET), float(COORD_Y_OFFSET)))
+    except Exception:
+        pass
+    try:
+        calibrator = _get_calibrator(geometry)
+        if calibrator is not None and calibrator.converged:
+            pts = calibrator.command_for_array(pts)
+    except Exception:
+        pass
+    pts[:, 0] = np.clip(pts[:, 0], 0, geometry.screen_w - 1)
+    pts[:, 1] = np.clip(pts[:, 1], 0, geometry.screen_h - 1)
+    return pts.astype(np.int64)
 
 
 def parse_key_combo(combo: str) -> List[str]:
@@ -381,51 +917,144 @@ def _with_modifiers(mods: List[str], action_fn):
     mods = [m for m in mods if m]
     try:
         for m in mods:
-            pyautogui.keyDown(m)
+            _keyboard().key_down(m)
         return action_fn()
     finally:
         for m in reversed(mods):
             try:
-                pyautogui.keyUp(m)
+                _keyboard().key_up(m)
             except Exception:
                 pass
 
 
-def handle_computer_action(action: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+def _compound_steps(action: str, params: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any], float]]:
+    """Expand a compound action into (action, params, pause_after_s) steps."""
+    space = params.get("coordinate_space")
+    step_pause = max(0.0, float(COMPOUND_STEP_DELAY_MS) / 1000.0)
+    select_all = "command+a" if sys.platform == "darwin" else "ctrl+a"
+
+    def field(coord: Any, text: Any, clear: bool, submit: Any) -> List[Tuple[str, Dict[str, Any], float]]:
+        if not (isinstance(coord, (list, tuple)) and len(coord) == 2):
+            raise ValueError("needs coordinate [x, y]")
+        out = [("left_click", {"coordinate": list(coord), "coordinate_space": space}, step_pause)]
+        if clear:
+            out.append(("key", {"key": select_all}, 0.0))
+        if text:
+            out.append(("type", {"text": str(text)}, 0.0))
+        if isinstance(submit, str) and submit.strip():
+            out.append(("key", {"key": submit}, step_pause))
+        return out
+
+    if action == "click_and_type":
+        return field(params.get("coordinate"), params.get("text", ""), bool(params.get("clear")), params.get("submit_key"))
+    if action == "fill_form":
+        fields = params.get("fields")
+        if not isinstance(fields, list) or not fields:
+            raise ValueError("needs a non-empty 'fields' list")
+        steps: List[Tuple[str, Dict[str, Any], float]] = []
+        for n, f in enumerate(fields, 1):
+            if not isinstance(f, dict):
+                raise ValueError(f"field {n} must be an object")
+            try:
+                steps.extend(field(f.get("coordinate"), f.get("text", ""), bool(f.get("clear")), f.get("submit_key")))
+            except ValueError as e:
+                raise ValueError(f"field {n} {e}")
+        submit = params.get("submit_key")
+        if isinstance(submit, str) and submit.strip():
+            steps.append(("key", {"key": submit}, step_pause))
+        return steps
+    # key_sequence
+    keys = params.get("keys")
+    if not isinstance(keys, list) or not keys:
+        raise ValueError("needs a non-empty 'keys' list")
+    default_delay = max(0.0, float(params.get("delay_ms", 0) or 0) / 1000.0)
+    steps = []
+    for n, k in enumerate(keys, 1):
+        if isinstance(k, dict):
+            combo, delay = k.get("key"), k.get("delay_ms")
+            delay_s = default_delay if delay is None else max(0.0, float(delay) / 1000.0)
+        else:
+            combo, delay_s = k, default_delay
+        if not isinstance(combo, str) or not combo.strip():
+            raise ValueError(f"key {n} is empty")
+        steps.append(("key", {"key": combo}, delay_s if n < len(keys) else 0.0))
+    return steps
+
+
+def _run_compound(action: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Run a compound action's steps locally; one screenshot at the end (also after a failed step)."""
     logger = logging.getLogger(LOGGER_NAME)
+    try:
+        steps = _compound_steps(action, params)
+    except (ValueError, TypeError) as e:
+        return [{"type": "text", "text": f"error: {action} {e}"}]
+    cancel_token = params.get("_cancel_token")
+    done: List[str] = []
+    status = f"done: {action}"
+    for n, (step, step_params, pause) in enumerate(steps, 1):
+        if cancel_token is not None and getattr(cancel_token, "is_cancelled", False):
+            status = f"cancelled: {action} after {n - 1}/{len(steps)} steps"
+            break
+        res = handle_computer_action(step, step_params)
+        text = next((str(b.get("text", "")) for b in res if isinstance(b, dict) and b.get("type") == "text"), "ok")
+        if text.startswith("error:") or "skipped" in text:
+            logger.warning("%s step %d/%d (%s) failed: %s", action, n, len(steps), step, text)
+            status = f"error: {action} step {n}/{len(steps)} ({step}) failed: {text}"
+            break
+        done.append(text)
+        if pause > 0:
+            time.sleep(pause)
+    summary = status if not done else f"{status} [{'; '.join(done)}]"
+    return [{"type": "text", "text": summary}, b64_image_from_screenshot(dedupe=True)]
 
+
+def handle_computer_action(action: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
     if action == "screenshot":
-        return [b64_image_from_screenshot()]
+        return [b64_image_from_screenshot(dedupe=True)]
+    if action in COMPOUND_ACTIONS:
+        return _run_compound(action, params)
+    if action in ("zoom", "screenshot_region"):
+        region = _region_from_params({**params, "action": action})
+        if region is None:
+            return [{"type": "text", "text": f"error: {action} needs region [x1, y1, x2, y2] or x/y/width/height"}]
+        return zoom_image_blocks(region, coordinate_space=params.get("coordinate_space"))
+    try:
+        return _perform_action(action, params)
+    finally:
+        _note_input()
+
+
+def _perform_action(action: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    logger = logging.getLogger(LOGGER_NAME)
 
     if action == "mouse_move":
         x, y = params.get("coordinate", [0, 0])
         coord_space = params.get("coordinate_space")
         x, y = _to_screen_xy(int(x), int(y), coordinate_space=coord_space)
         tween_fn = _resolve_tween(params)
+        profile = _motion_profile(params)
         dur = _compute_duration_to(x, y, params, default=0.35, speed_pps=DEFAULT_MOVE_SPEED_PPS)
         try:
             try:
                 get_drivers().overlay.highlight(x, y, duration=PREMOVE_HIGHLIGHT_DEFAULT_DURATION)
             except Exception:
                 pass
-            pyautogui.moveTo(x, y, duration=dur, tween=tween_fn)
+            _move_to(x, y, dur, tween_fn, profile)
             try:
                 get_drivers().overlay.process_events()
             except Exception:
                 pass
             if POST_MOVE_VERIFY:
                 try:
-                    ax, ay = pyautogui.position()
-                    dx, dy = abs(ax - x), abs(ay - y)
-                    if dx > POST_MOVE_TOLERANCE_PX or dy > POST_MOVE_TOLERANCE_PX:
-                        pyautogui.moveTo(x, y, duration=max(0.0, POST_MOVE_CORRECTION_DURATION), tween=getattr(pyautogui, "linear", None))
+                    _verify_pointer(x, y)
                 except Exception:
                     pass
         except pyautogui.FailSafeException:
             logger.warning("PyAutoGUI fail-safe triggered during move; skipping move")
             return [{"type": "text", "text": "move skipped: fail-safe"}]
         if (os.environ.get("SCREENSHOT_AFTER_ACTIONS") == "1"):
-            return [b64_image_from_screenshot()]
+            _note_input()
+            return [b64_image_from_screenshot(dedupe=True)]
         return [{"type": "text", "text": "ok"}]
 
     if action in ("left_click", "double_click", "triple_click", "right_click", "middle_click"):
@@ -444,11 +1073,17 @@ def handle_computer_action(action: str, params: Dict[str, Any]) -> List[Dict[str
             coord_space = params.get("coordinate_space")
             x, y = _to_screen_xy(int(coord[0]), int(coord[1]), coordinate_space=coord_space)
             tween_fn = _resolve_tween(params)
+            profile = _motion_profile(params)
             dur = _compute_duration_to(x, y, params, default=0.30, speed_pps=DEFAULT_MOVE_SPEED_PPS)
-            pyautogui.moveTo(x, y, duration=dur, tween=tween_fn)
+            _move_to(x, y, dur, tween_fn, profile)
+            if POST_MOVE_VERIFY:
+                try:
+                    _verify_pointer(x, y)
+                except Exception:
+                    pass
             try:
                 def _do():
-                    pyautogui.click(x=x, y=y, clicks=clicks, button=button, interval=0.05)
+                    _mouse().click(button=button, clicks=clicks)
                 _with_modifiers(modifiers, _do)
             except pyautogui.FailSafeException:
                 logger.warning("PyAutoGUI fail-safe triggered during click; skipping click")
@@ -456,7 +1091,7 @@ def handle_computer_action(action: str, params: Dict[str, Any]) -> List[Dict[str
         else:
             try:
                 def _do():
-                    pyautogui.click(clicks=clicks, button=button, interval=0.05)
+                    _mouse().click(button=button, clicks=clicks)
                 _with_modifiers(modifiers, _do)
             except pyautogui.FailSafeException:
                 logger.warning("PyAutoGUI fail-safe triggered during click at current position; skipping click")
@@ -479,17 +1114,18 @@ def handle_computer_action(action: str, params: Dict[str, Any]) -> List[Dict[str
             coord_space = params.get("coordinate_space")
             x, y = _to_screen_xy(int(coord[0]), int(coord[1]), coordinate_space=coord_space)
             tween_fn = _resolve_tween(params)
+            profile = _motion_profile(params)
             dur = _compute_duration_to(x, y, params, default=0.30, speed_pps=DEFAULT_MOVE_SPEED_PPS)
             try:
-                pyautogui.moveTo(x, y, duration=dur, tween=tween_fn)
+                _move_to(x, y, dur, tween_fn, profile)
             except pyautogui.FailSafeException:
                 logger.warning("PyAutoGUI fail-safe triggered during move before mouse down/up; skipping move")
         try:
             def _do():
                 if action == "left_mouse_down":
-                    pyautogui.mouseDown(button="left")
+                    _mouse().down(button="left")
                 else:
-                    pyautogui.mouseUp(button="left")
+                    _mouse().up(button="left")
             _with_modifiers(modifiers, _do)
         except pyautogui.FailSafeException:
             logger.warning("PyAutoGUI fail-safe triggered during mouse down/up; skipping")
@@ -514,35 +1150,41 @@ def handle_computer_action(action: str, params: Dict[str, Any]) -> List[Dict[str
             raw_mods = [s.strip() for s in raw_mods.split("+") if s.strip()]
         modifiers = parse_key_combo("+".join(raw_mods)) if raw_mods else []
         tween_fn = _resolve_tween(params)
+        profile = _motion_profile(params)
         move_dur = _compute_duration_to(x1, y1, params, default=0.30, speed_pps=DEFAULT_MOVE_SPEED_PPS)
         try:
-            pyautogui.moveTo(x1, y1, duration=move_dur, tween=tween_fn)
+            mouse = _mouse()
+            _move_to(x1, y1, move_dur, tween_fn, profile)
             def _do_drag():
                 time.sleep(max(0.0, hold_before_ms / 1000.0))
-                pyautogui.mouseDown(button="left")
+                mouse.down(button="left")
                 if full_path and len(full_path) > 2:
-                    # Multi-point path: follow all intermediate points for smooth curves
-                    for pt in full_path[1:]:
-                        px, py = _to_screen_xy(int(pt[0]), int(pt[1]), coordinate_space=coord_space)
-                        # Use short duration for path segments — no MIN_MOVE_DURATION clamp
-                        dist = ((px - pyautogui.position()[0]) ** 2 + (py - pyautogui.position()[1]) ** 2) ** 0.5
-                        seg_dur = max(0.01, dist / float(DEFAULT_DRAG_SPEED_PPS))
-                        pyautogui.moveTo(px, py, duration=seg_dur, tween=tween_fn)
-                        if step_delay > 0:
-                            time.sleep(step_delay)
+                    # Multi-point path: transform, simplify and resample it as one array, then play it back
+                    path = _to_screen_path(full_path, coordinate_space=coord_space)
+                    path[0] = (x1, y1)
+                    path = simplify_path(path, float(params.get("simplify_px", DRAG_PATH_SIMPLIFY_PX)))
+                    if profile.instant:
+                        points, hz = np.rint(path[1:]).astype(np.int32), 0.0
+                    else:
+                        # step_delay used to be slept after every input point; spread the same total over the path
+                        dur = path_length(path) / float(DEFAULT_DRAG_SPEED_PPS * profile.speed_scale)
+                        dur += step_delay * (len(full_path) - 1)
+                        hz = float(DRAG_PATH_EVENT_HZ)
+                        points = resample_path(path, dur, hz)
+                    play(points, hz, lambda px, py: mouse.move_to(px, py))
                 elif steps <= 1:
                     drag_dur = _compute_duration_to(x2, y2, params, default=0.40, speed_pps=DEFAULT_DRAG_SPEED_PPS)
-                    pyautogui.moveTo(x2, y2, duration=drag_dur, tween=tween_fn)
+                    _move_to(x2, y2, drag_dur, tween_fn, profile)
                 else:
                     for i in range(1, steps + 1):
                         nx = int(round(x1 + (x2 - x1) * (i / float(steps))))
                         ny = int(round(y1 + (y2 - y1) * (i / float(steps))))
                         step_dur = _compute_duration_to(nx, ny, params, default=0.05, speed_pps=DEFAULT_DRAG_SPEED_PPS)
-                        pyautogui.moveTo(nx, ny, duration=step_dur, tween=tween_fn)
+                        _move_to(nx, ny, step_dur, tween_fn, profile)
                         if step_delay > 0:
                             time.sleep(step_delay)
                 time.sleep(max(0.0, hold_after_ms / 1000.0))
-                pyautogui.mouseUp(button="left")
+                mouse.up(button="left")
             _with_modifiers(modifiers, _do_drag)
         except pyautogui.FailSafeException:
             logger.warning("PyAutoGUI fail-safe triggered during drag; skipping drag")
@@ -550,47 +1192,44 @@ def handle_computer_action(action: str, params: Dict[str, Any]) -> List[Dict[str
         return [{"type": "text", "text": f"done: {action}"}]
 
     if action == "type":
-        text = params.get("text", "")
-        # Heuristics: prefer clipboard paste for non-ASCII or multiline/code to avoid editor auto-pair insertion
-        try:
-            has_non_ascii = any(ord(c) > 127 for c in text)
-        except Exception:
-            has_non_ascii = False
-        looks_multiline = "\n" in str(text)
-        looks_codey = any(tok in str(text) for tok in ("()", "{}", "[]", "'", '"', "=>", ": "))
-        prefer_paste = has_non_ascii or looks_multiline or looks_codey
-        if prefer_paste:
+        text = str(params.get("text", "") or "")
+        caps = get_drivers().capabilities
+        strategy = choose_text_strategy(
+            text,
+            mode=str(params.get("strategy") or TYPE_STRATEGY),
+            unicode_typing=bool(getattr(caps, "supports_unicode_typing", False)),
+            paste_min_chars=TYPE_PASTE_MIN_CHARS,
+        )
+        if strategy == PASTE:
             try:
-                import pyperclip  # type: ignore
-                from os_ai_core.config import (
-                    RESTORE_CLIPBOARD_AFTER_PASTE,
-                    PASTE_COPY_DELAY_SECONDS,
-                    PASTE_POST_DELAY_SECONDS,
-                )
-                try:
-                    prev_clip = pyperclip.paste()
-                except Exception:
-                    prev_clip = None
-                try:
-                    pyperclip.copy(text)
-                    time.sleep(PASTE_COPY_DELAY_SECONDS)
-                    # Use platform-appropriate modifier: command on macOS, ctrl on Windows/Linux
-                    modifier = "command" if sys.platform == "darwin" else "ctrl"
-                    pyautogui.hotkey(modifier, "v")
-                    time.sleep(PASTE_POST_DELAY_SECONDS)
-                finally:
-                    if RESTORE_CLIPBOARD_AFTER_PASTE and prev_clip is not None:
-                        try:
-                            pyperclip.copy(prev_clip)
-                        except Exception:
-                            pass
-                return [{"type": "text", "text": f"pasted {len(text)} chars via clipboard"}]
-            except Exception:
+                chunks, confirmed = _paste_text(text)
+                suffix = f" in {chunks} chunks" if chunks > 1 else ""
+                if not confirmed:
+                    suffix += " (unconfirmed: the target did not fetch the clipboard; check the text before retrying)"
+                return [{"type": "text", "text": f"pasted {len(text)} chars via clipboard{suffix}"}]
+            except PasteInterrupted as e:
+                # Part of the text is already in the target: report instead of typing it twice
+                logger.warning("Clipboard %s", e)
+                return [{"type": "text", "text": f"error: clipboard {e}"}]
+            except Exception as e:
                 # Fallback to typing if clipboard unavailable
-                pass
-        pyautogui.write(text, interval=0.02)
+                logger.debug("Clipboard paste failed, typing instead: %s", e)
+        wpm = XTEST_TYPE_WPM if getattr(caps, "input_backend", "") == "xtest" else TYPE_WPM
+        for chunk in split_chunks(text, TYPE_CHUNK_CHARS):
+            _keyboard().type_text(chunk, wpm=wpm)
         return [{"type": "text", "text": "done: type"}]
 
+    if action == "key" and isinstance(params.get("sequence"), list) and params["sequence"]:
+        # Several key presses merged by the batch optimiser: press them in order, stop at the first error
+        labels: List[str] = []
+        for combo in params["sequence"]:
+            res = handle_computer_action("key", {"key": combo})
+            text = str(res[0].get("text", "")) if res else ""
+            if text.startswith("error:"):
+                return res
+            labels.append(text[len("pressed: "):] if text.startswith("pressed: ") else text)
+        return [{"type": "text", "text": f"pressed: {', '.join(labels)}"}]
+
     if action in ("key", "hold_key"):
         combo = params.get("key") or params.get("keys") or params.get("combo") or ""
         derived_from_text = False
@@ -621,7 +1260,7 @@ def handle_computer_action(action: str, params: Dict[str, Any]) -> List[Dict[str
                     norm_keys = maybe_keys
                     derived_from_text = True
                 else:
-                    pyautogui.write(fallback_text, interval=0.02)
+                    _keyboard().type_text(fallback_text, wpm=TYPE_WPM)
                     return [{"type": "text", "text": f"typed: {len(fallback_text)} chars"}]
             # Only return error if norm_keys is still empty after fallback parsing
             if not norm_keys:
@@ -632,19 +1271,20 @@ def handle_computer_action(action: str, params: Dict[str, Any]) -> List[Dict[str
         if action == "hold_key":
             if len(norm_keys) < 2:
                 return [{"type": "text", "text": "error: hold_key needs modifiers+key"}]
+            keyboard = _keyboard()
             try:
                 for k in norm_keys[:-1]:
-                    pyautogui.keyDown(k)
-                pyautogui.press(norm_keys[-1])
+                    keyboard.key_down(k)
+                keyboard.press(norm_keys[-1])
             finally:
                 for k in reversed(norm_keys[:-1]):
-                    pyautogui.keyUp(k)
+                    keyboard.key_up(k)
         else:
             if len(norm_keys) == 1 and norm_keys[0] in ("enter", "return"):
                 press_enter_mac()
             else:
                 if len(norm_keys) == 1:
-                    pyautogui.press(norm_keys[0])
+                    _keyboard().press(norm_keys[0])
                 else:
                     # If keys were derived from textual tokens (e.g., "Return Return") and are identical
                     # non-modifier keys, press them sequentially instead of treating as a combo
@@ -656,10 +1296,10 @@ def handle_computer_action(action: str, params: Dict[str, Any]) -> List[Dict[str
                             if key in ("enter",):
                                 press_enter_mac()
                             else:
-                                pyautogui.press(key)
+                                _keyboard().press(key)
                         pressed_label = f"{key} x{count}"
                     else:
-                        pyautogui.hotkey(*norm_keys)
+                        _keyboard().press_combo(tuple(norm_keys))
         return [{"type": "text", "text": f"pressed: {pressed_label}"}]
 
     if action == "scroll":
@@ -670,27 +1310,22 @@ def handle_computer_action(action: str, params: Dict[str, Any]) -> List[Dict[str
             coord_space = params.get("coordinate_space")
             x, y = _to_screen_xy(int(coord[0]), int(coord[1]), coordinate_space=coord_space)
             tween_fn = _resolve_tween(params)
+            profile = _motion_profile(params)
             dur = _compute_duration_to(x, y, params, default=0.25, speed_pps=DEFAULT_MOVE_SPEED_PPS)
             try:
-                pyautogui.moveTo(x, y, duration=dur, tween=tween_fn)
+                _move_to(x, y, dur, tween_fn, profile)
             except pyautogui.FailSafeException:
                 return [{"type": "text", "text": "scroll skipped: fail-safe"}]
         if direction in ("down", "up"):
             clicks = -abs(amount) if direction == "down" else abs(amount)
             try:
-                pyautogui.scroll(clicks)
+                _mouse().scroll(dy=clicks)
             except pyautogui.FailSafeException:
                 return [{"type": "text", "text": "scroll skipped: fail-safe"}]
         elif direction in ("left", "right"):
             clicks = -abs(amount) if direction == "left" else abs(amount)
             try:
-                pyautogui.hscroll(clicks)
-            except AttributeError:
-                try:
-                    pyautogui.keyDown("shift")
-                    pyautogui.scroll(clicks)
-                finally:
-                    pyautogui.keyUp("shift")
+                _mouse().scroll(dx=clicks)
             except pyautogui.FailSafeException:
                 return [{"type": "text", "text": "hscroll skipped: fail-safe"}]
         return [{"type": "text", "text": "ok"}]
@@ -700,6 +1335,14 @@ def handle_computer_action(action: str, params: Dict[str, Any]) -> List[Dict[str
         time.sleep(sec)
         return [{"type": "text", "text": "ok"}]
 
+    if action == "wait_until_stable":
+        result = _wait_until_stable(params, timeout_s=SETTLE_TIMEOUT_S)
+        if not result.frames:
+            # Nothing to compare: behave like a plain wait of the full timeout
+            time.sleep(max(0.0, float(params.get("timeout", SETTLE_TIMEOUT_S)) - result.elapsed_s))
+        logger.debug("wait_until_stable: %s", result.describe())
+        return [{"type": "text", "text": result.describe()}]
+
     return [{"type": "text", "text": f"error: unknown action '{action}'"}]
 
 
@@ -707,7 +1350,10 @@ def computer_tool_handler_batch(args: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Handle computer actions — supports both single (Anthropic) and batch (OpenAI).
 
     If args contains _openai_batch=True (merged from ToolCall.metadata by registry):
-      Execute all _openai_actions sequentially, return single screenshot.
+      Run the peephole optimiser over _openai_actions (BATCH_OPTIMIZE_ENABLED), execute the
+      resulting steps sequentially and return a single screenshot (preceded by any
+      zoom/screenshot_region captures taken along the way). The screenshot block carries
+      per-original-action results in metadata["batch_results"].
     Otherwise:
       Delegate to single-action computer_tool_handler.
     """
@@ -716,28 +1362,60 @@ def computer_tool_handler_batch(args: Dict[str, Any]) -> List[Dict[str, Any]]:
 
     actions = args.get("_openai_actions", [])
     if not actions:
-        return [b64_image_from_screenshot()]
+        return [b64_image_from_screenshot(dedupe=True)]
 
     cancel_token = args.get("_cancel_token")
     logger = logging.getLogger(LOGGER_NAME)
-    for i, action_args in enumerate(actions):
-        # Check cancel before each action in batch
+    if BATCH_OPTIMIZE_ENABLED:
+        batch = optimize_batch(actions)
+    else:
+        batch = OptimizedBatch(
+            steps=[BatchStep(action=dict(a), sources=(i,)) for i, a in enumerate(actions) if a.get("action") != "screenshot"],
+            dropped={i: "skipped: screenshot" for i, a in enumerate(actions) if a.get("action") == "screenshot"},
+        )
+    if batch.fused or len(batch.steps) < len(actions):
+        logger.debug("Batch optimised: %d actions -> %d steps (%d fused)", len(actions), len(batch.steps), batch.fused)
+
+    results: Dict[int, str] = dict(batch.dropped)
+    zoom_blocks: List[Dict[str, Any]] = []
+    for n, step in enumerate(batch.steps):
+        # Check cancel before each step in batch
         if cancel_token is not None and cancel_token.is_cancelled:
-            logger.info("Batch cancelled at action %d/%d", i + 1, len(actions))
+            logger.info("Batch cancelled at step %d/%d", n + 1, len(batch.steps))
+            for rest in batch.steps[n:]:
+                results.update({i: "skipped: cancelled" for i in rest.sources})
             break
 
-        action_name = action_args.get("action", "")
-        if action_name == "screenshot":
-            continue
-
-        logger.debug("Batch action %d/%d: %s", i + 1, len(actions), action_name)
+        action_name = step.name
+        logger.debug("Batch step %d/%d: %s (actions %s)", n + 1, len(batch.steps), action_name, list(step.sources))
+        text = "ok"
         try:
-            result = handle_computer_action(action_name, {**action_args, "coordinate_space": "auto"})
-            for block in result:
-                if isinstance(block, dict) and block.get("text", "").startswith("error:"):
-                    logger.warning("Batch action %d failed: %s", i + 1, block.get("text"))
+            result = handle_computer_action(action_name, {**step.action, "coordinate_space": "auto"})
+            texts = [b.get("text", "") for b in result if isinstance(b, dict) and b.get("type") == "text"]
+            text = texts[0] if texts else "ok"
+            if text.startswith("error:"):
+                logger.warning("Batch step %d failed: %s", n + 1, text)
+            if action_name in ("zoom", "screenshot_region"):
+                zoom_blocks.extend(b for b in result if isinstance(b, dict) and not b.get("text", "").startswith("error:"))
         except Exception as e:
-            logger.warning("Batch action %d exception: %s", i + 1, e)
-
-    return [b64_image_from_screenshot()]
+            logger.warning("Batch step %d exception: %s", n + 1, e)
+            text = f"error: {e}"
+        results.update({i: text for i in step.sources})
 
+    # Only after a final step that usually animates: a trailing type/key press would just pay the sampling time
+    if BATCH_SETTLE_ENABLED and batch.steps and likely_changes_screen(batch.steps[-1].action):
+        if cancel_token is None or not cancel_token.is_cancelled:
+            try:
+                settled = _wait_until_stable({}, timeout_s=BATCH_SETTLE_TIMEOUT_S)
+                logger.debug("Batch settle: %s", settled.describe())
+            except Exception as e:
+                logger.debug("Batch settle failed: %s", e)
+
+    batch_results = [
+        {"action": str(a.get("action", "")), "text": results.get(i, "skipped")}
+        for i, a in enumerate(actions)
+    ]
+    # Final full-screen frame goes last: providers treat the last screenshot as the screen state
+    frame = dict(b64_image_from_screenshot(dedupe=True))
+    frame["metadata"] = {**(frame.get("metadata") or {}), "batch_results": batch_results}
+    return zoom_blocks + [frame]
@@ -8,10 +8,34 @@ from os_ai_llm.types import ToolCall, ToolResult, TextPart, ImagePart
 class ToolRegistry:
     def __init__(self) -> None:
         self._handlers: Dict[str, Callable[..., List[Dict[str, Any]]]] = {}
+        self._reset_hooks: List[Callable[[], None]] = []
+        self._prune_hooks: List[Callable[[], None]] = []
 
     def register(self, name: str, handler: Callable[..., List[Dict[str, Any]]]) -> None:
         self._handlers[name] = handler
 
+    def add_reset_hook(self, hook: Callable[[], None]) -> None:
+        """Register a callback that clears per-run tool state (called at the start of each run)."""
+        self._reset_hooks.append(hook)
+
+    def reset(self) -> None:
+        for hook in self._reset_hooks:
+            try:
+                hook()
+            except Exception:
+                pass
+
+    def add_prune_hook(self, hook: Callable[[], None]) -> None:
+        """Register a callback for when the newest image the model saw was removed from the history."""
+        self._prune_hooks.append(hook)
+
+    def history_pruned(self) -> None:
+        for hook in self._prune_hooks:
+            try:
+                hook()
+            except Exception:
+                pass
+
     def execute(self, call: ToolCall, cancel_token: Optional[Any] = None) -> ToolResult:
         handler = self._handlers.get(call.name)
         if not handler:
@@ -39,16 +63,20 @@ class ToolRegistry:
 
         # Normalize handler output (Anthropic-style content blocks) to ContentPart
         parts = []
+        metadata: Dict[str, Any] = {}
         for b in raw_blocks or []:
             btype = b.get("type") if isinstance(b, dict) else None
+            # Blocks may carry side information for the orchestrator (not sent to the model)
+            if btype is not None and isinstance(b.get("metadata"), dict):
+                metadata.update(b["metadata"])
             if btype == "text":
                 parts.append(TextPart(text=str(b.get("text", ""))))
             elif btype == "image":
                 src = (b.get("source") or {}) if isinstance(b.get("source"), dict) else {}
                 media = str(src.get("media_type", "image/png"))
                 data = str(src.get("data", ""))
-                parts.append(ImagePart(media_type=media, data_base64=data))
+                parts.append(ImagePart(media_type=media, data_base64=data, label=str(b.get("label") or "")))
             else:
                 parts.append(TextPart(text=str(b)))
 
-        return ToolResult(tool_call_id=call.id, content=parts, is_error=False)
+        return ToolResult(tool_call_id=call.id, content=parts, is_error=False, metadata=metadata)
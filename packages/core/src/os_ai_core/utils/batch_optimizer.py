@@ -0,0 +1,163 @@
+"""Peephole pass over an OpenAI computer_call batch (internal actions).
+
+The model often sends a move immediately followed by a click at the same
+point, text split across several `type` actions, one keypress per action and
+`screenshot`/`wait` filler. optimize_batch() rewrites the batch into fewer
+steps before execution:
+
+  mouse_move + click at the same point (or at the current position)  -> click
+  adjacent `type` actions                                              -> one type
+  adjacent `key` actions                                               -> one key sequence
+  adjacent waits / wait_until_stable with timeouts                     -> one wait (summed)
+  zero-second waits, screenshots                                       -> dropped
+  zero-amount scrolls                                                  -> mouse_move (or dropped)
+
+Every step records the indices of the original actions it covers, so results
+can still be reported per original action.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+CLICK_ACTIONS = ("left_click", "double_click", "triple_click", "right_click", "middle_click")
+# Actions after which the screen usually animates (menus, page loads, scrolling)
+SCREEN_CHANGING_ACTIONS = CLICK_ACTIONS + ("scroll", "left_click_drag", "drag", "left_mouse_up")
+# Keys that submit or dismiss something
+SUBMIT_KEYS = ("enter", "return", "kp_enter", "escape", "esc")
+
+
+@dataclass
+class BatchStep:
+    action: Dict[str, Any]
+    # Indices of the original actions this step executes
+    sources: Tuple[int, ...]
+
+    @property
+    def name(self) -> str:
+        return str(self.action.get("action", ""))
+
+
+@dataclass
+class OptimizedBatch:
+    steps: List[BatchStep] = field(default_factory=list)
+    # Original index -> reason, for actions that need no execution
+    dropped: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def fused(self) -> int:
+        """How many original actions were folded into another step."""
+        return sum(len(s.sources) - 1 for s in self.steps)
+
+
+def _key_combos(action: Dict[str, Any]) -> Optional[List[str]]:
+    """Combos of a plain `key` action (None when it uses text fallbacks or modifiers we should not merge)."""
+    if action.get("action") != "key" or action.get("text") or action.get("character"):
+        return None
+    seq = action.get("sequence")
+    if isinstance(seq, list) and seq and all(isinstance(c, str) and c.strip() for c in seq):
+        return list(seq)
+    combo = action.get("key")
+    if isinstance(combo, str) and combo.strip() and not action.get("keys") and not action.get("combo"):
+        return [combo]
+    return None
+
+
+def likely_changes_screen(action: Dict[str, Any]) -> bool:
+    """True for clicks, scrolls, drags and submit keys (Enter/Escape, alone or in a combo)."""
+    name = action.get("action", "")
+    if name in SCREEN_CHANGING_ACTIONS:
+        return True
+    if name != "key":
+        return False
+    keys: List[Any] = []
+    for field_name in ("key", "keys", "combo", "sequence"):
+        value = action.get(field_name)
+        keys.extend(value if isinstance(value, list) else [value])
+    for combo in keys:
+        if isinstance(combo, str):
+            parts = combo.replace("-", "+").lower().split("+")
+            if any(p.strip() in SUBMIT_KEYS for p in parts):
+                return True
+    return False
+
+
+def _seconds(action: Dict[str, Any]) -> float:
+    try:
+        return float(action.get("seconds", 0.2))
+    except (TypeError, ValueError):
+        return 0.2
+
+
+def _scroll_amount(action: Dict[str, Any]) -> int:
+    try:
+        return int(action.get("scroll_amount", 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+def optimize_batch(actions: List[Dict[str, Any]]) -> OptimizedBatch:
+    out = OptimizedBatch()
+    for i, raw in enumerate(actions):
+        action = dict(raw) if isinstance(raw, dict) else {"action": ""}
+        name = action.get("action", "")
+        prev = out.steps[-1] if out.steps else None
+
+        if name == "screenshot":
+            out.dropped[i] = "skipped: screenshot"
+            continue
+
+        if name == "wait":
+            secs = _seconds(action)
+            if secs <= 0:
+                out.dropped[i] = "skipped: zero wait"
+                continue
+            if prev is not None and prev.name == "wait":
+                prev.action["seconds"] = _seconds(prev.action) + secs
+                prev.sources += (i,)
+                continue
+
+        if name == "wait_until_stable" and prev is not None and prev.name == "wait_until_stable":
+            # A second settle wait right after the first only extends the time budget
+            same = {k: v for k, v in action.items() if k != "timeout"} == {k: v for k, v in prev.action.items() if k != "timeout"}
+            if same and "timeout" in action and "timeout" in prev.action:
+                try:
+                    prev.action["timeout"] = float(prev.action["timeout"]) + float(action["timeout"])
+                    prev.sources += (i,)
+                    continue
+                except (TypeError, ValueError):
+                    pass
+
+        if name == "scroll" and _scroll_amount(action) == 0:
+            if not action.get("coordinate"):
+                out.dropped[i] = "skipped: zero scroll"
+                continue
+            # Only the pointer move is left; it may still fuse with a following click
+            action = {"action": "mouse_move", "coordinate": action["coordinate"]}
+            name = "mouse_move"
+
+        if name in CLICK_ACTIONS and prev is not None and prev.name == "mouse_move":
+            target = prev.action.get("coordinate")
+            coord = action.get("coordinate")
+            if target and (not coord or list(coord) == list(target)):
+                action["coordinate"] = target
+                prev.action = action
+                prev.sources += (i,)
+                continue
+
+        if name == "type" and prev is not None and prev.name == "type" and isinstance(action.get("text"), str):
+            if isinstance(prev.action.get("text"), str):
+                prev.action["text"] += action["text"]
+                prev.sources += (i,)
+                continue
+
+        combos = _key_combos(action)
+        if combos is not None and prev is not None:
+            prev_combos = _key_combos(prev.action)
+            if prev_combos is not None:
+                prev.action = {"action": "key", "sequence": prev_combos + combos}
+                prev.sources += (i,)
+                continue
+
+        out.steps.append(BatchStep(action=action, sources=(i,)))
+    return out
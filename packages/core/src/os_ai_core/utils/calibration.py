@@ -0,0 +1,299 @@
+"""Online pointer calibration from post-move verification samples.
+
+Every verified move yields a (commanded, actual) cursor pair. The calibrator fits
+actual = A @ commanded + t (2x3 affine, least squares) over a sliding window,
+drops samples whose residual is far above the rest, and once the fit is good
+enough inverts it so that commanding `command_for(target)` lands on `target`.
+That removes the corrective second move the verifier would otherwise issue on
+every action with a systematic offset or scale error.
+
+A full affine is only fitted when the commanded points spread at least
+`min_spread_px` in every direction; samples bunched on one row or column
+(repeated toolbar clicks) fit scale and offset only along the axes they cover,
+translation on the others. Corrections are capped at `max_correction_px`, so
+even a bad saved fit cannot send the pointer far from the target.
+
+Fits are stored per display geometry (e.g. "2560x1440") in a small JSON file.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from os_ai_core.config import LOGGER_NAME
+
+_log = logging.getLogger(LOGGER_NAME)
+
+IDENTITY: Tuple[float, ...] = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+# Commanded points must spread at least this much (std, px) along an axis to fit its scale
+MIN_SPREAD_PX = 32.0
+
+_Sample = Tuple[Tuple[float, float], Tuple[float, float]]
+
+
+def _solve3(m: List[List[float]], v: List[float]) -> Optional[List[float]]:
+    """Solve a 3x3 linear system (Cramer's rule); None when singular."""
+    def det(a: List[List[float]]) -> float:
+        return (
+            a[0][0] * (a[1][1] * a[2][2] - a[1][2] * a[2][1])
+            - a[0][1] * (a[1][0] * a[2][2] - a[1][2] * a[2][0])
+            + a[0][2] * (a[1][0] * a[2][1] - a[1][1] * a[2][0])
+        )
+
+    d = det(m)
+    if abs(d) < 1e-9:
+        return None
+    out = []
+    for col in range(3):
+        mc = [row[:] for row in m]
+        for r in range(3):
+            mc[r][col] = v[r]
+        out.append(det(mc) / d)
+    return out
+
+
+def spread(samples: Sequence[_Sample]) -> Tuple[float, float, float]:
+    """Standard deviation of the commanded points along x, y and their narrowest direction."""
+    n = len(samples)
+    if n == 0:
+        return 0.0, 0.0, 0.0
+    mx = sum(x for (x, _), _ in samples) / n
+    my = sum(y for (_, y), _ in samples) / n
+    cxx = sum((x - mx) ** 2 for (x, _), _ in samples) / n
+    cyy = sum((y - my) ** 2 for (_, y), _ in samples) / n
+    cxy = sum((x - mx) * (y - my) for (x, y), _ in samples) / n
+    # Smaller eigenvalue of the 2x2 covariance
+    narrow = (cxx + cyy) / 2.0 - (((cxx - cyy) / 2.0) ** 2 + cxy * cxy) ** 0.5
+    return cxx ** 0.5, cyy ** 0.5, max(0.0, narrow) ** 0.5
+
+
+def _fit_axis(pairs: List[Tuple[float, float]], scaled: bool) -> Tuple[float, float]:
+    """(scale, offset) with actual = scale * commanded + offset on one axis; scale 1 when not `scaled`."""
+    n = len(pairs)
+    mc = sum(c for c, _ in pairs) / n
+    ma = sum(a for _, a in pairs) / n
+    if scaled:
+        var = sum((c - mc) ** 2 for c, _ in pairs)
+        if var > 0:
+            scale = sum((c - mc) * (a - ma) for c, a in pairs) / var
+            return scale, ma - scale * mc
+    return 1.0, ma - mc
+
+
+def fit_affine(samples: Sequence[_Sample], min_spread: float = MIN_SPREAD_PX) -> Tuple[float, ...]:
+    """Least-squares (a, b, c, d, e, f) with actual = (a*x + b*y + c, d*x + e*y + f).
+
+    The full affine needs a spread of `min_spread` px in every direction. Otherwise each
+    axis gets its own scale when its points spread enough, or a pure translation.
+    """
+    n = len(samples)
+    if n == 0:
+        return IDENTITY
+    sd_x, sd_y, narrow = spread(samples)
+    if n < 3 or narrow < max(min_spread, 1e-6):
+        a, c = _fit_axis([(x, u) for (x, _), (u, _) in samples], sd_x >= min_spread and n >= 2)
+        e, f = _fit_axis([(y, v) for (_, y), (_, v) in samples], sd_y >= min_spread and n >= 2)
+        return (a, 0.0, c, 0.0, e, f)
+    sxx = sxy = syy = sx = sy = 0.0
+    sux = suy = su = svx = svy = sv = 0.0
+    for (x, y), (u, v) in samples:
+        sxx += x * x
+        sxy += x * y
+        syy += y * y
+        sx += x
+        sy += y
+        sux += u * x
+        suy += u * y
+        su += u
+        svx += v * x
+        svy += v * y
+        sv += v
+    normal = [[sxx, sxy, sx], [sxy, syy, sy], [sx, sy, float(n)]]
+    row_u = _solve3(normal, [sux, suy, su])
+    row_v = _solve3(normal, [svx, svy, sv])
+    if row_u is None or row_v is None:
+        return (1.0, 0.0, (su - sx) / n, 0.0, 1.0, (sv - sy) / n)
+    return (row_u[0], row_u[1], row_u[2], row_v[0], row_v[1], row_v[2])
+
+
+def apply_affine(params: Sequence[float], x: float, y: float) -> Tuple[float, float]:
+    a, b, c, d, e, f = params
+    return a * x + b * y + c, d * x + e * y + f
+
+
+def invert_affine(params: Sequence[float], u: float, v: float) -> Optional[Tuple[float, float]]:
+    a, b, c, d, e, f = params
+    det = a * e - b * d
+    if abs(det) < 1e-9:
+        return None
+    du, dv = u - c, v - f
+    return (e * du - b * dv) / det, (a * dv - d * du) / det
+
+
+class AffineCalibrator:
+    def __init__(
+        self,
+        *,
+        min_samples: int = 6,
+        max_samples: int = 64,
+        outlier_px: float = 25.0,
+        max_error_px: float = 1.5,
+        min_spread_px: float = MIN_SPREAD_PX,
+        max_correction_px: Optional[float] = None,
+    ) -> None:
+        self.min_samples = max(3, int(min_samples))
+        self.max_samples = max(self.min_samples, int(max_samples))
+        self.outlier_px = max(1.0, float(outlier_px))
+        self.max_error_px = max(0.1, float(max_error_px))
+        self.min_spread_px = max(0.0, float(min_spread_px))
+        # Samples further off than outlier_px * 4 are never accepted, so neither are larger corrections
+        self.max_correction_px = float(max_correction_px) if max_correction_px is not None else self.outlier_px * 4
+        self.samples: Deque[Tuple[Tuple[float, float], Tuple[float, float]]] = deque(maxlen=self.max_samples)
+        self.params: Tuple[float, ...] = IDENTITY
+        self.rms_px = 0.0
+        self.inliers = 0
+        self.converged = False
+        self._lock = threading.Lock()
+
+    def add_sample(self, commanded: Tuple[float, float], actual: Tuple[float, float]) -> bool:
+        """Record one verified move; returns True when the fit was updated."""
+        cx, cy = float(commanded[0]), float(commanded[1])
+        ax, ay = float(actual[0]), float(actual[1])
+        # A cursor far from where it was sent was moved by the user (or hit a screen edge)
+        if abs(ax - cx) > self.outlier_px * 4 or abs(ay - cy) > self.outlier_px * 4:
+            return False
+        with self._lock:
+            self.samples.append(((cx, cy), (ax, ay)))
+            if len(self.samples) < self.min_samples:
+                return False
+            self._refit()
+        return True
+
+    def _refit(self) -> None:
+        inliers = list(self.samples)
+        params = fit_affine(inliers, self.min_spread_px)
+        residuals = [self._residual(params, s) for s in inliers]
+        # Trim the worst sample while the fit is poor, keeping at least 60% of the window:
+        # a handful of user-nudged moves cannot outvote the systematic error
+        keep = max(self.min_samples, int(len(inliers) * 0.6 + 0.999))
+        while len(inliers) > keep:
+            rms = (sum(r * r for r in residuals) / len(residuals)) ** 0.5
+            worst = max(range(len(residuals)), key=residuals.__getitem__)
+            if rms <= self.max_error_px or residuals[worst] <= 2.0 * self.max_error_px:
+                break
+            del inliers[worst]
+            params = fit_affine(inliers, self.min_spread_px)
+            residuals = [self._residual(params, s) for s in inliers]
+        rms = (sum(r * r for r in residuals) / max(1, len(residuals))) ** 0.5
+        self.params = params
+        self.rms_px = rms
+        self.inliers = len(inliers)
+        was = self.converged
+        self.converged = rms <= self.max_error_px and invert_affine(params, 0.0, 0.0) is not None
+        if self.converged and not was:
+            _log.info("Pointer calibration converged: %s (rms %.2fpx, %d samples)", _fmt(params), rms, len(inliers))
+
+    @staticmethod
+    def _residual(params: Sequence[float], sample: Tuple[Tuple[float, float], Tuple[float, float]]) -> float:
+        (x, y), (u, v) = sample
+        px, py = apply_affine(params, x, y)
+        return ((px - u) ** 2 + (py - v) ** 2) ** 0.5
+
+    def _capped(self, origin: Tuple[float, float], point: Tuple[float, float]) -> Tuple[int, int]:
+        """`point`, moved back towards `origin` so that it is at most max_correction_px away."""
+        dx, dy = point[0] - origin[0], point[1] - origin[1]
+        dist = (dx * dx + dy * dy) ** 0.5
+        if dist > self.max_correction_px:
+            k = self.max_correction_px / dist
+            dx, dy = dx * k, dy * k
+        return int(round(origin[0] + dx)), int(round(origin[1] + dy))
+
+    def predict(self, commanded: Tuple[float, float]) -> Tuple[int, int]:
+        """Where the cursor is expected to land for a command (the command itself until converged)."""
+        if not self.converged:
+            return int(commanded[0]), int(commanded[1])
+        return self._capped(commanded, apply_affine(self.params, commanded[0], commanded[1]))
+
+    def command_for(self, target: Tuple[float, float]) -> Tuple[int, int]:
+        """Command that lands on `target` under the current fit (the target itself until converged)."""
+        if not self.converged:
+            return int(round(target[0])), int(round(target[1]))
+        inv = invert_affine(self.params, float(target[0]), float(target[1]))
+        if inv is None:
+            return int(round(target[0])), int(round(target[1]))
+        return self._capped(target, inv)
+
+    def command_for_array(self, targets: np.ndarray) -> np.ndarray:
+        """command_for() for an (n, 2) array of targets (drag paths); float64, rounded, same cap."""
+        pts = np.asarray(targets, dtype=np.float64).reshape(-1, 2)
+        if not self.converged or len(pts) == 0:
+            return np.rint(pts)
+        inv = invert_affine(self.params, pts[:, 0], pts[:, 1])
+        if inv is None:
+            return np.rint(pts)
+        delta = np.column_stack(inv) - pts
+        dist = np.hypot(delta[:, 0], delta[:, 1])
+        scale = np.minimum(1.0, self.max_correction_px / np.maximum(dist, 1e-12))
+        return np.rint(pts + delta * scale[:, None])
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"params": list(self.params), "rms_px": self.rms_px, "samples": self.inliers}
+
+    def load_dict(self, data: Dict[str, object]) -> None:
+        try:
+            params = tuple(float(v) for v in data.get("params", ()))  # type: ignore[union-attr]
+        except Exception:
+            return
+        if len(params) != 6 or invert_affine(params, 0.0, 0.0) is None:
+            return
+        self.params = params
+        self.rms_px = float(data.get("rms_px", 0.0) or 0.0)  # type: ignore[arg-type]
+        self.inliers = int(data.get("samples", 0) or 0)  # type: ignore[arg-type]
+        self.converged = self.rms_px <= self.max_error_px
+
+
+def _fmt(params: Sequence[float]) -> str:
+    a, b, c, d, e, f = params
+    return f"x'={a:.4f}x{b:+.4f}y{c:+.1f} y'={d:+.4f}x{e:.4f}y{f:+.1f}"
+
+
+class CalibrationStore:
+    """JSON file mapping a display-geometry key to a saved fit."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> Optional[Dict[str, object]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            entry = data.get(key)
+            return entry if isinstance(entry, dict) else None
+        except Exception:
+            return None
+
+    def save(self, key: str, entry: Dict[str, object]) -> None:
+        with self._lock:
+            try:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as fh:
+                        data = json.load(fh)
+                    if not isinstance(data, dict):
+                        data = {}
+                except Exception:
+                    data = {}
+                data[key] = entry
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp = self.path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as fh:
+                    json.dump(data, fh, indent=2, sort_keys=True)
+                os.replace(tmp, self.path)
+            except Exception as e:
+                _log.debug("Could not save pointer calibration: %s", e)
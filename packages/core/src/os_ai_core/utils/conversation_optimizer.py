@@ -1,12 +1,43 @@
+"""History compaction for long runs.
+
+Every turn resends the history, so without compaction each step costs more
+than the one before. ConversationOptimizer sends a bounded window instead:
+
+  pinned    initial messages and the task, always sent
+  summary   rolling summary of the turns that left the window, appended to `system`
+  tail      the newest turns, verbatim
+
+Compaction runs when more than `max_messages` follow the task (or every
+`interval` calls) and cuts back to about `keep_messages`, so the prompt prefix
+(and the provider's prompt cache) stays the same between compactions. Only the
+newly dropped turns go to the summarizer. The tail always starts at an
+assistant message: tool results directly follow the assistant message with
+their tool_use, so no tool_use/tool_result pair is split and the roles still
+alternate after the task.
+
+The history itself is never modified; summarize_history() returns the
+messages to send.
+"""
 from __future__ import annotations
 
-from typing import List, Dict, Any, Tuple
+import logging
+from typing import List, Optional, Tuple
+
+from os_ai_llm.interfaces import LLMClient
+from os_ai_llm.types import Message
 
 from os_ai_core.config import (
     SIMPLE_STEP_MAX_TOKENS,
+    HISTORY_COMPACTION_ENABLED,
     HISTORY_MAX_MESSAGES,
-    HISTORY_SUMMARY_MAX_CHARS,
+    HISTORY_KEEP_MESSAGES,
+    HISTORY_SUMMARY_INTERVAL,
+    HISTORY_SUMMARIZER,
+    LOGGER_NAME,
 )
+from os_ai_core.utils.summarizers.base import Summarizer, TextSummarizer
+
+SUMMARY_HEADER = "Summary of earlier steps (older messages were removed from the conversation):"
 
 
 SIMPLE_ACTIONS = {
@@ -24,8 +55,29 @@ SIMPLE_ACTIONS = {
 
 
 class ConversationOptimizer:
-    def __init__(self):
-        self.summary: str | None = None
+    def __init__(
+        self,
+        summarizer: Optional[Summarizer] = None,
+        *,
+        max_messages: int = HISTORY_MAX_MESSAGES,
+        keep_messages: int = HISTORY_KEEP_MESSAGES,
+        interval: int = HISTORY_SUMMARY_INTERVAL,
+    ) -> None:
+        self.summarizer = summarizer if summarizer is not None else TextSummarizer()
+        self.max_messages = max(2, int(max_messages))
+        self.keep_messages = max(1, min(int(keep_messages), self.max_messages))
+        self.interval = max(0, int(interval))
+        self.reset()
+
+    def reset(self, pinned: int = 0) -> None:
+        """Start a new run; the first `pinned` messages (initial messages and the task) are always sent."""
+        self.summary: Optional[str] = None
+        self._pinned = max(0, int(pinned))
+        # First message of the tail; everything between the pinned messages and it is in the summary
+        self._start = self._pinned
+        self._calls = 0
+        # Messages folded by the last summarize_history() call
+        self.last_folded = 0
 
     def choose_max_tokens(self, pending_tool_action: str | None) -> int | None:
         """Если шаг простой — ограничить max_tokens для экономии.
@@ -36,41 +88,55 @@ class ConversationOptimizer:
             return int(SIMPLE_STEP_MAX_TOKENS)
         return None
 
-    def summarize_history(self, messages: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], str | None]:
-        """Оставляет только последние HISTORY_MAX_MESSAGES сообщений.
-        Старшие сообщения сворачивает в текстовую сводку (короткая), которую можно подмешать в system.
-        """
-        if len(messages) <= HISTORY_MAX_MESSAGES:
-            return messages, None
-
-        head = messages[:-HISTORY_MAX_MESSAGES]
-        tail = messages[-HISTORY_MAX_MESSAGES:]
-
-        # Грубая текстовая сводка из head (без картинок/больших блоков)
-        parts: List[str] = []
-        for m in head:
-            role = m.get("role", "user")
-            content = m.get("content")
-            if isinstance(content, str):
-                parts.append(f"[{role}] {content}")
-            elif isinstance(content, list):
-                # собрать короткий текст
-                texts: List[str] = []
-                for c in content:
-                    try:
-                        if isinstance(c, dict):
-                            t = c.get("text")
-                            if isinstance(t, str) and t.strip():
-                                texts.append(t.strip())
-                    except Exception:
-                        pass
-                if texts:
-                    parts.append(f"[{role}] " + " | ".join(texts))
-
-        summary_text = "\n".join(parts)
-        if len(summary_text) > HISTORY_SUMMARY_MAX_CHARS:
-            summary_text = summary_text[:HISTORY_SUMMARY_MAX_CHARS] + "…"
-        self.summary = summary_text if summary_text else None
-        return tail, self.summary
+    def _due(self, messages: List[Message]) -> bool:
+        turns = len(messages) - self._start
+        if turns > self.max_messages:
+            return True
+        return bool(self.interval) and self._calls >= self.interval and turns > self.keep_messages
+
+    def _cut(self, messages: List[Message]) -> int:
+        """Start of a tail of at least `keep_messages` that begins at an assistant message (self._start if none)."""
+        i = len(messages) - self.keep_messages
+        while i > self._start and messages[i].role != "assistant":
+            i -= 1
+        return i if i > self._start else self._start
+
+    def summarize_history(self, messages: List[Message]) -> Tuple[List[Message], Optional[str]]:
+        """Messages to send (pinned + tail) and the summary of everything in between."""
+        self._calls += 1
+        self.last_folded = 0
+        if self._start > len(messages):
+            # A different history than the one this run started with
+            self.reset(min(self._pinned, len(messages)))
+        if self._due(messages):
+            cut = self._cut(messages)
+            if cut > self._start:
+                self.summary = self.summarizer.summarize(self.summary, messages[self._start:cut])
+                self.last_folded = cut - self._start
+                self._start = cut
+                self._calls = 0
+        if self._start == self._pinned:
+            return messages, self.summary
+        return messages[: self._pinned] + messages[self._start:], self.summary
 
+    def system_prompt(self, system: Optional[str]) -> Optional[str]:
+        """`system` with the rolling summary appended."""
+        if not self.summary:
+            return system
+        block = f"{SUMMARY_HEADER}\n{self.summary}"
+        return f"{system}\n\n{block}" if system else block
+
+
+def default_conversation_optimizer(client: Optional[LLMClient] = None) -> Optional[ConversationOptimizer]:
+    """Optimizer from config; None when compaction is disabled."""
+    if not HISTORY_COMPACTION_ENABLED:
+        return None
+    summarizer: Optional[Summarizer] = None
+    if str(HISTORY_SUMMARIZER).lower() == "llm" and client is not None:
+        try:
+            from os_ai_core.utils.summarizers.llm_summarizer import LLMSummarizer
 
+            summarizer = LLMSummarizer.for_client(client)
+        except Exception as e:
+            logging.getLogger(LOGGER_NAME).warning("LLM history summarizer unavailable, using the text summary: %s", e)
+    return ConversationOptimizer(summarizer)
@@ -6,6 +6,8 @@ from os_ai_core.config import (
     LONG_CONTEXT_INPUT_TOKENS_THRESHOLD,
     COST_INPUT_PER_MTOKENS_USD_LONG_CONTEXT,
     COST_OUTPUT_PER_MTOKENS_USD_LONG_CONTEXT,
+    COST_CACHE_WRITE_MULTIPLIER,
+    COST_CACHE_READ_MULTIPLIER,
 )
 
 
@@ -59,9 +61,22 @@ def get_rates_for_model(model: str, input_tokens: int = 0) -> Tuple[float, float
     )
 
 
-def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> Tuple[float, float, float, str]:
-    """Estimate API cost in USD. Returns (input_cost, output_cost, total_cost, pricing_tier)."""
-    in_rate, out_rate, tier = get_rates_for_model(model, input_tokens)
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_creation_tokens: int = 0,
+    cache_read_tokens: int = 0,
+) -> Tuple[float, float, float, str]:
+    """Estimate API cost in USD. Returns (input_cost, output_cost, total_cost, pricing_tier).
+
+    Prompt-cache writes/reads are billed at a multiple of the input rate and
+    are included in input_cost; the tier is chosen on the full prompt size.
+    """
+    prompt_tokens = int(input_tokens) + int(cache_creation_tokens) + int(cache_read_tokens)
+    in_rate, out_rate, tier = get_rates_for_model(model, prompt_tokens)
     input_cost = (float(input_tokens) / 1_000_000.0) * in_rate
+    input_cost += (float(cache_creation_tokens) / 1_000_000.0) * in_rate * float(COST_CACHE_WRITE_MULTIPLIER)
+    input_cost += (float(cache_read_tokens) / 1_000_000.0) * in_rate * float(COST_CACHE_READ_MULTIPLIER)
     output_cost = (float(output_tokens) / 1_000_000.0) * out_rate
     return input_cost, output_cost, (input_cost + output_cost), tier
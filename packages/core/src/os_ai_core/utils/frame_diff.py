@@ -0,0 +1,74 @@
+"""Detect screenshots that are effectively identical to the last one sent to the model.
+
+Frames are reduced to a small grayscale grid (box filter) and compared cell by cell;
+a cell counts as changed when its mean brightness moved by more than the pixel
+tolerance. This ignores JPEG/cursor-blink noise but still catches a single typed
+character, which shifts the mean of its cell by far more than the tolerance.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional
+
+
+class FrameDiffTracker:
+    def __init__(
+        self,
+        *,
+        grid_width: int = 96,
+        pixel_tolerance: int = 8,
+        max_changed_fraction: float = 0.0,
+    ) -> None:
+        self.grid_width = max(8, int(grid_width))
+        self.pixel_tolerance = max(0, int(pixel_tolerance))
+        self.max_changed_fraction = max(0.0, float(max_changed_fraction))
+        self.active = False
+        self.step = 0
+        self.last_sent_step = 0
+        self._reference: Any = None
+
+    def start_session(self) -> None:
+        """Begin a new conversation: nothing has been sent to the model yet."""
+        self.active = True
+        self.step = 0
+        self.last_sent_step = 0
+        self._reference = None
+
+    def forget(self) -> None:
+        """Drop the reference frame so the next screenshot is always sent in full."""
+        self._reference = None
+
+    def signature(self, img: Any) -> Any:
+        from PIL import Image  # type: ignore
+
+        w = min(self.grid_width, max(1, int(img.width)))
+        h = max(1, int(round(img.height * w / float(max(1, img.width)))))
+        return img.convert("L").resize((w, h), resample=getattr(Image, "BOX", Image.BILINEAR))
+
+    def changed_fraction(self, a: Any, b: Any) -> float:
+        from PIL import ImageChops  # type: ignore
+
+        if a.size != b.size:
+            return 1.0
+        diff = ImageChops.difference(a, b)
+        tol = self.pixel_tolerance
+        changed = diff.point(lambda v: 255 if v > tol else 0).histogram()[255]
+        return changed / float(a.width * a.height)
+
+    def observe(self, img: Any) -> Optional[int]:
+        """Register a frame about to be sent.
+
+        Returns the step of the last frame sent when this one is effectively identical
+        (caller should send a compact note instead), or None when it must be sent.
+        """
+        self.step += 1
+        if not self.active:
+            return None
+        try:
+            sig = self.signature(img)
+        except Exception:
+            return None
+        if self._reference is not None and self.changed_fraction(sig, self._reference) <= self.max_changed_fraction:
+            return self.last_sent_step
+        self._reference = sig
+        self.last_sent_step = self.step
+        return None
@@ -0,0 +1,267 @@
+"""Encoded screenshot frames.
+
+A frame is encoded exactly once; the resulting bytes are shared by the on-disk
+archive, the base64 payload sent to the model and the UI screenshot event.
+The AUTO format picks palette PNG, lossless WebP or JPEG per frame from cheap
+statistics of a downsampled copy (colour count, edge density).
+"""
+from __future__ import annotations
+
+import base64
+import time
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image, ImageFilter
+
+
+_MEDIA_TYPES = {
+    "PNG": "image/png",
+    "JPEG": "image/jpeg",
+    "WEBP": "image/webp",
+}
+
+_EXTENSIONS = {
+    "PNG": "png",
+    "JPEG": "jpg",
+    "WEBP": "webp",
+}
+
+AUTO = "AUTO"
+
+
+def normalize_format(fmt: Optional[str]) -> str:
+    """Map user-facing format names (png, jpg, jpeg) to PIL format names."""
+    name = (fmt or "PNG").strip().upper()
+    if name == "JPG":
+        name = "JPEG"
+    if name == AUTO:
+        return AUTO
+    return name if name in _MEDIA_TYPES else "PNG"
+
+
+@dataclass
+class EncodedFrame:
+    """Single encoded screenshot with lazily computed base64 view."""
+
+    data: bytes
+    format: str
+    width: int
+    height: int
+    encode_ms: float = 0.0
+    quality: Optional[int] = None  # JPEG quality actually used
+    attempts: int = 1  # encoder passes spent on this frame
+    _b64: Optional[str] = field(default=None, repr=False, compare=False)
+
+    @property
+    def media_type(self) -> str:
+        return _MEDIA_TYPES.get(self.format, "image/png")
+
+    @property
+    def extension(self) -> str:
+        return _EXTENSIONS.get(self.format, "png")
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.data)
+
+    @property
+    def estimated_image_tokens(self) -> int:
+        # Vision models bill by pixel area (~750 px per token), not by encoded bytes
+        return int(self.width * self.height / 750)
+
+    @property
+    def b64(self) -> str:
+        # Computed once; the same str object is reused by the tool result and UI events
+        if self._b64 is None:
+            self._b64 = base64.b64encode(self.data).decode("ascii")
+        return self._b64
+
+    def write_to(self, path: str) -> None:
+        with open(path, "wb") as fh:
+            fh.write(self.data)
+
+    def to_block(self) -> Dict[str, Any]:
+        """Anthropic-style image content block consumed by ToolRegistry."""
+        return {
+            "type": "image",
+            "source": {"type": "base64", "media_type": self.media_type, "data": self.b64},
+        }
+
+
+def encode_frame(
+    img: Any,
+    fmt: Optional[str] = "PNG",
+    *,
+    quality: int = 85,
+    palette_colors: int = 0,
+    lossless: bool = False,
+) -> EncodedFrame:
+    """Encode a PIL image once into an in-memory buffer.
+
+    palette_colors > 0 quantises PNG output to that many colours; lossless applies
+    to WebP. AUTO is resolved with choose_format(). Falls back to PNG if the
+    requested encoder fails (e.g. JPEG on an RGBA/P image that cannot be
+    converted, or a Pillow build without WebP). Raises if PNG encoding fails too.
+    """
+    name = normalize_format(fmt)
+    if name == AUTO:
+        name, opts = choose_format(img)
+        palette_colors = int(opts.get("palette_colors", palette_colors))
+        lossless = bool(opts.get("lossless", lossless))
+    started = time.perf_counter()
+    buf = BytesIO()
+    used_quality: Optional[int] = None
+    try:
+        if name == "JPEG":
+            used_quality = int(quality)
+            src = img if getattr(img, "mode", "RGB") == "RGB" else img.convert("RGB")
+            src.save(buf, format="JPEG", quality=int(quality))
+        elif name == "WEBP":
+            src = img if getattr(img, "mode", "RGB") in ("RGB", "RGBA") else img.convert("RGB")
+            if lossless:
+                # method 0: fastest lossless mode; UI frames still shrink well below PNG
+                src.save(buf, format="WEBP", lossless=True, method=0)
+            else:
+                used_quality = int(quality)
+                src.save(buf, format="WEBP", quality=int(quality), method=0)
+        elif palette_colors > 0:
+            src = img if getattr(img, "mode", "RGB") == "RGB" else img.convert("RGB")
+            quant = src.quantize(colors=min(256, int(palette_colors)), method=getattr(Image, "FASTOCTREE", 2), dither=0)
+            quant.save(buf, format="PNG", compress_level=6)
+        else:
+            img.save(buf, format="PNG")
+    except Exception:
+        if name == "PNG":
+            raise
+        buf = BytesIO()
+        img.save(buf, format="PNG")
+        name = "PNG"
+        used_quality = None
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    return EncodedFrame(
+        data=buf.getvalue(),
+        format=name,
+        width=int(getattr(img, "width", 0) or 0),
+        height=int(getattr(img, "height", 0) or 0),
+        encode_ms=elapsed_ms,
+        quality=used_quality,
+    )
+
+
+# choose_format thresholds (measured on a 256px-wide copy of the frame)
+_SAMPLE_WIDTH = 256
+_PALETTE_MAX_COLORS = 512
+_WEBP_MAX_COLORS = 2048
+_EDGE_LEVEL = 32
+_TEXT_EDGE_DENSITY = 0.06
+
+
+def frame_stats(img: Any) -> Tuple[int, float]:
+    """(unique colours, edge density) of a downsampled copy; colours are capped at 4097."""
+    # Nearest-neighbour keeps real pixel values (a box filter would invent blended colours)
+    if img.width > _SAMPLE_WIDTH:
+        h = max(1, int(round(img.height * _SAMPLE_WIDTH / float(img.width))))
+        sample = img.resize((_SAMPLE_WIDTH, h), resample=getattr(Image, "NEAREST", 0))
+    else:
+        sample = img
+    if sample.mode != "RGB":
+        sample = sample.convert("RGB")
+    colors = sample.getcolors(4096)
+    n_colors = len(colors) if colors is not None else 4097
+    edges = sample.convert("L").filter(ImageFilter.FIND_EDGES)
+    hist = edges.histogram()
+    strong = sum(hist[_EDGE_LEVEL + 1:])
+    density = strong / float(max(1, sample.width * sample.height))
+    return n_colors, density
+
+
+def choose_format(img: Any) -> Tuple[str, Dict[str, Any]]:
+    """Pick the encoding for one frame.
+
+    - Flat UI with few colours: palette PNG (small, pixel-exact text).
+    - Text-heavy UI with moderate colour count (antialiasing, icons): lossless WebP.
+    - Photos, video, gradients: JPEG.
+    """
+    try:
+        n_colors, density = frame_stats(img)
+    except Exception:
+        return "JPEG", {}
+    if n_colors <= _PALETTE_MAX_COLORS:
+        return "PNG", {"palette_colors": 256}
+    if n_colors <= _WEBP_MAX_COLORS and density >= _TEXT_EDGE_DENSITY and _webp_supported():
+        return "WEBP", {"lossless": True}
+    return "JPEG", {}
+
+
+_WEBP_OK: Optional[bool] = None
+
+
+def _webp_supported() -> bool:
+    global _WEBP_OK
+    if _WEBP_OK is None:
+        try:
+            from PIL import features  # type: ignore
+            _WEBP_OK = bool(features.check("webp"))
+        except Exception:
+            _WEBP_OK = False
+    return _WEBP_OK
+
+
+class BudgetJpegEncoder:
+    """JPEG encoder that picks, per frame, the highest quality fitting a byte budget.
+
+    Binary-searches quality in [min_quality, max_quality], probing first at the
+    quality chosen for the previous frame (consecutive screens compress alike), and
+    stops after max_iters passes or once a fit lands within `slack` of the budget.
+    If nothing fits, the lowest-quality attempt is returned (over budget).
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        *,
+        min_quality: int = 20,
+        max_quality: int = 90,
+        max_iters: int = 5,
+        slack: float = 0.1,
+        start_quality: int = 60,
+    ) -> None:
+        self.max_bytes = max(1, int(max_bytes))
+        self.min_quality = max(1, min(95, int(min_quality)))
+        self.max_quality = max(self.min_quality, min(95, int(max_quality)))
+        self.max_iters = max(1, int(max_iters))
+        self.slack = max(0.0, float(slack))
+        self.last_quality = max(self.min_quality, min(self.max_quality, int(start_quality)))
+
+    def encode(self, img: Any) -> EncodedFrame:
+        started = time.perf_counter()
+        src = img if getattr(img, "mode", "RGB") == "RGB" else img.convert("RGB")
+        lo, hi = self.min_quality, self.max_quality
+        q = self.last_quality
+        best: Optional[EncodedFrame] = None
+        lowest: Optional[EncodedFrame] = None
+        attempts = 0
+        while attempts < self.max_iters and lo <= hi:
+            attempts += 1
+            frame = encode_frame(src, "JPEG", quality=q)
+            if frame.format != "JPEG":
+                return frame
+            if frame.size_bytes <= self.max_bytes:
+                best = frame
+                if frame.size_bytes >= self.max_bytes * (1.0 - self.slack):
+                    break
+                lo = q + 1
+            else:
+                if lowest is None or q < (lowest.quality or 0):
+                    lowest = frame
+                hi = q - 1
+            q = (lo + hi) // 2
+        chosen = best or lowest
+        if chosen is None:  # pragma: no cover - loop always encodes at least once
+            chosen = encode_frame(src, "JPEG", quality=self.min_quality)
+        self.last_quality = int(chosen.quality or self.last_quality)
+        chosen.attempts = attempts
+        chosen.encode_ms = (time.perf_counter() - started) * 1000.0
+        return chosen
@@ -0,0 +1,67 @@
+"""Model-side geometry derived from a display snapshot.
+
+Replaces the SCREEN_W / MODEL_DISPLAY_* / letterbox globals that
+os_ai_core.tools.computer used to compute once at import time. A ModelGeometry
+is immutable: callers take one snapshot per action and use it for every
+transform and resize in that action, so a display change mid-action cannot mix
+old and new numbers.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from os_ai_core.utils.viewport import Viewport, fit_viewport
+
+
+@dataclass(frozen=True)
+class ModelGeometry:
+    screen_w: int
+    screen_h: int
+    # Canvas the model sees for a full-screen frame
+    model_w: int
+    model_h: int
+    viewport: Viewport
+    letterbox: bool = False
+    generation: int = 0
+
+    def fit(self, x: int, y: int, width: int, height: int) -> Viewport:
+        """Viewport for a sub-rectangle of the screen (e.g. the focused window) within the same canvas budget."""
+        return fit_viewport(x, y, width, height, self.model_w, self.model_h, letterbox=self.letterbox)
+
+
+def build_model_geometry(
+    screen_w: int,
+    screen_h: int,
+    *,
+    mode: str = "downscale",
+    virtual_enabled: bool = True,
+    virtual_w: Optional[Any] = None,
+    virtual_h: Optional[Any] = None,
+    letterbox: bool = False,
+    generation: int = 0,
+) -> ModelGeometry:
+    """Full-screen geometry for the configured screenshot mode.
+
+    'native' (or no virtual display) sends the screen 1:1. 'downscale' fits the
+    screen into VIRTUAL_DISPLAY_WIDTH x HEIGHT (height follows the screen aspect
+    when unset); bars are added only when `letterbox` is set and the aspects differ.
+    """
+    sw, sh = max(1, int(screen_w)), max(1, int(screen_h))
+    if (mode or "downscale").lower() != "downscale" or not virtual_enabled:
+        vp = Viewport(0, 0, sw, sh, sw, sh)
+        return ModelGeometry(sw, sh, sw, sh, vp, False, int(generation))
+    try:
+        box_w = int(virtual_w)
+    except Exception:
+        box_w = sw
+    try:
+        box_h = int(virtual_h)
+    except Exception:
+        box_h = 0
+    if box_w <= 0:
+        box_w = sw
+    if box_h <= 0:
+        box_h = max(1, int(round(float(sh) * float(box_w) / float(sw))))
+    vp = fit_viewport(0, 0, sw, sh, box_w, box_h, letterbox=letterbox)
+    return ModelGeometry(sw, sh, vp.model_w, vp.model_h, vp, bool(letterbox), int(generation))
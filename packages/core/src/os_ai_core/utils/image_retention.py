@@ -0,0 +1,290 @@
+"""Image retention for conversation history.
+
+Every screenshot stays in the history and is resent on each turn, so input
+size grows linearly with the number of steps. A retention policy rewrites the
+history in place before each model call. TieredImageRetention counts images
+from the newest one back:
+
+  newest `keep_last`               kept verbatim
+  next `downscale_count`           downscaled to `downscale_width` (JPEG)
+  older                            replaced by a text note with the step and action
+
+Tiers are assigned in coarse steps: new screenshots stay verbatim until
+`keep_last + retier_step` of them are untiered, then every image is re-tiered
+at once, and an image never moves back to a lighter tier. Between those points
+the older history is byte-identical from turn to turn, so provider prompt
+caches (Anthropic cache breakpoints) keep hitting; re-tiering on every new
+screenshot would rewrite a message before the previous breakpoint each turn.
+
+Images are found wherever the adapters put them: canonical ImagePart, Anthropic
+tool_result blocks and OpenAI computer_call_output items. Tool results are never
+removed, so tool_use/tool_result pairing stays valid. An OpenAI
+computer_call_output must carry a screenshot, so there the note becomes a
+small thumbnail instead.
+"""
+from __future__ import annotations
+
+import base64
+import io
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from os_ai_llm.types import ImagePart, Message, ProviderPart, TextPart
+
+from os_ai_core.config import (
+    IMAGE_RETENTION_ENABLED,
+    IMAGE_RETENTION_KEEP_LAST,
+    IMAGE_RETENTION_RETIER_STEP,
+    IMAGE_RETENTION_DOWNSCALE_COUNT,
+    IMAGE_RETENTION_DOWNSCALE_WIDTH,
+    IMAGE_RETENTION_THUMB_WIDTH,
+    IMAGE_RETENTION_JPEG_QUALITY,
+)
+
+KEEP = "keep"
+DOWNSCALE = "downscale"
+REPLACE = "replace"
+_RANK = {KEEP: 0, DOWNSCALE: 1, REPLACE: 2}
+
+
+@dataclass
+class RetentionStats:
+    images: int = 0
+    kept: int = 0
+    downscaled: int = 0
+    replaced: int = 0
+    # The newest image in the history was downscaled or replaced
+    latest_changed: bool = False
+
+    @property
+    def changed(self) -> int:
+        return self.downscaled + self.replaced
+
+
+class ImageRetentionPolicy:
+    """Base policy: keep every image."""
+
+    def apply(self, messages: List[Message], actions: Optional[Dict[str, str]] = None) -> RetentionStats:
+        """Rewrite `messages` in place. `actions` maps tool call ids to action names (for notes)."""
+        return RetentionStats()
+
+    def reset(self) -> None:
+        """Forget per-history state before a new run."""
+
+
+# One image in the history: (step, tool call id, edit(tier, note) -> changed?, position)
+_Found = Tuple[int, str, Callable[[str, str], bool], Tuple[int, ...]]
+
+
+def _parse_data_url(url: str) -> Tuple[str, str]:
+    if not isinstance(url, str) or not url.startswith("data:") or ";base64," not in url:
+        return "", ""
+    head, data = url.split(";base64,", 1)
+    return head[5:], data
+
+
+class _PartSlot:
+    """Position of a content part; edits always read and replace the current part."""
+
+    def __init__(self, messages: List[Message], mi: int, pi: int) -> None:
+        self.messages, self.mi, self.pi = messages, mi, pi
+
+    def get(self) -> Any:
+        return self.messages[self.mi].content[self.pi]
+
+    def set(self, part: Any) -> None:
+        msg = self.messages[self.mi]
+        content = list(msg.content)
+        content[self.pi] = part
+        self.messages[self.mi] = Message(role=msg.role, content=content)
+
+    def item(self, ii: int) -> Dict[str, Any]:
+        data = self.get().data
+        return data[ii] if isinstance(data, list) else data
+
+    def set_item(self, ii: int, item: Dict[str, Any]) -> None:
+        # New containers only: provider data may be shared with other references
+        part = self.get()
+        if isinstance(part.data, list):
+            data: Any = list(part.data)
+            data[ii] = item
+        else:
+            data = item
+        self.set(ProviderPart(provider=part.provider, sub_type=part.sub_type, data=data))
+
+
+class TieredImageRetention(ImageRetentionPolicy):
+    def __init__(
+        self,
+        *,
+        keep_last: int = 3,
+        downscale_count: int = 3,
+        downscale_width: int = 512,
+        thumb_width: int = 96,
+        jpeg_quality: int = 50,
+        retier_step: int = 1,
+    ) -> None:
+        self.keep_last = max(0, int(keep_last))
+        self.downscale_count = max(0, int(downscale_count))
+        self.downscale_width = max(16, int(downscale_width))
+        self.thumb_width = max(8, int(thumb_width))
+        self.jpeg_quality = max(1, min(95, int(jpeg_quality)))
+        self.retier_step = max(1, int(retier_step))
+        # Image position (message, part, item, block) -> tier assigned at the last re-tier
+        self._tiers: Dict[Tuple[int, ...], str] = {}
+        # hash() of payloads already at most (downscale_width, thumb_width) wide: never decoded again
+        self._small: Dict[int, int] = {}
+
+    def tier(self, age: int) -> str:
+        """Tier of the image `age` positions back from the newest one (0 = newest)."""
+        if age < self.keep_last:
+            return KEEP
+        if age < self.keep_last + self.downscale_count:
+            return DOWNSCALE
+        return REPLACE
+
+    def reset(self) -> None:
+        self._tiers = {}
+
+    @staticmethod
+    def note(step: int, action: str) -> str:
+        what = f" after {action}" if action else ""
+        return f"[screenshot from step {step}{what} removed from history]"
+
+    def _shrink(self, data: str, width: int) -> Optional[Tuple[str, str]]:
+        """(media_type, data) re-encoded at most `width` px wide; None when it already is."""
+        key = hash(data)
+        known = self._small.get(key)
+        if known is not None and known <= width:
+            return None
+        try:
+            from PIL import Image  # type: ignore
+
+            img = Image.open(io.BytesIO(base64.b64decode(data)))
+            if img.width <= width:
+                self._small[key] = img.width
+                return None
+            height = max(1, int(round(img.height * width / float(img.width))))
+            img = img.convert("RGB").resize((width, height), resample=getattr(Image, "LANCZOS", Image.BILINEAR))
+            buf = io.BytesIO()
+            img.save(buf, format="JPEG", quality=self.jpeg_quality, optimize=True)
+            out = base64.b64encode(buf.getvalue()).decode("ascii")
+        except Exception:
+            return None
+        self._small[hash(out)] = width
+        return "image/jpeg", out
+
+    def apply(self, messages: List[Message], actions: Optional[Dict[str, str]] = None) -> RetentionStats:
+        actions = actions or {}
+        found: List[_Found] = []
+        step = 0
+        for mi, msg in enumerate(messages):
+            if any(isinstance(p, ProviderPart) and p.sub_type in ("tool_result", "computer_call_output") for p in msg.content):
+                step += 1
+            for pi, part in enumerate(msg.content):
+                found.extend(self._images_in(_PartSlot(messages, mi, pi), part, step))
+
+        stats = RetentionStats(images=len(found))
+        untiered = sum(1 for f in found if self._tiers.get(f[3], KEEP) == KEEP)
+        retier = untiered >= self.keep_last + self.retier_step
+        for age, (st, call_id, edit, key) in enumerate(reversed(found)):
+            tier = self._tiers.get(key, KEEP)
+            if retier:
+                tier = max(tier, self.tier(age), key=_RANK.__getitem__)
+                self._tiers[key] = tier
+            if tier == KEEP:
+                stats.kept += 1
+                continue
+            if not edit(tier, self.note(st, actions.get(call_id, ""))):
+                continue
+            if tier == DOWNSCALE:
+                stats.downscaled += 1
+            else:
+                stats.replaced += 1
+            stats.latest_changed = stats.latest_changed or age == 0
+        return stats
+
+    def _images_in(self, slot: _PartSlot, part: Any, step: int) -> List[_Found]:
+        if isinstance(part, ImagePart):
+            return [(step, "", self._image_part_edit(slot), (slot.mi, slot.pi))]
+        if not isinstance(part, ProviderPart):
+            return []
+        out: List[_Found] = []
+        items = part.data if isinstance(part.data, list) else [part.data]
+        for ii, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            if part.provider == "anthropic" and item.get("type") == "tool_result":
+                for ci, c in enumerate(item.get("content") or []):
+                    if isinstance(c, dict) and c.get("type") == "image":
+                        out.append((step, str(item.get("tool_use_id", "")), self._block_edit(slot, ii, ci), (slot.mi, slot.pi, ii, ci)))
+            elif part.provider == "openai" and item.get("type") == "computer_call_output":
+                if _parse_data_url((item.get("output") or {}).get("image_url", ""))[1]:
+                    out.append((step, str(item.get("call_id", "")), self._screenshot_edit(slot, ii), (slot.mi, slot.pi, ii)))
+            elif part.provider == "openai" and isinstance(item.get("content"), list):
+                for ci, c in enumerate(item["content"]):
+                    if isinstance(c, dict) and c.get("type") == "input_image":
+                        out.append((step, "", self._block_edit(slot, ii, ci), (slot.mi, slot.pi, ii, ci)))
+        return out
+
+    def _image_part_edit(self, slot: _PartSlot) -> Callable[[str, str], bool]:
+        def edit(tier: str, note: str) -> bool:
+            part = slot.get()
+            if tier == REPLACE:
+                slot.set(TextPart(text=note))
+                return True
+            shrunk = self._shrink(part.data_base64, self.downscale_width)
+            if shrunk is None:
+                return False
+            slot.set(ImagePart(media_type=shrunk[0], data_base64=shrunk[1], label=part.label))
+            return True
+        return edit
+
+    def _block_edit(self, slot: _PartSlot, ii: int, ci: int) -> Callable[[str, str], bool]:
+        """Anthropic image block in a tool_result, or OpenAI input_image in a user input item."""
+        def edit(tier: str, note: str) -> bool:
+            item = slot.item(ii)
+            block = item["content"][ci]
+            anthropic = block.get("type") == "image"
+            if tier == REPLACE:
+                new_block: Dict[str, Any] = {"type": "text" if anthropic else "input_text", "text": note}
+            else:
+                data = (block.get("source") or {}).get("data", "") if anthropic else _parse_data_url(block.get("image_url", ""))[1]
+                shrunk = self._shrink(str(data), self.downscale_width)
+                if shrunk is None:
+                    return False
+                if anthropic:
+                    new_block = {**block, "source": {"type": "base64", "media_type": shrunk[0], "data": shrunk[1]}}
+                else:
+                    new_block = {**block, "image_url": f"data:{shrunk[0]};base64,{shrunk[1]}"}
+            content = list(item["content"])
+            content[ci] = new_block
+            slot.set_item(ii, {**item, "content": content})
+            return True
+        return edit
+
+    def _screenshot_edit(self, slot: _PartSlot, ii: int) -> Callable[[str, str], bool]:
+        def edit(tier: str, note: str) -> bool:
+            item = slot.item(ii)
+            # computer_call_output requires a screenshot: the oldest ones become thumbnails
+            width = self.thumb_width if tier == REPLACE else self.downscale_width
+            shrunk = self._shrink(_parse_data_url(item["output"].get("image_url", ""))[1], width)
+            if shrunk is None:
+                return False
+            output = {**item["output"], "image_url": f"data:{shrunk[0]};base64,{shrunk[1]}"}
+            slot.set_item(ii, {**item, "output": output})
+            return True
+        return edit
+
+
+def default_image_policy() -> ImageRetentionPolicy:
+    if not IMAGE_RETENTION_ENABLED:
+        return ImageRetentionPolicy()
+    return TieredImageRetention(
+        keep_last=int(IMAGE_RETENTION_KEEP_LAST),
+        downscale_count=int(IMAGE_RETENTION_DOWNSCALE_COUNT),
+        downscale_width=int(IMAGE_RETENTION_DOWNSCALE_WIDTH),
+        thumb_width=int(IMAGE_RETENTION_THUMB_WIDTH),
+        jpeg_quality=int(IMAGE_RETENTION_JPEG_QUALITY),
+        retier_step=int(IMAGE_RETENTION_RETIER_STEP),
+    )
@@ -0,0 +1,143 @@
+"""Pointer motion profiles and precomputed trajectories.
+
+pyautogui's animated moveTo() sleeps between many tiny steps whose count
+depends on its minimum sleep, and every move was clamped to at least
+MIN_MOVE_DURATION even when nobody watches the cursor. Here a move is
+planned once as an (n, 2) NumPy array for a tween and event rate (the
+normalised curve is cached per tween/step count) and played back against
+a monotonic clock: each point has an absolute deadline, so slow backends
+drop intermediate points instead of stretching the move.
+
+Profiles:
+  instant  warp to the target (no intermediate events)
+  fast     short eased moves at a high event rate, no minimum duration
+  human    the classic speed/duration limits (MIN/MAX_MOVE_DURATION)
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from os_ai_core.config import LOGGER_NAME
+from os_ai_os.config import MAX_MOVE_DURATION, MIN_MOVE_DURATION
+
+_log = logging.getLogger(LOGGER_NAME)
+
+
+@dataclass(frozen=True)
+class MotionProfile:
+    name: str
+    # Multiplier on the caller's pixels-per-second speed (moves and drags differ)
+    speed_scale: float
+    min_duration: float
+    max_duration: float
+    event_hz: float
+
+    @property
+    def instant(self) -> bool:
+        return self.max_duration <= 0 or self.event_hz <= 0
+
+    def duration_for(self, distance_px: float, speed_pps: float) -> float:
+        if self.instant:
+            return 0.0
+        dur = float(distance_px) / max(1.0, float(speed_pps) * self.speed_scale)
+        return max(self.min_duration, min(self.max_duration, dur))
+
+
+PROFILES: Dict[str, MotionProfile] = {
+    "instant": MotionProfile("instant", 1.0, 0.0, 0.0, 0.0),
+    "fast": MotionProfile("fast", 4.0, 0.0, 0.15, 120.0),
+    "human": MotionProfile("human", 1.0, MIN_MOVE_DURATION, MAX_MOVE_DURATION, 60.0),
+}
+
+
+def get_profile(name: str | None) -> MotionProfile:
+    key = (name or "human").strip().lower()
+    profile = PROFILES.get(key)
+    if profile is None:
+        _log.warning("Unknown motion profile %r, using 'human'", name)
+        return PROFILES["human"]
+    return profile
+
+
+TWEENS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "linear": lambda t: t,
+    "easeinquad": lambda t: t * t,
+    "easeoutquad": lambda t: t * (2.0 - t),
+    "easeinoutquad": lambda t: np.where(t < 0.5, 2.0 * t * t, -2.0 * t * t + 4.0 * t - 1.0),
+}
+
+
+def normalize_tween(name: str | None) -> str:
+    key = (name or "easeInOutQuad").strip().lower()
+    return key if key in TWEENS else "easeinoutquad"
+
+
+@lru_cache(maxsize=128)
+def _curve(tween: str, steps: int) -> np.ndarray:
+    """Progress fractions at t = 1/steps .. 1 (read-only, shared between moves)."""
+    t = np.arange(1, steps + 1, dtype=np.float64) / float(steps)
+    f = np.clip(TWEENS[normalize_tween(tween)](t), 0.0, 1.0)
+    f[-1] = 1.0
+    f.setflags(write=False)
+    return f
+
+
+def trajectory(
+    start: Tuple[int, int],
+    end: Tuple[int, int],
+    duration_s: float,
+    *,
+    event_hz: float,
+    tween: str = "linear",
+) -> np.ndarray:
+    """(n, 2) int array of pointer positions after `start`, ending exactly on `end`."""
+    steps = int(max(0.0, float(duration_s)) * max(0.0, float(event_hz)))
+    target = np.array([[int(end[0]), int(end[1])]], dtype=np.int32)
+    if steps <= 1 or tuple(start) == tuple(end):
+        return target
+    s = np.asarray(start, dtype=np.float64)
+    delta = np.asarray(end, dtype=np.float64) - s
+    points = np.rint(s + _curve(normalize_tween(tween), steps)[:, None] * delta).astype(np.int32)
+    points[-1] = target[0]
+    return points
+
+
+def play(
+    points: np.ndarray,
+    event_hz: float,
+    move: Callable[[int, int], None],
+    *,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> int:
+    """Emit `points` at `event_hz` against absolute deadlines; returns the number of events sent.
+
+    Points whose deadline already passed are skipped (never the last one), so a
+    backend slower than the event rate shortens the path rather than the timing.
+    """
+    n = len(points)
+    if n == 0:
+        return 0
+    period = 1.0 / event_hz if event_hz > 0 else 0.0
+    start = clock()
+    sent = 0
+    i = 0
+    while i < n:
+        if period > 0:
+            now = clock()
+            deadline = start + (i + 1) * period
+            if now < deadline:
+                sleep(deadline - now)
+            else:
+                i = max(i, min(n - 1, int((now - start) / period) - 1))
+        x, y = points[i]
+        move(int(x), int(y))
+        sent += 1
+        i += 1
+    return sent
@@ -0,0 +1,88 @@
+"""Pointer path simplification and resampling for multi-point drags.
+
+Drawing actions can carry hundreds of points. They are handled as one (n, 2)
+array: simplify_path() drops points that lie within a pixel tolerance of the
+line through their neighbours (Ramer-Douglas-Peucker), and resample_path()
+spreads the remaining polyline over a duration at a fixed event rate by arc
+length. Resampling always keeps the simplified vertices, so corners are hit
+exactly and the drawn shape does not round off.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+
+def as_path(points) -> np.ndarray:
+    """(n, 2) float64 array from any sequence of [x, y] pairs."""
+    arr = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return arr
+
+
+def path_length(path: np.ndarray) -> float:
+    if len(path) < 2:
+        return 0.0
+    return float(np.hypot(*np.diff(path, axis=0).T).sum())
+
+
+def _dedupe(path: np.ndarray) -> np.ndarray:
+    """Drop consecutive duplicate points."""
+    if len(path) < 2:
+        return path
+    keep = np.ones(len(path), dtype=bool)
+    keep[1:] = np.any(np.diff(path, axis=0) != 0, axis=1)
+    return path[keep]
+
+
+def simplify_path(path: np.ndarray, tolerance_px: float) -> np.ndarray:
+    """Ramer-Douglas-Peucker simplification; endpoints are always kept."""
+    path = _dedupe(as_path(path))
+    n = len(path)
+    if n < 3 or tolerance_px <= 0:
+        return path
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        a, b = path[first], path[last]
+        inner = path[first + 1:last]
+        seg = b - a
+        seg_len = float(np.hypot(seg[0], seg[1]))
+        if seg_len == 0.0:
+            dist = np.hypot(*(inner - a).T)
+        else:
+            # Perpendicular distance to the chord a-b
+            dist = np.abs(seg[0] * (inner[:, 1] - a[1]) - seg[1] * (inner[:, 0] - a[0])) / seg_len
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance_px:
+            mid = first + 1 + i
+            keep[mid] = True
+            stack.append((first, mid))
+            stack.append((mid, last))
+    return path[keep]
+
+
+def resample_path(path: np.ndarray, duration_s: float, event_hz: float) -> np.ndarray:
+    """Points along `path` (excluding its first point) for one event every 1/event_hz over `duration_s`.
+
+    Samples are spaced evenly by arc length; every vertex of `path` is kept.
+    Returns int32 screen coordinates ending exactly on the last vertex.
+    """
+    path = as_path(path)
+    if len(path) < 2:
+        return np.rint(path).astype(np.int32)
+    seg = np.hypot(*np.diff(path, axis=0).T)
+    cum = np.concatenate(([0.0], np.cumsum(seg)))
+    total = float(cum[-1])
+    if total == 0.0:
+        return np.rint(path[-1:]).astype(np.int32)
+    steps = int(max(0.0, float(duration_s)) * max(0.0, float(event_hz)))
+    samples = np.linspace(0.0, total, steps + 1)[1:] if steps > 0 else np.empty(0)
+    at = np.union1d(samples, cum[1:])
+    xs = np.interp(at, cum, path[:, 0])
+    ys = np.interp(at, cum, path[:, 1])
+    out = np.rint(np.column_stack((xs, ys))).astype(np.int32)
+    out[-1] = np.rint(path[-1]).astype(np.int32)
+    return out
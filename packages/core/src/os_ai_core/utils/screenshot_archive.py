@@ -0,0 +1,167 @@
+"""Background archiver for the screenshots/ folder.
+
+Frames are handed over as already-encoded bytes and written by a daemon thread,
+so disk latency (e.g. network-mounted home directories) stays off the action path.
+The pending queue is bounded: when the writer falls behind, the oldest pending
+frame is dropped in favour of the newest one. Retention mirrors the backend
+FileStore GC: files older than the TTL go first, then the oldest files until the
+folder fits into the size quota.
+"""
+from __future__ import annotations
+
+import collections
+import logging
+import os
+import threading
+import time
+from typing import Deque, Dict, Optional, Tuple
+
+from os_ai_core.config import LOGGER_NAME
+from os_ai_core.utils.frames import EncodedFrame
+
+
+_FILE_PREFIX = "screenshot_"
+
+
+class ScreenshotArchiver:
+    def __init__(
+        self,
+        root: str,
+        *,
+        max_pending: int = 8,
+        max_total_bytes: int = 512 * 1024 * 1024,
+        ttl_seconds: float = 7 * 86400,
+    ) -> None:
+        self.root = root
+        self.max_pending = max(1, int(max_pending))
+        self.max_total_bytes = int(max_total_bytes)
+        self.ttl_seconds = float(ttl_seconds)
+        self.dropped = 0
+        self.written = 0
+        self._pending: Deque[Tuple[str, EncodedFrame]] = collections.deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        # path -> (mtime, size); built once from disk, then maintained incrementally
+        self._index: Dict[str, Tuple[float, int]] = {}
+        self._total_bytes = 0
+        self._indexed = False
+        self._thread = threading.Thread(target=self._run, name="screenshot-archiver", daemon=True)
+        self._thread.start()
+
+    def next_path(self, frame: EncodedFrame) -> str:
+        ts = time.strftime("%Y%m%d_%H%M%S")
+        ms = int((time.time() - int(time.time())) * 1000)
+        name = f"{_FILE_PREFIX}{ts}_{ms:03d}.{frame.extension}"
+        path = os.path.join(self.root, name)
+        # Several frames per millisecond are possible in tight loops
+        suffix = 1
+        with self._cond:
+            taken = {p for p, _ in self._pending}
+        while path in taken or path in self._index:
+            path = os.path.join(self.root, f"{_FILE_PREFIX}{ts}_{ms:03d}_{suffix}.{frame.extension}")
+            suffix += 1
+        return path
+
+    def submit(self, frame: EncodedFrame) -> str:
+        """Queue a frame for writing and return the path it will be written to."""
+        path = self.next_path(frame)
+        with self._cond:
+            if self._closed:
+                return path
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                self.dropped += 1
+                logging.getLogger(LOGGER_NAME).debug("Screenshot archive behind; dropped oldest pending frame")
+            self._pending.append((path, frame))
+            self._cond.notify()
+        return path
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until all pending frames are written. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + float(timeout)
+        with self._cond:
+            while self._pending or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 2.0) -> None:
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    # ---- worker ----
+
+    def _run(self) -> None:
+        logger = logging.getLogger(LOGGER_NAME)
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._pending:
+                    return
+                path, frame = self._pending.popleft()
+                self._busy = True
+            try:
+                self._write(path, frame)
+                logger.info(f"Saved screenshot: {path}")
+            except Exception as e:
+                logger.warning("Failed to save screenshot %s: %s", path, e)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, path: str, frame: EncodedFrame) -> None:
+        if not self._indexed:
+            os.makedirs(self.root, exist_ok=True)
+            self._scan()
+        frame.write_to(path)
+        self.written += 1
+        self._index[path] = (time.time(), frame.size_bytes)
+        self._total_bytes += frame.size_bytes
+        self._gc()
+
+    def _scan(self) -> None:
+        self._indexed = True
+        try:
+            with os.scandir(self.root) as it:
+                for entry in it:
+                    if not entry.name.startswith(_FILE_PREFIX) or not entry.is_file():
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    self._index[entry.path] = (st.st_mtime, st.st_size)
+                    self._total_bytes += st.st_size
+        except OSError:
+            pass
+
+    def _remove(self, path: str) -> None:
+        _, size = self._index.pop(path, (0.0, 0))
+        self._total_bytes -= size
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            pass
+
+    def _gc(self) -> None:
+        now = time.time()
+        # TTL-based deletion first
+        for path, (mtime, _) in list(self._index.items()):
+            if now - mtime > self.ttl_seconds:
+                self._remove(path)
+        # Enforce total size limit by removing oldest files
+        if self._total_bytes <= self.max_total_bytes:
+            return
+        for path, _ in sorted(self._index.items(), key=lambda kv: (kv[1][0], kv[0])):
+            if self._total_bytes <= self.max_total_bytes:
+                break
+            self._remove(path)
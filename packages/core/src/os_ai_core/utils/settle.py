@@ -0,0 +1,89 @@
+"""Wait until the screen stops changing.
+
+Fixed waits are either too long (seconds lost per step) or too short (the
+model sees a half-loaded screen and spends another turn). wait_until_stable()
+samples small frames, reduces each to the same grayscale grid signature used
+for screenshot de-duplication and returns as soon as the changed fraction has
+stayed at or below a threshold for N consecutive samples, or when the timeout
+expires.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from os_ai_core.utils.frame_diff import FrameDiffTracker
+
+
+@dataclass(frozen=True)
+class SettleResult:
+    stable: bool
+    elapsed_s: float
+    samples: int
+    # Changed fraction between the last two samples (1.0 before two frames were compared)
+    last_change: float
+    # Frames that could be grabbed and compared; 0 means no capture was possible at all
+    frames: int = 0
+
+    def describe(self) -> str:
+        if not self.frames:
+            return "screen capture unavailable"
+        if self.stable:
+            return f"stable after {self.elapsed_s:.2f}s ({self.samples} samples)"
+        return f"not stable after {self.elapsed_s:.2f}s (last change {self.last_change * 100:.1f}%)"
+
+
+def wait_until_stable(
+    grab: Callable[[], Optional[Any]],
+    *,
+    threshold: float = 0.002,
+    stable_samples: int = 3,
+    interval_s: float = 0.1,
+    timeout_s: float = 5.0,
+    grid_width: int = 64,
+    pixel_tolerance: int = 8,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> SettleResult:
+    """Sample `grab()` (a PIL image or None) every `interval_s` until `stable_samples`
+    consecutive comparisons change at most `threshold` of the grid cells.
+
+    Returns right away (frames=0) when the very first grab fails.
+    """
+    diff = FrameDiffTracker(grid_width=grid_width, pixel_tolerance=pixel_tolerance)
+    need = max(1, int(stable_samples))
+    start = clock()
+    deadline = start + max(0.0, float(timeout_s))
+    prev: Any = None
+    calm = 0
+    samples = 0
+    frames = 0
+    last = 1.0
+    while True:
+        tick = clock()
+        sig = None
+        try:
+            img = grab()
+            if img is not None:
+                sig = diff.signature(img)
+        except Exception:
+            sig = None
+        samples += 1
+        if sig is None and frames == 0:
+            return SettleResult(False, clock() - start, samples, last, frames)
+        if sig is not None:
+            frames += 1
+            if prev is not None:
+                last = diff.changed_fraction(sig, prev)
+                calm = calm + 1 if last <= threshold else 0
+            prev = sig
+        else:
+            # A missing frame proves nothing: start counting again
+            calm, prev = 0, None
+        now = clock()
+        if calm >= need:
+            return SettleResult(True, now - start, samples, last, frames)
+        if now >= deadline:
+            return SettleResult(False, now - start, samples, last, frames)
+        sleep(max(0.0, min(deadline, tick + interval_s) - now))
@@ -0,0 +1,81 @@
+"""Summarizers fold history messages into the rolling summary of ConversationOptimizer."""
+from __future__ import annotations
+
+import json
+from typing import Any, List, Optional
+
+from os_ai_llm.types import ImagePart, Message, ProviderPart, TextPart
+
+from os_ai_core.config import HISTORY_SUMMARY_MAX_CHARS
+
+# One line per message part is enough to remember what happened
+LINE_MAX_CHARS = 200
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def _item_text(item: Any) -> str:
+    """Short text for one provider block/item; empty for images, reasoning and the like."""
+    if not isinstance(item, dict):
+        return ""
+    kind = item.get("type")
+    if kind == "tool_use":
+        return f"{item.get('name', 'tool')} {json.dumps(item.get('input') or {}, ensure_ascii=False, sort_keys=True)}"
+    if kind == "tool_result":
+        texts = [c.get("text", "") for c in item.get("content") or [] if isinstance(c, dict) and c.get("type") == "text"]
+        err = "error: " if item.get("is_error") else ""
+        return err + " | ".join(t for t in texts if t) if texts else ""
+    if kind == "computer_call":
+        actions = item.get("actions") or ([item["action"]] if isinstance(item.get("action"), dict) else [])
+        return "computer " + json.dumps(actions, ensure_ascii=False, sort_keys=True)
+    if kind == "computer_call_output":
+        return "screenshot"
+    if kind == "function_call":
+        return f"{item.get('name', 'function')} {item.get('arguments', '')}"
+    if isinstance(item.get("text"), str):
+        return item["text"]
+    if isinstance(item.get("content"), list):
+        return " | ".join(filter(None, (_item_text(c) for c in item["content"])))
+    return ""
+
+
+def describe_messages(messages: List[Message]) -> List[str]:
+    """`[role] text` lines for canonical messages: texts, tool calls and tool result texts, no images."""
+    lines: List[str] = []
+    for m in messages:
+        for part in m.content:
+            if isinstance(part, TextPart):
+                text = part.text
+            elif isinstance(part, ProviderPart):
+                items = part.data if isinstance(part.data, list) else [part.data]
+                text = " | ".join(filter(None, (_item_text(i) for i in items)))
+            elif isinstance(part, ImagePart):
+                continue
+            else:
+                text = ""
+            if text and text.strip():
+                lines.append(f"[{m.role}] {_clip(text, LINE_MAX_CHARS)}")
+    return lines
+
+
+class Summarizer:
+    """Folds messages that leave the history window into the previous summary."""
+
+    def summarize(self, previous: Optional[str], messages: List[Message]) -> Optional[str]:
+        raise NotImplementedError
+
+
+class TextSummarizer(Summarizer):
+    """No model call: the summary is the message lines, newest kept when over `max_chars`."""
+
+    def __init__(self, max_chars: int = HISTORY_SUMMARY_MAX_CHARS) -> None:
+        self.max_chars = max(80, int(max_chars))
+
+    def summarize(self, previous: Optional[str], messages: List[Message]) -> Optional[str]:
+        text = "\n".join(([previous] if previous else []) + describe_messages(messages))
+        if len(text) > self.max_chars:
+            text = "…" + text[-(self.max_chars - 1):]
+        return text or previous
@@ -0,0 +1,85 @@
+"""History summaries written by a cheap model (HISTORY_SUMMARIZER = 'llm').
+
+One short completion per compaction replaces the extracted text summary with
+a state + steps digest. Any failure falls back to TextSummarizer, so a
+compaction never blocks the run.
+"""
+from __future__ import annotations
+
+import logging
+from typing import List, Optional
+
+from os_ai_llm.interfaces import LLMClient
+from os_ai_llm.types import Message, TextPart
+
+from os_ai_core.config import (
+    HISTORY_SUMMARY_MAX_CHARS,
+    HISTORY_SUMMARY_MAX_TOKENS,
+    HISTORY_SUMMARY_MODELS,
+    LOGGER_NAME,
+)
+from os_ai_core.utils.summarizers.base import Summarizer, TextSummarizer, describe_messages
+
+SYSTEM_PROMPT = (
+    "You keep the memory of a desktop automation agent. Merge the previous summary and the new steps "
+    "into one summary of at most {max_chars} characters. Start with the current state (open apps and windows, "
+    "what is done, what is left), then list the key steps, values and findings. Facts only, no advice."
+)
+
+
+class LLMSummarizer(Summarizer):
+    def __init__(
+        self,
+        client: LLMClient,
+        *,
+        max_chars: int = HISTORY_SUMMARY_MAX_CHARS,
+        max_tokens: int = HISTORY_SUMMARY_MAX_TOKENS,
+        fallback: Optional[Summarizer] = None,
+    ) -> None:
+        self._client = client
+        self.max_chars = max(80, int(max_chars))
+        self.max_tokens = max(16, int(max_tokens))
+        self._fallback = fallback if fallback is not None else TextSummarizer(self.max_chars)
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    @classmethod
+    def for_client(cls, client: LLMClient, model_name: Optional[str] = None, **kwargs) -> "LLMSummarizer":
+        """Summarizer on the cheap model of `client`'s provider, with the same API key."""
+        provider = client.get_provider_name()
+        model = model_name or HISTORY_SUMMARY_MODELS.get(provider)
+        if not model or model == client.get_model_name():
+            return cls(client, **kwargs)
+        # Both adapters take (api_key, model_name)
+        cheap = type(client)(api_key=getattr(client, "_api_key", None), model_name=model)  # type: ignore[call-arg]
+        return cls(cheap, **kwargs)
+
+    def summarize(self, previous: Optional[str], messages: List[Message]) -> Optional[str]:
+        lines = describe_messages(messages)
+        if not lines:
+            return previous
+        prompt = (f"Previous summary:\n{previous}\n\n" if previous else "") + "New steps:\n" + "\n".join(lines)
+        text = ""
+        try:
+            resp = self._client.generate(
+                messages=[Message(role="user", content=[TextPart(text=prompt)])],
+                tools=[],
+                system=SYSTEM_PROMPT.format(max_chars=self.max_chars),
+                max_tokens=self.max_tokens,
+            )
+            self.input_tokens += int(getattr(resp.usage, "input_tokens", 0) or 0)
+            self.output_tokens += int(getattr(resp.usage, "output_tokens", 0) or 0)
+            text = "\n".join(
+                p.text for m in resp.messages if m.role == "assistant" for p in m.content if isinstance(p, TextPart)
+            ).strip()
+        except Exception as e:
+            logging.getLogger(LOGGER_NAME).warning("History summary by %s failed, using the text summary: %s", self._model_name(), e)
+        if not text:
+            return self._fallback.summarize(previous, messages)
+        return text if len(text) <= self.max_chars else text[: self.max_chars - 1] + "…"
+
+    def _model_name(self) -> str:
+        try:
+            return self._client.get_model_name()
+        except Exception:
+            return "model"
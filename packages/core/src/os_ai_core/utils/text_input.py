@@ -0,0 +1,60 @@
+"""Strategy and chunking for the computer tool's `type` action.
+
+Typing goes through the keyboard driver one keystroke at a time: it is the
+only option for fields that reject paste, but its cost grows with the text.
+Pasting costs a clipboard handoff plus one Ctrl/Cmd+V regardless of length
+and also avoids editor auto-pairing of brackets and quotes. choose_text_strategy()
+picks between them; split_chunks() cuts long texts at line or word breaks so
+no single paste or typed burst exceeds the configured size.
+"""
+from __future__ import annotations
+
+from typing import List
+
+PASTE = "paste"
+TYPE = "type"
+
+# Substrings that editors tend to auto-complete or auto-indent when typed
+_CODE_TOKENS = ("()", "{}", "[]", "'", '"', "=>", ": ")
+
+
+def choose_text_strategy(text: str, *, mode: str = "auto", unicode_typing: bool = False, paste_min_chars: int = 0) -> str:
+    """'paste' or 'type' for `text`.
+
+    mode 'paste' / 'type' forces a strategy; 'auto' pastes multiline or code-like
+    text, non-ASCII text the keyboard cannot type, and anything of at least
+    `paste_min_chars` characters (0 disables the length rule).
+    """
+    forced = (mode or "auto").strip().lower()
+    if forced in (PASTE, TYPE):
+        return forced
+    text = str(text)
+    if "\n" in text or any(tok in text for tok in _CODE_TOKENS):
+        return PASTE
+    if not unicode_typing and not text.isascii():
+        return PASTE
+    if paste_min_chars > 0 and len(text) >= paste_min_chars:
+        return PASTE
+    return TYPE
+
+
+def split_chunks(text: str, size: int) -> List[str]:
+    """Split `text` into pieces of at most `size` chars, preferring to end after a newline, then a space."""
+    if size <= 0 or len(text) <= size:
+        return [text] if text else []
+    chunks: List[str] = []
+    start = 0
+    n = len(text)
+    while start < n:
+        end = min(n, start + size)
+        if end < n:
+            # Only back off to a break in the second half of the window
+            floor = start + size // 2
+            cut = text.rfind("\n", floor, end)
+            if cut < 0:
+                cut = text.rfind(" ", floor, end)
+            if cut >= 0:
+                end = cut + 1
+        chunks.append(text[start:end])
+        start = end
+    return chunks
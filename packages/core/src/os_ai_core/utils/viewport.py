@@ -0,0 +1,103 @@
+"""Mapping between a captured screen rectangle and the model's display canvas.
+
+The model always sees a `model_w` x `model_h` image. A viewport is the screen
+rectangle shown in that image (the whole screen, or only the focused window),
+scaled to fit and optionally letterboxed. Model coordinates are translated back
+through the same geometry, then shifted by the rectangle's screen offset.
+
+fit_viewport() shrinks the canvas to the scaled rectangle when letterboxing is
+off, so no image tokens are spent on black bars.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from os_ai_core.utils.resize import ResizeEngine
+
+
+@dataclass(frozen=True)
+class Viewport:
+    x: int
+    y: int
+    width: int
+    height: int
+    model_w: int
+    model_h: int
+    letterbox: bool = True
+
+    @property
+    def rect(self) -> Tuple[int, int, int, int]:
+        return self.x, self.y, self.width, self.height
+
+    @property
+    def content_size(self) -> Tuple[int, int]:
+        """Size of the scaled rectangle inside the model canvas."""
+        if not self.letterbox:
+            return self.model_w, self.model_h
+        src_aspect = self.width / float(max(1, self.height))
+        model_aspect = self.model_w / float(max(1, self.model_h))
+        if src_aspect > model_aspect:
+            return self.model_w, max(1, int(round(self.model_w / src_aspect)))
+        return max(1, int(round(self.model_h * src_aspect))), self.model_h
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        """Top-left of the content inside the canvas (letterbox bars)."""
+        cw, ch = self.content_size
+        return int((self.model_w - cw) / 2), int((self.model_h - ch) / 2)
+
+    def to_screen(self, mx: float, my: float) -> Tuple[int, int]:
+        """Model canvas point -> absolute screen point (clamped to the rectangle)."""
+        cw, ch = self.content_size
+        ox, oy = self.offset
+        cx = max(0.0, min(float(mx) - ox, float(cw) - 1.0))
+        cy = max(0.0, min(float(my) - oy, float(ch) - 1.0))
+        sx = int(round(cx * self.width / float(cw)))
+        sy = int(round(cy * self.height / float(ch)))
+        return self.x + min(sx, self.width - 1), self.y + min(sy, self.height - 1)
+
+    def region_to_screen(self, mx1: float, my1: float, mx2: float, my2: float) -> Tuple[int, int, int, int]:
+        """Model canvas rectangle -> screen (x1, y1, x2, y2); maps edges, so (0, 0, model_w, model_h) is the whole rectangle."""
+        cw, ch = self.content_size
+        ox, oy = self.offset
+
+        def edge(v: float, off: int, content: int, size: int, base: int) -> int:
+            t = max(0.0, min(float(v) - off, float(content)))
+            return base + int(round(t * size / float(content)))
+
+        return (
+            edge(mx1, ox, cw, self.width, self.x),
+            edge(my1, oy, ch, self.height, self.y),
+            edge(mx2, ox, cw, self.width, self.x),
+            edge(my2, oy, ch, self.height, self.y),
+        )
+
+    def to_screen_array(self, points: np.ndarray) -> np.ndarray:
+        """Vectorised to_screen() for an (n, 2) array of model points; returns int64 screen points."""
+        cw, ch = self.content_size
+        ox, oy = self.offset
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        cx = np.clip(pts[:, 0] - ox, 0.0, float(cw) - 1.0)
+        cy = np.clip(pts[:, 1] - oy, 0.0, float(ch) - 1.0)
+        sx = np.minimum(np.rint(cx * self.width / float(cw)), self.width - 1)
+        sy = np.minimum(np.rint(cy * self.height / float(ch)), self.height - 1)
+        return np.column_stack((sx + self.x, sy + self.y)).astype(np.int64)
+
+    def resize_engine(self, *, resample: str = "quality") -> ResizeEngine:
+        return ResizeEngine(self.content_size, (self.model_w, self.model_h), self.offset, resample=resample)
+
+
+def fit_viewport(x: int, y: int, width: int, height: int, box_w: int, box_h: int, *, letterbox: bool = False) -> Viewport:
+    """Viewport showing the rectangle inside a `box_w` x `box_h` budget.
+
+    With letterbox=False the canvas is exactly the fitted content (no bars);
+    with letterbox=True the canvas is the whole box with the content centred.
+    """
+    boxed = Viewport(int(x), int(y), max(1, int(width)), max(1, int(height)), max(1, int(box_w)), max(1, int(box_h)))
+    if letterbox:
+        return boxed
+    cw, ch = boxed.content_size
+    return Viewport(boxed.x, boxed.y, boxed.width, boxed.height, cw, ch)
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
-from .types import Message, ToolDescriptor, LLMResponse, ToolResult
+from .types import Message, ToolDescriptor, LLMResponse, ToolResult, StreamEvent
 
 
 class LLMClient(ABC):
@@ -28,6 +29,75 @@ class LLMClient(ABC):
                              (e.g., OpenAI's previous_response_id).
         """
 
+    async def agenerate(
+        self,
+        messages: List[Message],
+        tools: List[ToolDescriptor],
+        system: Optional[str] = None,
+        tool_choice: str = "auto",
+        max_tokens: int = 1024,
+        allow_parallel_tools: bool = True,
+        provider_context: Optional[Dict[str, Any]] = None,
+    ) -> LLMResponse:
+        """Async generate(). Providers with an async SDK override this; the default
+        runs the blocking generate() in a worker thread."""
+        return await asyncio.to_thread(
+            self.generate,
+            messages=messages,
+            tools=tools,
+            system=system,
+            tool_choice=tool_choice,
+            max_tokens=max_tokens,
+            allow_parallel_tools=allow_parallel_tools,
+            provider_context=provider_context,
+        )
+
+    def supports_streaming(self) -> bool:
+        """True when stream()/astream() deliver text and tool calls before the response is complete."""
+        return False
+
+    def stream(
+        self,
+        messages: List[Message],
+        tools: List[ToolDescriptor],
+        system: Optional[str] = None,
+        tool_choice: str = "auto",
+        max_tokens: int = 1024,
+        allow_parallel_tools: bool = True,
+        provider_context: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[StreamEvent]:
+        """Streaming generate(). The default yields only the final 'response' event."""
+        yield StreamEvent(kind="response", response=self.generate(
+            messages=messages,
+            tools=tools,
+            system=system,
+            tool_choice=tool_choice,
+            max_tokens=max_tokens,
+            allow_parallel_tools=allow_parallel_tools,
+            provider_context=provider_context,
+        ))
+
+    async def astream(
+        self,
+        messages: List[Message],
+        tools: List[ToolDescriptor],
+        system: Optional[str] = None,
+        tool_choice: str = "auto",
+        max_tokens: int = 1024,
+        allow_parallel_tools: bool = True,
+        provider_context: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """Async stream(). The default yields only the final 'response' event."""
+        yield StreamEvent(kind="response", response=await self.agenerate(
+            messages=messages,
+            tools=tools,
+            system=system,
+            tool_choice=tool_choice,
+            max_tokens=max_tokens,
+            allow_parallel_tools=allow_parallel_tools,
+            provider_context=provider_context,
+        ))
+
     @abstractmethod
     def format_tool_result(self, result: ToolResult) -> Message:
         """Format a provider-specific tool-result message to append to history."""
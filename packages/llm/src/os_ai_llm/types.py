@@ -19,6 +19,7 @@ class ImagePart:
     type: Literal["image"] = "image"
     media_type: str = "image/png"
     data_base64: str = ""  # base64-encoded image data
+    label: str = ""  # "zoom" for region captures that are not full-screen screenshots
 
 
 @dataclass
@@ -71,6 +72,9 @@ class Usage:
     input_tokens: int = 0
     output_tokens: int = 0
     provider_raw: Any = None
+    # Prompt caching (Anthropic): not included in input_tokens
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
 
 
 @dataclass
@@ -79,3 +83,19 @@ class LLMResponse:
     tool_calls: List[ToolCall]
     usage: Usage
     provider_context: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class StreamEvent:
+    """One item of LLMClient.stream().
+
+    kind:
+      text_delta  `text` is the next piece of assistant text
+      text        `text` is a completed assistant text block
+      tool_call   `tool_call` is complete (its input JSON closed) and can be executed
+      response    `response` is the final LLMResponse; always the last event
+    """
+    kind: Literal["text_delta", "text", "tool_call", "response"]
+    text: str = ""
+    tool_call: Optional[ToolCall] = None
+    response: Optional[LLMResponse] = None
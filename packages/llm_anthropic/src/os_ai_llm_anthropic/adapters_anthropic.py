@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-import os, time, random, logging
-from typing import Any, Dict, List, Optional
+import os, time, random, logging, asyncio
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 import json
 
 import anthropic
@@ -10,7 +10,11 @@ import httpx
 from os_ai_llm_anthropic.config import (
     MODEL_NAME,
     COMPUTER_TOOL_TYPE,
+    COMPUTER_ENABLE_ZOOM,
     COMPUTER_BETA_FLAG,
+    STREAMING_ENABLED,
+    PROMPT_CACHING_ENABLED,
+    PROMPT_CACHE_HISTORY_BREAKPOINTS,
 )
 from os_ai_llm.config import (
     API_REQUEST_TIMEOUT_SECONDS,
@@ -32,8 +36,55 @@ from os_ai_llm.types import (
     ImagePart,
     ToolCall,
     ProviderPart,
+    StreamEvent,
 )
 
+# The API accepts at most this many cache_control blocks per request
+MAX_CACHE_BREAKPOINTS = 4
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def _cacheable(block: Any) -> bool:
+    if not isinstance(block, dict) or block.get("type") in ("thinking", "redacted_thinking"):
+        return False
+    return not (block.get("type") == "text" and not block.get("text"))
+
+
+def with_cache_breakpoints(
+    tools: List[Dict[str, Any]],
+    system: Optional[str],
+    messages: List[Dict[str, Any]],
+    history_breakpoints: int = 2,
+) -> Tuple[List[Dict[str, Any]], Any, List[Dict[str, Any]]]:
+    """Return (tools, system, messages) with prompt-cache breakpoints.
+
+    The cached prefix is tools -> system -> messages: breakpoints go on the last
+    tool, the system prompt and the last block of the newest `history_breakpoints`
+    user turns (the previous turn's breakpoint is where this request's cache read
+    hits). Inputs are not modified; at most MAX_CACHE_BREAKPOINTS are placed.
+    """
+    budget = MAX_CACHE_BREAKPOINTS
+    out_tools = list(tools)
+    if out_tools and budget > 0:
+        out_tools[-1] = {**out_tools[-1], "cache_control": _EPHEMERAL}
+        budget -= 1
+    out_system: Any = system
+    if system and budget > 0:
+        out_system = [{"type": "text", "text": system, "cache_control": _EPHEMERAL}]
+        budget -= 1
+    out_messages = list(messages)
+    marks = min(budget, max(0, int(history_breakpoints)))
+    for idx in range(len(out_messages) - 1, -1, -1):
+        if marks <= 0:
+            break
+        m = out_messages[idx]
+        content = m.get("content")
+        if m.get("role") != "user" or not isinstance(content, list) or not content or not _cacheable(content[-1]):
+            continue
+        out_messages[idx] = {**m, "content": content[:-1] + [{**content[-1], "cache_control": _EPHEMERAL}]}
+        marks -= 1
+    return out_tools, out_system, out_messages
+
 
 class AnthropicClient(LLMClient):
     def __init__(self, api_key: Optional[str] = None, model_name: Optional[str] = None) -> None:
@@ -47,6 +98,9 @@ class AnthropicClient(LLMClient):
             self._client = anthropic.Anthropic(api_key=key, max_retries=0, timeout=httpx.Timeout(float(API_REQUEST_TIMEOUT_SECONDS)))  # type: ignore
         except Exception:
             self._client = anthropic.Anthropic(api_key=key)
+        self._api_key = key
+        # Created on first agenerate() call
+        self._aclient: Any = None
         self._model = model_name or MODEL_NAME
 
     def get_model_name(self) -> str:
@@ -82,14 +136,26 @@ class AnthropicClient(LLMClient):
         for t in tools:
             if t.kind == "computer_use":
                 params = dict(t.params)
-                out.append({
-                    "type": params.get("type", COMPUTER_TOOL_TYPE),
+                tool_type = params.get("type", COMPUTER_TOOL_TYPE)
+                tool_def: Dict[str, Any] = {
+                    "type": tool_type,
                     "name": t.name,
                     "display_width_px": params.get("display_width_px"),
                     "display_height_px": params.get("display_height_px"),
-                })
+                }
+                # zoom is only part of the computer_20251124+ tool versions
+                if params.get("enable_zoom", COMPUTER_ENABLE_ZOOM) and str(tool_type) >= "computer_20251124":
+                    tool_def["enable_zoom"] = True
+                out.append(tool_def)
             else:
-                out.append({"type": "tool", "name": t.name})
+                # Client tool: name + JSON schema (+ description)
+                tool_def = {
+                    "name": t.name,
+                    "input_schema": t.params.get("input_schema") or {"type": "object", "properties": {}},
+                }
+                if t.params.get("description"):
+                    tool_def["description"] = t.params["description"]
+                out.append(tool_def)
         return out
 
     def _parse_tool_calls(self, content: Any) -> List[ToolCall]:
@@ -102,16 +168,15 @@ class AnthropicClient(LLMClient):
                 calls.append(ToolCall(id=id_, name=name, args=args))
         return calls
 
-    def generate(
+    def _request_kwargs(
         self,
         messages: List[Message],
         tools: List[ToolDescriptor],
-        system: Optional[str] = None,
-        tool_choice: str = "auto",
-        max_tokens: int = 1024,
-        allow_parallel_tools: bool = True,
-        provider_context: Optional[Dict[str, Any]] = None,
-    ) -> LLMResponse:
+        system: Optional[str],
+        tool_choice: str,
+        max_tokens: int,
+        allow_parallel_tools: bool,
+    ) -> Dict[str, Any]:
         provider_messages = self._to_provider_messages(messages)
         provider_tools = self._to_provider_tools(tools)
 
@@ -137,66 +202,229 @@ class AnthropicClient(LLMClient):
                 new_blocks.append(b)
             patched_messages.append({"role": m.get("role"), "content": new_blocks})
 
+        system_param: Any = system
+        if PROMPT_CACHING_ENABLED:
+            provider_tools, system_param, patched_messages = with_cache_breakpoints(
+                provider_tools, system, patched_messages, PROMPT_CACHE_HISTORY_BREAKPOINTS
+            )
+
+        kwargs: Dict[str, Any] = dict(
+            model=self._model,
+            max_tokens=int(max_tokens),
+            tools=provider_tools,
+            messages=patched_messages,
+            betas=[COMPUTER_BETA_FLAG],
+            system=system_param,
+            tool_choice={
+                "type": tool_choice,
+                "disable_parallel_tool_use": (not bool(allow_parallel_tools)),
+            },
+            timeout=API_REQUEST_TIMEOUT_SECONDS,
+        )
+        if not provider_tools:
+            # Plain completions (history summaries): tool_choice requires tools
+            kwargs.pop("tools")
+            kwargs.pop("tool_choice")
+        return kwargs
+
+    def _retry_delay(self, e: httpx.HTTPStatusError, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a 429, or None when the error should be raised."""
         logger = logging.getLogger(LOGGER_NAME)
+        status = getattr(e.response, "status_code", None)
+        if status == 429 and attempt < int(API_MAX_RETRIES):
+            retry_after_hdr = None
+            try:
+                retry_after_hdr = e.response.headers.get("retry-after")
+            except Exception:
+                retry_after_hdr = None
+            if retry_after_hdr:
+                try:
+                    backoff = float(retry_after_hdr)
+                except Exception:
+                    backoff = float(API_BACKOFF_BASE_SECONDS)
+            else:
+                backoff = min(
+                    float(API_BACKOFF_MAX_SECONDS),
+                    float(API_BACKOFF_BASE_SECONDS) * (2 ** (attempt - 1)) + random.uniform(0, float(API_BACKOFF_JITTER_SECONDS)),
+                )
+            try:
+                logger.warning(f"Rate limited (429). Attempt {attempt}/{int(API_MAX_RETRIES)-1}. Waiting {backoff:.2f}s before retry...")
+            except Exception:
+                pass
+            return backoff
+        try:
+            body = None
+            try:
+                body = e.response.json()
+            except Exception:
+                body = e.response.text
+            logger.error(f"HTTP {status} from Anthropic: {body}")
+        except Exception:
+            pass
+        return None
+
+    def generate(
+        self,
+        messages: List[Message],
+        tools: List[ToolDescriptor],
+        system: Optional[str] = None,
+        tool_choice: str = "auto",
+        max_tokens: int = 1024,
+        allow_parallel_tools: bool = True,
+        provider_context: Optional[Dict[str, Any]] = None,
+    ) -> LLMResponse:
+        kwargs = self._request_kwargs(messages, tools, system, tool_choice, max_tokens, allow_parallel_tools)
         resp = None
         last_err: Exception | None = None
         for attempt in range(1, int(API_MAX_RETRIES) + 1):
             try:
-                resp = self._client.beta.messages.create(
-                    model=self._model,
-                    max_tokens=int(max_tokens),
-                    tools=provider_tools,
-                    messages=patched_messages,
-                    betas=[COMPUTER_BETA_FLAG],
-                    system=system,
-                    tool_choice={
-                        "type": tool_choice,
-                        "disable_parallel_tool_use": (not bool(allow_parallel_tools)),
-                    },
-                    timeout=API_REQUEST_TIMEOUT_SECONDS,
-                )
+                resp = self._client.beta.messages.create(**kwargs)
                 break
             except httpx.HTTPStatusError as e:
                 last_err = e
-                status = getattr(e.response, "status_code", None)
-                if status == 429 and attempt < int(API_MAX_RETRIES):
-                    retry_after_hdr = None
-                    try:
-                        retry_after_hdr = e.response.headers.get("retry-after")
-                    except Exception:
-                        retry_after_hdr = None
-                    if retry_after_hdr:
-                        try:
-                            backoff = float(retry_after_hdr)
-                        except Exception:
-                            backoff = float(API_BACKOFF_BASE_SECONDS)
-                    else:
-                        backoff = min(
-                            float(API_BACKOFF_MAX_SECONDS),
-                            float(API_BACKOFF_BASE_SECONDS) * (2 ** (attempt - 1)) + random.uniform(0, float(API_BACKOFF_JITTER_SECONDS)),
-                        )
-                    try:
-                        logger.warning(f"Rate limited (429). Attempt {attempt}/{int(API_MAX_RETRIES)-1}. Waiting {backoff:.2f}s before retry...")
-                    except Exception:
-                        pass
-                    time.sleep(backoff)
-                    continue
-                try:
-                    body = None
-                    try:
-                        body = e.response.json()
-                    except Exception:
-                        body = e.response.text
-                    logger.error(f"HTTP {status} from Anthropic: {body}")
-                except Exception:
-                    pass
+                backoff = self._retry_delay(e, attempt)
+                if backoff is None:
+                    raise
+                time.sleep(backoff)
+                continue
+            except Exception as e:
+                last_err = e
                 raise
+        if resp is None and last_err is not None:
+            raise last_err
+        return self._parse_response(resp)
+
+    def _async_client(self) -> Any:
+        if self._aclient is None:
+            try:
+                self._aclient = anthropic.AsyncAnthropic(api_key=self._api_key, max_retries=0, timeout=httpx.Timeout(float(API_REQUEST_TIMEOUT_SECONDS)))  # type: ignore
+            except Exception:
+                self._aclient = anthropic.AsyncAnthropic(api_key=self._api_key)
+        return self._aclient
+
+    async def agenerate(
+        self,
+        messages: List[Message],
+        tools: List[ToolDescriptor],
+        system: Optional[str] = None,
+        tool_choice: str = "auto",
+        max_tokens: int = 1024,
+        allow_parallel_tools: bool = True,
+        provider_context: Optional[Dict[str, Any]] = None,
+    ) -> LLMResponse:
+        """Same as generate() on anthropic.AsyncAnthropic; 429 backoff does not block the event loop."""
+        kwargs = self._request_kwargs(messages, tools, system, tool_choice, max_tokens, allow_parallel_tools)
+        client = self._async_client()
+        resp = None
+        last_err: Exception | None = None
+        for attempt in range(1, int(API_MAX_RETRIES) + 1):
+            try:
+                resp = await client.beta.messages.create(**kwargs)
+                break
+            except httpx.HTTPStatusError as e:
+                last_err = e
+                backoff = self._retry_delay(e, attempt)
+                if backoff is None:
+                    raise
+                await asyncio.sleep(backoff)
+                continue
             except Exception as e:
                 last_err = e
                 raise
         if resp is None and last_err is not None:
             raise last_err
+        return self._parse_response(resp)
+
+    def supports_streaming(self) -> bool:
+        return bool(STREAMING_ENABLED)
+
+    def _stream_event(self, ev: Any) -> Optional[StreamEvent]:
+        """Map an SDK message-stream event to a StreamEvent (None for events we do not surface)."""
+        etype = getattr(ev, "type", None)
+        if etype == "text":
+            delta = getattr(ev, "text", "")
+            return StreamEvent(kind="text_delta", text=delta) if delta else None
+        if etype == "content_block_stop":
+            block = getattr(ev, "content_block", None)
+            btype = getattr(block, "type", None)
+            if btype == "text":
+                return StreamEvent(kind="text", text=getattr(block, "text", "") or "")
+            if btype == "tool_use":
+                calls = self._parse_tool_calls([block])
+                return StreamEvent(kind="tool_call", tool_call=calls[0]) if calls else None
+        return None
+
+    def stream(
+        self,
+        messages: List[Message],
+        tools: List[ToolDescriptor],
+        system: Optional[str] = None,
+        tool_choice: str = "auto",
+        max_tokens: int = 1024,
+        allow_parallel_tools: bool = True,
+        provider_context: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[StreamEvent]:
+        """generate() over the SDK message stream.
+
+        A 429 is retried only while nothing has been yielded yet.
+        """
+        kwargs = self._request_kwargs(messages, tools, system, tool_choice, max_tokens, allow_parallel_tools)
+        final = None
+        yielded = False
+        for attempt in range(1, int(API_MAX_RETRIES) + 1):
+            try:
+                with self._client.beta.messages.stream(**kwargs) as s:
+                    for ev in s:
+                        out = self._stream_event(ev)
+                        if out is not None:
+                            yielded = True
+                            yield out
+                    final = s.get_final_message()
+                break
+            except httpx.HTTPStatusError as e:
+                backoff = None if yielded else self._retry_delay(e, attempt)
+                if backoff is None:
+                    raise
+                time.sleep(backoff)
+        if final is None:
+            raise RuntimeError("Anthropic stream ended without a message")
+        yield StreamEvent(kind="response", response=self._parse_response(final))
+
+    async def astream(
+        self,
+        messages: List[Message],
+        tools: List[ToolDescriptor],
+        system: Optional[str] = None,
+        tool_choice: str = "auto",
+        max_tokens: int = 1024,
+        allow_parallel_tools: bool = True,
+        provider_context: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """Async stream() on anthropic.AsyncAnthropic."""
+        kwargs = self._request_kwargs(messages, tools, system, tool_choice, max_tokens, allow_parallel_tools)
+        client = self._async_client()
+        final = None
+        yielded = False
+        for attempt in range(1, int(API_MAX_RETRIES) + 1):
+            try:
+                async with client.beta.messages.stream(**kwargs) as s:
+                    async for ev in s:
+                        out = self._stream_event(ev)
+                        if out is not None:
+                            yielded = True
+                            yield out
+                    final = await s.get_final_message()
+                break
+            except httpx.HTTPStatusError as e:
+                backoff = None if yielded else self._retry_delay(e, attempt)
+                if backoff is None:
+                    raise
+                await asyncio.sleep(backoff)
+        if final is None:
+            raise RuntimeError("Anthropic stream ended without a message")
+        yield StreamEvent(kind="response", response=self._parse_response(final))
 
+    def _parse_response(self, resp: Any) -> LLMResponse:
         # Convert assistant message content — use ProviderPart instead of text markers
         assistant_texts: List[str] = []
         tool_use_blocks: List[Dict[str, Any]] = []
@@ -222,18 +450,33 @@ class AnthropicClient(LLMClient):
         # Usage mapping
         in_tokens = 0
         out_tokens = 0
+        cache_write = 0
+        cache_read = 0
         try:
             usage = getattr(resp, "usage", None)
             if usage is not None:
                 in_tokens = int(getattr(usage, "input_tokens", 0) or 0)
                 out_tokens = int(getattr(usage, "output_tokens", 0) or 0)
+                cache_write = int(getattr(usage, "cache_creation_input_tokens", 0) or 0)
+                cache_read = int(getattr(usage, "cache_read_input_tokens", 0) or 0)
         except Exception:
             pass
 
         return LLMResponse(
             messages=[assistant_msg],
             tool_calls=tool_calls,
-            usage=Usage(input_tokens=in_tokens, output_tokens=out_tokens, provider_raw={"input_tokens": in_tokens, "output_tokens": out_tokens}),
+            usage=Usage(
+                input_tokens=in_tokens,
+                output_tokens=out_tokens,
+                provider_raw={
+                    "input_tokens": in_tokens,
+                    "output_tokens": out_tokens,
+                    "cache_creation_input_tokens": cache_write,
+                    "cache_read_input_tokens": cache_read,
+                },
+                cache_creation_input_tokens=cache_write,
+                cache_read_input_tokens=cache_read,
+            ),
         )
 
     def format_tool_result(self, result: ToolResult) -> Message:
@@ -2,3 +2,10 @@
 MODEL_NAME = 'claude-sonnet-4-6'
 COMPUTER_TOOL_TYPE = 'computer_20251124'
 COMPUTER_BETA_FLAG = 'computer-use-2025-11-24'
+# Let the model request zoomed region captures (computer_20251124+)
+COMPUTER_ENABLE_ZOOM = True
+# Stream responses: text deltas as they arrive, tool calls executed as soon as their input is complete
+STREAMING_ENABLED = True
+# Prompt caching: breakpoints on the tools, the system prompt and the newest user turns
+PROMPT_CACHING_ENABLED = True
+PROMPT_CACHE_HISTORY_BREAKPOINTS = 2
@@ -12,7 +12,7 @@ import logging
 import sys
 from typing import Any, Dict, List
 
-from os_ai_llm_openai.config import SCROLL_PIXELS_PER_CLICK
+from os_ai_llm_openai.config import SCROLL_PIXELS_PER_CLICK, WAIT_SETTLE_TIMEOUT_SECONDS
 
 _LOGGER = logging.getLogger("os_ai")
 
@@ -149,7 +149,22 @@ def openai_action_to_internal(action: Dict[str, Any]) -> Dict[str, Any]:
         return {"action": "screenshot"}
 
     if action_type == "wait":
-        return {"action": "wait", "seconds": 2.0}
+        return {"action": "wait_until_stable", "timeout": WAIT_SETTLE_TIMEOUT_SECONDS}
+
+    if action_type in ("zoom", "screenshot_region"):
+        region = action.get("region")
+        if isinstance(region, (list, tuple)) and len(region) == 4:
+            return {"action": "zoom", "region": [int(v) for v in region]}
+        if all(k in action for k in ("x", "y", "width", "height")):
+            return {
+                "action": "screenshot_region",
+                "x": int(action["x"]),
+                "y": int(action["y"]),
+                "width": int(action["width"]),
+                "height": int(action["height"]),
+            }
+        _LOGGER.warning("Zoom without region, fallback to screenshot")
+        return {"action": "screenshot"}
 
     _LOGGER.warning("Unknown OpenAI action type '%s', fallback to screenshot", action_type)
     return {"action": "screenshot"}
@@ -12,7 +12,7 @@ import logging
 from typing import Any, Dict, List, Optional
 
 import httpx
-from openai import OpenAI, RateLimitError, APIStatusError, APIConnectionError, APITimeoutError
+from openai import OpenAI, AsyncOpenAI, RateLimitError, APIStatusError, APIConnectionError, APITimeoutError
 
 from os_ai_llm_openai.config import (
     OPENAI_MODEL_NAME,
@@ -54,7 +54,12 @@ class OpenAIClient(LLMClient):
             timeout=httpx.Timeout(float(OPENAI_API_TIMEOUT_SECONDS)),
             max_retries=OPENAI_API_MAX_RETRIES,
         )
+        self._api_key = key
+        # Created on first agenerate() call
+        self._aclient: Optional[AsyncOpenAI] = None
         self._model = model_name or OPENAI_MODEL_NAME
+        # Last screenshot sent; re-attached when a tool reports the screen as unchanged
+        self._last_screenshot: Optional[tuple] = None
 
     def get_model_name(self) -> str:
         return self._model
@@ -237,16 +242,13 @@ class OpenAIClient(LLMClient):
 
     # ---- Main generate method ----
 
-    def generate(
+    def _request_kwargs(
         self,
         messages: List[Message],
         tools: List[ToolDescriptor],
-        system: Optional[str] = None,
-        tool_choice: str = "auto",
-        max_tokens: int = 1024,
-        allow_parallel_tools: bool = True,
-        provider_context: Optional[Dict[str, Any]] = None,
-    ) -> LLMResponse:
+        system: Optional[str],
+        provider_context: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
         logger = logging.getLogger(LOGGER_NAME)
 
         provider_tools: List[Dict[str, Any]] = []
@@ -286,41 +288,110 @@ class OpenAIClient(LLMClient):
                       self._model, previous_response_id, type(input_data).__name__,
                       len(input_data) if isinstance(input_data, list) else "str")
 
-        try:
-            resp = self._client.responses.create(**kwargs)
-        except APIStatusError as e:
-            # Fallback: if previous_response_id expired/invalid, retry without it
-            if previous_response_id and e.status_code in (400, 404):
+        return kwargs
+
+    def _failed_response(
+        self,
+        e: Exception,
+        kwargs: Dict[str, Any],
+        messages: List[Message],
+        system: Optional[str],
+        provider_context: Optional[Dict[str, Any]],
+    ) -> Optional[LLMResponse]:
+        """Map a request error to an LLMResponse.
+
+        Returns None when the request should be retried with the (already rewritten)
+        kwargs: an expired/invalid previous_response_id falls back to full context.
+        """
+        logger = logging.getLogger(LOGGER_NAME)
+        if isinstance(e, APIStatusError):
+            if kwargs.get("previous_response_id") and e.status_code in (400, 404):
                 logger.warning("previous_response_id rejected (%s), falling back to full context", e.status_code)
                 kwargs.pop("previous_response_id", None)
                 kwargs["input"] = self._build_initial_input(messages, system)
-                try:
-                    resp = self._client.responses.create(**kwargs)
-                except Exception as retry_err:
-                    logger.error("OpenAI retry without previous_response_id failed: %s", retry_err)
-                    return LLMResponse(
-                        messages=[Message(role="assistant", content=[TextPart(text=f"API error: {retry_err}")])],
-                        tool_calls=[], usage=Usage(),
-                    )
-            else:
-                logger.error("OpenAI API error %s: %s", e.status_code, e.message)
-                return LLMResponse(
-                    messages=[Message(role="assistant", content=[TextPart(text=f"API error: {e.message}")])],
-                    tool_calls=[], usage=Usage(),
-                )
-        except RateLimitError as e:
+                return None
+            logger.error("OpenAI API error %s: %s", e.status_code, e.message)
+            return LLMResponse(
+                messages=[Message(role="assistant", content=[TextPart(text=f"API error: {e.message}")])],
+                tool_calls=[], usage=Usage(),
+            )
+        if isinstance(e, RateLimitError):
             logger.error("Rate limited by OpenAI (retries exhausted): %s", e)
             return LLMResponse(
                 messages=[Message(role="assistant", content=[TextPart(text=f"Rate limited: {e}")])],
                 tool_calls=[], usage=Usage(),
                 provider_context={"previous_response_id": provider_context.get("previous_response_id") if provider_context else None},
             )
-        except (APIConnectionError, APITimeoutError) as e:
-            logger.error("OpenAI connection/timeout: %s", e)
-            return LLMResponse(
-                messages=[Message(role="assistant", content=[TextPart(text=f"Connection error: {e}")])],
-                tool_calls=[], usage=Usage(),
+        logger.error("OpenAI connection/timeout: %s", e)
+        return LLMResponse(
+            messages=[Message(role="assistant", content=[TextPart(text=f"Connection error: {e}")])],
+            tool_calls=[], usage=Usage(),
+        )
+
+    @staticmethod
+    def _retry_failed_response(retry_err: Exception) -> LLMResponse:
+        logging.getLogger(LOGGER_NAME).error("OpenAI retry without previous_response_id failed: %s", retry_err)
+        return LLMResponse(
+            messages=[Message(role="assistant", content=[TextPart(text=f"API error: {retry_err}")])],
+            tool_calls=[], usage=Usage(),
+        )
+
+    def generate(
+        self,
+        messages: List[Message],
+        tools: List[ToolDescriptor],
+        system: Optional[str] = None,
+        tool_choice: str = "auto",
+        max_tokens: int = 1024,
+        allow_parallel_tools: bool = True,
+        provider_context: Optional[Dict[str, Any]] = None,
+    ) -> LLMResponse:
+        kwargs = self._request_kwargs(messages, tools, system, provider_context)
+        try:
+            resp = self._client.responses.create(**kwargs)
+        except (APIStatusError, RateLimitError, APIConnectionError, APITimeoutError) as e:
+            failed = self._failed_response(e, kwargs, messages, system, provider_context)
+            if failed is not None:
+                return failed
+            try:
+                resp = self._client.responses.create(**kwargs)
+            except Exception as retry_err:
+                return self._retry_failed_response(retry_err)
+
+        return self._parse_response(resp)
+
+    def _async_client(self) -> AsyncOpenAI:
+        if self._aclient is None:
+            self._aclient = AsyncOpenAI(
+                api_key=self._api_key,
+                timeout=httpx.Timeout(float(OPENAI_API_TIMEOUT_SECONDS)),
+                max_retries=OPENAI_API_MAX_RETRIES,
             )
+        return self._aclient
+
+    async def agenerate(
+        self,
+        messages: List[Message],
+        tools: List[ToolDescriptor],
+        system: Optional[str] = None,
+        tool_choice: str = "auto",
+        max_tokens: int = 1024,
+        allow_parallel_tools: bool = True,
+        provider_context: Optional[Dict[str, Any]] = None,
+    ) -> LLMResponse:
+        """Same as generate() on AsyncOpenAI."""
+        kwargs = self._request_kwargs(messages, tools, system, provider_context)
+        client = self._async_client()
+        try:
+            resp = await client.responses.create(**kwargs)
+        except (APIStatusError, RateLimitError, APIConnectionError, APITimeoutError) as e:
+            failed = self._failed_response(e, kwargs, messages, system, provider_context)
+            if failed is not None:
+                return failed
+            try:
+                resp = await client.responses.create(**kwargs)
+            except Exception as retry_err:
+                return self._retry_failed_response(retry_err)
 
         return self._parse_response(resp)
 
@@ -333,12 +404,21 @@ class OpenAIClient(LLMClient):
         screenshot_b64 = ""
         media_type = "image/png"
 
+        zoom_parts: List[ImagePart] = []
         for p in result.content:
             if isinstance(p, ImagePart):
+                if p.label == "zoom":
+                    zoom_parts.append(p)
+                    continue
                 screenshot_b64 = p.data_base64
                 media_type = p.media_type
 
-        if not screenshot_b64:
+        if screenshot_b64:
+            self._last_screenshot = (screenshot_b64, media_type)
+        elif self._last_screenshot is not None:
+            # computer_call_output must carry a screenshot: reuse the previous (identical) frame
+            screenshot_b64, media_type = self._last_screenshot
+        else:
             logger.warning("No screenshot in tool result — OpenAI requires one. Check tool handler.")
 
         output_item: Dict[str, Any] = {
@@ -357,11 +437,22 @@ class OpenAIClient(LLMClient):
                 for sc in pending_checks
             ]
 
+        data: Any = output_item
+        if zoom_parts:
+            # Region captures are not the screen state; send them as a follow-up user input
+            notes = [p.text for p in result.content if isinstance(p, TextPart) and p.text.startswith("zoomed view")]
+            content: List[Dict[str, Any]] = [{"type": "input_text", "text": t} for t in notes]
+            content.extend(
+                {"type": "input_image", "image_url": f"data:{p.media_type};base64,{p.data_base64}", "detail": "high"}
+                for p in zoom_parts
+            )
+            data = [output_item, {"role": "user", "content": content}]
+
         return Message(
             role="user",
             content=[ProviderPart(
                 provider="openai",
                 sub_type="computer_call_output",
-                data=output_item,
+                data=data,
             )],
         )
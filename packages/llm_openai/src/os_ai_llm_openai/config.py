@@ -7,3 +7,5 @@ OPENAI_REASONING_SUMMARY = "auto"
 OPENAI_SCREENSHOT_DETAIL = "original"
 OPENAI_AUTO_ACKNOWLEDGE_SAFETY_CHECKS = True
 SCROLL_PIXELS_PER_CLICK = int(os.environ.get("SCROLL_PIXELS_PER_CLICK", "100"))
+# OpenAI "wait" has no duration: wait for the screen to stop changing, at most this long
+WAIT_SETTLE_TIMEOUT_SECONDS = 2.0
@@ -181,7 +181,7 @@ def test_screenshot():
 
 def test_wait_default():
     r = openai_action_to_internal({"type": "wait"})
-    assert r == {"action": "wait", "seconds": 2.0}
+    assert r == {"action": "wait_until_stable", "timeout": 2.0}
 
 
 def test_unknown_action():
@@ -200,3 +200,20 @@ def test_batch_converter():
     assert len(results) == 2
     assert results[0]["action"] == "left_click"
     assert results[1]["action"] == "type"
+
+
+# === Zoom / region capture ===
+
+
+def test_zoom_with_region():
+    result = openai_action_to_internal({"type": "zoom", "region": [10, 20, 410, 320]})
+    assert result == {"action": "zoom", "region": [10, 20, 410, 320]}
+
+
+def test_screenshot_region_xywh():
+    result = openai_action_to_internal({"type": "screenshot_region", "x": 5, "y": 6, "width": 400, "height": 300})
+    assert result == {"action": "screenshot_region", "x": 5, "y": 6, "width": 400, "height": 300}
+
+
+def test_zoom_without_region_falls_back_to_screenshot():
+    assert openai_action_to_internal({"type": "zoom"}) == {"action": "screenshot"}
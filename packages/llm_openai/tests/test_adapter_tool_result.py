@@ -0,0 +1,48 @@
+"""Tests for OpenAIClient.format_tool_result (computer_call_output construction)."""
+
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "llm", "src"))
+
+from os_ai_llm.types import ImagePart, TextPart, ToolResult  # noqa: E402
+from os_ai_llm_openai.adapters_openai import OpenAIClient  # noqa: E402
+
+
+def _client(monkeypatch) -> OpenAIClient:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    return OpenAIClient()
+
+
+def test_screenshot_becomes_computer_call_output(monkeypatch):
+    client = _client(monkeypatch)
+    msg = client.format_tool_result(ToolResult(tool_call_id="c1", content=[ImagePart(media_type="image/jpeg", data_base64="AAA")]))
+    item = msg.content[0].data
+    assert item["type"] == "computer_call_output"
+    assert item["output"]["image_url"] == "data:image/jpeg;base64,AAA"
+
+
+def test_unchanged_screen_reuses_previous_screenshot(monkeypatch):
+    client = _client(monkeypatch)
+    client.format_tool_result(ToolResult(tool_call_id="c1", content=[ImagePart(media_type="image/png", data_base64="BBB")]))
+    msg = client.format_tool_result(ToolResult(tool_call_id="c2", content=[TextPart(text="screen unchanged since step 1")]))
+    assert msg.content[0].data["output"]["image_url"] == "data:image/png;base64,BBB"
+
+
+def test_zoom_images_follow_as_user_input(monkeypatch):
+    client = _client(monkeypatch)
+    result = ToolResult(tool_call_id="c3", content=[
+        TextPart(text="zoomed view of region (0,0)-(100,50) at 1024x512"),
+        ImagePart(media_type="image/jpeg", data_base64="ZOOM", label="zoom"),
+        ImagePart(media_type="image/jpeg", data_base64="FULL"),
+    ])
+    items = client.format_tool_result(result).content[0].data
+    assert isinstance(items, list) and len(items) == 2
+    assert items[0]["output"]["image_url"].endswith("FULL")
+    follow_up = items[1]
+    assert follow_up["role"] == "user"
+    assert follow_up["content"][0]["text"].startswith("zoomed view")
+    assert follow_up["content"][1]["image_url"].endswith("ZOOM")
@@ -2,23 +2,32 @@
 
 Uses shared pyautogui-based defaults from os_ai_os.defaults.
 Adds Linux-specific: DPI detection via GDK_SCALE,
-Wayland/X11 permission checks, scrot availability check.
+Wayland/X11 permission checks, scrot availability check,
+a persistent X11 (MIT-SHM) screen capture backend and
+persistent XTest mouse/keyboard injection and an in-process
+CLIPBOARD owner.
 """
 from __future__ import annotations
 
 import logging
 import os
 import shutil
+from typing import Any, Optional, Tuple
 
 from os_ai_os.defaults import (
     PyAutoGUIMouse,
     PyAutoGUIKeyboard,
     PyAutoGUIScreen,
+    PyperclipClipboard,
     NoOpOverlay,
     NoOpSound,
 )
 from os_ai_os.platform.drivers import PlatformDrivers
-from os_ai_os.ports.types import Capabilities
+from os_ai_os.ports.types import Capabilities, Rect, Size
+
+from .x11_capture import X11Capture
+from .x11_clipboard import X11Clipboard
+from .xtest_input import XTestInput, XTestKeyboard, XTestMouse
 
 _log = logging.getLogger("os_ai")
 
@@ -51,6 +60,98 @@ class LinuxPermissions:
             )
 
 
+class XShmScreen(PyAutoGUIScreen):
+    """Screen backed by a persistent X connection (MIT-SHM, XGetImage fallback).
+
+    Frames are read into a reusable buffer instead of going through
+    pyscreeze's scrot subprocess and temporary PNG. Falls back to the
+    pyautogui implementation if the X request fails.
+    """
+
+    def __init__(self, capture: X11Capture) -> None:
+        self._capture = capture
+
+    @property
+    def backend(self) -> str:
+        return self._capture.backend
+
+    def size(self) -> Size:
+        try:
+            w, h = self._capture.size()
+            if w > 0 and h > 0:
+                return Size(width=w, height=h)
+        except Exception:
+            pass
+        return super().size()
+
+    def screenshot(self, region: Optional[Tuple[int, int, int, int]] = None):
+        try:
+            return self._capture.grab_image(region)
+        except Exception as e:
+            _log.warning("X11 capture failed, using pyautogui: %s", e)
+            return super().screenshot(region)
+
+    def grab_array(self, region: Optional[Tuple[int, int, int, int]] = None) -> Any:
+        """(h, w, 4) BGRX NumPy view of the frame; valid until the next grab."""
+        return self._capture.grab_array(region)
+
+    def display_changed(self) -> Optional[bool]:
+        """RandR screen-change notification since the last call (None: no RandR, poll instead)."""
+        try:
+            return self._capture.display_changed()
+        except Exception:
+            return None
+
+    def active_window_rect(self) -> Optional[Rect]:
+        """Screen rectangle of the focused window (_NET_ACTIVE_WINDOW), None if unknown."""
+        try:
+            rect = self._capture.active_window_rect()
+        except Exception as e:
+            _log.debug("Active window lookup failed: %s", e)
+            return None
+        if rect is None:
+            return None
+        return Rect(x=rect[0], y=rect[1], width=rect[2], height=rect[3])
+
+
+def _make_screen() -> Tuple[PyAutoGUIScreen, str]:
+    """Pick the screen backend: OS_AI_CAPTURE_BACKEND=auto (default) | x11 | pyautogui."""
+    choice = (os.environ.get("OS_AI_CAPTURE_BACKEND") or "auto").strip().lower()
+    if choice != "pyautogui" and os.environ.get("DISPLAY"):
+        try:
+            screen = XShmScreen(X11Capture(os.environ.get("DISPLAY")))
+            return screen, screen.backend
+        except Exception as e:
+            log = _log.warning if choice == "x11" else _log.debug
+            log("Native X11 capture unavailable, using pyautogui: %s", e)
+    return PyAutoGUIScreen(), "pyautogui"
+
+
+def _make_input() -> Tuple[PyAutoGUIMouse, PyAutoGUIKeyboard, str]:
+    """Pick the input backend: OS_AI_INPUT_BACKEND=auto (default) | xtest | pyautogui."""
+    choice = (os.environ.get("OS_AI_INPUT_BACKEND") or "auto").strip().lower()
+    if choice != "pyautogui" and os.environ.get("DISPLAY"):
+        try:
+            xinput = XTestInput(os.environ.get("DISPLAY"))
+            return XTestMouse(xinput), XTestKeyboard(xinput), "xtest"
+        except Exception as e:
+            log = _log.warning if choice == "xtest" else _log.debug
+            log("XTest input unavailable, using pyautogui: %s", e)
+    return PyAutoGUIMouse(), PyAutoGUIKeyboard(), "pyautogui"
+
+
+def _make_clipboard() -> Tuple[Any, str]:
+    """Pick the clipboard backend: OS_AI_CLIPBOARD_BACKEND=auto (default) | x11 | pyperclip."""
+    choice = (os.environ.get("OS_AI_CLIPBOARD_BACKEND") or "auto").strip().lower()
+    if choice != "pyperclip" and os.environ.get("DISPLAY"):
+        try:
+            return X11Clipboard(os.environ.get("DISPLAY")), "x11"
+        except Exception as e:
+            log = _log.warning if choice == "x11" else _log.debug
+            log("X11 clipboard unavailable, using pyperclip: %s", e)
+    return PyperclipClipboard(), "pyperclip"
+
+
 def _detect_scale() -> float:
     """Detect Linux display scale via GDK_SCALE env var."""
     raw = os.environ.get("GDK_SCALE", "")
@@ -74,20 +175,30 @@ def make_drivers() -> PlatformDrivers:
     perms.ensure_input_access()
     perms.ensure_screen_recording()
 
-    has_screen = perms.has_screen_recording()
+    screen, capture_backend = _make_screen()
+    mouse, keyboard, input_backend = _make_input()
+    clipboard, clipboard_backend = _make_clipboard()
+    # Native capture does not need scrot/gnome-screenshot
+    has_screen = perms.has_screen_recording() or capture_backend != "pyautogui"
 
     return PlatformDrivers(
-        mouse=PyAutoGUIMouse(),
-        keyboard=PyAutoGUIKeyboard(),
-        screen=PyAutoGUIScreen(),
+        mouse=mouse,
+        keyboard=keyboard,
+        screen=screen,
         overlay=NoOpOverlay(),
         permissions=perms,
         sound=NoOpSound(),
+        clipboard=clipboard,
         capabilities=Capabilities(
             supports_synthetic_input=True,
             supports_click_through_overlay=False,
             supports_smooth_move=True,
             dpi_scale=_detect_scale(),
             screen_recording_available=has_screen,
+            capture_backend=capture_backend,
+            supports_window_capture=isinstance(screen, XShmScreen),
+            input_backend=input_backend,
+            clipboard_backend=clipboard_backend,
+            supports_unicode_typing=input_backend == "xtest",
         ),
     )
@@ -0,0 +1,460 @@
+"""Persistent X11 frame grabber (MIT-SHM with XGetImage fallback).
+
+Keeps one Xlib connection open for the lifetime of the process and reads frames
+straight from the X server into a reusable shared-memory segment, avoiding the
+scrot/gnome-screenshot subprocess and temporary PNG round-trip used by
+pyscreeze. Bound via ctypes to libX11/libXext so no extra Python dependency
+is required.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+_log = logging.getLogger("os_ai")
+
+_ZPIXMAP = 2
+_ANY_PROPERTY_TYPE = 0
+_IPC_PRIVATE = 0
+_IPC_CREAT = 0o1000
+_IPC_RMID = 0
+_RR_SCREEN_CHANGE_NOTIFY = 0
+_RR_SCREEN_CHANGE_NOTIFY_MASK = 1 << 0
+_ALL_PLANES = ctypes.c_ulong(-1 & ((1 << (8 * ctypes.sizeof(ctypes.c_ulong))) - 1))
+
+
+class _XImageFuncs(ctypes.Structure):
+    _fields_ = [
+        ("create_image", ctypes.c_void_p),
+        ("destroy_image", ctypes.c_void_p),
+        ("get_pixel", ctypes.c_void_p),
+        ("put_pixel", ctypes.c_void_p),
+        ("sub_image", ctypes.c_void_p),
+        ("add_pixel", ctypes.c_void_p),
+    ]
+
+
+class _XImage(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong),
+        ("green_mask", ctypes.c_ulong),
+        ("blue_mask", ctypes.c_ulong),
+        ("obdata", ctypes.c_void_p),
+        ("f", _XImageFuncs),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+class _XErrorEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("display", ctypes.c_void_p),
+        ("resourceid", ctypes.c_ulong),
+        ("serial", ctypes.c_ulong),
+        ("error_code", ctypes.c_ubyte),
+        ("request_code", ctypes.c_ubyte),
+        ("minor_code", ctypes.c_ubyte),
+    ]
+
+
+_XImagePtr = ctypes.POINTER(_XImage)
+_DestroyImageFn = ctypes.CFUNCTYPE(ctypes.c_int, _XImagePtr)
+_XErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(_XErrorEvent))
+
+_libs: Dict[str, Any] = {}
+_errors: list = []
+
+
+@_XErrorHandler
+def _on_x_error(_display, event):  # pragma: no cover - only invoked by a live X server
+    # Default Xlib handler calls exit(); record instead so callers can fall back
+    try:
+        _errors.append(int(event.contents.error_code))
+    except Exception:
+        _errors.append(-1)
+    return 0
+
+
+def _load_libs() -> Tuple[Any, Optional[Any], Any]:
+    if not _libs:
+        x11_name = ctypes.util.find_library("X11") or "libX11.so.6"
+        xext_name = ctypes.util.find_library("Xext") or "libXext.so.6"
+        x11 = ctypes.CDLL(x11_name)
+        try:
+            xext = ctypes.CDLL(xext_name)
+        except OSError:
+            xext = None
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        x11.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        x11.XRootWindow.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XRootWindow.restype = ctypes.c_ulong
+        x11.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultVisual.restype = ctypes.c_void_p
+        x11.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XGetGeometry.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint),
+            ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint),
+        ]
+        x11.XGetImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int, ctypes.c_int,
+            ctypes.c_uint, ctypes.c_uint, ctypes.c_ulong, ctypes.c_int,
+        ]
+        x11.XGetImage.restype = _XImagePtr
+        x11.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+        x11.XInternAtom.restype = ctypes.c_ulong
+        x11.XGetWindowProperty.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_long, ctypes.c_long, ctypes.c_int,
+            ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.POINTER(ctypes.c_ubyte)),
+        ]
+        x11.XFree.argtypes = [ctypes.c_void_p]
+        x11.XPending.argtypes = [ctypes.c_void_p]
+        x11.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+        x11.XTranslateCoordinates.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_int, ctypes.c_int,
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_ulong),
+        ]
+        x11.XSetErrorHandler.argtypes = [_XErrorHandler]
+        x11.XSetErrorHandler.restype = ctypes.c_void_p
+
+        if xext is not None:
+            xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+            xext.XShmCreateImage.argtypes = [
+                ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int,
+                ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo), ctypes.c_uint, ctypes.c_uint,
+            ]
+            xext.XShmCreateImage.restype = _XImagePtr
+            xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+            xext.XShmDetach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+            xext.XShmGetImage.argtypes = [
+                ctypes.c_void_p, ctypes.c_ulong, _XImagePtr, ctypes.c_int, ctypes.c_int, ctypes.c_ulong,
+            ]
+
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmdt.argtypes = [ctypes.c_void_p]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+
+        x11.XSetErrorHandler(_on_x_error)
+        _libs.update(x11=x11, xext=xext, libc=libc)
+    return _libs["x11"], _libs["xext"], _libs["libc"]
+
+
+def _load_xrandr() -> Optional[Any]:
+    """libXrandr for display-change notifications (None when not installed)."""
+    if "xrandr" not in _libs:
+        xrandr = None
+        try:
+            xrandr = ctypes.CDLL(ctypes.util.find_library("Xrandr") or "libXrandr.so.2")
+            xrandr.XRRQueryExtension.argtypes = [
+                ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+            ]
+            xrandr.XRRSelectInput.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int]
+            xrandr.XRRUpdateConfiguration.argtypes = [ctypes.c_void_p]
+        except (OSError, AttributeError):
+            xrandr = None
+        _libs["xrandr"] = xrandr
+    return _libs["xrandr"]
+
+
+def _destroy_image(img: Any) -> None:
+    try:
+        fn = _DestroyImageFn(img.contents.f.destroy_image)
+        fn(img)
+    except Exception:
+        pass
+
+
+class _ShmBuffer:
+    """Shared-memory XImage of a fixed size, reused across grabs."""
+
+    def __init__(self, x11: Any, xext: Any, libc: Any, display: int, visual: int, depth: int, width: int, height: int) -> None:
+        self._x11, self._xext, self._libc, self._display = x11, xext, libc, display
+        self.width, self.height = int(width), int(height)
+        self.info = _XShmSegmentInfo()
+        self.image = xext.XShmCreateImage(display, visual, depth, _ZPIXMAP, None, ctypes.byref(self.info), self.width, self.height)
+        if not self.image:
+            raise RuntimeError("XShmCreateImage failed")
+        self.nbytes = int(self.image.contents.bytes_per_line) * self.height
+        shmid = libc.shmget(_IPC_PRIVATE, self.nbytes, _IPC_CREAT | 0o600)
+        if shmid < 0:
+            _destroy_image(self.image)
+            raise RuntimeError(f"shmget failed (errno={ctypes.get_errno()})")
+        addr = libc.shmat(shmid, None, 0)
+        if addr in (None, ctypes.c_void_p(-1).value):
+            libc.shmctl(shmid, _IPC_RMID, None)
+            _destroy_image(self.image)
+            raise RuntimeError("shmat failed")
+        self.info.shmid = shmid
+        self.info.shmaddr = addr
+        self.info.readOnly = 0
+        self.image.contents.data = addr
+        del _errors[:]
+        attached = xext.XShmAttach(display, ctypes.byref(self.info))
+        x11.XSync(display, 0)
+        # Segment is freed automatically once both sides detach
+        libc.shmctl(shmid, _IPC_RMID, None)
+        if not attached or _errors:
+            self._release(detach=False)
+            raise RuntimeError("XShmAttach failed (remote display?)")
+
+    def _release(self, *, detach: bool = True) -> None:
+        if detach:
+            try:
+                self._xext.XShmDetach(self._display, ctypes.byref(self.info))
+            except Exception:
+                pass
+        try:
+            self._libc.shmdt(self.info.shmaddr)
+        except Exception:
+            pass
+        # shmaddr belongs to us, not to Xlib's malloc — detach it before destroying the XImage
+        self.image.contents.data = None
+        _destroy_image(self.image)
+
+    def close(self) -> None:
+        self._release(detach=True)
+
+
+class X11Capture:
+    """One persistent X connection that grabs root-window frames into reusable buffers."""
+
+    def __init__(self, display_name: Optional[str] = None, *, use_shm: bool = True) -> None:
+        x11, xext, libc = _load_libs()
+        self._x11, self._xext, self._libc = x11, xext, libc
+        name = display_name.encode() if display_name else None
+        display = x11.XOpenDisplay(name)
+        if not display:
+            raise RuntimeError(f"Cannot open X display {display_name or '(DISPLAY)'}")
+        self._display = display
+        screen = x11.XDefaultScreen(display)
+        self._root = x11.XRootWindow(display, screen)
+        self._visual = x11.XDefaultVisual(display, screen)
+        self._depth = x11.XDefaultDepth(display, screen)
+        self._lock = threading.RLock()
+        self._buffers: Dict[Tuple[int, int], _ShmBuffer] = {}
+        self.use_shm = bool(use_shm and xext is not None and xext.XShmQueryExtension(display))
+        # Last fallback frame is kept so the returned view stays valid until the next grab
+        self._fallback_bytes: Optional[bytes] = None
+        self._xrandr = _load_xrandr()
+        self._randr_event: Optional[int] = None
+        self._watch_display_changes()
+
+    def _watch_display_changes(self) -> None:
+        if self._xrandr is None:
+            return
+        event_base, error_base = ctypes.c_int(), ctypes.c_int()
+        try:
+            if self._xrandr.XRRQueryExtension(self._display, ctypes.byref(event_base), ctypes.byref(error_base)):
+                self._xrandr.XRRSelectInput(self._display, self._root, _RR_SCREEN_CHANGE_NOTIFY_MASK)
+                self._x11.XSync(self._display, 0)
+                self._randr_event = int(event_base.value) + _RR_SCREEN_CHANGE_NOTIFY
+        except Exception as e:
+            _log.debug("RandR change notifications unavailable: %s", e)
+
+    @property
+    def watches_display_changes(self) -> bool:
+        return self._randr_event is not None
+
+    def display_changed(self) -> Optional[bool]:
+        """Drain queued RandR events; True if the screen configuration changed since the last call.
+
+        None when the server has no RandR extension (callers must poll the size instead).
+        """
+        if self._randr_event is None:
+            return None
+        changed = False
+        # XEvent is a union padded to 24 longs
+        event = (ctypes.c_long * 24)()
+        with self._lock:
+            while self._x11.XPending(self._display) > 0:
+                self._x11.XNextEvent(self._display, ctypes.byref(event))
+                if ctypes.cast(event, ctypes.POINTER(ctypes.c_int))[0] == self._randr_event:
+                    self._xrandr.XRRUpdateConfiguration(ctypes.byref(event))
+                    changed = True
+        return changed
+
+    @property
+    def backend(self) -> str:
+        return "xshm" if self.use_shm else "xgetimage"
+
+    def size(self) -> Tuple[int, int]:
+        root = ctypes.c_ulong()
+        x, y = ctypes.c_int(), ctypes.c_int()
+        w, h, bw, depth = ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint()
+        with self._lock:
+            self._x11.XGetGeometry(
+                self._display, self._root, ctypes.byref(root), ctypes.byref(x), ctypes.byref(y),
+                ctypes.byref(w), ctypes.byref(h), ctypes.byref(bw), ctypes.byref(depth),
+            )
+        return int(w.value), int(h.value)
+
+    def _window_property(self, window: int, name: bytes) -> Optional[Tuple[int, ...]]:
+        """32-bit items of a window property (None when unset)."""
+        atom = self._x11.XInternAtom(self._display, name, 1)
+        if not atom:
+            return None
+        actual_type, actual_format = ctypes.c_ulong(), ctypes.c_int()
+        nitems, after = ctypes.c_ulong(), ctypes.c_ulong()
+        data = ctypes.POINTER(ctypes.c_ubyte)()
+        del _errors[:]
+        status = self._x11.XGetWindowProperty(
+            self._display, window, atom, 0, 16, 0, _ANY_PROPERTY_TYPE,
+            ctypes.byref(actual_type), ctypes.byref(actual_format),
+            ctypes.byref(nitems), ctypes.byref(after), ctypes.byref(data),
+        )
+        try:
+            if status != 0 or _errors or not data or actual_format.value != 32 or nitems.value == 0:
+                return None
+            # Format-32 properties are returned as C longs regardless of the server word size
+            items = ctypes.cast(data, ctypes.POINTER(ctypes.c_ulong))
+            return tuple(int(items[i]) for i in range(int(nitems.value)))
+        finally:
+            if data:
+                self._x11.XFree(data)
+
+    def active_window_rect(self) -> Optional[Tuple[int, int, int, int]]:
+        """Root-relative (x, y, width, height) of the focused top-level window.
+
+        Read from the window manager's _NET_ACTIVE_WINDOW; None without an EWMH
+        window manager, when nothing is focused or the window just vanished.
+        The rectangle is the client area clipped to the screen (no WM decorations).
+        """
+        with self._lock:
+            active = self._window_property(self._root, b"_NET_ACTIVE_WINDOW")
+            if not active or not active[0]:
+                return None
+            window = active[0]
+            root = ctypes.c_ulong()
+            gx, gy = ctypes.c_int(), ctypes.c_int()
+            w, h, bw, depth = ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint()
+            x, y, child = ctypes.c_int(), ctypes.c_int(), ctypes.c_ulong()
+            del _errors[:]
+            ok = self._x11.XGetGeometry(
+                self._display, window, ctypes.byref(root), ctypes.byref(gx), ctypes.byref(gy),
+                ctypes.byref(w), ctypes.byref(h), ctypes.byref(bw), ctypes.byref(depth),
+            )
+            ok = ok and self._x11.XTranslateCoordinates(
+                self._display, window, self._root, 0, 0, ctypes.byref(x), ctypes.byref(y), ctypes.byref(child),
+            )
+            self._x11.XSync(self._display, 0)
+            if not ok or _errors or w.value == 0 or h.value == 0:
+                return None
+        sw, sh = self.size()
+        x0, y0 = max(0, int(x.value)), max(0, int(y.value))
+        x1, y1 = min(sw, int(x.value) + int(w.value)), min(sh, int(y.value) + int(h.value))
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return x0, y0, x1 - x0, y1 - y0
+
+    def _clip(self, region: Optional[Tuple[int, int, int, int]]) -> Tuple[int, int, int, int]:
+        sw, sh = self.size()
+        if region is None:
+            return 0, 0, sw, sh
+        x, y, w, h = (int(v) for v in region)
+        x = max(0, min(x, sw - 1))
+        y = max(0, min(y, sh - 1))
+        w = max(1, min(w, sw - x))
+        h = max(1, min(h, sh - y))
+        return x, y, w, h
+
+    def _buffer_for(self, w: int, h: int) -> _ShmBuffer:
+        buf = self._buffers.get((w, h))
+        if buf is None:
+            # Keep at most the full-screen buffer plus one region buffer alive
+            if len(self._buffers) >= 2:
+                old_key = next(iter(self._buffers))
+                self._buffers.pop(old_key).close()
+            buf = _ShmBuffer(self._x11, self._xext, self._libc, self._display, self._visual, self._depth, w, h)
+            self._buffers[(w, h)] = buf
+        return buf
+
+    def grab_raw(self, region: Optional[Tuple[int, int, int, int]] = None) -> Tuple[memoryview, int, int, int]:
+        """Grab a frame as (BGRX memoryview, width, height, stride).
+
+        The memoryview aliases the reusable buffer and is only valid until the next grab.
+        """
+        x, y, w, h = self._clip(region)
+        with self._lock:
+            if self.use_shm:
+                try:
+                    buf = self._buffer_for(w, h)
+                    del _errors[:]
+                    ok = self._xext.XShmGetImage(self._display, self._root, buf.image, x, y, _ALL_PLANES)
+                    if ok and not _errors:
+                        stride = int(buf.image.contents.bytes_per_line)
+                        raw = (ctypes.c_ubyte * buf.nbytes).from_address(buf.info.shmaddr)
+                        return memoryview(raw).cast("B"), w, h, stride
+                except Exception as e:
+                    _log.warning("MIT-SHM capture failed, falling back to XGetImage: %s", e)
+                for b in list(self._buffers.values()):
+                    b.close()
+                self._buffers.clear()
+                self.use_shm = False
+            img = self._x11.XGetImage(self._display, self._root, x, y, w, h, _ALL_PLANES, _ZPIXMAP)
+            if not img:
+                raise RuntimeError("XGetImage failed")
+            try:
+                stride = int(img.contents.bytes_per_line)
+                self._fallback_bytes = ctypes.string_at(img.contents.data, stride * h)
+            finally:
+                _destroy_image(img)
+            return memoryview(self._fallback_bytes), w, h, stride
+
+    def grab_image(self, region: Optional[Tuple[int, int, int, int]] = None) -> Any:
+        """Grab a frame as an RGB PIL image (one BGRX->RGB conversion copy)."""
+        from PIL import Image  # type: ignore
+
+        # Decode under the lock so a concurrent grab cannot overwrite the buffer mid-copy
+        with self._lock:
+            raw, w, h, stride = self.grab_raw(region)
+            return Image.frombuffer("RGB", (w, h), raw, "raw", "BGRX", stride, 1)
+
+    def grab_array(self, region: Optional[Tuple[int, int, int, int]] = None) -> Any:
+        """Grab a frame as an (h, w, 4) BGRX NumPy view into the reusable buffer (no copy)."""
+        import numpy as np  # type: ignore
+
+        raw, w, h, stride = self.grab_raw(region)
+        arr = np.frombuffer(raw, dtype=np.uint8, count=stride * h).reshape(h, stride)
+        return arr[:, : w * 4].reshape(h, w, 4)
+
+    def close(self) -> None:
+        with self._lock:
+            for b in list(self._buffers.values()):
+                b.close()
+            self._buffers.clear()
+            if self._display:
+                self._x11.XCloseDisplay(self._display)
+                self._display = None
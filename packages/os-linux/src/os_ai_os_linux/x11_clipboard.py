@@ -0,0 +1,199 @@
+"""In-process X11 CLIPBOARD owner (python-xlib).
+
+pyperclip shells out to xclip/xsel for every copy, paste and restore, and the
+paste path then sleeps to let the subprocess take the selection. X11Clipboard
+owns CLIPBOARD from a hidden window on its own connection and answers
+SelectionRequests from a background thread, so setting the text is one
+round-trip and wait_read() returns as soon as the paste target fetched it.
+
+Only single-request transfers are served (no INCR); texts larger than
+`max_transfer` bytes are refused, so callers chunk long pastes.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import select
+import threading
+from typing import Any, Callable, Optional
+
+_log = logging.getLogger("os_ai")
+
+# Conservative cap below the core protocol limit (max_request_length * 4 bytes)
+_TRANSFER_HEADROOM = 1024
+
+
+class X11Clipboard:
+    def __init__(self, display_name: Optional[str] = None, *, timeout_s: float = 1.0) -> None:
+        from Xlib import X, Xatom  # type: ignore
+        from Xlib.display import Display  # type: ignore
+
+        self._X = X
+        self._Xatom = Xatom
+        self.timeout_s = float(timeout_s)
+        self._display = Display(display_name)
+        root = self._display.screen().root
+        self._window = root.create_window(0, 0, 1, 1, 0, X.CopyFromParent, event_mask=X.PropertyChangeMask)
+        atom = self._display.intern_atom
+        self._clipboard = atom("CLIPBOARD")
+        self._targets = atom("TARGETS")
+        self._utf8 = atom("UTF8_STRING")
+        self._text = atom("TEXT")
+        self._incr = atom("INCR")
+        self._transfer = atom("OS_AI_CLIPBOARD")
+        self.max_transfer = max(4096, int(self._display.display.info.max_request_length) * 4 - _TRANSFER_HEADROOM)
+        self._display.flush()
+
+        self._data: Optional[bytes] = None
+        self._owned = False
+        self._served = threading.Event()
+        self._calls: "queue.Queue[tuple[Callable[[], Any], queue.Queue]]" = queue.Queue()
+        self._pending_read: Optional[queue.Queue] = None
+        self._wake_r, self._wake_w = os.pipe()
+        self._stop = False
+        self._thread = threading.Thread(target=self._loop, name="x11-clipboard", daemon=True)
+        self._thread.start()
+
+    # -- public API (any thread) --
+
+    def set_text(self, text: str) -> None:
+        """Own CLIPBOARD with `text`; returns once the server confirmed ownership."""
+        data = (text or "").encode("utf-8")
+        if len(data) > self.max_transfer:
+            raise ValueError(f"clipboard text too large for one transfer ({len(data)} > {self.max_transfer} bytes)")
+        if not self._call(lambda: self._own(data)):
+            raise RuntimeError("could not acquire the X11 CLIPBOARD selection")
+
+    def get_text(self) -> Optional[str]:
+        """Current CLIPBOARD text (UTF-8), None when empty, not text, or the owner does not answer."""
+        if self._owned and self._data is not None:
+            return self._data.decode("utf-8", errors="replace")
+        reply: queue.Queue = queue.Queue(maxsize=1)
+        self._call(lambda: self._request(reply))
+        try:
+            data = reply.get(timeout=self.timeout_s)
+        except queue.Empty:
+            return None
+        return data.decode("utf-8", errors="replace") if data is not None else None
+
+    def arm(self) -> None:
+        """Forget reads so far: clipboard managers fetch every new owner's text before the paste happens."""
+        self._served.clear()
+
+    def wait_read(self, timeout: float) -> bool:
+        """True once a client fetched the text set by the last set_text() after the last arm()."""
+        return self._served.wait(max(0.0, float(timeout)))
+
+    def close(self) -> None:
+        self._stop = True
+        os.write(self._wake_w, b"x")
+        self._thread.join(timeout=1.0)
+        try:
+            self._display.close()
+        except Exception:
+            pass
+        for fd in (self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    # -- event thread --
+
+    def _call(self, fn: Callable[[], Any]) -> Any:
+        reply: queue.Queue = queue.Queue(maxsize=1)
+        self._calls.put((fn, reply))
+        os.write(self._wake_w, b"x")
+        ok, value = reply.get(timeout=self.timeout_s + 1.0)
+        if not ok:
+            raise value
+        return value
+
+    def _loop(self) -> None:
+        fd = self._display.fileno()
+        while not self._stop:
+            try:
+                readable, _, _ = select.select([fd, self._wake_r], [], [], 1.0)
+                if self._wake_r in readable:
+                    os.read(self._wake_r, 4096)
+                while True:
+                    try:
+                        fn, reply = self._calls.get_nowait()
+                    except queue.Empty:
+                        break
+                    try:
+                        reply.put((True, fn()))
+                    except Exception as e:  # reported to the calling thread
+                        reply.put((False, e))
+                while self._display.pending_events():
+                    self._handle(self._display.next_event())
+            except Exception as e:
+                if self._stop:
+                    break
+                _log.warning("X11 clipboard event loop error: %s", e)
+
+    def _own(self, data: bytes) -> bool:
+        self._data = data
+        self._served.clear()
+        self._window.set_selection_owner(self._clipboard, self._X.CurrentTime)
+        owner = self._display.get_selection_owner(self._clipboard)
+        self._owned = owner is not None and owner.id == self._window.id
+        return self._owned
+
+    def _request(self, reply: queue.Queue) -> None:
+        self._pending_read = reply
+        self._window.delete_property(self._transfer)
+        self._window.convert_selection(self._clipboard, self._utf8, self._transfer, self._X.CurrentTime)
+        self._display.flush()
+
+    def _handle(self, event: Any) -> None:
+        X = self._X
+        if event.type == X.SelectionRequest:
+            self._serve(event)
+        elif event.type == X.SelectionClear:
+            if event.selection == self._clipboard:
+                self._owned = False
+                self._data = None
+        elif event.type == X.SelectionNotify:
+            reply, self._pending_read = self._pending_read, None
+            if reply is None:
+                return
+            data: Optional[bytes] = None
+            if event.property != X.NONE:
+                prop = self._window.get_full_property(self._transfer, X.AnyPropertyType)
+                self._window.delete_property(self._transfer)
+                if prop is not None and prop.property_type != self._incr:
+                    value = prop.value
+                    data = value if isinstance(value, bytes) else str(value).encode("utf-8")
+            self._display.flush()
+            reply.put(data)
+
+    def _serve(self, event: Any) -> None:
+        from Xlib.protocol import event as xevent  # type: ignore
+
+        X, Xatom = self._X, self._Xatom
+        prop = event.property if event.property != X.NONE else event.target
+        data = self._data if self._owned else None
+        if data is None or event.selection != self._clipboard:
+            prop = X.NONE
+        elif event.target == self._targets:
+            event.requestor.change_property(prop, Xatom.ATOM, 32, [self._targets, self._utf8, self._text, Xatom.STRING])
+        elif event.target in (self._utf8, self._text):
+            event.requestor.change_property(prop, self._utf8, 8, data)
+            self._served.set()
+        elif event.target == Xatom.STRING:
+            latin1 = data.decode("utf-8", errors="replace").encode("latin-1", errors="replace")
+            event.requestor.change_property(prop, Xatom.STRING, 8, latin1)
+            self._served.set()
+        else:
+            prop = X.NONE
+        notify = xevent.SelectionNotify(
+            time=event.time,
+            requestor=event.requestor,
+            selection=event.selection,
+            target=event.target,
+            property=prop,
+        )
+        event.requestor.send_event(notify, event_mask=0)
+        self._display.flush()
@@ -0,0 +1,400 @@
+"""Persistent XTest input injection (python-xlib).
+
+pyautogui pays for every pointer/key call with its PAUSE sleep, a failsafe
+position poll and one or more X round-trips per event. XTestInput keeps one
+Xlib connection open, queues all fake events of an operation (a combo, a
+click, a typed chunk) and commits them with a single sync, and tracks the
+cursor position locally so position() never queries the server.
+
+Characters the current layout cannot produce (CJK, emoji, other scripts) are
+typed by binding their Unicode keysym to a spare keycode - one with no keysyms
+in the server keymap - for as long as the slot is not needed by another
+character. Slots are reused least-recently-used first and cleared on close().
+
+pyautogui's fail-safe is kept: while pyautogui.FAILSAFE is set, each pointer
+action starts with one pointer query (which also resyncs the tracked position
+after the user moved the mouse) and raises FailSafeException in a corner.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pyautogui
+
+from os_ai_os.defaults import PyAutoGUIKeyboard, PyAutoGUIMouse
+
+_log = logging.getLogger("os_ai")
+
+_BUTTONS = {"left": 1, "middle": 2, "right": 3}
+# X core protocol wheel buttons: up, down, left, right
+_WHEEL_UP, _WHEEL_DOWN, _WHEEL_LEFT, _WHEEL_RIGHT = 4, 5, 6, 7
+# Interpolated moves are played back at this event rate
+_MOTION_HZ = 120.0
+# Typed text is flushed in groups of about this many seconds of keystrokes
+_TYPE_FLUSH_S = 0.01
+# Before a spare keycode is rebound, give clients time to handle the keys already sent with it
+_REMAP_SETTLE_S = 0.05
+
+# pyautogui key names -> X keysym names
+_KEY_NAMES: Dict[str, str] = {
+    "ctrl": "Control_L", "ctrlleft": "Control_L", "ctrlright": "Control_R", "control": "Control_L",
+    "shift": "Shift_L", "shiftleft": "Shift_L", "shiftright": "Shift_R",
+    "alt": "Alt_L", "altleft": "Alt_L", "altright": "Alt_R", "option": "Alt_L",
+    "win": "Super_L", "winleft": "Super_L", "winright": "Super_R", "super": "Super_L",
+    "command": "Super_L", "cmd": "Super_L", "meta": "Super_L",
+    "enter": "Return", "return": "Return", "esc": "Escape", "escape": "Escape",
+    "tab": "Tab", "space": "space", "backspace": "BackSpace", "delete": "Delete", "del": "Delete",
+    "insert": "Insert", "home": "Home", "end": "End",
+    "pageup": "Prior", "pgup": "Prior", "pagedown": "Next", "pgdn": "Next",
+    "up": "Up", "down": "Down", "left": "Left", "right": "Right",
+    "capslock": "Caps_Lock", "numlock": "Num_Lock", "scrolllock": "Scroll_Lock",
+    "printscreen": "Print", "prtsc": "Print", "pause": "Pause", "menu": "Menu", "apps": "Menu",
+    "volumeup": "XF86AudioRaiseVolume", "volumedown": "XF86AudioLowerVolume", "volumemute": "XF86AudioMute",
+}
+
+
+def char_keysym(ch: str) -> int:
+    """Keysym for a single character (Latin-1 direct, anything else as a Unicode keysym)."""
+    from Xlib import XK  # type: ignore
+
+    if ch == "\n" or ch == "\r":
+        return XK.string_to_keysym("Return")
+    if ch == "\t":
+        return XK.string_to_keysym("Tab")
+    code = ord(ch)
+    if 0x20 <= code <= 0x7E or 0xA0 <= code <= 0xFF:
+        return code
+    return 0x01000000 + code
+
+
+def key_keysym(name: str) -> int:
+    """Keysym for a pyautogui-style key name ('ctrl', 'f5', 'a', 'Return', ...); 0 if unknown."""
+    from Xlib import XK  # type: ignore
+
+    if len(name) == 1:
+        return char_keysym(name)
+    lowered = name.lower()
+    mapped = _KEY_NAMES.get(lowered)
+    if mapped:
+        return XK.string_to_keysym(mapped)
+    if lowered.startswith("f") and lowered[1:].isdigit():
+        return XK.string_to_keysym(f"F{int(lowered[1:])}")
+    for candidate in (name, name.capitalize(), lowered):
+        ks = XK.string_to_keysym(candidate)
+        if ks:
+            return ks
+    return 0
+
+
+class XTestInput:
+    """One XTest-capable connection shared by the mouse and keyboard drivers."""
+
+    def __init__(self, display_name: Optional[str] = None) -> None:
+        from Xlib import X  # type: ignore
+        from Xlib.display import Display  # type: ignore
+        from Xlib.ext import xtest  # type: ignore
+
+        self._X = X
+        self._xtest = xtest
+        self.display = Display(display_name)
+        if not self.display.has_extension("XTEST"):
+            self.display.close()
+            raise RuntimeError("X server has no XTEST extension")
+        self.root = self.display.screen().root
+        self.lock = threading.RLock()
+        pointer = self.root.query_pointer()
+        self.position: Tuple[int, int] = (int(pointer.root_x), int(pointer.root_y))
+        # keysym -> (keycode, needs_shift), resolved lazily from the server keymap
+        self._keycodes: Dict[int, Optional[Tuple[int, bool]]] = {}
+        self._shift = self._lookup(key_keysym("shift"))
+        # Unicode keysym -> spare keycode currently bound to it (LRU order)
+        self._spare: Optional[List[int]] = None
+        self._remapped: "OrderedDict[int, int]" = OrderedDict()
+
+    # -- low level (callers hold the lock and commit) --
+
+    def _lookup(self, keysym: int) -> Optional[Tuple[int, bool]]:
+        if keysym in self._keycodes:
+            return self._keycodes[keysym]
+        entry: Optional[Tuple[int, bool]] = None
+        for keycode, index in self.display.keysym_to_keycodes(keysym):
+            if index in (0, 1):
+                entry = (int(keycode), index == 1)
+                break
+        self._keycodes[keysym] = entry
+        return entry
+
+    def _spare_keycodes(self) -> List[int]:
+        if self._spare is None:
+            info = self.display.display.info
+            first, last = int(info.min_keycode), int(info.max_keycode)
+            mapping = self.display.get_keyboard_mapping(first, last - first + 1)
+            self._spare = [first + i for i, syms in enumerate(mapping) if not any(syms)]
+        return self._spare
+
+    def _remap(self, keysym: int) -> Optional[Tuple[int, bool]]:
+        """Bind `keysym` to a spare keycode (evicting the least recently used binding if needed)."""
+        keycode = self._remapped.get(keysym)
+        if keycode is not None:
+            self._remapped.move_to_end(keysym)
+            return keycode, False
+        spare = self._spare_keycodes()
+        if not spare:
+            return None
+        used = set(self._remapped.values())
+        free = [kc for kc in spare if kc not in used]
+        if free:
+            keycode = free[0]
+        else:
+            _, keycode = self._remapped.popitem(last=False)
+            self.commit()
+            time.sleep(_REMAP_SETTLE_S)
+        self.display.change_keyboard_mapping(keycode, [(keysym, keysym)])
+        self._remapped[keysym] = keycode
+        return keycode, False
+
+    def motion(self, x: int, y: int) -> None:
+        self._xtest.fake_input(self.display, self._X.MotionNotify, x=int(x), y=int(y))
+        self.position = (int(x), int(y))
+
+    def button(self, button: int, press: bool) -> None:
+        kind = self._X.ButtonPress if press else self._X.ButtonRelease
+        self._xtest.fake_input(self.display, kind, int(button))
+
+    def keycode(self, keycode: int, press: bool) -> None:
+        kind = self._X.KeyPress if press else self._X.KeyRelease
+        self._xtest.fake_input(self.display, kind, int(keycode))
+
+    def keycode_for(self, name: str) -> Optional[Tuple[int, bool]]:
+        keysym = key_keysym(name)
+        return self._lookup(keysym) if keysym else None
+
+    def key(self, name: str, press: bool) -> bool:
+        entry = self.keycode_for(name)
+        if entry is None:
+            return False
+        self.keycode(entry[0], press)
+        return True
+
+    def type_char(self, ch: str) -> bool:
+        """Queue press/release for one character (Shift when the keymap needs it, a spare keycode if unmapped)."""
+        keysym = char_keysym(ch)
+        entry = self._lookup(keysym) or self._remap(keysym)
+        if entry is None:
+            return False
+        keycode, shifted = entry
+        if shifted and self._shift is not None:
+            self.keycode(self._shift[0], True)
+        self.keycode(keycode, True)
+        self.keycode(keycode, False)
+        if shifted and self._shift is not None:
+            self.keycode(self._shift[0], False)
+        return True
+
+    def query_pointer(self) -> Tuple[int, int]:
+        """Pointer position as the server reports it (one round-trip); resyncs the tracked position."""
+        with self.lock:
+            pointer = self.root.query_pointer()
+            self.position = (int(pointer.root_x), int(pointer.root_y))
+            return self.position
+
+    def check_failsafe(self) -> None:
+        if not getattr(pyautogui, "FAILSAFE", False):
+            return
+        with self.lock:
+            x, y = self.query_pointer()
+            screen = self.display.screen()
+            w, h = int(screen.width_in_pixels), int(screen.height_in_pixels)
+        if x in (0, w - 1) and y in (0, h - 1):
+            raise pyautogui.FailSafeException(
+                "PyAutoGUI fail-safe triggered from mouse moving to a corner of the screen."
+            )
+
+    def commit(self) -> None:
+        """Send everything queued and wait until the server processed it (one round-trip)."""
+        self.display.sync()
+
+    def close(self) -> None:
+        with self.lock:
+            try:
+                for keycode in self._remapped.values():
+                    self.display.change_keyboard_mapping(keycode, [(0, 0)])
+                self._remapped.clear()
+                self.display.sync()
+            except Exception:
+                pass
+            try:
+                self.display.close()
+            except Exception:
+                pass
+
+
+class XTestMouse(PyAutoGUIMouse):
+    """Mouse driver on a persistent XTest connection; pyautogui is only a fallback."""
+
+    def __init__(self, xinput: XTestInput) -> None:
+        self._x = xinput
+
+    def position(self) -> Tuple[int, int]:
+        # Tracked locally: every motion we inject goes through this connection
+        return self._x.position
+
+    def query_position(self) -> Tuple[int, int]:
+        """Where the server has the pointer: what a move verification must compare against."""
+        return self._x.query_pointer()
+
+    def move_to(self, x: int, y: int, *, duration_ms: int = 0, tween: Optional[Callable[[float], float]] = None) -> None:
+        self._x.check_failsafe()
+        try:
+            with self._x.lock:
+                sx, sy = self._x.position
+                tx, ty = int(x), int(y)
+                steps = int(max(0.0, float(duration_ms)) / 1000.0 * _MOTION_HZ)
+                if steps > 1 and (sx, sy) != (tx, ty):
+                    start = time.monotonic()
+                    for i in range(1, steps):
+                        t = i / float(steps)
+                        f = tween(t) if tween is not None else t
+                        self._x.motion(round(sx + (tx - sx) * f), round(sy + (ty - sy) * f))
+                        self._x.display.flush()
+                        delay = start + i / _MOTION_HZ - time.monotonic()
+                        if delay > 0:
+                            time.sleep(delay)
+                self._x.motion(tx, ty)
+                self._x.commit()
+        except Exception as e:
+            _log.warning("XTest move failed, using pyautogui: %s", e)
+            super().move_to(x, y, duration_ms=duration_ms, tween=tween)
+
+    def click(self, *, button: str = "left", clicks: int = 1) -> None:
+        self._x.check_failsafe()
+        try:
+            with self._x.lock:
+                code = _BUTTONS.get(button, 1)
+                for _ in range(max(1, int(clicks))):
+                    self._x.button(code, True)
+                    self._x.button(code, False)
+                self._x.commit()
+        except Exception as e:
+            _log.warning("XTest click failed, using pyautogui: %s", e)
+            super().click(button=button, clicks=clicks)
+
+    def down(self, *, button: str = "left") -> None:
+        self._x.check_failsafe()
+        try:
+            with self._x.lock:
+                self._x.button(_BUTTONS.get(button, 1), True)
+                self._x.commit()
+        except Exception as e:
+            _log.warning("XTest mouse down failed, using pyautogui: %s", e)
+            super().down(button=button)
+
+    def up(self, *, button: str = "left") -> None:
+        self._x.check_failsafe()
+        try:
+            with self._x.lock:
+                self._x.button(_BUTTONS.get(button, 1), False)
+                self._x.commit()
+        except Exception as e:
+            _log.warning("XTest mouse up failed, using pyautogui: %s", e)
+            super().up(button=button)
+
+    def scroll(self, *, dx: int = 0, dy: int = 0) -> None:
+        self._x.check_failsafe()
+        try:
+            with self._x.lock:
+                # pyautogui convention: positive dy scrolls up, positive dx scrolls right
+                for button, count in ((_WHEEL_UP if dy > 0 else _WHEEL_DOWN, abs(int(dy))),
+                                      (_WHEEL_RIGHT if dx > 0 else _WHEEL_LEFT, abs(int(dx)))):
+                    for _ in range(count):
+                        self._x.button(button, True)
+                        self._x.button(button, False)
+                self._x.commit()
+        except Exception as e:
+            _log.warning("XTest scroll failed, using pyautogui: %s", e)
+            super().scroll(dx=dx, dy=dy)
+
+    def drag(self, start: Tuple[int, int], end: Tuple[int, int], *, steps: int = 1, delay_ms: int = 0) -> None:
+        sx, sy = int(start[0]), int(start[1])
+        ex, ey = int(end[0]), int(end[1])
+        self._x.check_failsafe()
+        with self._x.lock:
+            self._x.motion(sx, sy)
+            self._x.button(1, True)
+            n = max(1, int(steps))
+            for i in range(1, n + 1):
+                self._x.motion(round(sx + (ex - sx) * i / float(n)), round(sy + (ey - sy) * i / float(n)))
+                if delay_ms > 0 and i < n:
+                    self._x.display.flush()
+                    time.sleep(float(delay_ms) / 1000.0)
+            self._x.button(1, False)
+            self._x.commit()
+
+
+class XTestKeyboard(PyAutoGUIKeyboard):
+    """Keyboard driver on a persistent XTest connection; pyautogui is only a fallback."""
+
+    def __init__(self, xinput: XTestInput) -> None:
+        self._x = xinput
+
+    def _keys(self, names: Iterable[str], press: bool) -> List[str]:
+        """Queue the keys; returns the names that have no keycode in the current keymap."""
+        return [k for k in names if not self._x.key(k, press)]
+
+    def key_down(self, key: str) -> None:
+        with self._x.lock:
+            if self._keys([key], True):
+                super().key_down(key)
+                return
+            self._x.commit()
+
+    def key_up(self, key: str) -> None:
+        with self._x.lock:
+            if self._keys([key], False):
+                super().key_up(key)
+                return
+            self._x.commit()
+
+    def press(self, key: str) -> None:
+        self.press_combo((key,))
+
+    def press_enter(self) -> None:
+        self.press_combo(("enter",))
+
+    def press_combo(self, keys: Tuple[str, ...]) -> None:
+        keys = tuple(k for k in keys if k)
+        if not keys:
+            return
+        with self._x.lock:
+            if any(self._x.keycode_for(k) is None for k in keys):
+                super().press_combo(keys)
+                return
+            # Modifiers down in order, released in reverse: one batch, one sync
+            self._keys(keys, True)
+            self._keys(reversed(keys), False)
+            self._x.commit()
+
+    def type_text(self, text: str, *, wpm: int = 180) -> None:
+        """Type `text` at `wpm` (<= 0: as fast as the server takes it), flushing every ~10 ms of keystrokes."""
+        if not text:
+            return
+        try:
+            interval = 60.0 / (float(wpm) * 5.0) if wpm > 0 else 0.0
+        except Exception:
+            interval = 0.02
+        group = max(1, int(round(_TYPE_FLUSH_S / interval))) if interval > 0 else len(text)
+        with self._x.lock:
+            start = time.monotonic()
+            for i, ch in enumerate(text, 1):
+                if not self._x.type_char(ch):
+                    _log.warning("Cannot type %r: no keycode and no spare keycode to remap", ch)
+                if interval > 0 and i % group == 0 and i < len(text):
+                    self._x.display.flush()
+                    delay = start + i * interval - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+            self._x.commit()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 import pyautogui
 
@@ -62,9 +62,16 @@ def _normalize_combo_keys(keys: Tuple[str, ...]) -> Tuple[str, ...]:
 
 
 class DarwinMouse:
-    def move_to(self, x: int, y: int, *, duration_ms: int = 0) -> None:
+    def position(self) -> Tuple[int, int]:
+        x, y = pyautogui.position()
+        return int(x), int(y)
+
+    def move_to(self, x: int, y: int, *, duration_ms: int = 0, tween: Optional[Callable[[float], float]] = None) -> None:
         dur = max(0.0, float(duration_ms) / 1000.0)
-        pyautogui.moveTo(int(x), int(y), duration=dur)
+        if tween is not None:
+            pyautogui.moveTo(int(x), int(y), duration=dur, tween=tween)
+        else:
+            pyautogui.moveTo(int(x), int(y), duration=dur)
 
     def click(self, *, button: str = "left", clicks: int = 1) -> None:
         pyautogui.click(button=button, clicks=int(clicks), interval=0.05)
@@ -109,6 +116,17 @@ class DarwinKeyboard:
     def press_enter(self) -> None:
         press_enter_mac()
 
+    def press(self, key: str) -> None:
+        self.press_combo((key,))
+
+    def key_down(self, key: str) -> None:
+        for k in _normalize_combo_keys((key,)):
+            pyautogui.keyDown(k)
+
+    def key_up(self, key: str) -> None:
+        for k in reversed(_normalize_combo_keys((key,))):
+            pyautogui.keyUp(k)
+
     def press_combo(self, keys: Tuple[str, ...]) -> None:
         if not keys:
             return
@@ -134,6 +152,26 @@ class DarwinKeyboard:
         pyautogui.write(text, interval=interval)
 
 
+def _quartz_available() -> bool:
+    try:
+        import Quartz  # noqa: F401
+
+        return hasattr(Quartz, "CGWindowListCreateImage")
+    except Exception:
+        return False
+
+
+def _cgimage_to_pil(cg):
+    from PIL import Image
+    import Quartz
+
+    w, h = int(Quartz.CGImageGetWidth(cg)), int(Quartz.CGImageGetHeight(cg))
+    stride = int(Quartz.CGImageGetBytesPerRow(cg))
+    data = Quartz.CGDataProviderCopyData(Quartz.CGImageGetDataProvider(cg))
+    # Screen images are 32-bit little-endian BGRA/BGRX
+    return Image.frombuffer("RGB", (w, h), bytes(data), "raw", "BGRX", stride, 1)
+
+
 class DarwinScreen:
     def size(self) -> Size:
         w, h = pyautogui.size()
@@ -145,6 +183,42 @@ class DarwinScreen:
             return pyautogui.screenshot(region=(int(x), int(y), int(w), int(h)))
         return pyautogui.screenshot()
 
+    def screenshot_scaled(self, size: Tuple[int, int], region: Optional[Tuple[int, int, int, int]] = None):
+        """Frame scaled by Quartz: captured at nominal (logical, 1x) resolution and,
+        when `size` is smaller, drawn into a `size` bitmap with high interpolation.
+
+        Avoids reading Retina backing pixels only to throw 3/4 of them away.
+        Returns None if Quartz capture is unavailable (e.g. removed in newer macOS).
+        """
+        import Quartz
+
+        if region is not None:
+            x, y, w, h = region
+            rect = Quartz.CGRectMake(float(x), float(y), float(w), float(h))
+        else:
+            rect = Quartz.CGDisplayBounds(Quartz.CGMainDisplayID())
+        cg = Quartz.CGWindowListCreateImage(
+            rect,
+            Quartz.kCGWindowListOptionOnScreenOnly,
+            Quartz.kCGNullWindowID,
+            Quartz.kCGWindowImageNominalResolution,
+        )
+        if cg is None:
+            return None
+        tw, th = max(1, int(size[0])), max(1, int(size[1]))
+        if (tw, th) != (int(Quartz.CGImageGetWidth(cg)), int(Quartz.CGImageGetHeight(cg))):
+            ctx = Quartz.CGBitmapContextCreate(
+                None, tw, th, 8, tw * 4, Quartz.CGColorSpaceCreateDeviceRGB(),
+                Quartz.kCGImageAlphaNoneSkipFirst | Quartz.kCGBitmapByteOrder32Little,
+            )
+            if ctx is not None:
+                Quartz.CGContextSetInterpolationQuality(ctx, Quartz.kCGInterpolationHigh)
+                Quartz.CGContextDrawImage(ctx, Quartz.CGRectMake(0, 0, tw, th), cg)
+                scaled = Quartz.CGBitmapContextCreateImage(ctx)
+                if scaled is not None:
+                    cg = scaled
+        return _cgimage_to_pil(cg)
+
 
 class DarwinOverlay:
     def highlight(self, x: int, y: int, *, radius: Optional[int] = None, duration: Optional[float] = None) -> None:
@@ -194,6 +268,7 @@ def make_drivers() -> PlatformDrivers:
         supports_smooth_move=True,
         dpi_scale=_detect_scale(),
         screen_recording_available=True,
+        supports_scaled_capture=_quartz_available(),
     )
     return PlatformDrivers(
         mouse=DarwinMouse(),
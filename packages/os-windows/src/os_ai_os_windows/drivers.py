@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import time
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 import pyautogui
 
@@ -16,9 +16,16 @@ from os_ai_os.ports.types import Capabilities, Size
 
 
 class WindowsMouse:
-    def move_to(self, x: int, y: int, *, duration_ms: int = 0) -> None:
+    def position(self) -> Tuple[int, int]:
+        x, y = pyautogui.position()
+        return int(x), int(y)
+
+    def move_to(self, x: int, y: int, *, duration_ms: int = 0, tween: Optional[Callable[[float], float]] = None) -> None:
         dur = max(0.0, float(duration_ms) / 1000.0)
-        pyautogui.moveTo(int(x), int(y), duration=dur)
+        if tween is not None:
+            pyautogui.moveTo(int(x), int(y), duration=dur, tween=tween)
+        else:
+            pyautogui.moveTo(int(x), int(y), duration=dur)
 
     def click(self, *, button: str = "left", clicks: int = 1) -> None:
         pyautogui.click(button=button, clicks=int(clicks), interval=0.05)
@@ -63,6 +70,15 @@ class WindowsKeyboard:
     def press_enter(self) -> None:
         pyautogui.press("enter")
 
+    def press(self, key: str) -> None:
+        pyautogui.press(key)
+
+    def key_down(self, key: str) -> None:
+        pyautogui.keyDown(key)
+
+    def key_up(self, key: str) -> None:
+        pyautogui.keyUp(key)
+
     def press_combo(self, keys: Tuple[str, ...]) -> None:
         if not keys:
             return
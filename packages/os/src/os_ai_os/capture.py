@@ -0,0 +1,138 @@
+"""Continuous screen capture service.
+
+Grabs frames from a Screen port on a background thread into a double buffer
+(front = last published frame, back = frame being captured). Each frame carries
+the monotonic time its grab started and the input generation observed at that
+moment; callers bump the generation after every input event via note_input(),
+so latest() never hands out a frame that could predate the last action.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .ports.screen import Screen
+
+_log = logging.getLogger("os_ai")
+
+
+@dataclass(frozen=True)
+class Frame:
+    image: Any
+    timestamp: float  # time.monotonic() when the grab started
+    generation: int  # input generation observed when the grab started
+    capture_ms: float = 0.0
+
+
+class CaptureService:
+    def __init__(self, screen: Screen, *, interval_s: float = 0.1, settle_s: float = 0.0) -> None:
+        self.screen = screen
+        self.interval_s = max(0.0, float(interval_s))
+        self.settle_s = max(0.0, float(settle_s))
+        self._cond = threading.Condition()
+        self._front: Optional[Frame] = None
+        self._back: Optional[Frame] = None
+        self._generation = 0
+        self._last_input_ts = 0.0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.frames_captured = 0
+        self.sync_fallbacks = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def start(self) -> None:
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="screen-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 1.0) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def note_input(self) -> int:
+        """Mark that input was injected: frames started before now become stale."""
+        with self._cond:
+            self._generation += 1
+            self._last_input_ts = time.monotonic()
+            # Wake the grabber so the first fresh frame starts right away
+            self._cond.notify_all()
+            return self._generation
+
+    def _is_fresh(self, frame: Optional[Frame], generation: int) -> bool:
+        if frame is None or frame.generation < generation:
+            return False
+        return frame.timestamp >= self._last_input_ts + self.settle_s
+
+    def latest(self, timeout: Optional[float] = 1.0) -> Frame:
+        """Newest frame taken after the last input event.
+
+        Waits up to `timeout` for the background thread; captures synchronously if
+        the service is stopped or no fresh frame arrives in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + float(timeout)
+        with self._cond:
+            generation = self._generation
+            while self._running and not self._is_fresh(self._front, generation):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            if self._is_fresh(self._front, generation):
+                return self._front  # type: ignore[return-value]
+            self.sync_fallbacks += 1
+        return self._grab()
+
+    def _grab(self) -> Frame:
+        with self._cond:
+            generation = self._generation
+            settle_until = self._last_input_ts + self.settle_s
+        wait = settle_until - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        started = time.monotonic()
+        image = self.screen.screenshot()
+        return Frame(
+            image=image,
+            timestamp=started,
+            generation=generation,
+            capture_ms=(time.monotonic() - started) * 1000.0,
+        )
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+            try:
+                self._back = self._grab()
+            except Exception as e:
+                _log.debug("Background capture failed: %s", e)
+                self._back = None
+            with self._cond:
+                ok = self._back is not None
+                if ok:
+                    # Publish: back buffer becomes front; a frame invalidated mid-grab is still
+                    # published but latest() rejects it by generation
+                    self._front, self._back = self._back, self._front
+                    self.frames_captured += 1
+                    self._cond.notify_all()
+                if not self._running:
+                    return
+                if not ok:
+                    self._cond.wait(max(self.interval_s, 0.05))
+                elif self._front is not None and self._front.generation == self._generation:
+                    # Up to date: idle until the next tick or input event
+                    self._cond.wait(self.interval_s)
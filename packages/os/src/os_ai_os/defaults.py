@@ -6,7 +6,7 @@ Platform packages may import these directly or override.
 """
 from __future__ import annotations
 
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 import time
 
@@ -21,8 +21,16 @@ from .ports.types import Size
 class PyAutoGUIMouse:
     """Mouse implementation via pyautogui (works on X11, Win32, Cocoa)."""
 
-    def move_to(self, x: int, y: int, *, duration_ms: int = 0) -> None:
-        pyautogui.moveTo(int(x), int(y), duration=max(0.0, float(duration_ms) / 1000.0))
+    def position(self) -> Tuple[int, int]:
+        x, y = pyautogui.position()
+        return int(x), int(y)
+
+    def move_to(self, x: int, y: int, *, duration_ms: int = 0, tween: Optional[Callable[[float], float]] = None) -> None:
+        duration = max(0.0, float(duration_ms) / 1000.0)
+        if tween is not None:
+            pyautogui.moveTo(int(x), int(y), duration=duration, tween=tween)
+        else:
+            pyautogui.moveTo(int(x), int(y), duration=duration)
 
     def click(self, *, button: str = "left", clicks: int = 1) -> None:
         pyautogui.click(button=button, clicks=int(clicks), interval=0.05)
@@ -72,6 +80,15 @@ class PyAutoGUIKeyboard:
     def press_enter(self) -> None:
         pyautogui.press("enter")
 
+    def press(self, key: str) -> None:
+        pyautogui.press(key)
+
+    def key_down(self, key: str) -> None:
+        pyautogui.keyDown(key)
+
+    def key_up(self, key: str) -> None:
+        pyautogui.keyUp(key)
+
     def press_combo(self, keys: Tuple[str, ...]) -> None:
         if not keys:
             return
@@ -107,6 +124,31 @@ class PyAutoGUIScreen:
         return pyautogui.screenshot()
 
 
+# --------------- Clipboard ---------------
+
+
+class PyperclipClipboard:
+    """Clipboard via pyperclip (pbcopy / xclip / xsel / win32, imported lazily)."""
+
+    def get_text(self) -> Optional[str]:
+        import pyperclip  # type: ignore
+
+        return pyperclip.paste()
+
+    def set_text(self, text: str) -> None:
+        import pyperclip  # type: ignore
+
+        pyperclip.copy(text)
+
+    def arm(self) -> None:
+        return None
+
+    def wait_read(self, timeout: float) -> bool:
+        # No way to observe the paste target; just give it the time
+        time.sleep(max(0.0, float(timeout)))
+        return False
+
+
 # --------------- No-op stubs ---------------
 
 
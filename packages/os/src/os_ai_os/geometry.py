@@ -0,0 +1,83 @@
+"""Display geometry owned by the driver layer.
+
+The screen size used to be read once at import time, so a resolution change (or
+a monitor plugged into a long-running backend) left every coordinate transform
+working on stale numbers. GeometryService caches the current size and hands out
+immutable snapshots; the cache is refreshed when the screen reports a display
+change (RandR on X11) or, for screens without change notifications, after
+`max_age_s`. Every snapshot carries a generation that increases whenever the
+geometry actually changed, so consumers can rebuild derived state lazily.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from .ports.screen import Screen
+
+_log = logging.getLogger("os_ai")
+
+
+@dataclass(frozen=True)
+class DisplayGeometry:
+    width: int
+    height: int
+    dpi_scale: float = 1.0
+    generation: int = 0
+
+
+class GeometryService:
+    def __init__(self, screen: Screen, *, dpi_scale: float = 1.0, max_age_s: float = 2.0) -> None:
+        self.screen = screen
+        self.dpi_scale = float(dpi_scale or 1.0)
+        self.max_age_s = max(0.0, float(max_age_s))
+        self._lock = threading.Lock()
+        self._current: Optional[DisplayGeometry] = None
+        self._fetched_at = 0.0
+        self._stale = True
+
+    def invalidate(self) -> None:
+        """Force the next snapshot() to re-query the screen."""
+        with self._lock:
+            self._stale = True
+
+    def _display_changed(self) -> Optional[bool]:
+        """True/False from screens that track display changes, None when they cannot tell."""
+        probe = getattr(self.screen, "display_changed", None)
+        if not callable(probe):
+            return None
+        try:
+            return probe()
+        except Exception:
+            return None
+
+    def snapshot(self) -> DisplayGeometry:
+        with self._lock:
+            changed = self._display_changed()
+            now = time.monotonic()
+            if changed is None:
+                expired = self.max_age_s <= 0 or now - self._fetched_at >= self.max_age_s
+            else:
+                expired = bool(changed)
+            if self._current is not None and not self._stale and not expired:
+                return self._current
+            try:
+                size = self.screen.size()
+            except Exception:
+                if self._current is None:
+                    raise
+                return self._current
+            width, height = int(size.width), int(size.height)
+            current = self._current
+            if current is None:
+                current = DisplayGeometry(width, height, self.dpi_scale, 0)
+            elif (current.width, current.height) != (width, height):
+                _log.info("Display geometry changed: %dx%d -> %dx%d", current.width, current.height, width, height)
+                current = DisplayGeometry(width, height, self.dpi_scale, current.generation + 1)
+            self._current = current
+            self._fetched_at = now
+            self._stale = False
+            return current
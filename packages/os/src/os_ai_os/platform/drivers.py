@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional
+
+from ..geometry import GeometryService
 from ..ports.mouse import Mouse
 from ..ports.keyboard import Keyboard
 from ..ports.screen import Screen
 from ..ports.overlay import Overlay
 from ..ports.sound import Sound
 from ..ports.permissions import Permissions
+from ..ports.clipboard import Clipboard
 from ..ports.types import Capabilities
 
 
@@ -19,5 +23,15 @@ class PlatformDrivers:
     permissions: Permissions
     sound: Sound
     capabilities: Capabilities
+    geometry: Optional[GeometryService] = None
+    clipboard: Optional[Clipboard] = None
+
+    def __post_init__(self) -> None:
+        if self.geometry is None:
+            self.geometry = GeometryService(self.screen, dpi_scale=self.capabilities.dpi_scale)
+        if self.clipboard is None:
+            from ..defaults import PyperclipClipboard
+
+            self.clipboard = PyperclipClipboard()
 
 
@@ -2,9 +2,10 @@
 from .types import Point, Size, Rect, Capabilities  # noqa: F401
 from .mouse import Mouse  # noqa: F401
 from .keyboard import Keyboard  # noqa: F401
-from .screen import Screen  # noqa: F401
+from .screen import Screen, ScaledScreen, WindowScreen  # noqa: F401
 from .overlay import Overlay  # noqa: F401
 from .sound import Sound  # noqa: F401
 from .permissions import Permissions  # noqa: F401
 
 
+from .clipboard import Clipboard  # noqa: F401
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from typing import Optional, Protocol
+
+
+class Clipboard(Protocol):
+    def get_text(self) -> Optional[str]: ...
+    def set_text(self, text: str) -> None: ...
+    # Forget earlier reads (clipboard managers fetch on every change); call right before the paste keystroke
+    def arm(self) -> None: ...
+    # True once the target application fetched the text after arm() (False: unknown / timed out)
+    def wait_read(self, timeout: float) -> bool: ...
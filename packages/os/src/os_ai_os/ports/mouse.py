@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Protocol, Tuple
+from typing import Callable, Optional, Protocol, Tuple
 
 
 class Mouse(Protocol):
-    def move_to(self, x: int, y: int, *, duration_ms: int = 0) -> None: ...
+    def position(self) -> Tuple[int, int]: ...
+    def move_to(self, x: int, y: int, *, duration_ms: int = 0, tween: Optional[Callable[[float], float]] = None) -> None: ...
     def click(self, *, button: str = "left", clicks: int = 1) -> None: ...
     def down(self, *, button: str = "left") -> None: ...
     def up(self, *, button: str = "left") -> None: ...
@@ -9,3 +9,19 @@ class Screen(Protocol):
     def screenshot(self, region: Optional[Tuple[int, int, int, int]] = None) -> Any: ...  # returns PIL.Image or ndarray
 
 
+class WindowScreen(Screen, Protocol):
+    """Screen that can also locate the focused window (Capabilities.supports_window_capture)."""
+
+    def active_window_rect(self) -> Optional[Rect]: ...
+
+
+
+
+class ScaledScreen(Screen, Protocol):
+    """Screen that scales frames natively (Capabilities.supports_scaled_capture).
+
+    Returns a frame of exactly `size` for the region (logical coordinates), or None
+    when the native path is unavailable and the caller should use screenshot().
+    """
+
+    def screenshot_scaled(self, size: Tuple[int, int], region: Optional[Tuple[int, int, int, int]] = None) -> Any: ...
@@ -30,5 +30,11 @@ class Capabilities:
     supports_smooth_move: bool = True
     dpi_scale: float = 1.0
     screen_recording_available: bool = True
-
-
+    capture_backend: str = "pyautogui"
+    supports_window_capture: bool = False
+    # Screen can return frames already scaled to a requested size (logical / model resolution)
+    supports_scaled_capture: bool = False
+    input_backend: str = "pyautogui"
+    clipboard_backend: str = "pyperclip"
+    # Keyboard can type characters missing from the layout (keysym remapping)
+    supports_unicode_typing: bool = False
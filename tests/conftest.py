@@ -26,6 +26,9 @@ for p in PKG_SRC_DIRS:
 
 # Skip flaky overlay tests by default unless explicitly enabled
 os.environ.setdefault("SKIP_OVERLAY_TESTS", "1")
+# Action tests assert PyAutoGUI/pyperclip calls; keep the Linux XTest input and X11 clipboard drivers out of the way
+os.environ.setdefault("OS_AI_INPUT_BACKEND", "pyautogui")
+os.environ.setdefault("OS_AI_CLIPBOARD_BACKEND", "pyperclip")
 
 
 def pytest_collection_modifyitems(session, config, items):
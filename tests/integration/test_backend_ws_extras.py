@@ -83,15 +83,19 @@ def test_cancel_flow(client):
         ws.send_text(json.dumps({"jsonrpc": "2.0", "id": "2", "method": "agent.cancel", "params": {"jobId": job_id}}))
         # responses and events may race; wait for reply with id=="2"
         r2 = None
+        final = None
         for _ in range(10):
             msg = json.loads(ws.receive_text())
+            if msg.get("method") == "event.final":
+                final = msg
             if msg.get("id") == "2":
                 r2 = msg
                 break
         assert r2 is not None
         assert r2["result"]["ok"] is True
-        # we should still receive final
-        final = _recv_until(ws, "event.final")
+        # we should still receive final (the job may have finished before the cancel reply)
+        if final is None:
+            final = _recv_until(ws, "event.final")
         assert final["params"]["jobId"] == job_id
 
 
@@ -102,3 +106,25 @@ def test_upload_large_file_returns_413(client, monkeypatch):
     data = b"x" * 10000
     r = client.post("/v1/files", headers={"Authorization": "Bearer secret"}, files={"file": ("b.bin", data, "application/octet-stream")})
     assert r.status_code == 413
+
+
+def test_agent_run_lock_works_on_each_event_loop():
+    import asyncio
+    from os_ai_backend import ws
+
+    async def contend():
+        order = []
+
+        async def run(name):
+            async with ws._agent_run_lock():
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(run("a"), run("b"))
+        return order, ws._agent_run_lock()
+
+    # Each TestClient / server restart runs its own loop; a lock bound to the first one would raise here
+    first, lock1 = asyncio.run(contend())
+    second, lock2 = asyncio.run(contend())
+    assert first == second == ["a", "b"]
+    assert lock1 is not lock2
@@ -98,3 +98,121 @@ def test_to_provider_messages_skips_other_provider_parts(monkeypatch):
     # Only text block, openai ProviderPart skipped
     assert len(blocks) == 1
     assert blocks[0]["type"] == "text"
+
+
+def test_computer_tool_enables_zoom_only_for_new_tool_versions(monkeypatch):
+    client = _make_client(monkeypatch)
+    new = client._to_provider_tools([ToolDescriptor(name="computer", kind="computer_use", params={"type": "computer_20251124", "display_width_px": 10, "display_height_px": 10})])
+    old = client._to_provider_tools([ToolDescriptor(name="computer", kind="computer_use", params={"type": "computer_20250124", "display_width_px": 10, "display_height_px": 10})])
+    off = client._to_provider_tools([ToolDescriptor(name="computer", kind="computer_use", params={"type": "computer_20251124", "enable_zoom": False})])
+    assert new[0]["enable_zoom"] is True
+    assert "enable_zoom" not in old[0]
+    assert "enable_zoom" not in off[0]
+
+
+def test_function_tools_carry_schema_and_description(monkeypatch):
+    from os_ai_core.tools.compound import COMPOUND_TOOL_NAME, compound_tool_descriptor
+
+    client = _make_client(monkeypatch)
+    tools = client._to_provider_tools([compound_tool_descriptor()])
+    assert tools[0]["name"] == COMPOUND_TOOL_NAME
+    assert "type" not in tools[0]
+    assert tools[0]["input_schema"]["properties"]["action"]["enum"] == ["click_and_type", "fill_form", "key_sequence"]
+    assert tools[0]["description"]
+
+
+async def test_agenerate_uses_the_async_sdk_client(monkeypatch):
+    import httpx
+    import os_ai_llm_anthropic.adapters_anthropic as aa
+
+    seen = []
+
+    class DummyAsyncAnthropic:
+        def __init__(self, **kwargs):
+
+            class _Messages:
+                async def create(self, **kw):
+                    seen.append(kw)
+                    if len(seen) == 1:
+                        req = httpx.Request("POST", "https://example.invalid")
+                        resp = httpx.Response(429, headers={"retry-after": "0"}, request=req)
+                        raise httpx.HTTPStatusError("rate limited", request=req, response=resp)
+                    return DummyAnthropic.Beta.Messages().create(**kw)
+
+            self.beta = type("_Beta", (), {"messages": _Messages()})()
+
+    monkeypatch.setattr(aa.anthropic, "AsyncAnthropic", DummyAsyncAnthropic, raising=False)
+    client = _make_client(monkeypatch)
+    resp = await client.agenerate([Message(role="user", content=[TextPart(text="hi")])], tools=[])
+
+    # The 429 is retried without blocking; request kwargs match the sync path
+    assert len(seen) == 2 and seen[0]["model"] == client.get_model_name()
+    assert resp.usage.input_tokens == 1
+
+
+def test_stream_maps_sdk_events(monkeypatch):
+    from types import SimpleNamespace as NS
+
+    tool = NS(type="tool_use", id="tu1", name="computer", input={"action": "left_click", "coordinate": [1, 2]})
+    events = [
+        NS(type="text", text="Click", snapshot="Click"),
+        NS(type="input_json", partial_json='{"action"', snapshot={}),
+        NS(type="content_block_stop", index=0, content_block=NS(type="text", text="Click")),
+        NS(type="content_block_stop", index=1, content_block=tool),
+    ]
+    final = NS(content=[NS(type="text", text="Click"), tool], usage=NS(input_tokens=5, output_tokens=3))
+
+    class _Stream:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def __iter__(self):
+            return iter(events)
+
+        def get_final_message(self):
+            return final
+
+    client = _make_client(monkeypatch)
+    client._client.beta.messages.stream = lambda **kw: _Stream()
+    out = list(client.stream([Message(role="user", content=[TextPart(text="hi")])], tools=[]))
+
+    assert [e.kind for e in out] == ["text_delta", "text", "tool_call", "response"]
+    assert out[2].tool_call.id == "tu1" and out[2].tool_call.args["coordinate"] == [1, 2]
+    assert [c.id for c in out[3].response.tool_calls] == ["tu1"]
+    assert out[3].response.usage.input_tokens == 5
+
+
+def test_cache_breakpoints_on_tools_system_and_latest_user_turns(monkeypatch):
+    from os_ai_llm_anthropic.adapters_anthropic import MAX_CACHE_BREAKPOINTS
+
+    client = _make_client(monkeypatch)
+    history = [
+        Message(role="user", content=[TextPart(text="task")]),
+        Message(role="assistant", content=[TextPart(text="a1")]),
+        Message(role="user", content=[TextPart(text="r1")]),
+        Message(role="assistant", content=[TextPart(text="a2")]),
+        Message(role="user", content=[TextPart(text="r2"), ImagePart(media_type="image/png", data_base64="AA")]),
+    ]
+    tools = [ToolDescriptor(name="computer", kind="computer_use", params={"display_width_px": 10, "display_height_px": 10})]
+    kwargs = client._request_kwargs(history, tools, "be careful", "auto", 1024, True)
+
+    assert kwargs["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert kwargs["system"] == [{"type": "text", "text": "be careful", "cache_control": {"type": "ephemeral"}}]
+    marked = [i for i, m in enumerate(kwargs["messages"]) for b in m["content"] if "cache_control" in b]
+    assert marked == [2, 4]
+    assert kwargs["messages"][4]["content"][-1]["type"] == "image"
+    total = 2 + len(marked)
+    assert total <= MAX_CACHE_BREAKPOINTS
+    # The canonical history is not modified
+    assert client._to_provider_messages(history)[4]["content"][-1].get("cache_control") is None
+
+
+def test_usage_includes_prompt_cache_tokens(monkeypatch):
+    from types import SimpleNamespace as NS
+
+    client = _make_client(monkeypatch)
+    resp = client._parse_response(NS(content=[], usage=NS(input_tokens=10, output_tokens=5, cache_creation_input_tokens=1200, cache_read_input_tokens=None)))
+    assert (resp.usage.cache_creation_input_tokens, resp.usage.cache_read_input_tokens) == (1200, 0)
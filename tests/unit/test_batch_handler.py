@@ -15,6 +15,8 @@ def _mock_pyautogui(monkeypatch):
     mock_pag.FAILSAFE = False
     mock_pag.PAUSE = 0
     monkeypatch.setattr("os_ai_core.tools.computer.pyautogui", mock_pag)
+    # No settle sampling before the closing screenshot (covered in test_settle.py)
+    monkeypatch.setattr("os_ai_core.tools.computer.BATCH_SETTLE_ENABLED", False)
     return mock_pag
 
 
@@ -118,3 +120,72 @@ def test_batch_continues_on_error(monkeypatch):
 
     assert call_count[0] == 3  # all three attempted
     assert result[0]["type"] == "image"  # screenshot returned
+
+
+def test_batch_returns_zoom_captures_before_final_screenshot(monkeypatch):
+    """Zoom images from the batch are kept; the full screenshot stays last."""
+    from os_ai_core.tools.computer import computer_tool_handler_batch
+
+    def fake_handle(action, params):
+        if action == "zoom":
+            return [
+                {"type": "text", "text": "zoomed view of region (0,0)-(10,10)"},
+                {"type": "image", "label": "zoom", "source": {"type": "base64", "media_type": "image/png", "data": "z"}},
+            ]
+        return [{"type": "text", "text": "ok"}]
+
+    with patch("os_ai_core.tools.computer.handle_computer_action", side_effect=fake_handle):
+        with patch("os_ai_core.tools.computer.b64_image_from_screenshot") as mock_ss:
+            mock_ss.return_value = {"type": "image", "source": {"type": "base64", "media_type": "image/png", "data": "full"}}
+            result = computer_tool_handler_batch({
+                "_openai_batch": True,
+                "_openai_actions": [
+                    {"action": "zoom", "region": [0, 0, 10, 10]},
+                    {"action": "left_click", "coordinate": [1, 1]},
+                ],
+            })
+
+    assert [b.get("label") for b in result if b["type"] == "image"] == ["zoom", None]
+    assert result[-1]["source"]["data"] == "full"
+
+
+def test_batch_is_optimised_and_reports_per_action_results(monkeypatch):
+    """Fused steps run once; every original action still gets a result."""
+    from os_ai_core.tools.computer import computer_tool_handler_batch
+
+    calls = []
+
+    def fake_handle(action, params):
+        calls.append((action, params.get("coordinate"), params.get("text")))
+        return [{"type": "text", "text": f"done: {action}"}]
+
+    with patch("os_ai_core.tools.computer.handle_computer_action", side_effect=fake_handle):
+        with patch("os_ai_core.tools.computer.b64_image_from_screenshot") as mock_ss:
+            mock_ss.return_value = {"type": "image", "source": {"type": "base64", "media_type": "image/png", "data": "s"}}
+            result = computer_tool_handler_batch({
+                "_openai_batch": True,
+                "_openai_actions": [
+                    {"action": "mouse_move", "coordinate": [10, 20]},
+                    {"action": "left_click", "coordinate": [10, 20]},
+                    {"action": "type", "text": "ab"},
+                    {"action": "type", "text": "c"},
+                    {"action": "screenshot"},
+                ],
+            })
+
+    assert calls == [("left_click", [10, 20], None), ("type", None, "abc")]
+    assert [r["text"] for r in result[-1]["metadata"]["batch_results"]] == [
+        "done: left_click", "done: left_click", "done: type", "done: type", "skipped: screenshot",
+    ]
+    assert "metadata" not in mock_ss.return_value
+
+
+def test_key_sequence_presses_each_combo(monkeypatch):
+    from os_ai_core.tools import computer
+
+    kb = MagicMock()
+    monkeypatch.setattr(computer, "_keyboard", lambda: kb)
+    res = computer.handle_computer_action("key", {"sequence": ["ctrl+a", "delete"]})
+    kb.press_combo.assert_called_once_with(("ctrl", "a"))
+    kb.press.assert_called_once_with("delete")
+    assert res[0]["text"] == "pressed: ctrl+a, delete"
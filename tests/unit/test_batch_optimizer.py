@@ -0,0 +1,82 @@
+"""Tests for the OpenAI batch peephole optimiser (os_ai_core.utils.batch_optimizer)."""
+from __future__ import annotations
+
+from os_ai_core.utils.batch_optimizer import optimize_batch
+
+
+def _steps(actions):
+    batch = optimize_batch(actions)
+    return [(s.action, s.sources) for s in batch.steps], batch.dropped
+
+
+def test_move_then_click_at_same_point_is_one_click():
+    steps, _ = _steps([
+        {"action": "mouse_move", "coordinate": [100, 200]},
+        {"action": "left_click", "coordinate": [100, 200]},
+        {"action": "mouse_move", "coordinate": [5, 5]},
+        {"action": "double_click"},
+    ])
+    assert steps == [
+        ({"action": "left_click", "coordinate": [100, 200]}, (0, 1)),
+        ({"action": "double_click", "coordinate": [5, 5]}, (2, 3)),
+    ]
+
+
+def test_move_then_click_elsewhere_is_kept():
+    steps, _ = _steps([
+        {"action": "mouse_move", "coordinate": [100, 200]},
+        {"action": "left_click", "coordinate": [300, 200]},
+    ])
+    assert [s[1] for s in steps] == [(0,), (1,)]
+
+
+def test_adjacent_types_keys_and_waits_merge():
+    steps, dropped = _steps([
+        {"action": "type", "text": "hello "},
+        {"action": "screenshot"},
+        {"action": "type", "text": "world"},
+        {"action": "key", "key": "ctrl+a"},
+        {"action": "key", "key": "delete"},
+        {"action": "wait", "seconds": 2.0},
+        {"action": "wait", "seconds": 0},
+        {"action": "wait", "seconds": 2.0},
+    ])
+    assert steps == [
+        ({"action": "type", "text": "hello world"}, (0, 2)),
+        ({"action": "key", "sequence": ["ctrl+a", "delete"]}, (3, 4)),
+        ({"action": "wait", "seconds": 4.0}, (5, 7)),
+    ]
+    assert dropped == {1: "skipped: screenshot", 6: "skipped: zero wait"}
+
+
+def test_zero_scroll_becomes_move_and_fuses_with_click():
+    actions = [
+        {"action": "scroll", "coordinate": [40, 50], "scroll_direction": "down", "scroll_amount": 0},
+        {"action": "left_click", "coordinate": [40, 50]},
+        {"action": "scroll", "scroll_direction": "down", "scroll_amount": 0},
+    ]
+    steps, dropped = _steps(actions)
+    assert steps == [({"action": "left_click", "coordinate": [40, 50]}, (0, 1))]
+    assert dropped == {2: "skipped: zero scroll"}
+    # The caller's dicts are not modified
+    assert actions[1] == {"action": "left_click", "coordinate": [40, 50]}
+
+
+def test_key_text_fallbacks_are_not_merged():
+    steps, _ = _steps([
+        {"action": "key", "key": "enter"},
+        {"action": "key", "text": "Return"},
+    ])
+    assert len(steps) == 2
+
+
+def test_adjacent_settle_waits_extend_the_timeout():
+    steps, _ = _steps([
+        {"action": "wait_until_stable", "timeout": 2.0},
+        {"action": "wait_until_stable", "timeout": 2.0},
+        {"action": "wait_until_stable", "timeout": 1.0, "region": [0, 0, 10, 10]},
+    ])
+    assert steps == [
+        ({"action": "wait_until_stable", "timeout": 4.0}, (0, 1)),
+        ({"action": "wait_until_stable", "timeout": 1.0, "region": [0, 0, 10, 10]}, (2,)),
+    ]
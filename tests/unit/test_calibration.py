@@ -0,0 +1,166 @@
+"""Tests for online pointer calibration (os_ai_core.utils.calibration)."""
+from __future__ import annotations
+
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from os_ai_core.utils.calibration import AffineCalibrator, CalibrationStore, fit_affine, invert_affine
+
+
+def _skewed(x, y):
+    # Systematic error: 1% scale on x plus an (8, -5) offset
+    return round(x * 1.01 + 8), round(y - 5)
+
+
+def _grid(n=12, seed=3):
+    rnd = random.Random(seed)
+    return [(rnd.randint(0, 1919), rnd.randint(0, 1079)) for _ in range(n)]
+
+
+def test_fit_recovers_affine_and_inverts():
+    samples = [((x, y), _skewed(x, y)) for x, y in _grid()]
+    a, b, c, d, e, f = fit_affine(samples)
+    assert a == pytest.approx(1.01, abs=1e-3) and e == pytest.approx(1.0, abs=1e-3)
+    assert c == pytest.approx(8, abs=1.0) and f == pytest.approx(-5, abs=1.0)
+    x, y = invert_affine((a, b, c, d, e, f), 1018.0, 495.0)
+    assert (round(x), round(y)) == (1000, 500)
+
+
+def test_degenerate_samples_fall_back_to_translation():
+    samples = [((100, 100), (103, 98))] * 5
+    assert fit_affine(samples) == (1.0, 0.0, 3.0, 0.0, 1.0, -2.0)
+
+
+def test_not_applied_until_converged():
+    cal = AffineCalibrator(min_samples=6)
+    for x, y in _grid(5):
+        cal.add_sample((x, y), _skewed(x, y))
+    assert not cal.converged
+    assert cal.command_for((500, 500)) == (500, 500)
+
+
+def test_converged_fit_lands_on_target():
+    cal = AffineCalibrator(min_samples=6)
+    for x, y in _grid():
+        cal.add_sample((x, y), _skewed(x, y))
+    assert cal.converged
+    command = cal.command_for((1000, 600))
+    assert _skewed(*command) == pytest.approx((1000, 600), abs=1)
+
+
+def test_outliers_are_rejected():
+    cal = AffineCalibrator(min_samples=6, outlier_px=25)
+    points = _grid(16)
+    for i, (x, y) in enumerate(points):
+        actual = _skewed(x, y)
+        if i % 5 == 0:
+            actual = (actual[0] + 40, actual[1] - 30)  # user nudged the mouse
+        cal.add_sample((x, y), actual)
+    assert cal.converged
+    assert cal.inliers < len(points)
+    assert cal.params[2] == pytest.approx(8, abs=1.0)
+
+
+def test_user_moves_far_away_are_not_samples():
+    cal = AffineCalibrator()
+    assert cal.add_sample((100, 100), (900, 700)) is False
+    assert len(cal.samples) == 0
+
+
+def test_store_round_trip(tmp_path):
+    cal = AffineCalibrator(min_samples=6)
+    for x, y in _grid():
+        cal.add_sample((x, y), _skewed(x, y))
+    store = CalibrationStore(str(tmp_path / "cal.json"))
+    store.save("1920x1080", cal.to_dict())
+    store.save("2560x1440", AffineCalibrator().to_dict())
+    restored = AffineCalibrator()
+    restored.load_dict(store.load("1920x1080"))
+    assert restored.converged
+    assert restored.command_for((1000, 600)) == cal.command_for((1000, 600))
+    assert store.load("800x600") is None
+
+
+def test_mouse_move_stops_correcting_once_converged(monkeypatch, tmp_path):
+    pag = MagicMock()
+    pag.size.return_value = (1920, 1080)
+    drivers = MagicMock()
+    state = {"pos": (0, 0)}
+    drivers.mouse.move_to.side_effect = lambda x, y, **kw: state.update(pos=_skewed(x, y))
+    drivers.mouse.position.side_effect = lambda: state["pos"]
+    import os_ai_core.tools.computer as computer
+    monkeypatch.setattr(computer, "pyautogui", pag)
+    monkeypatch.setattr(computer, "_GEOMETRY", None)
+    monkeypatch.setattr(computer, "_ACTIVE_VIEWPORT", None)
+    monkeypatch.setattr(computer, "_CALIBRATOR", None)
+    monkeypatch.setattr(computer, "_CALIBRATION_STORE", None)
+    monkeypatch.setattr(computer, "COORD_CALIBRATION_FILE", str(tmp_path / "cal.json"))
+    monkeypatch.setattr(computer, "get_drivers", lambda: drivers)
+    monkeypatch.setattr(computer, "MOTION_PROFILE", "instant")
+
+    for x, y in _grid(10):
+        computer.handle_computer_action("mouse_move", {"coordinate": [x, y], "coordinate_space": "screen"})
+    assert computer._CALIBRATOR.converged
+    drivers.mouse.move_to.reset_mock()
+    computer.handle_computer_action("mouse_move", {"coordinate": [700, 400], "coordinate_space": "screen"})
+    # One move, no corrective second move, and the cursor is on target
+    assert drivers.mouse.move_to.call_count == 1
+    assert state["pos"] == pytest.approx((700, 400), abs=1)
+
+
+def test_noisy_samples_on_one_row_do_not_fit_a_wild_affine():
+    rnd = random.Random(7)
+    cal = AffineCalibrator(min_samples=6)
+    # Repeated toolbar clicks: one row, +-1 px noise on the reported position
+    for x in (40, 90, 140, 190, 240, 290, 340, 390):
+        actual = (x + 8 + rnd.choice((-1, 0, 1)), 20 - 5 + rnd.choice((-1, 0, 1)))
+        cal.add_sample((x, 20), actual)
+
+    a, b, c, d, e, f = cal.params
+    assert (b, d, e) == (0.0, 0.0, 1.0)
+    assert a == pytest.approx(1.0, abs=0.01) and f == pytest.approx(-5, abs=1.0)
+    # Far from the sampled row the correction stays the measured offset, not a blow-up
+    command = cal.command_for((800, 1000))
+    assert abs(command[0] - 792) <= 10 and abs(command[1] - 1005) <= 2
+
+
+def test_corrections_are_capped():
+    cal = AffineCalibrator(max_correction_px=50)
+    cal.load_dict({"params": [2.0, 0.0, 0.0, 0.0, 2.0, 0.0], "rms_px": 0.5, "samples": 8})
+    x, y = cal.command_for((1000, 0))
+    assert (x, y) == (950, 0)
+    assert cal.predict((1000, 0)) == (1050, 0)
+
+
+def test_xtest_backend_verifies_against_the_server_pointer(monkeypatch, tmp_path):
+    pag = MagicMock()
+    pag.size.return_value = (1920, 1080)
+    drivers = MagicMock()
+    drivers.capabilities.input_backend = "xtest"
+    state = {"pos": (0, 0), "tracked": (0, 0)}
+
+    def move_to(x, y, **kw):
+        state.update(tracked=(x, y), pos=_skewed(x, y))
+
+    drivers.mouse.move_to.side_effect = move_to
+    # XTestMouse.position() is the last injected target, only query_position() asks the server
+    drivers.mouse.position.side_effect = lambda: state["tracked"]
+    drivers.mouse.query_position.side_effect = lambda: state["pos"]
+    import os_ai_core.tools.computer as computer
+    monkeypatch.setattr(computer, "pyautogui", pag)
+    monkeypatch.setattr(computer, "_GEOMETRY", None)
+    monkeypatch.setattr(computer, "_ACTIVE_VIEWPORT", None)
+    monkeypatch.setattr(computer, "_CALIBRATOR", None)
+    monkeypatch.setattr(computer, "_CALIBRATION_STORE", None)
+    monkeypatch.setattr(computer, "COORD_CALIBRATION_FILE", str(tmp_path / "cal.json"))
+    monkeypatch.setattr(computer, "get_drivers", lambda: drivers)
+    monkeypatch.setattr(computer, "MOTION_PROFILE", "instant")
+
+    computer.handle_computer_action("mouse_move", {"coordinate": [700, 400], "coordinate_space": "screen"})
+
+    assert drivers.mouse.query_position.called
+    assert computer._CALIBRATOR.samples[0][1] == pytest.approx(_skewed(700, 400), abs=1)
+    # The miss is seen, so the move is re-issued
+    assert drivers.mouse.move_to.call_count == 2
@@ -0,0 +1,116 @@
+"""Tests for the double-buffered background capture service (os_ai_os.capture)."""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from os_ai_os.capture import CaptureService
+
+
+class _CountingScreen:
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def size(self):
+        return None
+
+    def screenshot(self, region=None):
+        if self.fail:
+            raise RuntimeError("no display")
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        if self.delay:
+            time.sleep(self.delay)
+        return f"frame-{n}"
+
+
+def _wait_for(pred, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if pred():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_latest_without_thread_captures_synchronously():
+    screen = _CountingScreen()
+    svc = CaptureService(screen)
+    frame = svc.latest(timeout=0)
+    assert frame.image == "frame-1"
+    assert frame.generation == 0
+    assert svc.sync_fallbacks == 1
+
+
+def test_latest_reuses_background_frame():
+    screen = _CountingScreen()
+    svc = CaptureService(screen, interval_s=5.0)
+    svc.start()
+    try:
+        assert _wait_for(lambda: svc.frames_captured >= 1)
+        calls_before = screen.calls
+        frame = svc.latest(timeout=1.0)
+        assert frame.image.startswith("frame-")
+        # Served from the buffer, not a fresh grab
+        assert screen.calls == calls_before
+        assert svc.sync_fallbacks == 0
+    finally:
+        svc.stop()
+
+
+def test_frames_before_input_are_never_returned():
+    screen = _CountingScreen(delay=0.02)
+    svc = CaptureService(screen, interval_s=5.0)
+    svc.start()
+    try:
+        assert _wait_for(lambda: svc.frames_captured >= 1)
+        stale = svc.latest(timeout=1.0)
+        gen = svc.note_input()
+        fresh = svc.latest(timeout=1.0)
+        assert fresh.generation >= gen
+        assert fresh.timestamp > stale.timestamp
+        assert fresh.image != stale.image
+    finally:
+        svc.stop()
+
+
+def test_input_during_grab_invalidates_that_frame():
+    screen = _CountingScreen(delay=0.1)
+    svc = CaptureService(screen, interval_s=5.0)
+    svc.start()
+    try:
+        time.sleep(0.02)  # first grab is in flight
+        gen = svc.note_input()
+        frame = svc.latest(timeout=1.0)
+        assert frame.generation == gen
+        assert frame.image != "frame-1"
+    finally:
+        svc.stop()
+
+
+def test_timeout_falls_back_to_sync_capture():
+    screen = _CountingScreen()
+    svc = CaptureService(screen, interval_s=5.0, settle_s=0.05)
+    svc.note_input()
+    started = time.monotonic()
+    frame = svc.latest(timeout=0)
+    # Sync fallback still honours the settle delay after input
+    assert frame.timestamp - started >= 0.04
+    assert svc.sync_fallbacks == 1
+
+
+def test_failing_screen_does_not_spin_or_crash():
+    screen = _CountingScreen(fail=True)
+    svc = CaptureService(screen, interval_s=0.0)
+    svc.start()
+    time.sleep(0.1)
+    svc.stop()
+    assert svc.frames_captured == 0
+    with pytest.raises(RuntimeError):
+        svc.latest(timeout=0)
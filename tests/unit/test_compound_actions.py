@@ -0,0 +1,83 @@
+"""Tests for compound computer actions (click_and_type, fill_form, key_sequence)."""
+from __future__ import annotations
+
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+SCREENSHOT = {"type": "image", "source": {"type": "base64", "media_type": "image/png", "data": "s"}}
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    """Record the primitive actions a compound action expands to (nothing touches the real input)."""
+    import os_ai_core.tools.computer as computer
+
+    calls = []
+    real = computer.handle_computer_action
+
+    def fake_perform(action, params):
+        calls.append((action, {k: v for k, v in params.items() if k != "coordinate_space"}))
+        return [{"type": "text", "text": "error: boom" if params.get("text") == "fail" else f"done: {action}"}]
+
+    shots = MagicMock(return_value=SCREENSHOT)
+    sleeps = []
+    monkeypatch.setattr(computer, "_perform_action", fake_perform)
+    monkeypatch.setattr(computer, "b64_image_from_screenshot", shots)
+    monkeypatch.setattr(computer, "_note_input", lambda: None)
+    monkeypatch.setattr(computer.time, "sleep", sleeps.append)
+    return real, calls, shots, sleeps
+
+
+def test_click_and_type_runs_locally_with_one_screenshot(recorded):
+    run, calls, shots, _ = recorded
+    res = run("click_and_type", {"coordinate": [100, 40], "text": "alice", "clear": True, "submit_key": "enter"})
+
+    select_all = "command+a" if sys.platform == "darwin" else "ctrl+a"
+    assert calls == [
+        ("left_click", {"coordinate": [100, 40]}),
+        ("key", {"key": select_all}),
+        ("type", {"text": "alice"}),
+        ("key", {"key": "enter"}),
+    ]
+    shots.assert_called_once()
+    assert res[0]["text"].startswith("done: click_and_type")
+    assert res[-1] is SCREENSHOT
+
+
+def test_fill_form_stops_at_first_failed_step(recorded):
+    run, calls, shots, _ = recorded
+    res = run("fill_form", {
+        "fields": [
+            {"coordinate": [10, 10], "text": "a", "submit_key": "tab"},
+            {"coordinate": [10, 50], "text": "fail"},
+            {"coordinate": [10, 90], "text": "never"},
+        ],
+        "submit_key": "enter",
+    })
+    assert [c[0] for c in calls] == ["left_click", "type", "key", "left_click", "type"]
+    assert res[0]["text"].startswith("error: fill_form step 5/")
+    shots.assert_called_once()
+
+
+def test_key_sequence_uses_per_key_delays(recorded):
+    run, calls, _, sleeps = recorded
+    run("key_sequence", {"keys": ["ctrl+l", {"key": "enter", "delay_ms": 500}, "tab"], "delay_ms": 100})
+    assert [c[1]["key"] for c in calls] == ["ctrl+l", "enter", "tab"]
+    # Pause after each key but the last
+    assert sleeps == [0.1, 0.5]
+
+
+def test_invalid_compound_input_is_reported(recorded):
+    run, calls, shots, _ = recorded
+    res = run("fill_form", {"fields": [{"text": "no coordinate"}]})
+    assert res == [{"type": "text", "text": "error: fill_form field 1 needs coordinate [x, y]"}]
+    assert not calls and not shots.called
+
+
+def test_compound_tool_only_offered_to_anthropic():
+    from os_ai_core.tools.compound import COMPOUND_TOOL_NAME, compound_tools_for
+
+    assert [t.name for t in compound_tools_for("anthropic")] == [COMPOUND_TOOL_NAME]
+    assert compound_tools_for("openai") == []
@@ -0,0 +1,131 @@
+"""Tests for history compaction (os_ai_core.utils.conversation_optimizer)."""
+from __future__ import annotations
+
+from typing import List
+
+from os_ai_llm.interfaces import LLMClient
+from os_ai_llm.types import LLMResponse, Message, ProviderPart, TextPart, ToolCall, ToolDescriptor, Usage
+
+from os_ai_core.orchestrator import Orchestrator
+from os_ai_core.tools.registry import ToolRegistry
+from os_ai_core.utils.conversation_optimizer import SUMMARY_HEADER, ConversationOptimizer
+from os_ai_core.utils.summarizers.llm_summarizer import LLMSummarizer
+
+
+def _tool_use(*ids: str) -> Message:
+    blocks = [{"type": "tool_use", "id": i, "name": "computer", "input": {"action": "left_click"}} for i in ids]
+    return Message(role="assistant", content=[TextPart(text=f"step {ids[0]}"), ProviderPart(provider="anthropic", sub_type="tool_use", data=blocks)])
+
+
+def _tool_result(call_id: str) -> Message:
+    block = {"type": "tool_result", "tool_use_id": call_id, "content": [{"type": "text", "text": f"done {call_id}"}], "is_error": False}
+    return Message(role="user", content=[ProviderPart(provider="anthropic", sub_type="tool_result", data=[block])])
+
+
+def _ids(messages: List[Message], kind: str, key: str) -> List[str]:
+    return [b[key] for m in messages for p in m.content if isinstance(p, ProviderPart) for b in p.data if b["type"] == kind]
+
+
+def test_tail_keeps_tool_pairs_and_the_summary_rolls():
+    task = Message(role="user", content=[TextPart(text="task")])
+    opt = ConversationOptimizer(max_messages=8, keep_messages=4)
+    opt.reset(1)
+    history = [task]
+    compactions = 0
+    for i in range(1, 9):
+        # Every third turn runs two tools in parallel: one assistant message, two result messages
+        ids = (f"a{i}", f"b{i}") if i % 3 == 0 else (f"a{i}",)
+        history.append(_tool_use(*ids))
+        history.extend(_tool_result(c) for c in ids)
+
+        sent, summary = opt.summarize_history(history)
+
+        assert sent[0] is task and len(sent) <= 1 + 8
+        assert sent[1].role == "assistant"
+        assert sorted(_ids(sent, "tool_result", "tool_use_id")) == sorted(_ids(sent, "tool_use", "id"))
+        compactions += bool(opt.last_folded)
+
+    assert opt.summary == summary and "[assistant] step a1" in summary and "done a1" in summary
+    # Compaction cuts well below the limit, so the prompt prefix stays stable for several turns
+    assert compactions == 3
+    assert len(history) == 19
+    system = opt.system_prompt("base")
+    assert system.startswith("base\n\n" + SUMMARY_HEADER) and system.endswith(summary)
+
+
+class SummaryLLM(LLMClient):
+    def __init__(self, reply=None) -> None:
+        self.reply = reply
+        self.prompts = []
+
+    def generate(self, **kwargs):  # type: ignore[override]
+        self.prompts.append((kwargs["system"], kwargs["messages"][0].content[0].text, kwargs["tools"]))
+        if self.reply is None:
+            raise RuntimeError("overloaded")
+        return LLMResponse(messages=[Message(role="assistant", content=[TextPart(text=self.reply)])], tool_calls=[], usage=Usage(input_tokens=7, output_tokens=3))
+
+    def format_tool_result(self, result):
+        raise NotImplementedError
+
+
+def test_llm_summarizer_merges_the_previous_summary_and_falls_back_to_text():
+    client = SummaryLLM("Notepad is open; title typed.")
+    summarizer = LLMSummarizer(client, max_chars=200)
+
+    out = summarizer.summarize("Opened Notepad.", [_tool_use("a1"), _tool_result("a1")])
+
+    assert out == "Notepad is open; title typed."
+    system, prompt, tools = client.prompts[0]
+    assert "200 characters" in system and tools == []
+    assert prompt.startswith("Previous summary:\nOpened Notepad.") and "done a1" in prompt
+    assert (summarizer.input_tokens, summarizer.output_tokens) == (7, 3)
+
+    failing = LLMSummarizer(SummaryLLM(None))
+    assert failing.summarize("Opened Notepad.", [_tool_result("a2")]) == "Opened Notepad.\n[user] done a2"
+
+
+class LoopLLM(LLMClient):
+    """Clicks on every turn; records what each call was sent."""
+
+    def __init__(self, provider_context=None) -> None:
+        self.sent = []
+        self.provider_context = provider_context
+
+    def generate(self, messages, tools, system=None, **kwargs):  # type: ignore[override]
+        self.sent.append((list(messages), system))
+        n = len(self.sent)
+        call = ToolCall(id=f"a{n}", name="computer", args={"action": "left_click"})
+        return LLMResponse(messages=[_tool_use(call.id)], tool_calls=[call], usage=Usage(input_tokens=1), provider_context=self.provider_context)
+
+    def format_tool_result(self, result):
+        return _tool_result(result.tool_call_id)
+
+
+def _run(client, max_iterations=12):
+    reg = ToolRegistry()
+    reg.register("computer", lambda args: [{"type": "text", "text": "ok"}])
+    events = []
+    orch = Orchestrator(client, reg, history_optimizer=ConversationOptimizer(max_messages=6, keep_messages=4))
+    msgs = orch.run("task", [ToolDescriptor(name="computer", kind="computer_use")], "base", max_iterations, on_event=lambda k, p: events.append((k, p)))
+    return msgs, events
+
+
+def test_run_sends_a_bounded_window_and_keeps_the_full_history():
+    client = LoopLLM()
+    msgs, events = _run(client)
+
+    assert len(msgs) == 1 + 2 * 12
+    assert max(len(sent) for sent, _ in client.sent) <= 7
+    last_sent, last_system = client.sent[-1]
+    assert last_sent[0].content[0].text == "task"
+    assert last_system.startswith("base\n\n" + SUMMARY_HEADER) and "step a1" in last_system
+    compacted = [p for k, p in events if k == "progress" and p.get("stage") == "history_compacted"]
+    assert compacted and all(p["folded_messages"] > 0 for p in compacted)
+
+
+def test_server_side_context_is_not_compacted():
+    client = LoopLLM(provider_context={"previous_response_id": "resp_1"})
+    _run(client, max_iterations=6)
+
+    assert [len(sent) for sent, _ in client.sent] == [1, 3, 5, 7, 9, 11]
+    assert all(system == "base" for _, system in client.sent)
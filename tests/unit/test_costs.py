@@ -42,3 +42,12 @@ def test_unknown_model_fallback():
     inp, out, total, tier = estimate_cost("unknown-model-xyz", 1000, 500)
     assert tier == "base"
     assert total > 0
+
+
+def test_prompt_cache_tokens_are_billed_at_cache_rates():
+    base, _, _, _ = estimate_cost("claude-sonnet-4-6", 1000, 0)
+    inp, out, total, tier = estimate_cost("claude-sonnet-4-6", 1000, 0, cache_creation_tokens=2000, cache_read_tokens=10_000)
+    assert inp == pytest.approx(base + 2000 / 1_000_000 * 3.0 * 1.25 + 10_000 / 1_000_000 * 3.0 * 0.1)
+    # Cached tokens count towards the long-context tier
+    _, _, _, tier = estimate_cost("claude-sonnet-4-6", 1000, 0, cache_read_tokens=250_000)
+    assert "long-context" in tier
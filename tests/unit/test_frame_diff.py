@@ -0,0 +1,56 @@
+"""Tests for unchanged-screenshot detection (os_ai_core.utils.frame_diff)."""
+from __future__ import annotations
+
+from PIL import Image, ImageDraw
+
+from os_ai_core.utils.frame_diff import FrameDiffTracker
+
+
+def _screen(text: str = "", noise: int = 0) -> Image.Image:
+    img = Image.new("RGB", (1024, 576), (240, 240, 240) if not noise else (240 + noise, 240, 240))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((0, 0, 1023, 40), fill=(40, 60, 90))
+    if text:
+        draw.text((100, 300), text, fill=(0, 0, 0))
+    return img
+
+
+def test_inactive_tracker_never_suppresses():
+    tracker = FrameDiffTracker()
+    assert tracker.observe(_screen()) is None
+    assert tracker.observe(_screen()) is None
+
+
+def test_identical_frames_report_last_sent_step():
+    tracker = FrameDiffTracker()
+    tracker.start_session()
+    assert tracker.observe(_screen()) is None
+    assert tracker.observe(_screen()) == 1
+    assert tracker.observe(_screen()) == 1
+    assert tracker.step == 3
+
+
+def test_small_text_change_is_detected():
+    tracker = FrameDiffTracker()
+    tracker.start_session()
+    assert tracker.observe(_screen()) is None
+    assert tracker.observe(_screen("a")) is None
+    assert tracker.last_sent_step == 2
+
+
+def test_noise_below_tolerance_is_ignored():
+    tracker = FrameDiffTracker(pixel_tolerance=8)
+    tracker.start_session()
+    tracker.observe(_screen())
+    assert tracker.observe(_screen(noise=3)) == 1
+
+
+def test_start_session_and_forget_clear_reference():
+    tracker = FrameDiffTracker()
+    tracker.start_session()
+    tracker.observe(_screen())
+    tracker.forget()
+    assert tracker.observe(_screen()) is None
+    tracker.start_session()
+    assert tracker.step == 0
+    assert tracker.observe(_screen()) is None
@@ -0,0 +1,121 @@
+"""Tests for single-encode screenshot frames."""
+
+from __future__ import annotations
+
+import base64
+from io import BytesIO
+
+from PIL import Image
+
+from os_ai_core.utils.frames import BudgetJpegEncoder, choose_format, encode_frame, normalize_format
+
+
+def _img(mode: str = "RGB") -> Image.Image:
+    return Image.new(mode, (64, 32), (10, 200, 30) if mode == "RGB" else (10, 200, 30, 255))
+
+
+def test_normalize_format_aliases():
+    assert normalize_format("jpg") == "JPEG"
+    assert normalize_format("jpeg") == "JPEG"
+    assert normalize_format(None) == "PNG"
+    assert normalize_format("bmp") == "PNG"
+
+
+def test_jpeg_frame_block_roundtrip():
+    frame = encode_frame(_img(), "JPEG", quality=60)
+    block = frame.to_block()
+    assert block["type"] == "image"
+    assert block["source"]["media_type"] == "image/jpeg"
+    raw = base64.b64decode(block["source"]["data"])
+    assert raw == frame.data
+    with Image.open(BytesIO(raw)) as im:
+        assert im.size == (64, 32)
+
+
+def test_b64_is_computed_once():
+    frame = encode_frame(_img(), "PNG")
+    assert frame.b64 is frame.b64
+    assert frame.extension == "png"
+
+
+def test_jpeg_converts_rgba_source():
+    frame = encode_frame(_img("RGBA"), "JPEG")
+    assert frame.format == "JPEG"
+    assert frame.size_bytes > 0
+
+
+def test_write_to_uses_same_bytes(tmp_path):
+    frame = encode_frame(_img(), "JPEG")
+    path = tmp_path / f"shot.{frame.extension}"
+    frame.write_to(str(path))
+    assert path.read_bytes() == frame.data
+
+
+def _busy(seed: int = 1) -> Image.Image:
+    import random
+    rnd = random.Random(seed)
+    img = Image.new("RGB", (320, 200), (255, 255, 255))
+    px = img.load()
+    for y in range(0, 200, 2):
+        for x in range(0, 320, 2):
+            px[x, y] = (rnd.randrange(256), rnd.randrange(256), rnd.randrange(256))
+    return img
+
+
+def test_budget_encoder_fits_budget_and_reports_quality():
+    budget = 20 * 1024
+    enc = BudgetJpegEncoder(budget, min_quality=10, max_quality=95, max_iters=7)
+    frame = enc.encode(_busy())
+    assert frame.size_bytes <= budget
+    assert frame.quality is not None and 10 <= frame.quality <= 95
+    assert 1 <= frame.attempts <= 7
+    # A slightly higher quality would have blown the budget (or we hit the ceiling/slack)
+    if frame.quality < 95 and frame.size_bytes < budget * 0.9:
+        assert encode_frame(_busy(), "JPEG", quality=frame.quality + 1).size_bytes > budget
+
+
+def test_budget_encoder_starts_from_previous_quality():
+    enc = BudgetJpegEncoder(20 * 1024, min_quality=10, max_quality=95, max_iters=7)
+    first = enc.encode(_busy(1))
+    assert enc.last_quality == first.quality
+    second = enc.encode(_busy(2))
+    # Similar content: previous quality is already close, so fewer passes are needed
+    assert second.attempts <= first.attempts
+
+
+def test_budget_encoder_returns_lowest_attempt_when_nothing_fits():
+    enc = BudgetJpegEncoder(200, min_quality=30, max_quality=90, max_iters=10)
+    frame = enc.encode(_busy())
+    assert frame.size_bytes > 200
+    assert frame.quality == 30
+
+
+def _flat_ui() -> Image.Image:
+    from PIL import ImageDraw
+    img = Image.new("RGB", (640, 360), (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((0, 0, 640, 30), fill=(33, 150, 243))
+    for y in range(50, 340, 18):
+        draw.rectangle((40, y, 600, y + 8), fill=(30, 30, 30))
+    return img
+
+
+def test_choose_format_flat_ui_uses_palette_png():
+    fmt, opts = choose_format(_flat_ui())
+    assert fmt == "PNG"
+    assert opts.get("palette_colors") == 256
+
+
+def test_choose_format_photo_uses_jpeg():
+    bands = [Image.effect_noise((640, 360), 60 + 10 * i) for i in range(3)]
+    photo = Image.merge("RGB", bands)
+    assert choose_format(photo)[0] == "JPEG"
+
+
+def test_auto_and_webp_frames_carry_media_type():
+    frame = encode_frame(_flat_ui(), "auto")
+    assert frame.media_type == "image/png"
+    assert Image.open(BytesIO(frame.data)).mode == "P"
+    webp = encode_frame(_flat_ui(), "webp", lossless=True)
+    assert webp.media_type in ("image/webp", "image/png")  # PNG if Pillow lacks WebP
+    assert webp.to_block()["source"]["media_type"] == webp.media_type
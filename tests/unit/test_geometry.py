@@ -0,0 +1,92 @@
+"""Tests for the driver-owned display geometry and the model geometry built from it."""
+from __future__ import annotations
+
+from os_ai_core.utils.geometry import build_model_geometry
+from os_ai_os.geometry import GeometryService
+from os_ai_os.ports.types import Size
+
+
+class _Screen:
+    def __init__(self, w=1920, h=1080):
+        self.size_value = Size(w, h)
+        self.size_calls = 0
+
+    def size(self):
+        self.size_calls += 1
+        return self.size_value
+
+    def screenshot(self, region=None):
+        return None
+
+
+class _NotifyingScreen(_Screen):
+    def __init__(self, *a):
+        super().__init__(*a)
+        self.changed = False
+
+    def display_changed(self):
+        changed, self.changed = self.changed, False
+        return changed
+
+
+def test_snapshot_is_cached_until_it_expires():
+    screen = _Screen()
+    svc = GeometryService(screen, max_age_s=60.0)
+    first = svc.snapshot()
+    assert (first.width, first.height, first.generation) == (1920, 1080, 0)
+    assert svc.snapshot() is first
+    assert screen.size_calls == 1
+
+
+def test_generation_bumps_only_on_real_change():
+    screen = _Screen()
+    svc = GeometryService(screen, max_age_s=0.0)
+    assert svc.snapshot().generation == 0
+    assert svc.snapshot().generation == 0
+    screen.size_value = Size(2560, 1440)
+    snap = svc.snapshot()
+    assert (snap.width, snap.height, snap.generation) == (2560, 1440, 1)
+
+
+def test_change_notification_replaces_polling():
+    screen = _NotifyingScreen()
+    svc = GeometryService(screen, max_age_s=0.0)
+    svc.snapshot()
+    svc.snapshot()
+    # Without a notification the size is not re-queried even with max_age_s=0
+    assert screen.size_calls == 1
+    screen.size_value = Size(1280, 800)
+    screen.changed = True
+    assert (svc.snapshot().width, screen.size_calls) == (1280, 2)
+
+
+def test_invalidate_forces_requery():
+    screen = _NotifyingScreen()
+    svc = GeometryService(screen)
+    svc.snapshot()
+    svc.invalidate()
+    svc.snapshot()
+    assert screen.size_calls == 2
+
+
+def test_model_geometry_without_letterbox_matches_screen_aspect():
+    g = build_model_geometry(1920, 1200, virtual_w=1024, virtual_h=768)
+    assert (g.model_w, g.model_h) == (1024, 640)
+    assert g.viewport.offset == (0, 0)
+    assert g.viewport.to_screen(512, 320) == (960, 600)
+
+
+def test_model_geometry_letterbox_and_native():
+    boxed = build_model_geometry(1920, 1200, virtual_w=1024, virtual_h=768, letterbox=True)
+    assert (boxed.model_w, boxed.model_h) == (1024, 768)
+    assert boxed.viewport.offset == (0, 64)
+    native = build_model_geometry(1920, 1200, mode="native", virtual_w=1024)
+    assert (native.model_w, native.model_h) == (1920, 1200)
+    assert native.viewport.to_screen(100, 200) == (100, 200)
+
+
+def test_window_fits_in_the_full_screen_budget():
+    g = build_model_geometry(1920, 1080, virtual_w=1024)
+    vp = g.fit(100, 100, 800, 900)
+    assert vp.model_h == g.model_h
+    assert vp.model_w < g.model_w
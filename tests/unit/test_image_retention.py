@@ -0,0 +1,143 @@
+"""Tests for history image retention (os_ai_core.utils.image_retention)."""
+from __future__ import annotations
+
+import base64
+import io
+
+import pytest
+
+from os_ai_llm.types import ImagePart, Message, ProviderPart, TextPart
+
+from os_ai_core.utils.image_retention import TieredImageRetention
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _png(width: int = 400, height: int = 200) -> str:
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(buf, format="PNG")
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def _width(data: str) -> int:
+    return Image.open(io.BytesIO(base64.b64decode(data))).width
+
+
+def _anthropic_result(call_id: str, data: str) -> Message:
+    block = {
+        "type": "tool_result",
+        "tool_use_id": call_id,
+        "content": [{"type": "text", "text": "ok"}, {"type": "image", "source": {"type": "base64", "media_type": "image/png", "data": data}}],
+        "is_error": False,
+    }
+    return Message(role="user", content=[ProviderPart(provider="anthropic", sub_type="tool_result", data=[block])])
+
+
+def _openai_result(call_id: str, data: str) -> Message:
+    item = {"type": "computer_call_output", "call_id": call_id, "output": {"type": "computer_screenshot", "image_url": f"data:image/png;base64,{data}"}}
+    return Message(role="user", content=[ProviderPart(provider="openai", sub_type="computer_call_output", data=item)])
+
+
+def _history(make):
+    msgs = [Message(role="user", content=[TextPart(text="task"), ImagePart(media_type="image/png", data_base64=_png())])]
+    for i in range(1, 4):
+        msgs.append(Message(role="assistant", content=[TextPart(text=f"step {i}")]))
+        msgs.append(make(f"c{i}", _png()))
+    return msgs
+
+
+def test_anthropic_history_keeps_newest_downscales_then_replaces():
+    msgs = _history(_anthropic_result)
+    original = msgs[2].content[0].data[0]["content"][1]
+    policy = TieredImageRetention(keep_last=1, downscale_count=1, downscale_width=64)
+
+    stats = policy.apply(msgs, {"c1": "left_click"})
+
+    assert (stats.images, stats.kept, stats.downscaled, stats.replaced) == (4, 1, 1, 2)
+    assert not stats.latest_changed
+    blocks = [m.content[0].data[0] for m in msgs[2::2]]
+    # Every tool_result survives with its id
+    assert [b["tool_use_id"] for b in blocks] == ["c1", "c2", "c3"]
+    assert blocks[0]["content"][1] == {"type": "text", "text": "[screenshot from step 1 after left_click removed from history]"}
+    assert blocks[1]["content"][1]["source"]["media_type"] == "image/jpeg"
+    assert _width(blocks[1]["content"][1]["source"]["data"]) == 64
+    assert _width(blocks[2]["content"][1]["source"]["data"]) == 400
+    # The task image is the oldest one
+    assert isinstance(msgs[0].content[1], TextPart)
+    # Provider data that other references may hold is not modified
+    assert original["type"] == "image"
+
+    again = policy.apply(msgs, {})
+    assert again.changed == 0 and again.images == 2
+
+
+def test_openai_screenshots_become_thumbnails_not_notes():
+    msgs = _history(_openai_result)
+    stats = TieredImageRetention(keep_last=1, downscale_count=1, downscale_width=128, thumb_width=16).apply(msgs)
+
+    assert stats.replaced == 2
+    widths = []
+    for m in msgs[2::2]:
+        url = m.content[0].data["output"]["image_url"]
+        assert url.startswith("data:image/")
+        widths.append(_width(url.split(";base64,", 1)[1]))
+    assert widths == [16, 128, 400]
+
+
+def test_orchestrator_reports_images_and_calls_the_prune_hook():
+    from os_ai_llm.interfaces import LLMClient
+    from os_ai_llm.types import LLMResponse, ToolCall, ToolDescriptor, Usage
+    from os_ai_core.orchestrator import Orchestrator
+    from os_ai_core.tools.registry import ToolRegistry
+
+    class LLM(LLMClient):
+        calls = 0
+
+        def generate(self, **kwargs):  # type: ignore[override]
+            self.calls += 1
+            tc = [ToolCall(id=f"c{self.calls}", name="computer", args={"action": "left_click"})] if self.calls < 3 else []
+            return LLMResponse(messages=[Message(role="assistant", content=[TextPart(text="x")])], tool_calls=tc, usage=Usage(input_tokens=5))
+
+        def format_tool_result(self, result):
+            return _anthropic_result(result.tool_call_id, result.content[0].data_base64)
+
+    pruned = []
+    reg = ToolRegistry()
+    reg.register("computer", lambda args: [{"type": "image", "source": {"type": "base64", "media_type": "image/png", "data": _png()}}])
+    reg.add_prune_hook(lambda: pruned.append(True))
+    events = []
+    msgs = Orchestrator(LLM(), reg, image_policy=TieredImageRetention(keep_last=0, downscale_count=0)).run(
+        "task", [ToolDescriptor(name="computer", kind="computer_use")], None, on_event=lambda k, p: events.append((k, p))
+    )
+
+    usage = [p for k, p in events if k == "usage"]
+    assert [u["images_replaced"] for u in usage] == [0, 1, 1]
+    assert usage[0]["prompt_tokens"] == 5
+    assert pruned == [True, True]
+    note = msgs[2].content[0].data[0]["content"][1]["text"]
+    assert note == "[screenshot from step 1 after left_click removed from history]"
+
+
+def _prefix_changes(policy, turns=9):
+    """Turns whose retention rewrote the history the previous request ended with (its cache breakpoint)."""
+    import copy
+
+    msgs = _history(_anthropic_result)[:1]
+    sent = None
+    changed = []
+    for i in range(1, turns + 1):
+        msgs.append(Message(role="assistant", content=[TextPart(text=f"step {i}")]))
+        msgs.append(_anthropic_result(f"c{i}", _png()))
+        policy.apply(msgs)
+        if sent is not None and msgs[: len(sent)] != sent:
+            changed.append(i)
+        sent = copy.deepcopy(msgs)
+    return changed
+
+
+def test_coarse_retiering_keeps_the_cached_prefix_between_steps():
+    # Re-tiering on every screenshot rewrites an old message each turn: nothing past the system prompt is cached
+    assert _prefix_changes(TieredImageRetention(keep_last=3, downscale_count=3, downscale_width=64)) == [3, 4, 5, 6, 7, 8, 9]
+
+    changed = _prefix_changes(TieredImageRetention(keep_last=3, downscale_count=3, downscale_width=64, retier_step=3))
+    assert changed == [5, 8]
@@ -88,7 +88,8 @@ def test_type_multiline_uses_clipboard_paste(monkeypatch):
         # Should not be used for multiline/code path
         pasted["write_used"] = True
 
-    monkeypatch.setattr(main, "pyautogui", type("P", (), {"hotkey": hotkey, "write": write}))
+    monkeypatch.setattr(main.pyautogui, "hotkey", hotkey)
+    monkeypatch.setattr(main.pyautogui, "write", write)
     monkeypatch.setitem(sys.modules, "pyperclip", _Clip)
 
     text = "line1\nline2()"
@@ -0,0 +1,123 @@
+"""Tests for the persistent X11 capture backend (os_ai_os_linux.x11_capture).
+
+Live-capture tests need an X server (run under Xvfb in CI); the rest run anywhere libX11 exists.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="X11 capture is Linux-only")
+
+
+def _live_capture():
+    from os_ai_os_linux.x11_capture import X11Capture
+    if not os.environ.get("DISPLAY"):
+        pytest.skip("No X display (run under Xvfb)")
+    try:
+        return X11Capture(os.environ["DISPLAY"])
+    except (OSError, RuntimeError) as e:
+        pytest.skip(f"X display not reachable: {e}")
+
+
+def test_unreachable_display_raises():
+    from os_ai_os_linux.x11_capture import X11Capture, _load_libs
+    try:
+        _load_libs()
+    except OSError:
+        pytest.skip("libX11 not installed")
+    with pytest.raises(RuntimeError, match="Cannot open X display"):
+        X11Capture(":987")
+
+
+def test_grab_image_matches_root_size():
+    cap = _live_capture()
+    try:
+        w, h = cap.size()
+        img = cap.grab_image()
+        assert img.mode == "RGB"
+        assert img.size == (w, h)
+        assert cap.backend in ("xshm", "xgetimage")
+    finally:
+        cap.close()
+
+
+def test_grab_region_is_clipped_to_screen():
+    cap = _live_capture()
+    try:
+        w, h = cap.size()
+        assert cap.grab_image((10, 20, 64, 32)).size == (64, 32)
+        assert cap.grab_image((w - 5, h - 5, 100, 100)).size == (5, 5)
+    finally:
+        cap.close()
+
+
+def test_grab_array_is_bgrx_view():
+    np = pytest.importorskip("numpy")
+    cap = _live_capture()
+    try:
+        arr = cap.grab_array((0, 0, 40, 30))
+        assert arr.shape == (30, 40, 4)
+        assert arr.dtype == np.uint8
+        img = cap.grab_image((0, 0, 40, 30))
+        # Pixel (0, 0) must agree between the raw view and the RGB image
+        b, g, r = (int(v) for v in cap.grab_array((0, 0, 40, 30))[0, 0, :3])
+        assert img.getpixel((0, 0)) == (r, g, b)
+    finally:
+        cap.close()
+
+
+def test_buffers_are_reused_across_frames():
+    cap = _live_capture()
+    try:
+        cap.grab_image()
+        cap.grab_image((0, 0, 16, 16))
+        cap.grab_image()
+        if cap.backend == "xshm":
+            assert len(cap._buffers) == 2
+    finally:
+        cap.close()
+
+
+def test_make_drivers_reports_capture_backend(monkeypatch):
+    _live_capture().close()
+    from os_ai_os_linux.drivers import XShmScreen, make_drivers
+    drv = make_drivers()
+    assert isinstance(drv.screen, XShmScreen)
+    assert drv.capabilities.capture_backend in ("xshm", "xgetimage")
+    assert drv.capabilities.screen_recording_available is True
+
+
+def test_make_drivers_pyautogui_opt_out(monkeypatch):
+    _live_capture().close()
+    monkeypatch.setenv("OS_AI_CAPTURE_BACKEND", "pyautogui")
+    from os_ai_os.defaults import PyAutoGUIScreen
+    from os_ai_os_linux.drivers import XShmScreen, make_drivers
+    drv = make_drivers()
+    assert isinstance(drv.screen, PyAutoGUIScreen)
+    assert not isinstance(drv.screen, XShmScreen)
+    assert drv.capabilities.capture_backend == "pyautogui"
+
+
+def test_active_window_rect_is_inside_screen():
+    cap = _live_capture()
+    try:
+        rect = cap.active_window_rect()
+        # None without an EWMH window manager (bare Xvfb)
+        if rect is not None:
+            x, y, w, h = rect
+            sw, sh = cap.size()
+            assert w > 0 and h > 0
+            assert 0 <= x and x + w <= sw
+            assert 0 <= y and y + h <= sh
+    finally:
+        cap.close()
+
+
+def test_make_drivers_reports_window_capture():
+    _live_capture().close()
+    from os_ai_os_linux.drivers import make_drivers
+    assert make_drivers().capabilities.supports_window_capture is True
@@ -0,0 +1,114 @@
+"""Tests for the in-process X11 CLIPBOARD owner (os_ai_os_linux.x11_clipboard).
+
+SelectionRequest handling is checked against fake requestors; the live round-trip
+needs an X server (run under Xvfb in CI).
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+
+import pytest
+
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="X11 clipboard is Linux-only")
+
+X = pytest.importorskip("Xlib.X")
+
+
+class _Requestor:
+    def __init__(self):
+        self.props = {}
+        self.sent = []
+
+    def change_property(self, prop, type_, fmt, data):
+        self.props[prop] = (type_, fmt, data)
+
+    def send_event(self, event, event_mask=0):
+        self.sent.append(event)
+
+
+class _Request:
+    type = X.SelectionRequest
+    time = 0
+
+    def __init__(self, selection, target, prop):
+        self.requestor = _Requestor()
+        self.selection, self.target, self.property = selection, target, prop
+
+
+@pytest.fixture
+def owner(monkeypatch):
+    from Xlib import X, Xatom
+    from Xlib.protocol import event as xevent
+    from os_ai_os_linux.x11_clipboard import X11Clipboard
+
+    # SelectionNotify is only inspected, never serialised
+    monkeypatch.setattr(xevent, "SelectionNotify", lambda **kw: kw)
+    clip = X11Clipboard.__new__(X11Clipboard)
+    clip._X, clip._Xatom = X, Xatom
+    clip._clipboard, clip._targets, clip._utf8, clip._text, clip._incr = 100, 101, 102, 103, 104
+    clip._display = type("_D", (), {"flush": lambda self: None})()
+    clip._served = threading.Event()
+    clip._data, clip._owned = "héllo".encode("utf-8"), True
+    return clip
+
+
+def test_serves_utf8_and_marks_the_text_read(owner):
+    req = _Request(owner._clipboard, owner._utf8, 200)
+    owner._handle(req)
+
+    assert req.requestor.props[200] == (owner._utf8, 8, "héllo".encode("utf-8"))
+    assert req.requestor.sent[0]["property"] == 200
+    assert owner.wait_read(0)
+
+
+def test_reads_before_arm_do_not_count(owner):
+    # A clipboard manager fetches the new text as soon as we own the selection
+    owner._handle(_Request(owner._clipboard, owner._utf8, 200))
+    owner.arm()
+    assert not owner.wait_read(0)
+
+    # The paste target reads after the keystroke
+    owner._handle(_Request(owner._clipboard, owner._utf8, 201))
+    assert owner.wait_read(0)
+
+
+def test_targets_and_refusals(owner):
+    req = _Request(owner._clipboard, owner._targets, 200)
+    owner._handle(req)
+    assert owner._utf8 in req.requestor.props[200][2]
+    assert not owner.wait_read(0)
+
+    # Unknown target: refused with property None
+    req = _Request(owner._clipboard, 999, 200)
+    owner._handle(req)
+    assert req.requestor.sent[0]["property"] == X.NONE and not req.requestor.props
+
+    # Another client took the selection: stop serving
+    clear = type("_Clear", (), {"type": X.SelectionClear, "selection": owner._clipboard})()
+    owner._handle(clear)
+    req = _Request(owner._clipboard, owner._utf8, 200)
+    owner._handle(req)
+    assert req.requestor.sent[0]["property"] == X.NONE
+
+
+def test_live_set_and_get_text():
+    if not os.environ.get("DISPLAY"):
+        pytest.skip("No X display (run under Xvfb)")
+    from os_ai_os_linux.x11_clipboard import X11Clipboard
+
+    try:
+        first = X11Clipboard(os.environ["DISPLAY"])
+        second = X11Clipboard(os.environ["DISPLAY"])
+    except Exception as e:
+        pytest.skip(f"X11 clipboard not available: {e}")
+    try:
+        first.set_text("snowman ☃")
+        # Read through another connection: a real selection transfer
+        assert second.get_text() == "snowman ☃"
+        assert first.wait_read(1.0)
+    finally:
+        first.close()
+        second.close()
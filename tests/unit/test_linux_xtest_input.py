@@ -0,0 +1,271 @@
+"""Tests for the persistent XTest input drivers (os_ai_os_linux.xtest_input).
+
+The batching/tracking tests run against a fake Xlib display; the live test needs
+an X server with XTEST (run under Xvfb in CI).
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="XTest input is Linux-only")
+
+Xlib = pytest.importorskip("Xlib")
+
+
+class _Pointer:
+    def __init__(self, x, y):
+        self.root_x, self.root_y = x, y
+
+
+class _FakeDisplay:
+    """Records fake_input events and round-trips; keymap: letters, Return, Control_L, Shift_L.
+
+    Keycodes 252-253 carry no keysyms and are free for Unicode remapping.
+    """
+
+    _NAMED = {0xFF0D: 36, 0xFFE3: 37, 0xFFE1: 50}
+
+    def __init__(self, name=None):
+        self.events = []
+        self.syncs = 0
+        self.queries = 0
+        self.pointer = (100, 100)
+        display = self
+
+        class _Root:
+            def query_pointer(self):
+                display.queries += 1
+                return _Pointer(*display.pointer)
+
+        class _Screen:
+            root = _Root()
+            width_in_pixels = 1920
+            height_in_pixels = 1080
+
+        self._screen = _Screen()
+        self.display = type("_Conn", (), {"info": type("_Info", (), {"min_keycode": 8, "max_keycode": 253})()})()
+        self.remaps = []
+
+    def get_keyboard_mapping(self, first, count):
+        return [[0, 0] if kc >= 252 else [kc, kc] for kc in range(first, first + count)]
+
+    def change_keyboard_mapping(self, first, keysyms):
+        self.remaps.append((first, keysyms[0][0]))
+
+    def has_extension(self, name):
+        return name == "XTEST"
+
+    def screen(self):
+        return self._screen
+
+    def keysym_to_keycodes(self, keysym):
+        if 0x61 <= keysym <= 0x7A:
+            return [(keysym - 59, 0)]
+        if 0x41 <= keysym <= 0x5A:
+            return [(keysym + 32 - 59, 1)]
+        if keysym in self._NAMED:
+            return [(self._NAMED[keysym], 0)]
+        return []
+
+    def sync(self):
+        self.syncs += 1
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_x(monkeypatch):
+    from Xlib import X
+    import Xlib.display
+    from Xlib.ext import xtest
+
+    displays = []
+
+    def _display(name=None):
+        displays.append(_FakeDisplay(name))
+        return displays[-1]
+
+    def fake_input(display, event_type, detail=0, time=0, root=0, x=0, y=0):
+        kind = {X.KeyPress: "kd", X.KeyRelease: "ku", X.ButtonPress: "bd", X.ButtonRelease: "bu", X.MotionNotify: "mv"}[event_type]
+        display.events.append((kind, detail) if kind != "mv" else (kind, x, y))
+
+    monkeypatch.setattr(Xlib.display, "Display", _display)
+    monkeypatch.setattr(xtest, "fake_input", fake_input)
+    from os_ai_os_linux import xtest_input
+    monkeypatch.setattr(xtest_input.pyautogui, "FAILSAFE", False, raising=False)
+    xinput = xtest_input.XTestInput(":99")
+    return xtest_input, xinput, displays[0]
+
+
+def test_key_names_map_to_keysyms():
+    from Xlib import XK
+    from os_ai_os_linux.xtest_input import char_keysym, key_keysym
+
+    assert key_keysym("ctrl") == XK.string_to_keysym("Control_L")
+    assert key_keysym("enter") == XK.string_to_keysym("Return")
+    assert key_keysym("pagedown") == XK.string_to_keysym("Next")
+    assert key_keysym("f5") == XK.string_to_keysym("F5")
+    assert key_keysym("a") == ord("a")
+    assert char_keysym("é") == 0xE9
+    assert char_keysym("ж") == 0x01000436
+    assert key_keysym("no-such-key") == 0
+
+
+def test_combo_is_one_batch_with_one_sync(fake_x):
+    mod, xinput, display = fake_x
+    kb = mod.XTestKeyboard(xinput)
+
+    kb.press_combo(("ctrl", "v"))
+
+    ctrl, v = 37, ord("v") - 59
+    assert display.events == [("kd", ctrl), ("kd", v), ("ku", v), ("ku", ctrl)]
+    assert display.syncs == 1
+
+
+def test_type_text_adds_shift_for_shifted_keysyms(fake_x):
+    mod, xinput, display = fake_x
+    kb = mod.XTestKeyboard(xinput)
+
+    kb.type_text("aB", wpm=100000)
+
+    shift, a, b = 50, ord("a") - 59, ord("b") - 59
+    assert display.events == [("kd", a), ("ku", a), ("kd", shift), ("kd", b), ("ku", b), ("ku", shift)]
+    assert display.syncs == 1
+
+
+def test_unmapped_characters_use_spare_keycodes_lru(fake_x, monkeypatch):
+    mod, xinput, display = fake_x
+    monkeypatch.setattr(mod, "_REMAP_SETTLE_S", 0.0)
+    kb = mod.XTestKeyboard(xinput)
+    zhe, ya, euro = (mod.char_keysym(c) for c in "жя€")
+
+    kb.type_text("жяж€", wpm=0)
+
+    # Two spare slots: 'ж' is reused, '€' evicts the least recently used 'я'
+    assert display.remaps == [(252, zhe), (253, ya), (253, euro)]
+    assert [e for e in display.events if e[0] == "kd"] == [("kd", 252), ("kd", 253), ("kd", 252), ("kd", 253)]
+    # Keys typed with the evicted binding are committed before the keycode is rebound
+    assert display.syncs == 2
+
+    xinput.close()
+    assert display.remaps[-2:] in ([(252, 0), (253, 0)], [(253, 0), (252, 0)])
+
+
+def test_cursor_is_tracked_without_queries(fake_x):
+    mod, xinput, display = fake_x
+    mouse = mod.XTestMouse(xinput)
+    assert display.queries == 1  # initial position only
+
+    mouse.move_to(640, 480)
+    mouse.click(button="right", clicks=2)
+
+    assert mouse.position() == (640, 480)
+    assert display.queries == 1
+    assert display.events == [("mv", 640, 480), ("bd", 3), ("bu", 3), ("bd", 3), ("bu", 3)]
+    assert display.syncs == 2
+
+
+def test_query_position_asks_the_server_and_resyncs_tracking(fake_x):
+    mod, xinput, display = fake_x
+    mouse = mod.XTestMouse(xinput)
+    mouse.move_to(640, 480)
+    display.pointer = (652, 471)  # the server placed the pointer elsewhere
+
+    assert mouse.position() == (640, 480)
+    assert mouse.query_position() == (652, 471)
+    assert display.queries == 2
+    assert mouse.position() == (652, 471)
+
+
+def test_smooth_move_follows_tween_and_ends_on_target(fake_x):
+    mod, xinput, display = fake_x
+    mouse = mod.XTestMouse(xinput)
+
+    mouse.move_to(300, 100, duration_ms=50, tween=lambda t: t * t)
+
+    moves = [e for e in display.events if e[0] == "mv"]
+    assert len(moves) > 2
+    assert moves[-1] == ("mv", 300, 100)
+    xs = [m[1] for m in moves]
+    assert xs == sorted(xs)
+    # Ease-in: the first half of the steps covers less than half of the distance
+    assert xs[len(xs) // 2 - 1] < 200
+
+
+def test_failsafe_corner_raises(fake_x, monkeypatch):
+    mod, xinput, display = fake_x
+    monkeypatch.setattr(mod.pyautogui, "FAILSAFE", True, raising=False)
+    monkeypatch.setattr(mod.pyautogui, "FailSafeException", type("FailSafeException", (Exception,), {}), raising=False)
+    mouse = mod.XTestMouse(xinput)
+    display.pointer = (0, 0)
+
+    with pytest.raises(mod.pyautogui.FailSafeException):
+        mouse.move_to(500, 500)
+    assert not [e for e in display.events if e[0] == "mv"]
+
+
+def test_button_and_wheel_failures_fall_back_to_pyautogui(fake_x, monkeypatch):
+    mod, xinput, display = fake_x
+    fallback = []
+    for name in ("mouseDown", "mouseUp", "scroll", "hscroll"):
+        monkeypatch.setattr(mod.pyautogui, name, lambda *a, _n=name, **kw: fallback.append((_n, a, kw)), raising=False)
+
+    def broken(*a, **kw):
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(xinput, "commit", broken)
+    mouse = mod.XTestMouse(xinput)
+
+    mouse.down(button="right")
+    mouse.up(button="right")
+    mouse.scroll(dy=-3, dx=2)
+
+    assert fallback == [
+        ("mouseDown", (), {"button": "right"}),
+        ("mouseUp", (), {"button": "right"}),
+        ("scroll", (-3,), {}),
+        ("hscroll", (2,), {}),
+    ]
+
+
+def test_failsafe_applies_to_button_and_wheel_events(fake_x, monkeypatch):
+    mod, xinput, display = fake_x
+    monkeypatch.setattr(mod.pyautogui, "FAILSAFE", True, raising=False)
+    monkeypatch.setattr(mod.pyautogui, "FailSafeException", type("FailSafeException", (Exception,), {}), raising=False)
+    mouse = mod.XTestMouse(xinput)
+    display.pointer = (0, 0)
+
+    for action in (mouse.down, mouse.up, mouse.scroll):
+        with pytest.raises(mod.pyautogui.FailSafeException):
+            action()
+    assert display.events == []
+
+
+def test_live_move_lands_on_target():
+    if not os.environ.get("DISPLAY"):
+        pytest.skip("No X display (run under Xvfb)")
+    from Xlib.display import Display
+    from os_ai_os_linux.xtest_input import XTestInput, XTestMouse
+
+    try:
+        xinput = XTestInput(os.environ["DISPLAY"])
+    except Exception as e:
+        pytest.skip(f"XTest not available: {e}")
+    mouse = XTestMouse(xinput)
+    mouse.move_to(123, 77)
+    # Query through an independent connection: the server saw the move
+    other = Display(os.environ["DISPLAY"])
+    try:
+        pointer = other.screen().root.query_pointer()
+        assert (pointer.root_x, pointer.root_y) == (123, 77)
+    finally:
+        other.close()
+        xinput.close()
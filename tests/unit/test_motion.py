@@ -0,0 +1,90 @@
+"""Tests for pointer motion profiles and trajectory playback (os_ai_core.utils.motion)."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from os_ai_core.utils.motion import PROFILES, get_profile, normalize_tween, play, trajectory
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_trajectory_ends_exactly_on_target_and_follows_tween():
+    pts = trajectory((0, 0), (300, 150), 0.5, event_hz=60, tween="easeInQuad")
+    assert pts.shape == (30, 2)
+    assert tuple(pts[-1]) == (300, 150)
+    assert np.all(np.diff(pts[:, 0]) >= 0)
+    # Ease-in covers a quarter of the distance by half time
+    assert pts[14, 0] == pytest.approx(75, abs=2)
+
+
+def test_trajectory_degenerates_to_a_single_warp():
+    assert trajectory((5, 5), (100, 100), 0.0, event_hz=120).tolist() == [[100, 100]]
+    assert trajectory((5, 5), (5, 5), 1.0, event_hz=120).tolist() == [[5, 5]]
+
+
+def test_unknown_names_fall_back():
+    assert normalize_tween("bounce") == "easeinoutquad"
+    assert get_profile("warp-speed") is PROFILES["human"]
+    assert get_profile("INSTANT").instant
+
+
+def test_profiles_scale_duration():
+    dist = 100.0
+    assert get_profile("instant").duration_for(dist, 2000.0) == 0.0
+    assert get_profile("human").duration_for(dist, 2000.0) == pytest.approx(0.08)  # MIN_MOVE_DURATION
+    assert get_profile("fast").duration_for(dist, 2000.0) == pytest.approx(0.0125)
+    assert get_profile("fast").duration_for(10_000.0, 2000.0) == pytest.approx(0.15)
+
+
+def test_play_paces_against_absolute_deadlines():
+    clock = _Clock()
+    moves = []
+    pts = trajectory((0, 0), (100, 0), 0.1, event_hz=100)
+    sent = play(pts, 100, lambda x, y: moves.append((x, y)), clock=clock, sleep=clock.sleep)
+    assert sent == len(pts) == 10
+    assert moves[-1] == (100, 0)
+    assert clock.now == pytest.approx(0.1)
+
+
+def test_play_drops_late_points_instead_of_stretching():
+    clock = _Clock()
+
+    def slow_move(x, y):
+        clock.now += 0.025  # backend slower than the 100 Hz event rate
+
+    pts = trajectory((0, 0), (100, 0), 0.1, event_hz=100)
+    move = MagicMock(side_effect=slow_move)
+    sent = play(pts, 100, move, clock=clock, sleep=clock.sleep)
+    assert sent < len(pts)
+    assert move.call_args_list[-1].args == (100, 0)
+    # Total time stays within one late event of the planned duration (10 events would take 0.25 s)
+    assert clock.now <= 0.1 + 2 * 0.025
+
+
+def test_instant_profile_moves_once(monkeypatch):
+    import os_ai_core.tools.computer as computer
+
+    drivers = MagicMock()
+    drivers.mouse.position.return_value = (0, 0)
+    monkeypatch.setattr(computer, "get_drivers", lambda: drivers)
+    computer._move_to(400, 300, 0.5, "linear", get_profile("instant"))
+    drivers.mouse.move_to.assert_called_once_with(400, 300)
+
+    drivers.mouse.move_to.reset_mock()
+    computer._move_to(400, 300, 0.1, "linear", get_profile("fast"))
+    assert drivers.mouse.move_to.call_count > 1
+    assert drivers.mouse.move_to.call_args_list[-1].args == (400, 300)
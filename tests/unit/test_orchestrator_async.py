@@ -0,0 +1,116 @@
+"""Tests for Orchestrator.arun (async run loop)."""
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from os_ai_llm.interfaces import LLMClient
+from os_ai_llm.types import LLMResponse, Message, TextPart, ToolCall, ToolDescriptor, Usage
+from os_ai_core.orchestrator import CancelToken, Orchestrator
+from os_ai_core.tools.registry import ToolRegistry
+
+
+TOOLS = [ToolDescriptor(name="computer", kind="computer_use")]
+
+
+def _turn(text: str, calls: List[ToolCall]) -> LLMResponse:
+    return LLMResponse(
+        messages=[Message(role="assistant", content=[TextPart(text=text)])],
+        tool_calls=calls,
+        usage=Usage(input_tokens=2, output_tokens=1),
+    )
+
+
+class AsyncLLM(LLMClient):
+    """Native agenerate(); generate() must not be used by arun()."""
+
+    def __init__(self, turns: List[LLMResponse]) -> None:
+        self.turns = list(turns)
+        self.calls = 0
+
+    def generate(self, **kwargs):  # type: ignore[override]
+        raise AssertionError("arun() must call agenerate()")
+
+    async def agenerate(self, **kwargs):  # type: ignore[override]
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.turns.pop(0)
+
+    def format_tool_result(self, result):
+        return Message(role="user", content=[TextPart(text="tool_result")])
+
+
+class SyncLLM(LLMClient):
+    def __init__(self) -> None:
+        self.threads = []
+
+    def generate(self, **kwargs):  # type: ignore[override]
+        self.threads.append(threading.current_thread().name)
+        return _turn("done", [])
+
+    def format_tool_result(self, result):
+        return Message(role="user", content=[TextPart(text="tool_result")])
+
+
+async def test_arun_runs_tools_on_the_input_thread_and_awaits_events():
+    threads = []
+    reg = ToolRegistry()
+    reg.register("computer", lambda args: threads.append(threading.current_thread().name) or [{"type": "text", "text": "ok"}])
+    client = AsyncLLM([
+        _turn("clicking", [ToolCall(id="1", name="computer", args={"action": "left_click"})]),
+        _turn("done", []),
+    ])
+    events = []
+
+    async def on_event(kind, payload):
+        await asyncio.sleep(0)
+        events.append(kind)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="test-input") as ex:
+        msgs = await Orchestrator(client, reg, tool_executor=ex).arun("task", TOOLS, None, on_event=on_event)
+
+    assert client.calls == 2
+    assert threads == ["test-input_0"]
+    assert [m.role for m in msgs] == ["user", "assistant", "user", "assistant"]
+    assert events.count("usage") == 2
+    assert events.index("tool_call") < events.index("tool_result_text")
+
+
+async def test_agenerate_falls_back_to_a_worker_thread():
+    client = SyncLLM()
+    events = []
+    orch = Orchestrator(client, ToolRegistry())
+
+    await orch.arun("task", TOOLS, None, on_event=lambda kind, payload: events.append(kind))
+
+    assert client.threads and client.threads[0] != threading.current_thread().name
+    assert "assistant_text" in events and orch.total_input_tokens == 2
+
+
+async def test_task_cancellation_cancels_the_token():
+    started = threading.Event()
+    release = threading.Event()
+    reg = ToolRegistry()
+
+    def slow(args):
+        started.set()
+        release.wait(2.0)
+        return [{"type": "text", "text": "ok"}]
+
+    reg.register("computer", slow)
+    client = AsyncLLM([_turn("", [ToolCall(id="1", name="computer", args={"action": "wait"})])])
+    token = CancelToken()
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        task = asyncio.create_task(Orchestrator(client, reg, tool_executor=ex).arun("task", TOOLS, None, cancel_token=token))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+
+    assert token.is_cancelled
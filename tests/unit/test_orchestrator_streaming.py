@@ -0,0 +1,112 @@
+"""Tests for streamed turns: text deltas and early tool execution (Orchestrator.run/arun)."""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from os_ai_llm.interfaces import LLMClient
+from os_ai_llm.types import LLMResponse, Message, StreamEvent, TextPart, ToolCall, ToolDescriptor, Usage
+from os_ai_core.orchestrator import Orchestrator
+from os_ai_core.tools.registry import ToolRegistry
+
+
+TOOLS = [ToolDescriptor(name="computer", kind="computer_use")]
+CALL = ToolCall(id="t1", name="computer", args={"action": "left_click"})
+
+
+class StreamingLLM(LLMClient):
+    """First turn streams a tool call, then keeps 'writing' until the tool has run."""
+
+    def __init__(self, tool_ran: threading.Event) -> None:
+        self.tool_ran = tool_ran
+        self.turns = 0
+        self.ran_mid_stream = False
+
+    def supports_streaming(self) -> bool:
+        return True
+
+    def _first_turn(self):
+        yield StreamEvent(kind="text_delta", text="Click")
+        yield StreamEvent(kind="text_delta", text="ing")
+        yield StreamEvent(kind="text", text="Clicking")
+        yield StreamEvent(kind="tool_call", tool_call=CALL)
+        # Trailing output: the tool must already be running
+        self.ran_mid_stream = self.tool_ran.wait(2.0)
+        yield StreamEvent(kind="response", response=LLMResponse(
+            messages=[Message(role="assistant", content=[TextPart(text="Clicking")])],
+            tool_calls=[CALL],
+            usage=Usage(input_tokens=3, output_tokens=2),
+        ))
+
+    def _last_turn(self):
+        yield StreamEvent(kind="text", text="done")
+        yield StreamEvent(kind="response", response=LLMResponse(
+            messages=[Message(role="assistant", content=[TextPart(text="done")])],
+            tool_calls=[],
+            usage=Usage(input_tokens=1, output_tokens=1),
+        ))
+
+    def stream(self, **kwargs):  # type: ignore[override]
+        self.turns += 1
+        return self._first_turn() if self.turns == 1 else self._last_turn()
+
+    async def astream(self, **kwargs):  # type: ignore[override]
+        for ev in self.stream(**kwargs):
+            yield ev
+
+    def generate(self, **kwargs):  # type: ignore[override]
+        raise AssertionError("streaming clients are not asked for a full response")
+
+    def format_tool_result(self, result):
+        return Message(role="user", content=[TextPart(text="tool_result")])
+
+
+def _setup(threads=None):
+    ran = threading.Event()
+    reg = ToolRegistry()
+
+    def computer(args):
+        if threads is not None:
+            threads.append(threading.current_thread())
+        ran.set()
+        return [{"type": "text", "text": "ok"}]
+
+    reg.register("computer", computer)
+    return StreamingLLM(ran), reg
+
+
+def _check(client, msgs, events):
+    assert client.ran_mid_stream
+    assert [m.role for m in msgs] == ["user", "assistant", "user", "assistant"]
+    deltas = [p["text"] for k, p in events if k == "assistant_text" and p.get("delta")]
+    texts = [p["text"] for k, p in events if k == "assistant_text" and not p.get("delta")]
+    assert deltas == ["Click", "ing"]
+    # The completed text is reported once, not again with the final response
+    assert texts == ["Clicking", "done"]
+    kinds = [k for k, _ in events]
+    assert kinds.index("tool_call") < kinds.index("usage") < kinds.index("tool_result_text")
+
+
+def test_run_executes_streamed_tool_calls_early_on_the_calling_thread():
+    threads = []
+    client, reg = _setup(threads)
+    events = []
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        msgs = Orchestrator(client, reg, tool_executor=ex).run(
+            "task", TOOLS, None, on_event=lambda k, p: events.append((k, p))
+        )
+    _check(client, msgs, events)
+    # Platform code (macOS overlay) may wait for the main thread: sync runs never hand tools to a worker
+    assert threads == [threading.current_thread()]
+
+
+async def test_arun_executes_streamed_tool_calls_early():
+    client, reg = _setup()
+    events = []
+
+    async def on_event(k, p):
+        events.append((k, p))
+
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        msgs = await Orchestrator(client, reg, tool_executor=ex).arun("task", TOOLS, None, on_event=on_event)
+    _check(client, msgs, events)
@@ -0,0 +1,97 @@
+"""Tests for drag path simplification/resampling (os_ai_core.utils.paths)."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from os_ai_core.utils.paths import path_length, resample_path, simplify_path
+
+
+def _circle(n=300, r=100.0, cx=400.0, cy=300.0):
+    t = np.linspace(0.0, 2 * np.pi, n)
+    return np.column_stack((cx + r * np.cos(t), cy + r * np.sin(t)))
+
+
+def test_simplify_collapses_collinear_points_and_keeps_corners():
+    line = [[0, 0], [10, 0], [20, 0], [30, 0], [30, 10], [30, 20]]
+    assert simplify_path(line, 0.5).tolist() == [[0, 0], [30, 0], [30, 20]]
+    # Zero tolerance only drops consecutive duplicates
+    assert len(simplify_path([[0, 0], [0, 0], [5, 5], [9, 9]], 0.0)) == 3
+
+
+def test_simplified_circle_stays_within_tolerance():
+    circle = _circle()
+    simple = simplify_path(circle, 1.0)
+    assert len(simple) < len(circle) / 4
+    # Every original point is within ~tolerance of the simplified polyline's sample set
+    dense = resample_path(simple, 1.0, 1000).astype(np.float64)
+    d = np.min(np.hypot(circle[:, None, 0] - dense[None, :, 0], circle[:, None, 1] - dense[None, :, 1]), axis=1)
+    assert d.max() <= 1.5
+
+
+def test_resample_hits_every_vertex_and_ends_on_target():
+    path = np.array([[0, 0], [100, 0], [100, 100]], dtype=float)
+    out = resample_path(path, 0.5, 100)
+    assert tuple(out[-1]) == (100, 100)
+    assert [100, 0] in out.tolist()
+    assert 50 <= len(out) <= 52
+    steps = np.hypot(*np.diff(out, axis=0).T)
+    assert steps.max() <= path_length(path) / 50 + 1
+
+
+def test_drag_path_is_simplified_and_resampled(monkeypatch):
+    import os_ai_core.tools.computer as computer
+
+    drivers = MagicMock()
+    drivers.mouse.position.return_value = (0, 0)
+    monkeypatch.setattr(computer, "get_drivers", lambda: drivers)
+    monkeypatch.setattr(computer, "_ACTIVE_VIEWPORT", None)
+    monkeypatch.setattr(computer, "POST_MOVE_VERIFY", False)
+    circle = _circle().round().astype(int).tolist()
+
+    res = computer.handle_computer_action("left_click_drag", {
+        "start": circle[0], "end": circle[-1], "path": circle,
+        "coordinate_space": "screen", "motion": "instant", "hold_before_ms": 0, "hold_after_ms": 0,
+    })
+
+    assert "done" in res[0]["text"]
+    moves = [c.args for c in drivers.mouse.move_to.call_args_list]
+    # Start + simplified vertices instead of 300 per-point moves
+    assert 10 < len(moves) < 100
+    assert moves[-1] == tuple(circle[-1])
+    drivers.mouse.down.assert_called_once()
+    drivers.mouse.up.assert_called_once()
+
+
+def test_to_screen_path_matches_pointwise_transform(monkeypatch):
+    import os_ai_core.tools.computer as computer
+
+    monkeypatch.setattr(computer, "get_drivers", MagicMock())
+    monkeypatch.setattr(computer, "_GEOMETRY", None)
+    monkeypatch.setattr(computer, "_ACTIVE_VIEWPORT", None)
+    monkeypatch.setattr(computer, "COORD_AUTO_CALIBRATION", False)
+    pts = [[0, 0], [17, 400], [512, 288], [1023, 575], [2000, -5]]
+    expected = [computer._to_screen_xy(x, y, coordinate_space="model") for x, y in pts]
+    got = computer._to_screen_path(pts, coordinate_space="model")
+    assert [tuple(p) for p in got.tolist()] == expected
+
+
+def test_drag_path_correction_is_capped_for_a_bad_saved_fit(monkeypatch):
+    import os_ai_core.tools.computer as computer
+    from os_ai_core.utils.calibration import AffineCalibrator
+
+    monkeypatch.setattr(computer, "get_drivers", MagicMock())
+    monkeypatch.setattr(computer, "_GEOMETRY", None)
+    monkeypatch.setattr(computer, "_ACTIVE_VIEWPORT", None)
+    # Nearly singular fit, as left behind by bunched samples before the spread guard
+    cal = AffineCalibrator(max_correction_px=50)
+    cal.load_dict({"params": [1.0, 0.0, 0.0, 0.0, 0.001, 0.0], "rms_px": 0.5, "samples": 8})
+    monkeypatch.setattr(computer, "_get_calibrator", lambda geometry: cal)
+    pts = [[100, 100], [400, 300], [800, 600], [900, 20]]
+
+    got = computer._to_screen_path(pts, coordinate_space="screen")
+
+    for (tx, ty), (x, y) in zip(pts, got.tolist()):
+        assert ((x - tx) ** 2 + (y - ty) ** 2) ** 0.5 <= 50.5
+    assert [tuple(p) for p in got.tolist()] == [cal.command_for(tuple(p)) for p in pts]
@@ -0,0 +1,65 @@
+"""Tests for the precomputed screen-to-model resize engine (os_ai_core.utils.resize)."""
+from __future__ import annotations
+
+from PIL import Image
+
+from os_ai_core.utils.resize import ResizeEngine
+
+
+def test_letterbox_places_content_and_keeps_black_bars():
+    eng = ResizeEngine((1024, 576), (1024, 768), (0, 96))
+    out = eng.process(Image.new("RGB", (1920, 1080), (200, 10, 10)))
+    assert out.size == (1024, 768)
+    assert out.getpixel((10, 10)) == (0, 0, 0)
+    assert out.getpixel((10, 767)) == (0, 0, 0)
+    assert out.getpixel((512, 384)) == (200, 10, 10)
+
+
+def test_canvas_is_reused_between_frames():
+    eng = ResizeEngine((1024, 576), (1024, 768), (0, 96))
+    first = eng.process(Image.new("RGB", (1920, 1080), (255, 255, 255)))
+    second = eng.process(Image.new("RGB", (1920, 1080), (0, 0, 255)))
+    assert first is second
+    assert second.getpixel((512, 384)) == (0, 0, 255)
+
+
+def test_matching_aspect_skips_letterbox():
+    eng = ResizeEngine((1024, 576), (1024, 576))
+    assert eng.letterboxed is False
+    out = eng.process(Image.new("RGB", (1920, 1080)))
+    assert out.size == (1024, 576)
+
+
+def test_reduce_factor_by_mode():
+    quality = ResizeEngine((1024, 576), resample="quality")
+    fast = ResizeEngine((1024, 576), resample="fast")
+    # 4K -> 1024 is a 3.75x downscale
+    assert quality.reduce_factor((3840, 2160)) == 1
+    assert fast.reduce_factor((3840, 2160)) == 3
+    # HiDPI 2x capture of a 4K logical screen: 7.5x
+    assert quality.reduce_factor((7680, 4320)) == 3
+    assert fast.scale(Image.new("RGB", (7680, 4320))).size == (1024, 576)
+
+
+def test_same_size_frame_is_passed_through():
+    eng = ResizeEngine((800, 600))
+    img = Image.new("RGB", (800, 600))
+    assert eng.process(img) is img
+
+
+def test_rgba_capture_is_flattened_onto_rgb_canvas():
+    eng = ResizeEngine((100, 50), (100, 100), (0, 25))
+    out = eng.process(Image.new("RGBA", (200, 100), (1, 2, 3, 255)))
+    assert out.mode == "RGB"
+    assert out.getpixel((50, 50)) == (1, 2, 3)
+
+
+def test_exact_hidpi_multiple_is_a_single_reduce():
+    eng = ResizeEngine((1440, 900))
+    assert eng.exact_factor((2880, 1800)) == 2
+    assert eng.exact_factor((2880, 1802)) == 0
+    assert eng.exact_factor((1440, 900)) == 0
+    src = Image.new("RGB", (2880, 1800), (9, 8, 7))
+    out = eng.scale(src)
+    assert out.size == (1440, 900)
+    assert out.getpixel((700, 450)) == (9, 8, 7)
@@ -0,0 +1,57 @@
+"""Tests for driver-side scaled (HiDPI logical / model-size) capture in the screenshot pipeline."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image
+
+
+@pytest.fixture
+def computer(monkeypatch):
+    mock_pag = MagicMock()
+    mock_pag.size.return_value = (1440, 900)
+    import os_ai_core.tools.computer as computer
+    monkeypatch.setattr(computer, "pyautogui", mock_pag)
+    monkeypatch.setattr(computer, "_GEOMETRY", None)
+    monkeypatch.setattr(computer, "_ACTIVE_VIEWPORT", None)
+    monkeypatch.setattr(computer, "_RESIZE_ENGINE", None)
+    monkeypatch.setattr(computer, "SCREENSHOT_CAPTURE_AREA", "screen")
+    monkeypatch.setattr(computer, "SCREEN_CAPTURE_SERVICE_ENABLED", False)
+    monkeypatch.setattr(computer, "SCREENSHOT_NATIVE_SCALING", True)
+    monkeypatch.setattr(computer, "_save_frame", lambda frame: None)
+    return computer
+
+
+def _drivers(scaled: bool):
+    drivers = MagicMock()
+    drivers.capabilities.supports_scaled_capture = scaled
+    drivers.capabilities.supports_window_capture = False
+    drivers.screen.screenshot.return_value = Image.new("RGB", (2880, 1800))
+    drivers.screen.screenshot_scaled.side_effect = lambda size, region=None: Image.new("RGB", tuple(size))
+    return drivers
+
+
+def test_scaled_capture_skips_physical_frame(computer, monkeypatch):
+    drivers = _drivers(scaled=True)
+    monkeypatch.setattr(computer, "get_drivers", lambda: drivers)
+    content = computer._geometry().viewport.content_size
+    block = computer.b64_image_from_screenshot()
+    assert block["type"] == "image"
+    drivers.screen.screenshot_scaled.assert_called_once_with(content, region=None)
+    drivers.screen.screenshot.assert_not_called()
+
+
+def test_drivers_without_scaling_use_regular_capture(computer, monkeypatch):
+    drivers = _drivers(scaled=False)
+    monkeypatch.setattr(computer, "get_drivers", lambda: drivers)
+    computer.b64_image_from_screenshot()
+    drivers.screen.screenshot_scaled.assert_not_called()
+    drivers.screen.screenshot.assert_called_once()
+
+
+def test_wrong_size_from_driver_is_ignored(computer, monkeypatch):
+    drivers = _drivers(scaled=True)
+    drivers.screen.screenshot_scaled.side_effect = lambda size, region=None: Image.new("RGB", (10, 10))
+    monkeypatch.setattr(computer, "get_drivers", lambda: drivers)
+    assert computer._capture_scaled((1024, 640)) is None
@@ -0,0 +1,81 @@
+"""Tests for the background screenshot archiver."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from os_ai_core.utils.frames import EncodedFrame
+from os_ai_core.utils.screenshot_archive import ScreenshotArchiver
+
+
+def _frame(n: int = 100) -> EncodedFrame:
+    return EncodedFrame(data=b"x" * n, format="JPEG", width=1, height=1)
+
+
+def test_submit_writes_file_after_flush(tmp_path):
+    arch = ScreenshotArchiver(str(tmp_path / "shots"))
+    path = arch.submit(_frame())
+    assert arch.flush(timeout=5)
+    assert os.path.exists(path)
+    assert path.endswith(".jpg")
+    arch.close()
+
+
+def test_paths_are_unique_within_same_millisecond(tmp_path):
+    arch = ScreenshotArchiver(str(tmp_path))
+    paths = {arch.submit(_frame()) for _ in range(5)}
+    arch.flush(timeout=5)
+    assert len(paths) == 5
+    arch.close()
+
+
+def test_backlog_drops_oldest_pending(tmp_path, monkeypatch):
+    gate = threading.Event()
+    arch = ScreenshotArchiver(str(tmp_path), max_pending=2)
+    original = arch._write
+
+    def slow_write(path, frame):
+        gate.wait(5)
+        original(path, frame)
+
+    monkeypatch.setattr(arch, "_write", slow_write)
+    first = arch.submit(_frame())
+    time.sleep(0.05)  # let the worker pick up the first frame and block
+    p2 = arch.submit(_frame())
+    p3 = arch.submit(_frame())
+    p4 = arch.submit(_frame())
+    gate.set()
+    assert arch.flush(timeout=5)
+    assert arch.dropped == 1
+    assert os.path.exists(first)
+    assert not os.path.exists(p2)
+    assert os.path.exists(p3) and os.path.exists(p4)
+    arch.close()
+
+
+def test_size_quota_removes_oldest(tmp_path):
+    arch = ScreenshotArchiver(str(tmp_path), max_total_bytes=250)
+    paths = []
+    for _ in range(4):
+        paths.append(arch.submit(_frame(100)))
+        arch.flush(timeout=5)
+        time.sleep(0.01)
+    remaining = [p for p in paths if os.path.exists(p)]
+    assert remaining == paths[-2:]
+    arch.close()
+
+
+def test_ttl_removes_preexisting_old_files(tmp_path):
+    old = tmp_path / "screenshot_20000101_000000_000.jpg"
+    old.write_bytes(b"old")
+    os.utime(old, (time.time() - 3600, time.time() - 3600))
+    unrelated = tmp_path / "notes.txt"
+    unrelated.write_text("keep")
+    arch = ScreenshotArchiver(str(tmp_path), ttl_seconds=60)
+    arch.submit(_frame())
+    arch.flush(timeout=5)
+    assert not old.exists()
+    assert unrelated.exists()
+    arch.close()
@@ -0,0 +1,118 @@
+"""Tests for settle detection (os_ai_core.utils.settle) and the wait_until_stable action."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from PIL import Image
+
+from os_ai_core.utils.settle import wait_until_stable
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _frames(*shades):
+    """grab() returning solid frames of the given shades, then repeating the last one."""
+    seq = list(shades)
+
+    def grab():
+        shade = seq.pop(0) if len(seq) > 1 else seq[0]
+        return Image.new("RGB", (320, 200), (shade, shade, shade))
+
+    return grab
+
+
+def test_returns_once_the_screen_stops_changing():
+    clock = _Clock()
+    res = wait_until_stable(_frames(0, 80, 160, 200, 200), stable_samples=3, interval_s=0.1, timeout_s=5.0,
+                            clock=clock, sleep=clock.sleep)
+    assert res.stable
+    # 4 changing frames, then 3 calm comparisons
+    assert res.samples == 7
+    assert res.elapsed_s == 0.6
+
+
+def test_times_out_while_the_screen_keeps_changing():
+    clock = _Clock()
+    shades = list(range(0, 250, 10))
+    res = wait_until_stable(_frames(*shades), stable_samples=2, interval_s=0.1, timeout_s=1.0,
+                            clock=clock, sleep=clock.sleep)
+    assert not res.stable
+    assert res.elapsed_s == 1.0
+    assert res.last_change == 1.0
+
+
+def test_small_changes_below_threshold_count_as_stable():
+    clock = _Clock()
+    base = Image.new("L", (640, 400), 0)
+    blink = base.copy()
+    blink.paste(255, (0, 0, 4, 10))  # a cursor-sized change
+    frames = iter([base, blink, base, blink])
+    res = wait_until_stable(lambda: next(frames), threshold=0.01, stable_samples=3, interval_s=0.1,
+                            clock=clock, sleep=clock.sleep)
+    assert res.stable and res.samples == 4
+
+
+def test_unavailable_capture_returns_immediately():
+    clock = _Clock()
+    res = wait_until_stable(MagicMock(side_effect=RuntimeError("no display")), clock=clock, sleep=clock.sleep)
+    assert (res.stable, res.frames, res.elapsed_s) == (False, 0, 0.0)
+    assert res.describe() == "screen capture unavailable"
+
+
+def test_batch_settles_before_closing_screenshot(monkeypatch):
+    import os_ai_core.tools.computer as computer
+    from os_ai_core.utils.settle import SettleResult
+
+    settle = MagicMock(return_value=SettleResult(True, 0.3, 4, 0.0, 4))
+    monkeypatch.setattr(computer, "BATCH_SETTLE_ENABLED", True)
+    monkeypatch.setattr(computer, "_wait_until_stable", settle)
+    monkeypatch.setattr(computer, "handle_computer_action", lambda a, p: [{"type": "text", "text": "ok"}])
+    monkeypatch.setattr(computer, "b64_image_from_screenshot", lambda dedupe=False: {"type": "image", "source": {}})
+
+    computer.computer_tool_handler_batch({"_openai_batch": True, "_openai_actions": [{"action": "left_click", "coordinate": [1, 1]}]})
+    settle.assert_called_once()
+    assert settle.call_args.kwargs["timeout_s"] == computer.BATCH_SETTLE_TIMEOUT_S
+
+    # A batch that already ends in a settle wait is not settled twice
+    settle.reset_mock()
+    computer.computer_tool_handler_batch({"_openai_batch": True, "_openai_actions": [{"action": "wait_until_stable", "timeout": 2.0}]})
+    settle.assert_not_called()
+
+    # Nothing animates after typing; Enter submits and usually does
+    computer.computer_tool_handler_batch({"_openai_batch": True, "_openai_actions": [{"action": "left_click", "coordinate": [1, 1]}, {"action": "type", "text": "hi"}]})
+    settle.assert_not_called()
+    computer.computer_tool_handler_batch({"_openai_batch": True, "_openai_actions": [{"action": "type", "text": "hi"}, {"action": "key", "key": "Return"}]})
+    settle.assert_called_once()
+
+
+def test_batch_settle_is_off_by_default():
+    import os_ai_core.config as config
+
+    assert config.BATCH_SETTLE_ENABLED is False
+
+
+def test_settle_region_is_not_shifted_by_pointer_calibration(monkeypatch):
+    import os_ai_core.tools.computer as computer
+    from os_ai_core.utils.calibration import AffineCalibrator
+
+    cal = AffineCalibrator()
+    cal.load_dict({"params": [1.0, 0.0, 30.0, 0.0, 1.0, -20.0], "rms_px": 0.5, "samples": 8})
+    monkeypatch.setattr(computer, "_get_calibrator", lambda geometry: cal)
+    geometry = computer._geometry()
+    regions = []
+    monkeypatch.setattr(computer, "_settle_grabber", lambda region=None: regions.append(region) or (lambda: None))
+    monkeypatch.setattr(computer, "wait_until_stable", lambda grab, **kw: None)
+
+    w, h = geometry.screen_w, geometry.screen_h
+    computer._wait_until_stable({"region": [w - 100, h - 50, w, h], "coordinate_space": "screen"}, timeout_s=0.1)
+
+    assert regions == [(w - 100, h - 50, 100, 50)]
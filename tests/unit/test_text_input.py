@@ -0,0 +1,124 @@
+"""Tests for the `type` action strategy and chunking (os_ai_core.utils.text_input)."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from os_ai_core.utils.text_input import choose_text_strategy, split_chunks
+
+
+def test_strategy_picks_paste_for_code_multiline_long_and_untypable_text():
+    assert choose_text_strategy("hello world") == "type"
+    assert choose_text_strategy("a\nb") == "paste"
+    assert choose_text_strategy("f(x) => 1") == "paste"
+    assert choose_text_strategy("x" * 300, paste_min_chars=200) == "paste"
+    assert choose_text_strategy("x" * 300, paste_min_chars=0) == "type"
+    assert choose_text_strategy("привет") == "paste"
+    # A keyboard that can remap keysyms types non-ASCII directly
+    assert choose_text_strategy("привет", unicode_typing=True) == "type"
+    assert choose_text_strategy("a\nb", mode="type") == "type"
+    assert choose_text_strategy("hi", mode="PASTE") == "paste"
+
+
+def test_split_chunks_prefers_line_then_word_breaks():
+    text = "alpha beta\ngamma delta epsilon"
+    chunks = split_chunks(text, 16)
+    assert "".join(chunks) == text
+    assert chunks[0] == "alpha beta\n"
+    assert all(len(c) <= 16 for c in chunks)
+    assert split_chunks("x" * 25, 10) == ["x" * 10, "x" * 10, "x" * 5]
+    assert split_chunks("", 10) == []
+    assert split_chunks("short", 0) == ["short"]
+
+
+def test_long_paste_is_chunked_and_clipboard_restored(monkeypatch):
+    import os_ai_core.tools.computer as computer
+
+    drivers = MagicMock()
+    drivers.capabilities.clipboard_backend = "x11"
+    drivers.capabilities.supports_unicode_typing = False
+    drivers.clipboard.get_text.return_value = "previous"
+    drivers.clipboard.wait_read.return_value = True
+    monkeypatch.setattr(computer, "get_drivers", lambda: drivers)
+    monkeypatch.setattr(computer, "PASTE_CHUNK_CHARS", 1000)
+    sleeps = []
+    monkeypatch.setattr(computer.time, "sleep", sleeps.append)
+    text = "\n".join(f"line {i:04d} = value()" for i in range(250))
+
+    res = computer.handle_computer_action("type", {"text": text})
+
+    pasted = [c.args[0] for c in drivers.clipboard.set_text.call_args_list]
+    assert pasted[-1] == "previous"
+    assert "".join(pasted[:-1]) == text
+    assert len(pasted) - 1 == drivers.keyboard.press_combo.call_count > 1
+    assert "chunks" in res[0]["text"]
+    # The native clipboard reports reads: no fixed copy/post-paste sleeps
+    assert sleeps == []
+
+
+def _paste_drivers(monkeypatch):
+    import os_ai_core.tools.computer as computer
+
+    drivers = MagicMock()
+    drivers.capabilities.clipboard_backend = "x11"
+    drivers.capabilities.supports_unicode_typing = False
+    drivers.clipboard.get_text.return_value = "previous"
+    monkeypatch.setattr(computer, "get_drivers", lambda: drivers)
+    monkeypatch.setattr(computer.time, "sleep", lambda s: None)
+    return computer, drivers
+
+
+def test_clipboard_is_armed_right_before_each_paste_keystroke(monkeypatch):
+    computer, drivers = _paste_drivers(monkeypatch)
+    monkeypatch.setattr(computer, "PASTE_CHUNK_CHARS", 100)
+    calls = []
+    drivers.clipboard.set_text.side_effect = lambda text: calls.append("set")
+    drivers.clipboard.arm.side_effect = lambda: calls.append("arm")
+    drivers.keyboard.press_combo.side_effect = lambda combo: calls.append("paste")
+    drivers.clipboard.wait_read.side_effect = lambda timeout: calls.append("wait") or True
+
+    computer.handle_computer_action("type", {"text": "x" * 150, "strategy": "paste"})
+
+    assert calls == ["set", "arm", "paste", "wait"] * 2 + ["set"]
+
+
+def test_unread_clipboard_does_not_type_the_pasted_text_again(monkeypatch):
+    computer, drivers = _paste_drivers(monkeypatch)
+    drivers.clipboard.wait_read.return_value = False
+
+    res = computer.handle_computer_action("type", {"text": "x" * 600, "strategy": "paste"})
+
+    assert drivers.keyboard.press_combo.call_count == 1
+    drivers.keyboard.type_text.assert_not_called()
+    assert res[0]["text"].startswith("pasted 600 chars") and "unconfirmed" in res[0]["text"]
+    # The target may still read it: the previous text is not put back over it
+    assert [c.args[0] for c in drivers.clipboard.set_text.call_args_list] == ["x" * 600]
+
+
+def test_unread_chunk_stops_the_paste_before_the_next_one(monkeypatch):
+    computer, drivers = _paste_drivers(monkeypatch)
+    monkeypatch.setattr(computer, "PASTE_CHUNK_CHARS", 100)
+    drivers.clipboard.wait_read.return_value = False
+
+    res = computer.handle_computer_action("type", {"text": "x" * 250, "strategy": "paste"})
+
+    assert drivers.keyboard.press_combo.call_count == 1
+    drivers.keyboard.type_text.assert_not_called()
+    assert res[0]["text"].startswith("error: clipboard paste interrupted after 1 of 3 chunks: target did not fetch")
+    assert [c.args[0] for c in drivers.clipboard.set_text.call_args_list] == ["x" * 100]
+
+
+def test_paste_failing_midway_reports_instead_of_retyping(monkeypatch):
+    computer, drivers = _paste_drivers(monkeypatch)
+    monkeypatch.setattr(computer, "PASTE_CHUNK_CHARS", 100)
+    drivers.clipboard.wait_read.return_value = True
+    drivers.keyboard.press_combo.side_effect = [None, RuntimeError("display gone")]
+
+    res = computer.handle_computer_action("type", {"text": "x" * 250, "strategy": "paste"})
+
+    drivers.keyboard.type_text.assert_not_called()
+    assert res[0]["text"].startswith("error: clipboard paste interrupted after 1 of 3 chunks")
+
+    # Nothing pasted yet: typing is the fallback
+    drivers.keyboard.press_combo.side_effect = RuntimeError("no clipboard")
+    res = computer.handle_computer_action("type", {"text": "x" * 250, "strategy": "paste"})
+    assert drivers.keyboard.type_text.called and res[0]["text"] == "done: type"
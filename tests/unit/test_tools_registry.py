@@ -21,3 +21,38 @@ def test_tools_registry_normalizes_text_and_image_blocks():
     assert res.tool_call_id == "1"
     assert len(res.content) == 2
 
+
+
+def test_tools_registry_reset_runs_hooks_and_swallows_errors():
+    reg = ToolRegistry()
+    calls = []
+
+    def bad_hook():
+        raise RuntimeError("boom")
+
+    reg.add_reset_hook(lambda: calls.append("a"))
+    reg.add_reset_hook(bad_hook)
+    reg.add_reset_hook(lambda: calls.append("b"))
+    reg.reset()
+
+    assert calls == ["a", "b"]
+
+
+def test_tools_registry_keeps_image_label():
+    reg = ToolRegistry()
+    reg.register("computer", lambda args: [
+        {"type": "image", "label": "zoom", "source": {"type": "base64", "media_type": "image/jpeg", "data": "z"}},
+    ])
+    res = reg.execute(ToolCall(id="1", name="computer", args={}))
+    assert res.content[0].label == "zoom"
+
+
+def test_tools_registry_moves_block_metadata_to_result():
+    reg = ToolRegistry()
+    reg.register("computer", lambda args: [
+        {"type": "image", "source": {"type": "base64", "media_type": "image/png", "data": "s"},
+         "metadata": {"batch_results": [{"action": "left_click", "text": "ok"}]}},
+    ])
+    res = reg.execute(ToolCall(id="1", name="computer", args={}))
+    assert len(res.content) == 1
+    assert res.metadata["batch_results"][0]["text"] == "ok"
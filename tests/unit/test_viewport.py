@@ -0,0 +1,122 @@
+"""Tests for the capture viewport geometry (os_ai_core.utils.viewport)."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image
+
+from os_ai_core.utils.viewport import Viewport, fit_viewport
+
+
+def test_full_screen_matching_aspect_has_no_letterbox():
+    vp = Viewport(0, 0, 1920, 1080, 1024, 576)
+    assert vp.content_size == (1024, 576)
+    assert vp.offset == (0, 0)
+    assert vp.to_screen(512, 288) == (960, 540)
+
+
+def test_tall_window_is_pillarboxed_and_offset():
+    # 400x800 window at (100, 50) shown in a 1024x768 canvas -> 384x768 content, 320px bars
+    vp = Viewport(100, 50, 400, 800, 1024, 768)
+    assert vp.content_size == (384, 768)
+    assert vp.offset == (320, 0)
+    assert vp.to_screen(320, 0) == (100, 50)
+    assert vp.to_screen(320 + 192, 384) == (300, 450)
+
+
+def test_points_in_bars_clamp_to_the_window():
+    vp = Viewport(100, 50, 400, 800, 1024, 768)
+    assert vp.to_screen(0, 0) == (100, 50)
+    assert vp.to_screen(1023, 767) == (499, 849)
+
+
+def test_fit_viewport_drops_bars_unless_letterboxed():
+    vp = fit_viewport(0, 0, 1920, 1200, 1024, 768)
+    assert (vp.model_w, vp.model_h) == (1024, 640)
+    assert vp.offset == (0, 0)
+    boxed = fit_viewport(0, 0, 1920, 1200, 1024, 768, letterbox=True)
+    assert (boxed.model_w, boxed.model_h) == (1024, 768)
+    assert boxed.offset == (0, 64)
+
+
+def test_resize_engine_produces_model_canvas():
+    vp = Viewport(10, 10, 600, 300, 1024, 768)
+    out = vp.resize_engine().process(Image.new("RGB", (600, 300), (255, 0, 0)))
+    assert out.size == (1024, 768)
+    ox, oy = vp.offset
+    assert out.getpixel((ox + 5, oy + 5)) == (255, 0, 0)
+    assert out.getpixel((5, 5)) == (0, 0, 0)
+
+
+@pytest.fixture
+def computer(monkeypatch):
+    mock_pag = MagicMock()
+    mock_pag.size.return_value = (1920, 1080)
+    import os_ai_core.tools.computer as computer
+    monkeypatch.setattr(computer, "pyautogui", mock_pag)
+    monkeypatch.setattr(computer, "_ACTIVE_VIEWPORT", None)
+    monkeypatch.setattr(computer, "_GEOMETRY", None)
+    return computer
+
+
+def test_model_coordinates_follow_active_window(computer, monkeypatch):
+    geometry = computer._geometry()
+    vp = Viewport(200, 100, 800, 600, geometry.model_w, geometry.model_h)
+    monkeypatch.setattr(computer, "_ACTIVE_VIEWPORT", vp)
+    ox, oy = vp.offset
+    sx, sy = computer._to_screen_xy(ox, oy, coordinate_space="model")
+    assert (sx, sy) == computer._apply_calibration(200, 100)
+
+
+def test_window_capture_sets_viewport_and_falls_back(computer, monkeypatch):
+    from os_ai_os.ports.types import Rect
+
+    rect = Rect(x=40, y=30, width=500, height=400)
+    drivers = MagicMock()
+    drivers.capabilities.supports_window_capture = True
+    drivers.screen.active_window_rect.return_value = rect
+    drivers.screen.screenshot.side_effect = lambda region=None: Image.new("RGB", (region[2], region[3]) if region else (1920, 1080))
+    monkeypatch.setattr(computer, "get_drivers", lambda: drivers)
+    monkeypatch.setattr(computer, "SCREENSHOT_CAPTURE_AREA", "active_window")
+    monkeypatch.setattr(computer, "SCREEN_CAPTURE_SERVICE_ENABLED", False)
+    monkeypatch.setattr(computer, "_save_frame", lambda frame: None)
+
+    block = computer.b64_image_from_screenshot()
+    assert block["type"] == "image"
+    assert computer._ACTIVE_VIEWPORT.rect == (40, 30, 500, 400)
+    drivers.screen.screenshot.assert_called_with(region=(40, 30, 500, 400))
+
+    drivers.screen.active_window_rect.return_value = None
+    computer.b64_image_from_screenshot()
+    assert computer._ACTIVE_VIEWPORT is None
+
+
+def test_to_screen_array_matches_scalar_mapping():
+    import numpy as np
+
+    vp = Viewport(100, 50, 1280, 720, 1024, 640, letterbox=True)
+    rng = np.random.default_rng(0)
+    pts = np.column_stack((rng.uniform(-20, 1050, 200), rng.uniform(-20, 660, 200)))
+    expected = [vp.to_screen(x, y) for x, y in pts]
+    assert [tuple(p) for p in vp.to_screen_array(pts).tolist()] == expected
+
+
+def test_zoom_region_ignores_pointer_calibration(computer, monkeypatch):
+    from os_ai_core.utils.calibration import AffineCalibrator
+
+    cal = AffineCalibrator()
+    cal.load_dict({"params": [1.0, 0.0, 30.0, 0.0, 1.0, -20.0], "rms_px": 0.5, "samples": 8})
+    monkeypatch.setattr(computer, "_get_calibrator", lambda geometry: cal)
+    monkeypatch.setattr(computer, "COORD_X_OFFSET", 7)
+    drivers = MagicMock()
+    drivers.screen.screenshot.side_effect = lambda region=None: Image.new("RGB", (region[2], region[3]))
+    monkeypatch.setattr(computer, "get_drivers", lambda: drivers)
+    monkeypatch.setattr(computer, "_save_frame", lambda frame: None)
+
+    computer.zoom_image_blocks((1800, 1000, 1920, 1080), coordinate_space="screen")
+
+    # Exactly the requested pixels, including the last column and row
+    drivers.screen.screenshot.assert_called_once_with(region=(1800, 1000, 120, 80))
+    geometry = computer._geometry()
+    assert computer._region_to_screen((0, 0, geometry.model_w, geometry.model_h), coordinate_space="model") == (0, 0, 1920, 1080)